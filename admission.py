@@ -0,0 +1,155 @@
+"""
+Admission control and load shedding for CPU-bound requests.
+
+A bounded number of requests run at once, a bounded number wait for a slot,
+and everything else is rejected immediately so that clients get a fast 503
+instead of timing out behind a backlog. Requests that waited past their
+deadline are shed as well, since their clients have most likely given up.
+"""
+
+import math
+import threading
+import time
+from collections import OrderedDict
+from contextlib import contextmanager
+from typing import Any, Dict, Iterator, Optional
+
+class Overloaded(Exception):
+    """Raised when a request is shed; ``retry_after`` is a hint in seconds"""
+
+    def __init__(self, reason: str, retry_after: int):
+        super().__init__(f'Server overloaded ({reason})')
+        self.reason = reason
+        self.retry_after = retry_after
+
+class AdmissionController:
+    """Bounded concurrency with a bounded, deadline-aware wait queue"""
+
+    def __init__(self, max_concurrent: int = 4, max_queue: int = 16, queue_timeout: float = 5.0):
+        self.max_concurrent = max_concurrent
+        self.max_queue = max_queue
+        self.queue_timeout = queue_timeout
+        self._condition = threading.Condition()
+        self._in_flight = 0
+        self._queued = 0
+
+        # Counters and service time estimate (exponentially weighted, seconds)
+        self._admitted = 0
+        self._shed = {'queue_full': 0, 'deadline': 0, 'stale': 0}
+        self._degraded_served = 0
+        self._service_time = 0.05
+
+    def acquire(self, deadline: Optional[float] = None) -> float:
+        """Take a slot or raise Overloaded; returns a token for ``release``.
+
+        ``deadline`` is a ``time.monotonic()`` value after which the request
+        is no longer worth starting.
+        """
+        now = time.monotonic()
+        wait_until = now + self.queue_timeout
+        if deadline is not None:
+            if deadline <= now:
+                self._record_shed('stale')
+                raise Overloaded('stale', self.retry_after())
+            wait_until = min(wait_until, deadline)
+
+        with self._condition:
+            if self._in_flight >= self.max_concurrent:
+                if self._queued >= self.max_queue:
+                    self._shed['queue_full'] += 1
+                    raise Overloaded('queue_full', self._retry_after_locked())
+
+                self._queued += 1
+                try:
+                    while self._in_flight >= self.max_concurrent:
+                        remaining = wait_until - time.monotonic()
+                        if remaining <= 0:
+                            self._shed['deadline'] += 1
+                            raise Overloaded('deadline', self._retry_after_locked())
+                        self._condition.wait(remaining)
+                finally:
+                    self._queued -= 1
+
+            self._in_flight += 1
+            self._admitted += 1
+
+        return time.monotonic()
+
+    def release(self, token: float) -> None:
+        """Give back a slot taken by ``acquire``"""
+        elapsed = time.monotonic() - token
+        with self._condition:
+            self._in_flight -= 1
+            self._service_time += 0.1 * (elapsed - self._service_time)
+            self._condition.notify()
+
+    @contextmanager
+    def admit(self, deadline: Optional[float] = None) -> Iterator[None]:
+        """Hold a slot for the duration of the block or raise Overloaded"""
+        token = self.acquire(deadline)
+        try:
+            yield
+        finally:
+            self.release(token)
+
+    def record_degraded(self) -> None:
+        """Count a shed request that was answered from cached results instead"""
+        with self._condition:
+            self._degraded_served += 1
+
+    def retry_after(self) -> int:
+        """Seconds a shed client should wait, estimated from the current backlog"""
+        with self._condition:
+            return self._retry_after_locked()
+
+    def _retry_after_locked(self) -> int:
+        backlog = self._queued + self._in_flight
+        return max(1, math.ceil(backlog * self._service_time / self.max_concurrent))
+
+    def _record_shed(self, reason: str) -> None:
+        with self._condition:
+            self._shed[reason] += 1
+
+    def metrics(self) -> Dict[str, Any]:
+        """Queue depth, shed counts and service time"""
+        with self._condition:
+            return {
+                'max_concurrent': self.max_concurrent,
+                'max_queue': self.max_queue,
+                'queue_timeout_ms': self.queue_timeout * 1000,
+                'in_flight': self._in_flight,
+                'queue_depth': self._queued,
+                'saturated': self._in_flight >= self.max_concurrent and self._queued >= self.max_queue,
+                'admitted': self._admitted,
+                'shed': dict(self._shed),
+                'shed_total': sum(self._shed.values()),
+                'degraded_served': self._degraded_served,
+                'avg_service_ms': round(self._service_time * 1000, 3)
+            }
+
+class ResponseCache:
+    """Small thread-safe LRU of recent responses, used to answer shed requests"""
+
+    def __init__(self, max_entries: int = 1024):
+        self.max_entries = max_entries
+        self._entries: 'OrderedDict[str, Any]' = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> Any:
+        with self._lock:
+            value = self._entries.get(key)
+            if value is not None:
+                self._entries.move_to_end(key)
+            return value
+
+    def put(self, key: str, value: Any) -> None:
+        if self.max_entries <= 0:
+            return
+        with self._lock:
+            self._entries[key] = value
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def __len__(self) -> int:
+        return len(self._entries)
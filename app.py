@@ -3,14 +3,43 @@ Vedic Life Partner Prediction App
 A Flask web application for astrological compatibility analysis using Vedic astrology principles.
 """
 
-from flask import Flask, render_template, request, jsonify
+from flask import Flask, render_template, request, jsonify, Response, stream_with_context, send_file, abort, url_for
 import swisseph as swe
+import numpy as np
+import ast
 import datetime
+import json
+import hashlib
 import os
+import queue
+import bisect
+import itertools
 import logging
-from typing import Dict, List, Tuple, Optional, Any
-from dataclasses import dataclass
+import math
+import mimetypes
+import threading
+import time
+from typing import Dict, List, Tuple, Optional, Any, Iterable, Iterator
 from translations import get_text
+import fast_ephemeris
+import porutham
+import vargas
+import dasha
+import rules
+import synastry
+import pages
+import assets
+import serialization
+from jobs import JobStore, JobRunner, describe_progress
+from batching import MicroBatcher
+from singleflight import SingleFlight
+from admission import AdmissionController, Overloaded, ResponseCache
+from sessions import SessionStore, RESYNC, CLOSED
+from results import ResultStore
+from warmup import Warmup
+from engine import (ASTRO, RASI_INDEX, AYANAMSAS, NODE_TYPES, PLANET_BODIES, ChartEngine, PlanetInfo,
+                    AstrologyCalculator, AnalysisOptions, CompatibilityAnalyzer, ChartService, rule_store,
+                    initialize_ephemeris, configure as configure_engine)
 
 # Configure logging
 logging.basicConfig(
@@ -38,396 +67,1189 @@ except ImportError:
     })
     logger.info("Configuration loaded from environment variables")
 
+# Defaults for settings that an existing config.py may not define yet
+app.config.setdefault('EPHE_PATH', os.environ.get('EPHE_PATH', '.'))
+app.config.setdefault('EPHE_MODE', os.environ.get('EPHE_MODE', 'auto'))
+app.config.setdefault('EPHE_DATA_DIR', os.environ.get('EPHE_DATA_DIR', os.path.join(app.instance_path, 'ephemeris')))
+app.config.setdefault('DEFAULT_AYANAMSA', os.environ.get('DEFAULT_AYANAMSA', 'lahiri'))
+app.config.setdefault('DEFAULT_NODE_TYPE', os.environ.get('DEFAULT_NODE_TYPE', 'mean'))
+app.config.setdefault('REVERSE_SEARCH_MAX_YEARS', int(os.environ.get('REVERSE_SEARCH_MAX_YEARS', 100)))
+app.config.setdefault('REVERSE_SEARCH_MAX_INTERVALS', int(os.environ.get('REVERSE_SEARCH_MAX_INTERVALS', 10000)))
+app.config.setdefault('DASHA_MAX_UPCOMING', int(os.environ.get('DASHA_MAX_UPCOMING', 81)))
+app.config.setdefault('RULES_PATH', os.environ.get('RULES_PATH', ''))
+app.config.setdefault('RULES_CHECK_INTERVAL', float(os.environ.get('RULES_CHECK_INTERVAL', 2)))
+app.config.setdefault('ASSETS_DIR', os.environ.get('ASSETS_DIR', os.path.join(app.static_folder, 'dist')))
+app.config.setdefault('PAGE_CHECK_INTERVAL', float(os.environ.get('PAGE_CHECK_INTERVAL', 2)))
+app.config.setdefault('SESSION_TTL', float(os.environ.get('SESSION_TTL', 1800)))
+app.config.setdefault('SESSION_MAX_COUNT', int(os.environ.get('SESSION_MAX_COUNT', 1000)))
+app.config.setdefault('SESSION_HEARTBEAT', float(os.environ.get('SESSION_HEARTBEAT', 15)))
+app.config.setdefault('JOBS_DB_PATH', os.environ.get('JOBS_DB_PATH', os.path.join(app.instance_path, 'jobs.sqlite3')))
+app.config.setdefault('JOBS_WORKERS', int(os.environ.get('JOBS_WORKERS', 2)))
+app.config.setdefault('JOBS_MAX_ITEMS', int(os.environ.get('JOBS_MAX_ITEMS', 1000000)))
+app.config.setdefault('CHART_BATCH_WINDOW_MS', float(os.environ.get('CHART_BATCH_WINDOW_MS', 0)))
+app.config.setdefault('CHART_BATCH_MAX_SIZE', int(os.environ.get('CHART_BATCH_MAX_SIZE', 64)))
+app.config.setdefault('SINGLEFLIGHT_DIR', os.environ.get('SINGLEFLIGHT_DIR', ''))
+app.config.setdefault('SINGLEFLIGHT_TTL', float(os.environ.get('SINGLEFLIGHT_TTL', 5)))
+app.config.setdefault('ADMISSION_MAX_CONCURRENT', int(os.environ.get('ADMISSION_MAX_CONCURRENT', 4)))
+app.config.setdefault('ADMISSION_MAX_QUEUE', int(os.environ.get('ADMISSION_MAX_QUEUE', 16)))
+app.config.setdefault('ADMISSION_QUEUE_TIMEOUT_MS', float(os.environ.get('ADMISSION_QUEUE_TIMEOUT_MS', 5000)))
+app.config.setdefault('ADMISSION_DEADLINE_MS', float(os.environ.get('ADMISSION_DEADLINE_MS', 25000)))
+app.config.setdefault('ADMISSION_DEGRADED_MODE', os.environ.get('ADMISSION_DEGRADED_MODE', 'False').lower() == 'true')
+app.config.setdefault('ADMISSION_CACHE_SIZE', int(os.environ.get('ADMISSION_CACHE_SIZE', 1024)))
+app.config.setdefault('RESULTS_DB_PATH', os.environ.get('RESULTS_DB_PATH', os.path.join(app.instance_path, 'results.sqlite3')))
+app.config.setdefault('RESULTS_MAX_BYTES', int(os.environ.get('RESULTS_MAX_BYTES', 64 * 1024 * 1024)))
+app.config.setdefault('JSON_BACKEND', os.environ.get('JSON_BACKEND', 'auto'))
+app.config.setdefault('WARMUP_CHARTS', int(os.environ.get('WARMUP_CHARTS', 64)))
+app.config.setdefault('WARMUP_SAMPLES', int(os.environ.get('WARMUP_SAMPLES', 20)))
+
+# Responses, job results and cached bodies are encoded by serialization.py
+app.json = serialization.FastJSONProvider(app, app.config['JSON_BACKEND'])
+
 # =============================================================================
-# ASTROLOGICAL DATA CONSTANTS
+# CHART ENGINE
 # =============================================================================
 
-@dataclass
-class AstroConstants:
-    """Container for astrological constants"""
-    
-    NAKSHATRAS = [
-        "Ashwini", "Bharani", "Krittika", "Rohini", "Mrigashira", "Ardra",
-        "Punarvasu", "Pushya", "Ashlesha", "Magha", "Purva Phalguni", "Uttara Phalguni",
-        "Hasta", "Chitra", "Swati", "Vishakha", "Anuradha", "Jyeshtha",
-        "Mula", "Purva Ashadha", "Uttara Ashadha", "Shravana", "Dhanishta", "Shatabhisha",
-        "Purva Bhadrapada", "Uttara Bhadrapada", "Revati"
-    ]
+# Chart computation and compatibility analysis live in engine.py, which the app
+# configures from its settings
+configure_engine(
+    ayanamsa=app.config['DEFAULT_AYANAMSA'],
+    node_type=app.config['DEFAULT_NODE_TYPE'],
+    ephe_path=app.config['EPHE_PATH'],
+    ephemeris=app.config['EPHE_MODE'],
+    ephe_data_dir=app.config['EPHE_DATA_DIR'],
+    rules_path=app.config['RULES_PATH'],
+    rules_check_interval=app.config['RULES_CHECK_INTERVAL']
+)
+# Resolves the ephemeris mode (building compact tables if needed, before workers
+# fork), verifies it against its source and measures what a chart costs
+_ephemeris_report = initialize_ephemeris()
+# Load the rules at startup (once, before workers fork under --preload), so a
+# broken rules file fails the deploy instead of the first request
+rule_store()
 
-    NAKSHATRAS_TAMIL = [
-        "அசுவினி", "பரணி", "கிருத்திகை", "ரோகிணி", "மிருகசீரிடம்", "ஆருத்ரா",
-        "புனர்வசு", "பூசம்", "ஆயில்யம்", "மகம்", "பூரம்", "உத்தரம்",
-        "அஸ்தம்", "சித்திரை", "சுவாதி", "விசாகம்", "அனுஷம்", "கேட்டை",
-        "மூலம்", "பூராடம்", "உத்திராடம்", "திருவோணம்", "அவிட்டம்", "சதயம்",
-        "பூரட்டாதி", "உத்திரட்டாதி", "ரேவதி"
-    ]
+# =============================================================================
+# BIRTH TIME WINDOWS
+# =============================================================================
 
-    RASIS = [
-        "Mesha", "Rishaba", "Mithuna", "Kataka", "Simha", "Kanni",
-        "Thula", "Vrischika", "Dhanus", "Makara", "Kumbha", "Meena"
-    ]
+# Sign and nakshatra boundaries in degrees
+RASI_BOUNDARIES = [30.0 * index for index in range(12)]
+NAKSHATRA_BOUNDARIES = [360.0 * index / 27.0 for index in range(27)]
 
-    RASIS_TAMIL = [
-        "மேஷம்", "ரிஷபம்", "மிதுனம்", "கடகம்", "சிம்மம்", "கன்னி",
-        "துலாம்", "விருச்சிகம்", "தனுசு", "மகரம்", "கும்பம்", "மீனம்"
-    ]
+class BodyTimeline:
+    """Longitudes of one partner's bodies at minute offsets from a start time"""
+    
+    SIDEREAL_DAY_MINUTES = 1440.0 * 360.0 / 360.98564736629
+    
+    def __init__(self, start_jd: float, lat: float, lon: float, engine: ChartEngine):
+        self.start_jd = start_jd
+        self.lat = lat
+        self.lon = lon
+        self.engine = engine
+        self.evaluations = 0
+        self._body_ids = {name: planet_id for planet_id, name in PLANET_BODIES}
+        self._body_ids['Rahu'] = self._body_ids['Ketu'] = engine.node_id
+        self._cache: Dict[Tuple[str, int], Tuple[float, float]] = {}
+    
+    def _position(self, body: str, minute: int) -> Tuple[float, float]:
+        key = ('Rahu' if body == 'Ketu' else body, minute)
+        position = self._cache.get(key)
+        if position is None:
+            jd = self.start_jd + minute / 1440.0
+            self.evaluations += 1
+            with self.engine.activated():
+                if body == 'Ascendant':
+                    position = (swe.houses_ex(jd, self.lat, self.lon, b'O', flags=self.engine.flags)[1][0], 1.0)
+                else:
+                    lonlat = swe.calc_ut(jd, self._body_ids[body], self.engine.flags)[0]
+                    position = (lonlat[0], lonlat[3])
+            self._cache[key] = position
+        return position
+    
+    def longitude(self, body: str, minute: int) -> float:
+        """Sidereal longitude of a body (or the ascendant) at a minute offset"""
+        value = self._position(body, minute)[0]
+        return (value + 180.0) % 360.0 if body == 'Ketu' else value
+    
+    def speed(self, body: str, minute: int) -> float:
+        """Longitude speed in degrees per day (positive for the ascendant)"""
+        return self._position(body, minute)[1]
+    
+    def approximate_moon(self, minutes: np.ndarray) -> Optional[np.ndarray]:
+        """Fast-ephemeris Moon longitudes at many minute offsets.
+        
+        They are within fast_ephemeris.MAX_ERROR_DEG of ``longitude``; None is
+        returned outside the range of the series.
+        """
+        jds = self.start_jd + np.asarray(minutes, dtype=float) / 1440.0
+        if jds.min() < fast_ephemeris.VALID_JD[0] or jds.max() > fast_ephemeris.VALID_JD[1]:
+            return None
+        
+        # Delta T and the ayanamsa change slowly enough to interpolate between monthly anchors
+        anchors = np.linspace(jds.min(), jds.max(), int((jds.max() - jds.min()) // 30) + 2)
+        with self.engine.activated():
+            delta_t = np.interp(jds, anchors, [swe.deltat(jd) for jd in anchors])
+            ayanamsa = np.interp(jds, anchors, [swe.get_ayanamsa_ut(jd) for jd in anchors])
+        return (fast_ephemeris.moon(fast_ephemeris.centuries(jds + delta_t)) - ayanamsa) % 360.0
+    
+    def approximate_rising(self, longitudes: List[float], minute: int) -> Optional[np.ndarray]:
+        """Minutes after ``minute`` until each sidereal longitude next becomes the ascendant.
+        
+        Computed from the fast ephemeris within ``SIDEREAL_DAY_MINUTES``; the
+        ascendant error bound applies. None where the series do not apply.
+        """
+        jd = self.start_jd + minute / 1440.0
+        if not fast_ephemeris.VALID_JD[0] <= jd <= fast_ephemeris.VALID_JD[1] \
+                or abs(self.lat) > fast_ephemeris.ASCENDANT_MAX_LATITUDE:
+            return None
+        
+        with self.engine.activated():
+            t = fast_ephemeris.centuries(jd + swe.deltat(jd))
+            ayanamsa = swe.get_ayanamsa_ut(jd)
+        rising = fast_ephemeris.rising_sidereal_time(np.asarray(longitudes) + ayanamsa, t, self.lat)
+        return (rising - fast_ephemeris.sidereal_time(jd, self.lon)) % 360.0 * (self.SIDEREAL_DAY_MINUTES / 360.0)
+    
+    def first_minute_past(self, body: str, boundary: float, guess: int) -> int:
+        """First minute at which the Moon or the ascendant has passed ``boundary``.
+        
+        ``guess`` must be within a few degrees of motion of the answer.
+        """
+        def past(minute: int) -> float:
+            return (self.longitude(body, minute) - boundary + 180.0) % 360.0 - 180.0
+        
+        # Degrees per minute, only used to aim the first probes
+        rate = 0.25 if body == 'Ascendant' else self.speed(body, guess) / 1440.0
+        lo = hi = None
+        minute = guess
+        while True:
+            value = past(minute)
+            if value >= 0:
+                hi, hi_value = minute, value
+            else:
+                lo, lo_value = minute, value
+            
+            if lo is not None and hi is not None:
+                if hi - lo == 1:
+                    return hi
+                minute = lo + int(math.ceil(-lo_value / (hi_value - lo_value) * (hi - lo)))
+                minute = min(max(minute, lo + 1), hi - 1)
+            elif hi is not None:
+                minute = min(hi - 1, int(math.ceil(hi - value / rate)) - 1)
+            else:
+                minute = max(lo + 1, int(math.ceil(lo - value / rate)))
 
-    # Nakshatra lords cycle (9 planets repeated 3 times for 27 nakshatras)
-    NAKSHATRA_LORDS = [
-        "Ketu", "Venus", "Sun", "Moon", "Mars", "Rahu",
-        "Jupiter", "Saturn", "Mercury"
-    ] * 3
-
-    # Rasi lords mapping
-    RASI_LORDS = {
-        "Mesha": "Mars", "Rishaba": "Venus", "Mithuna": "Mercury", "Kataka": "Moon",
-        "Simha": "Sun", "Kanni": "Mercury", "Thula": "Venus", "Vrischika": "Mars",
-        "Dhanus": "Jupiter", "Makara": "Saturn", "Kumbha": "Saturn", "Meena": "Jupiter"
+class BirthWindowService:
+    """Compatibility outcomes across a range of possible birth times.
+    
+    The outcome only depends on discrete chart features (the male nodes'
+    nakshatras, the female Moon's and lagna's sign and nakshatra, and the sign
+    of every female body), so it is constant between the minutes at which one
+    of those features changes. These transitions are located by root finding
+    on each body's longitude instead of recomputing every minute.
+    """
+    
+    # Longest sampling step per body in minutes: short enough that a body
+    # moves well under half a circle, and passes at most one station, between
+    # samples (about half the shortest time between stations over 1800-2100).
+    # Intervals that contain a station are subdivided. The mean node never
+    # stations; the true node turns around within a day.
+    SAMPLE_MINUTES = {
+        'Ascendant': 120, 'Moon': 1440,
+        'Mercury': 14400, 'Venus': 28800, 'Mars': 43200,
+        'Sun': 86400, 'Jupiter': 57600, 'Saturn': 57600,
+        'Uranus': 57600, 'Neptune': 57600, 'Pluto': 57600
     }
+    NODE_SAMPLE_MINUTES = {'mean': 43200, 'true': 720}
+    
+    # Largest daily motion in degrees (with a safety margin), used to skip
+    # intervals around a station from which no boundary can be reached
+    MAX_DAILY_MOTION = {
+        'Sun': 1.1, 'Moon': 16.0, 'Mercury': 2.4, 'Venus': 1.4, 'Mars': 0.9,
+        'Jupiter': 0.27, 'Saturn': 0.15, 'Uranus': 0.075, 'Neptune': 0.05, 'Pluto': 0.05,
+        'Rahu': 0.3, 'Ketu': 0.3
+    }
+    
+    # Bodies whose changes matter and the boundaries that matter for each
+    MALE_BODIES = {'Rahu': NAKSHATRA_BOUNDARIES, 'Ketu': NAKSHATRA_BOUNDARIES}
+    FEMALE_BODIES = {
+        'Moon': sorted(set(RASI_BOUNDARIES + NAKSHATRA_BOUNDARIES)),
+        'Ascendant': sorted(set(RASI_BOUNDARIES + NAKSHATRA_BOUNDARIES)),
+        **{name: RASI_BOUNDARIES for _, name in PLANET_BODIES if name != 'Moon'},
+        'Rahu': RASI_BOUNDARIES,
+        'Ketu': RASI_BOUNDARIES
+    }
+    
+    # Bodies that always move forward; the others may be retrograde
+    DIRECT_BODIES = ('Moon', 'Ascendant')
+    
+    @staticmethod
+    def find_transitions(timeline: BodyTimeline, bodies: Dict[str, List[float]],
+                         first_minute: int, last_minute: int) -> List[int]:
+        """Minutes in (first_minute, last_minute] at which any of the bodies changes state.
+        
+        Each returned minute is the first one on which the new state holds.
+        """
+        transitions = set()
+        
+        for body, boundaries in bodies.items():
+            if body in ('Rahu', 'Ketu'):
+                step = BirthWindowService.NODE_SAMPLE_MINUTES[timeline.engine.node_type]
+            else:
+                step = BirthWindowService.SAMPLE_MINUTES[body]
+            samples = list(range(first_minute, last_minute, step)) + [last_minute]
+            pending = list(zip(samples, samples[1:]))
+            direct = body in BirthWindowService.DIRECT_BODIES
+            while pending:
+                lo, hi = pending.pop()
+                if not direct and hi - lo > 1 and (timeline.speed(body, lo) < 0) != (timeline.speed(body, hi) < 0):
+                    # The body turns around in between; split until the motion is
+                    # monotonic unless no boundary is within reach
+                    position = timeline.longitude(body, lo)
+                    reach = BirthWindowService.MAX_DAILY_MOTION[body] * (hi - lo) / 1440.0
+                    if all(abs((boundary - position + 180.0) % 360.0 - 180.0) > reach for boundary in boundaries):
+                        continue
+                    middle = (lo + hi) // 2
+                    pending.extend([(lo, middle), (middle, hi)])
+                    continue
+                
+                start = timeline.longitude(body, lo)
+                motion = timeline.longitude(body, hi) - start
+                motion = motion % 360.0 if direct else (motion + 180.0) % 360.0 - 180.0
+                
+                for boundary in boundaries:
+                    # Offset of the boundary from the start position along the direction of motion
+                    offset = (boundary - start) % 360.0 if motion >= 0 else -((start - boundary) % 360.0)
+                    if offset != 0.0 and abs(offset) <= abs(motion):
+                        transitions.add(BirthWindowService._find_crossing(
+                            timeline, body, lo, hi, start, offset, motion
+                        ))
+        
+        return sorted(transitions)
+    
+    @staticmethod
+    def _find_crossing(timeline: BodyTimeline, body: str, lo: int, hi: int,
+                       start: float, offset: float, motion: float) -> int:
+        """First minute in (lo, hi] at which the body has moved past ``offset`` degrees"""
+        def progress(minute: int) -> float:
+            moved = timeline.longitude(body, minute) - start
+            return moved % 360.0 if body in BirthWindowService.DIRECT_BODIES else (moved + 180.0) % 360.0 - 180.0
+        
+        sign = 1.0 if motion >= 0 else -1.0
+        lo_value, hi_value = 0.0, motion
+        use_bisection = False
+        while hi - lo > 1:
+            # Interpolate, alternating with bisection while interpolation converges slowly
+            width = hi - lo
+            if use_bisection or hi_value == lo_value:
+                guess = (lo + hi) // 2
+            else:
+                guess = lo + int(math.ceil((offset - lo_value) / (hi_value - lo_value) * width))
+                guess = min(max(guess, lo + 1), hi - 1)
+            
+            value = progress(guess)
+            if (value - offset) * sign >= 0:
+                hi, hi_value = guess, value
+            else:
+                lo, lo_value = guess, value
+            use_bisection = not use_bisection and hi - lo > width // 2
+        return hi
+    
+    @staticmethod
+    def segments(timeline: BodyTimeline, bodies: Dict[str, List[float]],
+                 minutes: int) -> List[Tuple[int, int]]:
+        """Split minutes [0, minutes] into (first, last) ranges over which no body changes state"""
+        starts = [0] + BirthWindowService.find_transitions(timeline, bodies, 0, minutes)
+        return list(zip(starts, [start - 1 for start in starts[1:]] + [minutes]))
+    
+    @staticmethod
+    def analyze_window(male_window: Tuple[datetime.datetime, int, float, float, float],
+                       female_window: Tuple[datetime.datetime, int, float, float, float],
+                       lang: str = 'en', engine: Optional[ChartEngine] = None) -> Dict[str, Any]:
+        """Compatibility outcome for every combination of birth times in both windows.
+        
+        A window is ``(start, minutes, lat, lon, tz_offset)`` with ``start`` the
+        earliest local birth time and ``minutes`` the length of the range. The
+        result lists intervals of constant outcome and the share of all
+        combinations of birth times that falls into each outcome.
+        """
+        engine = engine or ChartEngine.get()
+        options = AnalysisOptions()
+        timelines = {}
+        segments = {}
+        charts = {}
+        for partner, window, bodies in (('male', male_window, BirthWindowService.MALE_BODIES),
+                                        ('female', female_window, BirthWindowService.FEMALE_BODIES)):
+            start, minutes, lat, lon, tz_offset = window
+            timeline = BodyTimeline(
+                ChartService.birth_jd(start.strftime('%Y-%m-%d'), start.strftime('%H:%M'), tz_offset),
+                lat, lon, engine
+            )
+            timelines[partner] = timeline
+            segments[partner] = BirthWindowService.segments(timeline, bodies, minutes)
+            charts[partner] = [
+                ChartService.create_birth_chart(
+                    *_window_time(start, first).split(' '), lat, lon, tz_offset, engine=engine
+                )
+                for first, _ in segments[partner]
+            ]
+        
+        male_start, male_minutes = male_window[:2]
+        female_start, female_minutes = female_window[:2]
+        combinations = (male_minutes + 1) * (female_minutes + 1)
+        
+        intervals = []
+        distribution: Dict[int, float] = {}
+        verdict_shares = {'high': 0.0, 'moderate': 0.0, 'low': 0.0}
+        for (male_first, male_last), (male_chart, male_asc) in zip(segments['male'], charts['male']):
+            current = None
+            for (female_first, female_last), (female_chart, female_asc) in zip(segments['female'], charts['female']):
+                analysis = CompatibilityAnalyzer.analyze_compatibility(
+                    male_chart, female_chart, male_asc, female_asc, lang, include_poruthams=False, options=options
+                )
+                outcome = (analysis['total_matches'], analysis['rahu_matches'], analysis['ketu_matches'])
+                if current is not None and current[0] == outcome:
+                    current[2] = female_last
+                    continue
+                current = [outcome, female_first, female_last, analysis]
+                intervals.append((male_first, male_last, current))
+        
+        results = []
+        for male_first, male_last, (outcome, female_first, female_last, analysis) in intervals:
+            share = (male_last - male_first + 1) * (female_last - female_first + 1) / combinations
+            verdict = _determine_verdict(analysis['total_matches'], lang, options.ruleset)
+            distribution[analysis['total_matches']] = distribution.get(analysis['total_matches'], 0.0) + share
+            verdict_shares[verdict['verdict_class']] += share
+            results.append({
+                'male_from': _window_time(male_start, male_first),
+                'male_to': _window_time(male_start, male_last),
+                'female_from': _window_time(female_start, female_first),
+                'female_to': _window_time(female_start, female_last),
+                'total_matches': analysis['total_matches'],
+                'primary_match_type': analysis['primary_match_type'],
+                'rahu_matches': analysis['rahu_matches'],
+                'ketu_matches': analysis['ketu_matches'],
+                'verdict': verdict['verdict'],
+                'verdict_class': verdict['verdict_class'],
+                'share': round(share, 6)
+            })
+        
+        return {
+            'success': True,
+            'intervals': results,
+            'distribution': {str(matches): round(share, 6) for matches, share in sorted(distribution.items())},
+            'verdicts': {verdict_class: round(share, 6) for verdict_class, share in verdict_shares.items()},
+            'male_transitions': [_window_time(male_start, first) for first, _ in segments['male'][1:]],
+            'female_transitions': [_window_time(female_start, first) for first, _ in segments['female'][1:]],
+            'ephemeris_evaluations': sum(timeline.evaluations for timeline in timelines.values()),
+            'charts_evaluated': len(charts['male']) + len(charts['female'])
+        }
 
-# Initialize constants
-ASTRO = AstroConstants()
-
-# Create mapping dictionaries
-NAKSHATRA_MAPPING = dict(zip(ASTRO.NAKSHATRAS, ASTRO.NAKSHATRAS_TAMIL))
-RASI_MAPPING = dict(zip(ASTRO.RASIS, ASTRO.RASIS_TAMIL))
-
-# =============================================================================
-# SWISS EPHEMERIS INITIALIZATION
-# =============================================================================
-
-def initialize_ephemeris():
-    """Initialize Swiss Ephemeris with proper error handling"""
-    try:
-        swe.set_ephe_path('.')
-        swe.set_sid_mode(swe.SIDM_LAHIRI)
-        logger.info("Swiss Ephemeris initialized successfully")
-    except Exception as e:
-        logger.error(f"Failed to initialize Swiss Ephemeris: {e}")
-        raise
-
-initialize_ephemeris()
+def _window_time(start: datetime.datetime, minute: int) -> str:
+    """Local date and time ``minute`` minutes after ``start``"""
+    return (start + datetime.timedelta(minutes=minute)).strftime('%Y-%m-%d %H:%M')
 
 # =============================================================================
-# CORE ASTROLOGICAL CALCULATION CLASSES
+# REVERSE SEARCH
 # =============================================================================
 
-@dataclass
-class PlanetInfo:
-    """Data class for planet information"""
-    longitude: float
-    retrograde: bool
-    rasi: str
-    degree_in_sign: float
-    nakshatra: str
-    nakshatra_index: int
-    nakshatra_lord: str
-    pada: int
-
-class AstrologyCalculator:
-    """Core astrology calculation engine"""
+class ReverseSearchService:
+    """Find the birth times of one partner that reach a match threshold with a given chart.
+    
+    For a fixed male chart the matches only depend on the female Moon's sign
+    and nakshatra, the signs of the two planets that rule the male nodes'
+    nakshatras, and the female lagna. The slow features are tracked as
+    transitions over the whole range; within each stretch where they are
+    constant the attainable totals per lagna sign and nakshatra are known in
+    advance, so stretches that cannot reach the threshold are skipped and the
+    lagna is only followed where the outcome actually flips. For a fixed
+    female chart only the male nodes' nakshatras matter.
+    """
+    
+    # Lagna arcs: the 36 ranges of constant sign and nakshatra
+    ARC_BOUNDARIES = sorted(set(RASI_BOUNDARIES + NAKSHATRA_BOUNDARIES))
+    ARCS = [
+        (int(middle // 30), int(middle // (360.0 / 27.0)))
+        for middle in ((start + end) / 2 for start, end in zip(
+            ARC_BOUNDARIES, ARC_BOUNDARIES[1:] + [360.0]
+        ))
+    ]
+    
+    # Largest error in minutes of approximate Moon arc entries (fast ephemeris
+    # on a 4-hour grid, or daily exact positions) and of lagna arc entries
+    MOON_TOLERANCE = {'series': 10, 'samples': 60}
+    LAGNA_TOLERANCE = 2
     
     @staticmethod
-    def normalize_longitude(longitude: float) -> float:
-        """Normalize longitude to 0-360 range"""
-        return longitude % 360
+    def _arc(longitude: float) -> int:
+        return bisect.bisect_right(ReverseSearchService.ARC_BOUNDARIES, longitude % 360.0) - 1
     
     @staticmethod
-    def get_nakshatra_info(longitude: float) -> Dict[str, Any]:
-        """Calculate nakshatra and pada information from longitude"""
-        longitude = AstrologyCalculator.normalize_longitude(longitude)
+    def arc_totals(ruleset: rules.RulePlan, lords: Tuple[str, str], moon_rasi: int, moon_nakshatra: int,
+                   lord_rasis: Dict[str, int]) -> List[int]:
+        """Total matches for each lagna arc under the rules, evaluated for all arcs at once.
         
-        # Calculate nakshatra span (360° / 27 nakshatras)
-        nakshatra_span = 360.0 / 27.0
-        
-        # Calculate nakshatra index
-        nakshatra_index = int(longitude // nakshatra_span)
-        nakshatra_index = min(nakshatra_index, 26)  # Safety bound
+        The features are those of a female chart with the given Moon arc and
+        signs of the nodes' lords: occupancy only matters for the lords
+        themselves, so their signs decide it.
+        """
+        rasi_lord = lambda index: ASTRO.RASI_LORDS[ASTRO.RASIS[index]]
+        features = rules.RulePlan.encode([
+            {
+                'moon_rasi_lord': rasi_lord(moon_rasi),
+                'moon_nakshatra_lord': ASTRO.NAKSHATRA_LORDS[moon_nakshatra],
+                'lagna_rasi_lord': rasi_lord(asc_rasi),
+                'lagna_nakshatra_lord': ASTRO.NAKSHATRA_LORDS[asc_nakshatra],
+                'lagna_occupants': [lord for lord in lords if lord_rasis[lord] == asc_rasi],
+                'moon_rasi_occupants': [lord for lord in lords if lord_rasis[lord] == moon_rasi]
+            }
+            for asc_rasi, asc_nakshatra in ReverseSearchService.ARCS
+        ])
+        lord_indexes = np.array([[rules.GRAHA_INDEX[lord]] for lord in lords])
+        masks = ruleset.match_many(lord_indexes, {name: values[None, :] for name, values in features.items()})
+        return ruleset.totals(masks).sum(axis=0).tolist()
+    
+    @staticmethod
+    def search(fixed_chart: Tuple[Dict[str, PlanetInfo], float], search_for: str,
+               window: Tuple[datetime.datetime, int, float, float, float], min_matches: int,
+               max_intervals: int, lang: str = 'en', engine: Optional[ChartEngine] = None) -> Dict[str, Any]:
+        """Intervals of birth times in ``window`` with at least ``min_matches`` matches.
         
-        # Calculate position within nakshatra
-        nakshatra_position = longitude % nakshatra_span
+        ``window`` is ``(start, minutes, lat, lon, tz_offset)`` as in
+        BirthWindowService. The search stops after ``max_intervals`` intervals.
+        """
+        engine = engine or ChartEngine.get()
+        ruleset = rule_store().current()
+        start, minutes, lat, lon, tz_offset = window
+        timeline = BodyTimeline(
+            ChartService.birth_jd(start.strftime('%Y-%m-%d'), start.strftime('%H:%M'), tz_offset),
+            lat, lon, engine
+        )
         
-        # Calculate pada (1-4)
-        pada = int((nakshatra_position / (nakshatra_span / 4.0)) + 1)
-        pada = min(max(pada, 1), 4)  # Ensure pada is 1-4
+        if search_for == 'female':
+            intervals = ReverseSearchService._search_female(
+                fixed_chart[0], timeline, minutes, min_matches, max_intervals, ruleset
+            )
+        else:
+            intervals = ReverseSearchService._search_male(
+                fixed_chart, timeline, window, min_matches, max_intervals, lang, engine, ruleset
+            )
         
+        truncated = len(intervals) > max_intervals
+        intervals = intervals[:max_intervals]
         return {
-            'nakshatra': ASTRO.NAKSHATRAS[nakshatra_index],
-            'nakshatra_index': nakshatra_index,
-            'nakshatra_lord': ASTRO.NAKSHATRA_LORDS[nakshatra_index],
-            'pada': pada
+            'success': True,
+            'search_for': search_for,
+            'min_matches': min_matches,
+            'intervals': [
+                {
+                    'from': _window_time(start, first),
+                    'to': _window_time(start, last),
+                    'minutes': last - first + 1,
+                    'min_matches': low,
+                    'max_matches': high,
+                    'verdict_class': _determine_verdict(low, lang, ruleset)['verdict_class']
+                }
+                for first, last, low, high in intervals
+            ],
+            'matching_minutes': sum(last - first + 1 for first, last, _, _ in intervals),
+            'truncated': truncated,
+            'searched_until': _window_time(start, intervals[-1][1] if truncated else minutes),
+            'ephemeris_evaluations': timeline.evaluations
         }
     
     @staticmethod
-    def get_planet_info(longitude: float, speed: Optional[float] = None) -> PlanetInfo:
-        """Get comprehensive planet information"""
-        longitude = AstrologyCalculator.normalize_longitude(longitude)
-        nakshatra_info = AstrologyCalculator.get_nakshatra_info(longitude)
-        
-        return PlanetInfo(
-            longitude=longitude,
-            retrograde=speed < 0 if speed is not None else False,
-            rasi=ASTRO.RASIS[int(longitude // 30)],
-            degree_in_sign=longitude % 30,
-            **nakshatra_info
-        )
+    def _add_interval(intervals: List[List[int]], first: int, last: int, low: int, high: int) -> None:
+        """Append an interval, merging it with the previous one when they touch"""
+        if intervals and intervals[-1][1] == first - 1:
+            previous = intervals[-1]
+            previous[1] = last
+            previous[2] = min(previous[2], low)
+            previous[3] = max(previous[3], high)
+        else:
+            intervals.append([first, last, low, high])
     
     @staticmethod
-    def get_house_number(planet_longitude: float, asc_longitude: float) -> int:
-        """Calculate house number from planet and ascendant longitudes"""
-        lagna_rasi = int(asc_longitude // 30)
-        planet_rasi = int(planet_longitude // 30)
-        return (planet_rasi - lagna_rasi) % 12 + 1
+    def _search_male(fixed_chart: Tuple[Dict[str, PlanetInfo], float], timeline: BodyTimeline,
+                     window: Tuple[datetime.datetime, int, float, float, float], min_matches: int,
+                     max_intervals: int, lang: str, engine: ChartEngine,
+                     ruleset: rules.RulePlan) -> List[List[int]]:
+        start, minutes, lat, lon, tz_offset = window
+        female_chart, female_asc = fixed_chart
+        intervals: List[List[int]] = []
+        
+        for first, last in BirthWindowService.segments(timeline, BirthWindowService.MALE_BODIES, minutes):
+            male_chart, male_asc = ChartService.create_birth_chart(
+                *_window_time(start, first).split(' '), lat, lon, tz_offset, engine=engine
+            )
+            total = CompatibilityAnalyzer.analyze_compatibility(
+                male_chart, female_chart, male_asc, female_asc, lang, include_poruthams=False,
+                options=AnalysisOptions(ruleset=ruleset)
+            )['total_matches']
+            if total >= min_matches:
+                ReverseSearchService._add_interval(intervals, first, last, total, total)
+                if len(intervals) > max_intervals:
+                    break
+        
+        return intervals
     
     @staticmethod
-    def calculate_planetary_positions(jd: float, lat: float, lon: float) -> Tuple[Dict[str, PlanetInfo], float, List[float]]:
-        """Calculate all planetary positions for a given time and location"""
-        flags = swe.FLG_SIDEREAL | swe.FLG_SPEED
-        results = {}
+    def _arc_entries(start: float, progress: np.ndarray, grid: np.ndarray) -> Tuple[int, np.ndarray, np.ndarray]:
+        """Arc at ``start`` plus the arcs entered next and their interpolated minutes.
         
-        try:
-            # Calculate regular planets (0-9, excluding mean Node)
-            for planet_id in range(10):
-                name = swe.get_planet_name(planet_id)
-                
-                if name == "mean Node":
-                    continue
-                
-                lonlat = swe.calc_ut(jd, planet_id, flags)[0]
-                results[name] = AstrologyCalculator.get_planet_info(lonlat[0], lonlat[3])
+        ``progress`` is the unwrapped motion since ``grid[0]`` of a forward-moving
+        body that was at longitude ``start`` at that minute.
+        """
+        boundaries = np.array(ReverseSearchService.ARC_BOUNDARIES)
+        arc_count = len(boundaries)
+        arc = ReverseSearchService._arc(start)
+        steps = np.arange(1, int(progress[-1] / 360.0 * arc_count) + arc_count + 1)
+        arcs = (arc + steps) % arc_count
+        offsets = (boundaries[arcs] - start) % 360.0
+        offsets[offsets == 0.0] = 360.0
+        offsets += 360.0 * ((steps - 1) // arc_count)
+        reached = offsets <= progress[-1]
+        return arc, arcs[reached], np.interp(offsets[reached], progress, grid)
+    
+    @staticmethod
+    def _moon_stretches(timeline: BodyTimeline, minutes: int) -> Tuple[List[int], List[float], int]:
+        """Moon arcs over [0, minutes] with their approximate starting minutes.
+        
+        Entry times come from the fast ephemeris or, outside its range, from
+        daily exact positions; the third value bounds their error in minutes.
+        Arcs starting up to that bound after ``minutes`` are included.
+        """
+        tolerance = ReverseSearchService.MOON_TOLERANCE['series']
+        grid = np.arange(0, minutes + tolerance + 240, 240)
+        approximate = timeline.approximate_moon(grid)
+        if approximate is None:
+            tolerance = ReverseSearchService.MOON_TOLERANCE['samples']
+            grid = np.arange(0, minutes + tolerance + 1440, 1440)
+            approximate = np.array([timeline.longitude('Moon', minute) for minute in grid])
+        
+        progress = np.degrees(np.unwrap(np.radians(approximate)))
+        arc, arcs, starts = ReverseSearchService._arc_entries(
+            timeline.longitude('Moon', 0), progress - progress[0], grid
+        )
+        return [arc] + arcs.tolist(), [0.0] + starts.tolist(), tolerance
+    
+    @staticmethod
+    def _search_female(male_chart: Dict[str, PlanetInfo], timeline: BodyTimeline, minutes: int,
+                       min_matches: int, max_intervals: int, ruleset: rules.RulePlan) -> List[List[int]]:
+        lords = (male_chart['Rahu'].nakshatra_lord, male_chart['Ketu'].nakshatra_lord)
+        lord_bodies = [lord for lord in dict.fromkeys(lords) if lord != 'Moon']
+        boundaries = ReverseSearchService.ARC_BOUNDARIES
+        intervals: List[List[int]] = []
+        
+        # Exact sign changes of the planets ruling the male nodes' nakshatras
+        lord_changes = {
+            lord: [0] + BirthWindowService.find_transitions(timeline, {lord: RASI_BOUNDARIES}, 0, minutes)
+            for lord in lord_bodies
+        }
+        lord_signs = {
+            lord: [int(timeline.longitude(lord, minute) // 30) for minute in changes]
+            for lord, changes in lord_changes.items()
+        }
+        
+        def signs_during(lord: str, first: float, last: float) -> List[int]:
+            changes = lord_changes[lord]
+            return lord_signs[lord][max(bisect.bisect_right(changes, first) - 1, 0):bisect.bisect_right(changes, last)]
+        
+        totals_cache: Dict[Tuple[int, Tuple[int, ...]], List[int]] = {}
+        
+        def totals_for(moon_arc: int, signs: Tuple[int, ...]) -> List[int]:
+            totals = totals_cache.get((moon_arc, signs))
+            if totals is None:
+                moon_rasi, moon_nakshatra = ReverseSearchService.ARCS[moon_arc]
+                lord_rasis = dict(zip(lord_bodies, signs), Moon=moon_rasi)
+                totals = ReverseSearchService.arc_totals(ruleset, lords, moon_rasi, moon_nakshatra, lord_rasis)
+                totals_cache[(moon_arc, signs)] = totals
+            return totals
+        
+        # Moon arcs are walked on approximate entry times; only the entries that
+        # bound a stretch worth following are located exactly
+        moon_arcs, moon_starts, tolerance = ReverseSearchService._moon_stretches(timeline, minutes)
+        exact_starts: Dict[int, int] = {0: 0}
+        
+        def exact_start(index: int) -> int:
+            if index not in exact_starts:
+                exact_starts[index] = timeline.first_minute_past(
+                    'Moon', boundaries[moon_arcs[index]], int(round(moon_starts[index]))
+                )
+            return exact_starts[index]
+        
+        for index, moon_arc in enumerate(moon_arcs):
+            if len(intervals) > max_intervals:
+                break
             
-            # Calculate Rahu (Mean Node)
-            rahu_lonlat = swe.calc_ut(jd, swe.MEAN_NODE, flags)[0]
-            rahu_longitude = rahu_lonlat[0]
+            approx_first = moon_starts[index] - tolerance
+            approx_last = moon_starts[index + 1] + tolerance if index + 1 < len(moon_arcs) else minutes
+            possible = itertools.product(*(signs_during(lord, approx_first, approx_last) for lord in lord_bodies))
+            if all(max(totals_for(moon_arc, signs)) < min_matches for signs in possible):
+                continue
             
-            results['Rahu'] = AstrologyCalculator.get_planet_info(rahu_longitude, rahu_lonlat[3])
-            results['Rahu'].retrograde = True  # Rahu is always retrograde
+            moon_first = exact_start(index)
+            moon_last = exact_start(index + 1) - 1 if index + 1 < len(moon_arcs) else minutes
+            if moon_first > minutes:
+                break
+            moon_last = min(moon_last, minutes)
             
-            # Calculate Ketu (180° opposite to Rahu)
-            ketu_longitude = (rahu_longitude + 180.0) % 360.0
-            results['Ketu'] = AstrologyCalculator.get_planet_info(ketu_longitude, rahu_lonlat[3])
-            results['Ketu'].retrograde = True  # Ketu is always retrograde
+            # Stretches of constant lord signs within the Moon arc
+            starts = sorted({moon_first}.union(*(
+                lord_changes[lord][bisect.bisect_right(lord_changes[lord], moon_first):
+                                   bisect.bisect_right(lord_changes[lord], moon_last)]
+                for lord in lord_bodies
+            )))
+            for first, last in zip(starts, [start - 1 for start in starts[1:]] + [moon_last]):
+                signs = tuple(signs_during(lord, first, first)[0] for lord in lord_bodies)
+                totals = totals_for(moon_arc, signs)
+                if max(totals) < min_matches:
+                    continue
+                
+                for interval in ReverseSearchService._follow_lagna(timeline, totals, first, last, min_matches):
+                    ReverseSearchService._add_interval(intervals, *interval)
+        
+        return intervals
+    
+    @staticmethod
+    def _follow_lagna(timeline: BodyTimeline, totals: List[int], first: int, last: int,
+                      min_matches: int) -> Iterator[Tuple[int, int, int, int]]:
+        """Split [first, last] at the lagna crossings where the threshold is crossed"""
+        tolerance = ReverseSearchService.LAGNA_TOLERANCE
+        arc_count = len(ReverseSearchService.ARCS)
+        boundaries = ReverseSearchService.ARC_BOUNDARIES
+        arc = ReverseSearchService._arc(timeline.longitude('Ascendant', first))
+        rising = timeline.approximate_rising(boundaries, first)
+        if rising is None:
+            yield from ReverseSearchService._follow_lagna_exact(timeline, totals, first, last, arc, min_matches)
+            return
+        
+        # Walk the arc entries on the approximate rising times and locate exactly
+        # the ones where the threshold is crossed or that may fall on either side of ``last``
+        day = BodyTimeline.SIDEREAL_DAY_MINUTES
+        elapsed = 0.0
+        opened = first if totals[arc] >= min_matches else None
+        low = high = totals[arc]
+        for step in itertools.count(1):
+            next_arc = (arc + step) % arc_count
+            # Consecutive entries are at most a few hours apart; this also absorbs
+            # an approximate first entry that appears to lie just before ``first``
+            elapsed += (rising[next_arc] - elapsed + day / 4) % day - day / 4
+            guess = first + elapsed
+            if guess > last + tolerance:
+                break
             
-            # Calculate Ascendant
-            cusps, ascmc = swe.houses_ex(jd, lat, lon, b'O', flags=flags)
-            results['Ascendant'] = AstrologyCalculator.get_planet_info(ascmc[0])
+            qualifies = totals[next_arc] >= min_matches
+            minute = None
+            if qualifies != (opened is not None) or guess > last - tolerance:
+                minute = timeline.first_minute_past(
+                    'Ascendant', boundaries[next_arc], max(first + 1, int(math.ceil(guess)))
+                )
+                if minute > last:
+                    break
             
-            return results, ascmc[0], cusps
+            if qualifies != (opened is not None):
+                if qualifies:
+                    opened, low, high = minute, totals[next_arc], totals[next_arc]
+                else:
+                    if minute > opened:
+                        yield opened, minute - 1, low, high
+                    opened = None
+            elif qualifies:
+                low, high = min(low, totals[next_arc]), max(high, totals[next_arc])
+        
+        if opened is not None:
+            yield opened, last, low, high
+    
+    @staticmethod
+    def _follow_lagna_exact(timeline: BodyTimeline, totals: List[int], first: int, last: int,
+                            arc: int, min_matches: int) -> Iterator[Tuple[int, int, int, int]]:
+        """``_follow_lagna`` on sampled exact positions (for high latitudes and distant dates)"""
+        arc_count = len(ReverseSearchService.ARCS)
+        boundaries = ReverseSearchService.ARC_BOUNDARIES
+        
+        # Lagna arcs passed during the stretch: the lagna moves forward through
+        # every arc once per sidereal day (1436 minutes)
+        if last - first >= 1436:
+            covered = list(range(arc_count))
+        else:
+            last_arc = ReverseSearchService._arc(timeline.longitude('Ascendant', last))
+            steps = (last_arc - arc) % arc_count
+            # Ending in the starting arc means either almost no motion or almost a full circle
+            covered = None if steps == 0 and last > first else [
+                (arc + step) % arc_count for step in range(steps + 1)
+            ]
+        if covered is not None:
+            covered_totals = [totals[index] for index in covered]
+            if max(covered_totals) < min_matches:
+                return
+            if min(covered_totals) >= min_matches:
+                yield first, last, min(covered_totals), max(covered_totals)
+                return
+        
+        step = BirthWindowService.SAMPLE_MINUTES['Ascendant']
+        samples = list(range(first, last, step)) + [last]
+        
+        opened = first if totals[arc] >= min_matches else None
+        low = high = totals[arc]
+        for lo, hi in zip(samples, samples[1:]):
+            start = timeline.longitude('Ascendant', lo)
+            motion = (timeline.longitude('Ascendant', hi) - start) % 360.0
             
-        except Exception as e:
-            logger.error(f"Error calculating planetary positions: {e}")
-            raise
+            # Arc entries in the order the lagna reaches them
+            entries = sorted(
+                ((boundaries[index] - start) % 360.0, index) for index in range(arc_count)
+                if 0.0 < (boundaries[index] - start) % 360.0 <= motion
+            )
+            for offset, next_arc in entries:
+                qualifies = totals[next_arc] >= min_matches
+                if qualifies != (opened is not None):
+                    minute = BirthWindowService._find_crossing(timeline, 'Ascendant', lo, hi, start, offset, motion)
+                    if qualifies:
+                        opened, low, high = minute, totals[next_arc], totals[next_arc]
+                    else:
+                        if minute > opened:
+                            yield opened, minute - 1, low, high
+                        opened = None
+                elif qualifies:
+                    low, high = min(low, totals[next_arc]), max(high, totals[next_arc])
+        
+        if opened is not None:
+            yield opened, last, low, high
 
 # =============================================================================
-# COMPATIBILITY ANALYSIS ENGINE
+# DASHA TIMELINES
 # =============================================================================
 
-class CompatibilityAnalyzer:
-    """Life partner compatibility analysis engine"""
+class DashaService:
+    """Vimshottari dasha periods of both partners, compared at a date"""
     
     @staticmethod
-    def get_planets_in_rasi(chart_data: Dict[str, PlanetInfo], target_rasi: str) -> List[str]:
-        """Get all planets in a specific rasi"""
-        return [
-            planet for planet, info in chart_data.items()
-            if planet != 'Ascendant' and info.rasi == target_rasi
-        ]
+    def timeline(details: Tuple[str, str, float, float, float], engine: ChartEngine) -> dasha.Timeline:
+        """Dasha timeline from the birth moment; only the Moon is computed"""
+        dob, tob, _, _, tz_offset = details
+        jd = ChartService.birth_jd(dob, tob, tz_offset)
+        with engine.activated():
+            moon_longitude = swe.calc_ut(jd, swe.MOON, engine.flags)[0][0]
+        return dasha.Timeline(moon_longitude, jd)
     
     @staticmethod
-    def get_planets_in_house(chart_data: Dict[str, PlanetInfo], asc_longitude: float, house_number: int) -> List[str]:
-        """Get all planets in a specific house"""
-        planets = []
-        for planet, info in chart_data.items():
-            if planet != 'Ascendant':
-                house = AstrologyCalculator.get_house_number(info.longitude, asc_longitude)
-                if house == house_number:
-                    planets.append(planet)
-        return planets
+    def _describe(period: dasha.Period) -> Dict[str, Any]:
+        return {
+            'level': period.level,
+            'lord': period.lord,
+            'lords': list(period.lords),
+            'start': dasha.jd_to_date(period.start),
+            'end': dasha.jd_to_date(period.end)
+        }
     
     @staticmethod
-    def analyze_compatibility(
-        male_chart: Dict[str, PlanetInfo], 
-        female_chart: Dict[str, PlanetInfo],
-        male_asc: float, 
-        female_asc: float, 
-        lang: str = 'en'
-    ) -> Dict[str, Any]:
-        """Perform comprehensive compatibility analysis"""
-        
-        # Extract key information
-        male_rahu = male_chart['Rahu']
-        male_ketu = male_chart['Ketu']
-        female_moon = female_chart['Moon']
-        female_asc_info = female_chart['Ascendant']
-        
-        # Get nakshatra lords
-        rahu_lord = male_rahu.nakshatra_lord
-        ketu_lord = male_ketu.nakshatra_lord
-        
-        # Female chart analysis points
-        female_moon_rasi_lord = ASTRO.RASI_LORDS[female_moon.rasi]
-        female_lagna_lord = ASTRO.RASI_LORDS[female_asc_info.rasi]
-        
-        # Get planets in specific positions
-        planets_in_lagna = CompatibilityAnalyzer.get_planets_in_house(female_chart, female_asc, 1)
-        planets_in_rasi = CompatibilityAnalyzer.get_planets_in_rasi(female_chart, female_moon.rasi)
-        
-        # Analyze matches
-        rahu_matches, rahu_reasoning = CompatibilityAnalyzer._check_matches(
-            rahu_lord, female_chart, female_moon_rasi_lord, female_lagna_lord,
-            planets_in_lagna, planets_in_rasi, 'rahu', lang
-        )
+    def compare(timelines: Dict[str, dasha.Timeline], jd: float, upcoming: int) -> Dict[str, Any]:
+        """Running maha/antar/pratyantar periods and the next ``upcoming`` antardashas of each partner.
         
-        ketu_matches, ketu_reasoning = CompatibilityAnalyzer._check_matches(
-            ketu_lord, female_chart, female_moon_rasi_lord, female_lagna_lord,
-            planets_in_lagna, planets_in_rasi, 'ketu', lang
-        )
+        ``transitions`` merges the upcoming antardashas of both partners by
+        start date. Only the periods asked for are generated.
+        """
+        response = {'success': True, 'date': dasha.jd_to_date(jd)}
+        transitions = []
+        for partner, timeline in timelines.items():
+            running = timeline.at(jd, 3)
+            following = list(itertools.islice(timeline.periods(2, running[1].end, math.inf), upcoming))
+            response[partner] = {
+                'moon_nakshatra_lord': dasha.LORDS[timeline.first_lord],
+                'balance_at_birth_years': round(timeline.balance_years, 4),
+                'current': [DashaService._describe(period) for period in running],
+                'upcoming': [DashaService._describe(period) for period in following]
+            }
+            transitions.extend((period.start, partner, period) for period in following)
         
-        # Prepare detailed conditions
-        conditions = CompatibilityAnalyzer._prepare_conditions(
-            female_chart, female_asc_info, planets_in_lagna, planets_in_rasi, lang
-        )
+        current = {partner: response[partner]['current'] for partner in timelines}
+        response['same_mahadasha_lord'] = len({periods[0]['lord'] for periods in current.values()}) == 1
+        response['same_antardasha_lord'] = len({periods[1]['lord'] for periods in current.values()}) == 1
+        response['transitions'] = [
+            {'partner': partner, **DashaService._describe(period)}
+            for _, partner, period in sorted(transitions, key=lambda item: item[0])
+        ]
+        return response
+
+# =============================================================================
+# INTERACTIVE SESSIONS
+# =============================================================================
+
+class SessionChart:
+    """One partner's chart in an interactive session, recomputed only where its inputs changed.
+    
+    A new birth moment or chart engine recomputes the bodies, a new
+    birthplace only the ascendant. The analysis only reads the male Moon and
+    nodes, so a chart with ``lunar_only`` holds just the Moon, Rahu and Ketu.
+    """
+    
+    def __init__(self, lunar_only: bool = False):
+        self.lunar_only = lunar_only
+        self.chart: Dict[str, PlanetInfo] = {}
+        self.asc = 0.0
+        self._jd: Optional[float] = None
+        self._place: Optional[Tuple[float, float]] = None
+        self._engine: Optional[ChartEngine] = None
+    
+    def update(self, details: Tuple[str, str, float, float, float], engine: ChartEngine) -> List[str]:
+        """Bring the chart up to date with new birth details; returns the recomputed bodies"""
+        dob, tob, lat, lon, tz_offset = details
+        jd = ChartService.birth_jd(dob, tob, tz_offset)
+        moved = jd != self._jd or engine is not self._engine
+        relocated = (lat, lon) != self._place
         
-        return {
-            'male_rahu': male_rahu,
-            'male_ketu': male_ketu,
-            'male_rahu_nakshatra': CompatibilityAnalyzer._translate_nakshatra(male_rahu.nakshatra, lang),
-            'male_ketu_nakshatra': CompatibilityAnalyzer._translate_nakshatra(male_ketu.nakshatra, lang),
-            'rahu_nakshatra_lord': rahu_lord,
-            'ketu_nakshatra_lord': ketu_lord,
-            'conditions': conditions,
-            'rahu_matches': rahu_matches,
-            'ketu_matches': ketu_matches,
-            'rahu_reasoning': rahu_reasoning,
-            'ketu_reasoning': ketu_reasoning,
-            'total_matches': len(rahu_matches) + len(ketu_matches),
-            'primary_match_type': 'Rahu' if rahu_matches else 'Ketu' if ketu_matches else 'None'
-        }
+        recomputed = []
+        with engine.activated():
+            if moved:
+                if self.lunar_only:
+                    moon = swe.calc_ut(jd, swe.MOON, engine.flags)[0]
+                    bodies = {'Moon': AstrologyCalculator.get_planet_info(moon[0], moon[3]),
+                              **AstrologyCalculator._calculate_nodes(jd, engine)}
+                else:
+                    bodies = AstrologyCalculator._calculate_bodies(jd, engine)
+                self.chart.update(bodies)
+                recomputed.extend(bodies)
+            if not self.lunar_only and (moved or relocated):
+                self.asc = swe.houses_ex(jd, lat, lon, b'O', flags=engine.flags)[1][0]
+                self.chart['Ascendant'] = AstrologyCalculator.get_planet_info(self.asc)
+                recomputed.append('Ascendant')
+        
+        self._jd, self._place, self._engine = jd, (lat, lon), engine
+        return recomputed
+
+class AnalysisSession:
+    """Inputs, charts and latest /analyze response of one interactive session"""
     
-    @staticmethod
-    def _check_matches(lord: str, female_chart: Dict[str, PlanetInfo], 
-                      moon_rasi_lord: str, lagna_lord: str,
-                      planets_in_lagna: List[str], planets_in_rasi: List[str],
-                      node_type: str, lang: str) -> Tuple[List[str], List[str]]:
-        """Check matches for a specific node (Rahu/Ketu)"""
-        matches = []
-        reasoning = []
-        
-        node_text = get_text(f'{node_type}_lord', lang)
-        
-        # Check various compatibility conditions
-        if lord == moon_rasi_lord:
-            matches.append(get_text('female_rasi_moon_sign', lang))
-            reasoning.append(f"{node_text} {lord} = {get_text('female_moon_sign_lord', lang)} {moon_rasi_lord}")
-        
-        if lord == female_chart['Moon'].nakshatra_lord:
-            matches.append(get_text('female_nakshatra', lang))
-            reasoning.append(f"{node_text} {lord} = {get_text('female_moon_nakshatra_lord', lang)} {female_chart['Moon'].nakshatra_lord}")
-        
-        # Check Female Lagna Point matches (both rasi lord and nakshatra lord)
-        lagna_matches = []
-        if lord == lagna_lord:
-            lagna_matches.append(f"Rasi Lord {lagna_lord}")
-        if lord == female_chart['Ascendant'].nakshatra_lord:
-            lagna_matches.append(f"Nakshatra Lord {female_chart['Ascendant'].nakshatra_lord}")
-        
-        if lagna_matches:
-            matches.append(get_text('female_lagna_point', lang))
-            reasoning.append(f"{node_text} {lord} = Female Lagna {' & '.join(lagna_matches)}")
-        
-        if lord in planets_in_lagna:
-            matches.append(get_text('planets_in_female_lagna', lang))
-            reasoning.append(f"{node_text} {lord} {get_text('present_in_female_lagna', lang)}")
-        
-        if lord in planets_in_rasi:
-            matches.append(get_text('planets_in_female_rasi', lang))
-            reasoning.append(f"{node_text} {lord} {get_text('present_in_female_moon_sign', lang)}")
-        
-        return matches, reasoning
+    FIELDS = tuple(
+        f'{partner}_{suffix}' for partner in ('male', 'female')
+        for suffix in ('dob', 'tob', 'lat', 'lon', 'tz_offset')
+    ) + ('ayanamsa', 'node_type', 'lang', 'symmetric', 'navamsa', 'vargas', 'synastry')
     
-    @staticmethod
-    def _prepare_conditions(female_chart: Dict[str, PlanetInfo], asc_info: PlanetInfo,
-                          planets_in_lagna: List[str], planets_in_rasi: List[str],
-                          lang: str) -> Dict[str, Dict[str, Any]]:
-        """Prepare detailed condition information"""
-        moon = female_chart['Moon']
+    def __init__(self):
+        self.data: Dict[str, Any] = {}
+        self.male = SessionChart(lunar_only=True)
+        self.female = SessionChart()
+        self.response: Optional[Dict[str, Any]] = None
+    
+    def apply(self, changes: Dict[str, Any]) -> Dict[str, Any]:
+        """Apply changed inputs and return what changed in the response.
+        
+        Invalid input raises ValueError and leaves the session unchanged.
+        """
+        data = {**self.data, **{key: value for key, value in changes.items() if key in self.FIELDS}}
+        male_details = _parse_birth_details(data, 'male')
+        female_details = _parse_birth_details(data, 'female')
+        engine = _engine_from_request(data)
+        lang = data['lang'] = _language(data.get('lang'))
+        options = _options_from_request(data)
+        for dob, tob, _, _, tz_offset in (male_details, female_details):
+            ChartService.birth_jd(dob, tob, tz_offset)
+        
+        # The reverse direction, divisional charts and synastry read the whole male chart
+        lunar_only = not (options.symmetric or options.vargas or options.synastry)
+        if self.male.lunar_only != lunar_only:
+            self.male = SessionChart(lunar_only=lunar_only)
+        
+        recomputed = {
+            'male': self.male.update(male_details, engine),
+            'female': self.female.update(female_details, engine)
+        }
+        response = _build_analysis_response(self.male.chart, self.female.chart, self.male.asc, self.female.asc,
+                                            lang, options)
+        previous = self.response or {}
+        self.data, self.response = data, response
         
+        # Conditions are compared row by row, everything else key by key
+        rows = previous.get('compatibility_data', [])
         return {
-            get_text('female_rasi_moon_sign', lang): {
-                'value': CompatibilityAnalyzer._translate_rasi(moon.rasi, lang),
-                'details': f"{moon.longitude:.2f}° in {CompatibilityAnalyzer._translate_rasi(moon.rasi, lang)}",
-                'lord': ASTRO.RASI_LORDS.get(moon.rasi),
-                'nakshatra_lord': moon.nakshatra_lord
+            'changed': {
+                key: value for key, value in response.items()
+                if key != 'compatibility_data' and previous.get(key) != value
             },
-            get_text('female_nakshatra', lang): {
-                'value': CompatibilityAnalyzer._translate_nakshatra(moon.nakshatra, lang),
-                'details': f"{CompatibilityAnalyzer._translate_nakshatra(moon.nakshatra, lang)} Pada {moon.pada}",
-                'lord': moon.nakshatra_lord,
-                'nakshatra_lord': moon.nakshatra_lord
+            'changed_conditions': {
+                str(index): row for index, row in enumerate(response['compatibility_data'])
+                if index >= len(rows) or rows[index] != row
             },
-            get_text('female_lagna_point', lang): {
-                'value': f"{asc_info.longitude:.2f}° {CompatibilityAnalyzer._translate_rasi(asc_info.rasi, lang)} | {CompatibilityAnalyzer._translate_nakshatra(asc_info.nakshatra, lang)} Pada {asc_info.pada}",
-                'details': f"Lagna: {asc_info.longitude:.2f}° in {CompatibilityAnalyzer._translate_rasi(asc_info.rasi, lang)} | Nakshatra: {CompatibilityAnalyzer._translate_nakshatra(asc_info.nakshatra, lang)} Pada {asc_info.pada} | Rasi Lord: {ASTRO.RASI_LORDS[asc_info.rasi]} | Nakshatra Lord: {asc_info.nakshatra_lord}",
-                'lord': ASTRO.RASI_LORDS[asc_info.rasi],
-                'nakshatra_lord': asc_info.nakshatra_lord
-            },
-            get_text('planets_in_female_lagna', lang): {
-                'value': planets_in_lagna,
-                'details': ", ".join([f"{p} ({female_chart[p].longitude:.1f}°)" for p in planets_in_lagna]) if planets_in_lagna else get_text('none', lang),
-                'lord': planets_in_lagna,
-                'nakshatra_lord': None
-            },
-            get_text('planets_in_female_rasi', lang): {
-                'value': planets_in_rasi,
-                'details': ", ".join([f"{p} ({female_chart[p].longitude:.1f}°)" for p in planets_in_rasi]) if planets_in_rasi else get_text('none', lang),
-                'lord': planets_in_rasi,
-                'nakshatra_lord': None
-            }
+            'removed': [key for key in previous if key not in response],
+            'condition_count': len(response['compatibility_data']),
+            'recomputed': recomputed
         }
+
+_sessions = SessionStore(ttl=app.config['SESSION_TTL'], max_sessions=app.config['SESSION_MAX_COUNT'])
+
+# =============================================================================
+# CHART REQUEST BATCHING
+# =============================================================================
+
+# Concurrent chart requests (threaded workers) arriving within the window are
+# computed together; a window of 0 computes every chart directly.
+def _calculate_chart_batch(requests: List[Tuple[float, float, float, ChartEngine]]) -> List[Any]:
+    """Compute a mixed batch of (jd, lat, lon, engine) requests, one engine at a time"""
+    results: List[Any] = [None] * len(requests)
+    by_engine: Dict[ChartEngine, List[int]] = {}
+    for index, request_item in enumerate(requests):
+        by_engine.setdefault(request_item[3], []).append(index)
     
-    @staticmethod
-    def _translate_nakshatra(nakshatra: str, lang: str) -> str:
-        """Translate nakshatra name based on language"""
-        if lang == 'ta' and nakshatra in NAKSHATRA_MAPPING:
-            return NAKSHATRA_MAPPING[nakshatra]
-        return nakshatra
+    for engine, indexes in by_engine.items():
+        charts = AstrologyCalculator.calculate_planetary_positions_batch(
+            [requests[index][:3] for index in indexes], engine
+        )
+        for index, chart in zip(indexes, charts):
+            results[index] = chart
     
-    @staticmethod
-    def _translate_rasi(rasi: str, lang: str) -> str:
-        """Translate rasi name based on language"""
-        if lang == 'ta' and rasi in RASI_MAPPING:
-            return RASI_MAPPING[rasi]
-        return rasi
+    return results
+
+_chart_batcher: Optional[MicroBatcher] = None
+if app.config['CHART_BATCH_WINDOW_MS'] > 0:
+    _chart_batcher = MicroBatcher(
+        _calculate_chart_batch,
+        window_ms=app.config['CHART_BATCH_WINDOW_MS'],
+        max_batch=app.config['CHART_BATCH_MAX_SIZE'],
+        name='chart'
+    )
+    ChartService.batcher = _chart_batcher
+
+# =============================================================================
+# REQUEST COALESCING
+# =============================================================================
+
+# Concurrent /analyze requests with the same normalized input share one
+# computation; with SINGLEFLIGHT_DIR set, workers on this host share it too.
+_analysis_flight = SingleFlight(
+    lock_dir=app.config['SINGLEFLIGHT_DIR'] or None,
+    result_ttl=app.config['SINGLEFLIGHT_TTL'],
+    dumps=app.json.dumps
+)
 
 # =============================================================================
-# CHART CREATION SERVICE
+# ADMISSION CONTROL
 # =============================================================================
 
-class ChartService:
-    """Service for creating birth charts"""
+# Bounds the CPU-bound work running at once in this worker; excess requests
+# wait in a bounded queue and are shed with a fast 503 when it is full.
+_admission = AdmissionController(
+    max_concurrent=app.config['ADMISSION_MAX_CONCURRENT'],
+    max_queue=app.config['ADMISSION_MAX_QUEUE'],
+    queue_timeout=app.config['ADMISSION_QUEUE_TIMEOUT_MS'] / 1000.0
+)
+
+# Recent /analyze responses, served to shed requests in degraded mode
+_recent_responses = ResponseCache(
+    app.config['ADMISSION_CACHE_SIZE'] if app.config['ADMISSION_DEGRADED_MODE'] else 0
+)
+
+def _request_deadline() -> float:
+    """Monotonic deadline for starting work on the current request.
     
-    @staticmethod
-    def create_birth_chart(dob: str, tob: str, lat: float, lon: float, tz_offset: float = 5.5) -> Tuple[Dict[str, PlanetInfo], float]:
-        """Create birth chart from birth details"""
+    The budget is ADMISSION_DEADLINE_MS, shortened by a client-supplied
+    ``X-Request-Timeout`` (milliseconds). When a proxy sets ``X-Request-Start``,
+    time already spent in the server backlog counts against the budget.
+    """
+    budget = app.config['ADMISSION_DEADLINE_MS'] / 1000.0
+    
+    client_timeout = request.headers.get('X-Request-Timeout')
+    if client_timeout:
         try:
-            # Parse date and time
-            local_dt = datetime.datetime.strptime(f"{dob} {tob}", "%Y-%m-%d %H:%M")
-            
-            # Convert to UTC
-            utc_dt = local_dt - datetime.timedelta(hours=tz_offset)
-            
-            # Calculate Julian Day
-            jd = swe.julday(utc_dt.year, utc_dt.month, utc_dt.day, utc_dt.hour + utc_dt.minute/60.0)
-            
-            # Calculate planetary positions
-            planet_data, asc_deg, _ = AstrologyCalculator.calculate_planetary_positions(jd, lat, lon)
-            
-            logger.info(f"Birth chart created successfully for {dob} {tob}")
-            return planet_data, asc_deg
-            
-        except Exception as e:
-            logger.error(f"Error creating birth chart: {e}")
-            raise
+            budget = min(budget, float(client_timeout) / 1000.0)
+        except ValueError:
+            pass
+    
+    request_start = request.headers.get('X-Request-Start', '').replace('t=', '')
+    if request_start:
+        try:
+            started = float(request_start)
+            # Proxies send seconds, milliseconds or microseconds since the epoch
+            if started > 1e14:
+                started /= 1e6
+            elif started > 1e11:
+                started /= 1e3
+            budget -= max(0.0, time.time() - started)
+        except ValueError:
+            pass
+    
+    return time.monotonic() + budget
+
+def _admitted(compute):
+    """Run ``compute`` while holding an admission slot"""
+    with _admission.admit(_request_deadline()):
+        return compute()
+
+def _shed_response(error: Overloaded, key: Optional[str] = None):
+    """Answer a shed request from cache in degraded mode, otherwise with 503"""
+    if key is not None and app.config['ADMISSION_DEGRADED_MODE']:
+        cached = _recent_responses.get(key)
+        if cached is not None:
+            _admission.record_degraded()
+            response = app.json.raw_response(cached)
+            response.headers['X-Degraded-Response'] = 'cached'
+            return response
+    
+    logger.warning(f"Request shed: {error.reason}")
+    response = jsonify({'success': False, 'error': 'Server is busy, please retry shortly'})
+    response.status_code = 503
+    response.headers['Retry-After'] = str(error.retry_after)
+    return response
+
+# =============================================================================
+# RESULT STORE
+# =============================================================================
+
+# Encoded /analyze bodies by the digest of their inputs (their permalink),
+# shared by the workers of this host
+_results = ResultStore(app.config['RESULTS_DB_PATH'], app.config['RESULTS_MAX_BYTES'])
+
+# =============================================================================
+# STATIC ASSETS
+# =============================================================================
+
+# Fingerprinted assets are immutable: a changed file gets a new URL
+ASSET_MAX_AGE = 365 * 24 * 3600
+
+# Fingerprinted path of every static file, and the encodings stored for each fingerprinted file
+_asset_manifest: Dict[str, str] = {}
+_asset_encodings: Dict[str, List[str]] = {}
+
+def _build_assets() -> None:
+    """Build the fingerprinted assets (only new content is written) and load the manifest"""
+    try:
+        manifest = assets.build(app.static_folder, app.config['ASSETS_DIR'])
+    except OSError as e:
+        logger.warning(f"Serving unprocessed static files; building assets failed: {e}")
+        manifest = {}
+    # Files of earlier builds stay servable for pages that still reference them
+    for fingerprinted in manifest.values():
+        _asset_encodings[fingerprinted] = [pages.IDENTITY] + [
+            encoding for encoding, suffix in assets.SUFFIXES.items()
+            if os.path.exists(os.path.join(app.config['ASSETS_DIR'], f'{fingerprinted}.{suffix}'))
+        ]
+    _asset_manifest.clear()
+    _asset_manifest.update(manifest)
+
+@app.template_global()
+def asset_url(filename: str) -> str:
+    """URL of the fingerprinted build of a static file, or of the file itself when there is none"""
+    fingerprinted = _asset_manifest.get(filename)
+    if fingerprinted is None:
+        return url_for('static', filename=filename)
+    return url_for('asset', filename=fingerprinted)
+
+@app.route('/assets/<path:filename>')
+def asset(filename):
+    """Fingerprinted static file in the best accepted encoding, cacheable forever"""
+    encodings = _asset_encodings.get(filename)
+    if encodings is None:
+        abort(404)
+    encoding = pages.best_encoding(lambda name: request.accept_encodings[name], encodings)
+    path = os.path.join(app.config['ASSETS_DIR'], filename)
+    if encoding != pages.IDENTITY:
+        path = f'{path}.{assets.SUFFIXES[encoding]}'
+    
+    # send_file hands the open file to the server's file wrapper (sendfile under gunicorn)
+    digest = filename.rsplit('.', 2)[-2]
+    response = send_file(path, mimetype=mimetypes.guess_type(filename)[0], conditional=True,
+                         etag=f'{digest}-{encoding}', max_age=ASSET_MAX_AGE)
+    if encoding != pages.IDENTITY:
+        response.headers['Content-Encoding'] = encoding
+    response.headers['Vary'] = 'Accept-Encoding'
+    response.cache_control.public = True
+    response.cache_control.immutable = True
+    return response
+
+# =============================================================================
+# HOME PAGES
+# =============================================================================
+
+HOME_PAGE_LANGUAGES = ('en', 'ta')
+
+def _render_home_pages() -> Dict[str, str]:
+    """Render the home page in every language"""
+    # The page cache calls this again when the template or a static file has
+    # changed: a changed static file gets a new fingerprinted URL, and
+    # templates are cached without reload checks outside debug mode
+    _build_assets()
+    if app.jinja_env.cache is not None:
+        app.jinja_env.cache.clear()
+    with app.test_request_context('/'):
+        return {lang: render_template('index.html', lang=lang, get_text=get_text) for lang in HOME_PAGE_LANGUAGES}
+
+# Rendered once per worker; translations are code and change only with a restart
+_home_pages = pages.PageCache(
+    _render_home_pages,
+    [os.path.join(app.root_path, app.template_folder, 'index.html')] + [
+        os.path.join(app.static_folder, filename)
+        for filename in assets.sources(app.static_folder, app.config['ASSETS_DIR'])
+    ],
+    check_interval=app.config['PAGE_CHECK_INTERVAL']
+)
+
+def _home_page_response(lang: str) -> Response:
+    """Serve a pre-rendered home page in the best accepted encoding, or 304 if the client's copy is current"""
+    page = _home_pages.get(lang)
+    encoding = pages.best_encoding(lambda name: request.accept_encodings[name])
+    etag = page.etags[encoding]
+    if request.if_none_match.contains(etag):
+        response = Response(status=304)
+    else:
+        response = Response(page.bodies[encoding], mimetype='text/html')
+        if encoding != pages.IDENTITY:
+            response.headers['Content-Encoding'] = encoding
+    response.set_etag(etag)
+    response.headers['Vary'] = 'Accept-Encoding'
+    response.headers['Cache-Control'] = 'no-cache'
+    return response
+
+# =============================================================================
+# WORKER WARM-UP
+# =============================================================================
+
+# Warm-up birth dates step through the 60 years from this date
+WARMUP_START = datetime.date(1950, 1, 1)
+
+def _warmup_details(count: int) -> List[Tuple[str, str, float, float, float]]:
+    """Birth details of ``count`` partners spread over 1950-2010 and over India"""
+    return [
+        ((WARMUP_START + datetime.timedelta(days=index * 21915 // max(count - 1, 1))).isoformat(),
+         f'{index % 24:02d}:{index * 7 % 60:02d}', 8.0 + (index * 7) % 23, 70.0 + (index * 11) % 20, 5.5)
+        for index in range(count)
+    ]
+
+def _warm_up_worker() -> Dict[str, Any]:
+    """Run representative work once, so ephemeris data, caches and code paths are warm for the first request"""
+    engine = ChartEngine.get()
+    details = _warmup_details(app.config['WARMUP_CHARTS'])
+    requests = [(ChartService.birth_jd(dob, tob, tz_offset), lat, lon) for dob, tob, lat, lon, tz_offset in details]
+    charts = [AstrologyCalculator.calculate_planetary_positions(*request_item, engine)[:2] for request_item in requests]
+    AstrologyCalculator.calculate_screening_positions_batch(requests, engine, navamsa=True)
+    
+    # Every response shape in every language, keyed, built and encoded as /analyze does
+    variants = [
+        AnalysisOptions(),
+        AnalysisOptions(symmetric=True, navamsa=True, vargas=vargas.DIVISIONS, synastry=True),
+        AnalysisOptions(schema=2, symmetric=True, navamsa=True, explain=True)
+    ]
+    analyses = 0
+    for index, (options, lang) in enumerate(itertools.product(variants, HOME_PAGE_LANGUAGES)):
+        male, female = index % len(details), -1 - index % len(details)
+        _analysis_key(details[male], details[female], lang, engine, options)
+        (male_chart, male_asc), (female_chart, female_asc) = charts[male], charts[female]
+        app.json.dumps_bytes(_build_analysis_response(male_chart, female_chart, male_asc, female_asc, lang, options))
+        analyses += 1
+    for lang in HOME_PAGE_LANGUAGES:
+        _home_pages.get(lang)
+    return {'charts': len(charts), 'analyses': analyses}
+
+def _warmup_probe() -> None:
+    """One chart from the middle of the warm-up span, timed to report the warm chart latency"""
+    dob, tob, lat, lon, tz_offset = _warmup_details(3)[1]
+    AstrologyCalculator.calculate_planetary_positions(ChartService.birth_jd(dob, tob, tz_offset), lat, lon)
+
+# Started in each worker by the gunicorn post_worker_init hook (gunicorn.conf.py),
+# or by the first readiness check; WARMUP_CHARTS = 0 makes workers ready at once
+_warmup = Warmup(_warm_up_worker, _warmup_probe, samples=app.config['WARMUP_SAMPLES'],
+                 enabled=app.config['WARMUP_CHARTS'] > 0)
+
+def start_warmup() -> None:
+    """Warm up this worker in the background (idempotent per process)"""
+    _warmup.start()
 
 # =============================================================================
 # FLASK ROUTES
@@ -436,12 +1258,12 @@ class ChartService:
 @app.route('/')
 def index():
     """Home page - English"""
-    return render_template('index.html', lang='en', get_text=get_text)
+    return _home_page_response('en')
 
 @app.route('/tamil')
 def index_tamil():
     """Home page - Tamil"""
-    return render_template('index.html', lang='ta', get_text=get_text)
+    return _home_page_response('ta')
 
 @app.route('/analyze', methods=['POST'])
 def analyze():
@@ -452,61 +1274,387 @@ def analyze():
         if not data:
             return jsonify({'success': False, 'error': 'No data provided'}), 400
         
-        lang = request.headers.get('X-Language', 'en')
+        lang = _request_language()
         
         # Validate and extract data
-        required_fields = ['male_dob', 'male_tob', 'male_lat', 'male_lon',
-                          'female_dob', 'female_tob', 'female_lat', 'female_lon']
+        try:
+            male_details = _parse_birth_details(data, 'male')
+            female_details = _parse_birth_details(data, 'female')
+            engine = _engine_from_request(data)
+            options = _options_from_request(data)
+        except ValueError as e:
+            return jsonify({'success': False, 'error': str(e)}), 400
         
-        for field in required_fields:
-            if field not in data:
-                return jsonify({'success': False, 'error': f'Missing field: {field}'}), 400
+        # A client holding the current result only needs to hear that it is
+        # still current; nothing is computed
+        key = _analysis_key(male_details, female_details, lang, engine, options)
+        etag = _analysis_etag(key)
+        if request.if_none_match.contains_weak(etag):
+            not_modified = Response(status=304)
+            not_modified.set_etag(etag, weak=True)
+            return not_modified
         
-        # Extract and validate coordinates
+        # Only a result that is not stored yet is computed
         try:
-            male_lat = float(data['male_lat'])
-            male_lon = float(data['male_lon'])
-            female_lat = float(data['female_lat'])
-            female_lon = float(data['female_lon'])
-            male_tz_offset = float(data.get('male_tz_offset', 5.5))
-            female_tz_offset = float(data.get('female_tz_offset', 5.5))
-        except (ValueError, TypeError) as e:
-            return jsonify({'success': False, 'error': f'Invalid coordinate data: {e}'}), 400
-        
-        # Create birth charts
-        male_chart, male_asc = ChartService.create_birth_chart(
-            data['male_dob'], data['male_tob'], male_lat, male_lon, male_tz_offset
-        )
+            body, source = _stored_analysis(male_details, female_details, lang, engine, options)
+        except Overloaded as e:
+            return _shed_response(e, key)
         
-        female_chart, female_asc = ChartService.create_birth_chart(
-            data['female_dob'], data['female_tob'], female_lat, female_lon, female_tz_offset
-        )
+        if app.config['ADMISSION_DEGRADED_MODE']:
+            _recent_responses.put(key, body)
         
-        # Perform compatibility analysis
-        analysis_result = CompatibilityAnalyzer.analyze_compatibility(
-            male_chart, female_chart, male_asc, female_asc, lang
-        )
+        logger.info(f"Analysis completed successfully ({source} result)")
+        result = app.json.raw_response(body)
+        result.set_etag(etag, weak=True)
+        return result
         
-        # Prepare compatibility data for frontend
-        compatibility_data = _prepare_frontend_data(analysis_result, lang)
+    except Exception as e:
+        logger.error(f"Error in analysis: {e}")
+        return jsonify({'success': False, 'error': str(e)}), 500
+
+@app.route('/analyze/codes')
+def analyze_codes():
+    """Code tables of compact (schema 2) analysis bodies, in the requested language"""
+    lang = _request_language(query=True)
+    response = jsonify(_compact_codes(lang, rule_store().current()))
+    # The tables only change with the rules or a deploy, so clients revalidate them
+    response.add_etag()
+    response.headers['Cache-Control'] = 'no-cache'
+    response.vary.add('X-Language')
+    return response.make_conditional(request)
+
+@app.route('/result/<digest>')
+def stored_result(digest):
+    """Stored analysis by its ``result_id``, in the language of ``?lang=`` or X-Language.
+    
+    A language the result has not been stored in yet is computed from the
+    stored inputs, as long as the rules and analysis code that produced the
+    result are still in effect.
+    """
+    lang = _request_language(query=True)
+    etag = f'{digest}-{lang}'
+    if request.if_none_match.contains(etag):
+        not_modified = Response(status=304)
+        not_modified.set_etag(etag)
+        return not_modified
+    
+    body = _results.get(digest, lang)
+    if body is None:
+        inputs = _results.inputs(digest)
+        if inputs is None:
+            return jsonify({'success': False, 'error': 'Result not found'}), 404
+        male_details = _parse_birth_details(inputs, 'male')
+        female_details = _parse_birth_details(inputs, 'female')
+        engine = _engine_from_request(inputs)
+        options = _options_from_request(inputs)
+        if _result_digest(male_details, female_details, engine, options) != digest:
+            return jsonify({'success': False, 'error': 'Result is not available in this language'}), 404
+        try:
+            body, _ = _stored_analysis(male_details, female_details, lang, engine, options)
+        except Overloaded as e:
+            return _shed_response(e)
+    
+    response = app.json.raw_response(body)
+    # The bytes stored under a digest never change
+    response.set_etag(etag)
+    response.headers['Cache-Control'] = f'public, max-age={ASSET_MAX_AGE}, immutable'
+    response.vary.add('X-Language')
+    return response
+
+@app.route('/analyze/batch', methods=['POST'])
+def analyze_batch():
+    """Analyze one male profile against many female candidates.
+    
+    The body is either a JSON object with the male fields and a ``candidates``
+    list, or NDJSON (``Content-Type: application/x-ndjson``) whose first line
+    is the male profile and every following line one candidate. Clients that
+    send ``Accept: application/x-ndjson`` get one result line per candidate as
+    soon as it is computed, followed by a summary line.
+    """
+    lang = _request_language()
+    
+    try:
+        if request.mimetype == NDJSON_MIMETYPE:
+            lines = _iter_ndjson_request()
+            male_data = next(lines, None)
+            candidates = lines
+        else:
+            male_data = request.get_json(silent=True)
+            candidates = male_data.get('candidates') if isinstance(male_data, dict) else None
+            if not isinstance(candidates, list):
+                return jsonify({'success': False, 'error': 'Missing field: candidates'}), 400
         
-        # Determine verdict
-        verdict_info = _determine_verdict(analysis_result['total_matches'], lang)
+        if not male_data:
+            return jsonify({'success': False, 'error': 'No data provided'}), 400
         
-        # Prepare response
-        response = {
-            'success': True,
-            **analysis_result,
-            'compatibility_data': compatibility_data,
-            **verdict_info
-        }
+        male_details = _parse_birth_details(male_data, 'male')
+        engine = _engine_from_request(male_data)
+        options = _options_from_request(male_data)
+    except ValueError as e:
+        return jsonify({'success': False, 'error': str(e)}), 400
+    
+    try:
+        slot = _admission.acquire(_request_deadline())
+    except Overloaded as e:
+        return _shed_response(e)
+    
+    try:
+        results = _iter_batch_results(male_details, candidates, lang, engine, options)
         
-        logger.info(f"Analysis completed successfully. Total matches: {analysis_result['total_matches']}")
-        return jsonify(response)
+        if request.accept_mimetypes.best_match(['application/json', NDJSON_MIMETYPE]) == NDJSON_MIMETYPE:
+            # The generator is only advanced when the server is ready to write the
+            # next chunk, so a slow client throttles the computation instead of
+            # letting finished results pile up in memory. The admission slot is
+            # held until the stream is closed.
+            response = Response(
+                stream_with_context(app.json.dumps(item) + '\n' for item in results),
+                mimetype=NDJSON_MIMETYPE
+            )
+            response.call_on_close(lambda: _admission.release(slot))
+            return response
         
-    except Exception as e:
-        logger.error(f"Error in analysis: {e}")
-        return jsonify({'success': False, 'error': str(e)}), 500
+        items = list(results)
+    except Exception:
+        _admission.release(slot)
+        raise
+    
+    _admission.release(slot)
+    summary = items.pop()['summary']
+    return jsonify({'success': True, 'results': items, 'summary': summary})
+
+@app.route('/analyze/window', methods=['POST'])
+def analyze_window():
+    """Compatibility across each partner's range of possible birth times.
+    
+    Accepts the /analyze fields, where either partner's ``tob`` may be replaced
+    by ``tob_from`` and ``tob_to`` (a range that ends before it starts runs into
+    the next day). Returns the intervals of birth times with a constant outcome.
+    """
+    data = request.get_json(silent=True)
+    if not data:
+        return jsonify({'success': False, 'error': 'No data provided'}), 400
+    
+    lang = _request_language()
+    
+    try:
+        male_window = _parse_birth_window(data, 'male')
+        female_window = _parse_birth_window(data, 'female')
+        engine = _engine_from_request(data)
+    except ValueError as e:
+        return jsonify({'success': False, 'error': str(e)}), 400
+    
+    try:
+        response = _admitted(lambda: BirthWindowService.analyze_window(male_window, female_window, lang, engine))
+    except Overloaded as e:
+        return _shed_response(e)
+    
+    logger.info(f"Window analysis completed: {len(response['intervals'])} intervals from "
+                f"{response['ephemeris_evaluations']} ephemeris evaluations")
+    return jsonify(response)
+
+@app.route('/search/birth-windows', methods=['POST'])
+def search_birth_windows():
+    """Find birth times of one partner that reach ``min_matches`` with the other's chart.
+    
+    The fixed partner is given with the usual /analyze fields. The searched
+    partner (``search_for``, default ``female``) is given as a date range
+    ``<partner>_dob_from``/``<partner>_dob_to`` plus birthplace coordinates.
+    """
+    data = request.get_json(silent=True)
+    if not data:
+        return jsonify({'success': False, 'error': 'No data provided'}), 400
+    
+    lang = _request_language()
+    search_for = data.get('search_for', 'female')
+    if search_for not in ('male', 'female'):
+        return jsonify({'success': False, 'error': 'search_for must be male or female'}), 400
+    fixed = 'male' if search_for == 'female' else 'female'
+    
+    try:
+        fixed_details = _parse_birth_details(data, fixed)
+        window = _parse_search_window(data, search_for)
+        engine = _engine_from_request(data)
+        min_matches = int(data.get('min_matches', 3))
+        max_intervals = min(int(data.get('max_intervals', 1000)), app.config['REVERSE_SEARCH_MAX_INTERVALS'])
+        if max_intervals < 1:
+            raise ValueError('max_intervals must be positive')
+    except (ValueError, TypeError) as e:
+        return jsonify({'success': False, 'error': str(e)}), 400
+    
+    def compute():
+        fixed_chart = ChartService.create_birth_chart(*fixed_details, engine=engine)
+        return ReverseSearchService.search(fixed_chart, search_for, window, min_matches, max_intervals, lang, engine)
+    
+    try:
+        response = _admitted(compute)
+    except Overloaded as e:
+        return _shed_response(e)
+    
+    logger.info(f"Reverse search found {len(response['intervals'])} intervals from "
+                f"{response['ephemeris_evaluations']} ephemeris evaluations")
+    return jsonify(response)
+
+@app.route('/dasha', methods=['POST'])
+def dasha_periods():
+    """Vimshottari dasha periods of both partners at ``date`` (default: today, UT).
+    
+    Accepts the /analyze fields plus ``date`` (YYYY-MM-DD) and ``upcoming``,
+    the number of following antardashas to list per partner.
+    """
+    data = request.get_json(silent=True)
+    if not data:
+        return jsonify({'success': False, 'error': 'No data provided'}), 400
+    
+    try:
+        details = {partner: _parse_birth_details(data, partner) for partner in ('male', 'female')}
+        engine = _engine_from_request(data)
+        date = data.get('date') or datetime.datetime.now(datetime.timezone.utc).date().isoformat()
+        jd = dasha.date_to_jd(date)
+        upcoming = int(data.get('upcoming', 3))
+        if not 0 <= upcoming <= app.config['DASHA_MAX_UPCOMING']:
+            raise ValueError(f"upcoming must be between 0 and {app.config['DASHA_MAX_UPCOMING']}")
+        timelines = {partner: DashaService.timeline(values, engine) for partner, values in details.items()}
+        for timeline in timelines.values():
+            if jd < timeline.birth_jd:
+                raise ValueError('date must not be before either birth')
+    except (ValueError, TypeError) as e:
+        return jsonify({'success': False, 'error': str(e)}), 400
+    
+    try:
+        response = _admitted(lambda: DashaService.compare(timelines, jd, upcoming))
+    except Overloaded as e:
+        return _shed_response(e)
+    
+    return jsonify(response)
+
+@app.route('/sessions', methods=['POST'])
+def create_session():
+    """Start an interactive session from the /analyze fields.
+    
+    The response is the full /analyze body plus ``session_id`` and
+    ``version``. Later input changes are sent with PATCH and answered with
+    deltas, which are also pushed to ``/sessions/<id>/events``.
+    """
+    data = request.get_json(silent=True)
+    if not data:
+        return jsonify({'success': False, 'error': 'No data provided'}), 400
+    
+    state = AnalysisSession()
+    try:
+        _admitted(lambda: state.apply({'lang': _request_language(), **data}))
+    except ValueError as e:
+        return jsonify({'success': False, 'error': str(e)}), 400
+    except Overloaded as e:
+        return _shed_response(e)
+    
+    session = _sessions.create(state)
+    response = jsonify(_session_snapshot(session))
+    # The same validator as /analyze: the session's result is that analysis plus the session fields
+    lang = state.data['lang']
+    response.set_etag(_analysis_etag(_analysis_key(
+        _parse_birth_details(state.data, 'male'), _parse_birth_details(state.data, 'female'), lang,
+        _engine_from_request(state.data), _options_from_request(state.data)
+    )), weak=True)
+    return response, 201
+
+@app.route('/sessions/<session_id>', methods=['GET'])
+def get_session(session_id):
+    """Current full response of a session"""
+    session = _sessions.get(session_id)
+    if session is None:
+        return jsonify({'success': False, 'error': 'Session not found'}), 404
+    with session.lock:
+        return jsonify(_session_snapshot(session))
+
+@app.route('/sessions/<session_id>', methods=['PATCH'])
+def update_session(session_id):
+    """Change some inputs of a session and return only what changed"""
+    session = _sessions.get(session_id)
+    if session is None:
+        return jsonify({'success': False, 'error': 'Session not found'}), 404
+    
+    changes = request.get_json(silent=True)
+    if not isinstance(changes, dict) or not changes:
+        return jsonify({'success': False, 'error': 'No changes provided'}), 400
+    unknown = sorted(set(changes) - set(AnalysisSession.FIELDS))
+    if unknown:
+        return jsonify({'success': False, 'error': f"Unknown field: {', '.join(unknown)}"}), 400
+    
+    started = time.perf_counter()
+    try:
+        with session.lock:
+            delta = _admitted(lambda: session.state.apply(changes))
+            session.version += 1
+            delta = {
+                'success': True,
+                'version': session.version,
+                **delta,
+                'elapsed_ms': round((time.perf_counter() - started) * 1000, 3)
+            }
+            session.publish(delta)
+    except ValueError as e:
+        return jsonify({'success': False, 'error': str(e)}), 400
+    except Overloaded as e:
+        return _shed_response(e)
+    
+    return jsonify(delta)
+
+@app.route('/sessions/<session_id>', methods=['DELETE'])
+def delete_session(session_id):
+    """End a session and close its event streams"""
+    if not _sessions.delete(session_id):
+        return jsonify({'success': False, 'error': 'Session not found'}), 404
+    return jsonify({'success': True})
+
+@app.route('/sessions/<session_id>/events')
+def session_events(session_id):
+    """Server-sent events: a ``snapshot`` of the session, then a ``delta`` per update.
+    
+    Each open stream holds a worker thread, so serve it with threaded
+    workers (``gunicorn --threads N``).
+    """
+    session = _sessions.get(session_id)
+    if session is None:
+        return jsonify({'success': False, 'error': 'Session not found'}), 404
+    
+    subscriber = session.subscribe()
+    with session.lock:
+        snapshot = _session_snapshot(session)
+    heartbeat = app.config['SESSION_HEARTBEAT']
+    
+    def generate():
+        nonlocal snapshot
+        version = snapshot['version']
+        try:
+            yield _sse_event('snapshot', snapshot)
+            while True:
+                try:
+                    event = subscriber.get(timeout=heartbeat)
+                except queue.Empty:
+                    # Comment lines keep proxies from closing an idle stream
+                    if _sessions.get(session_id) is None:
+                        break
+                    yield ': keep-alive\n\n'
+                    continue
+                
+                if event is CLOSED:
+                    yield _sse_event('closed', {'session_id': session_id, 'version': version})
+                    break
+                if event is RESYNC:
+                    with session.lock:
+                        snapshot = _session_snapshot(session)
+                    version = snapshot['version']
+                    yield _sse_event('snapshot', snapshot)
+                elif event['version'] > version:
+                    version = event['version']
+                    yield _sse_event('delta', event)
+        finally:
+            session.unsubscribe(subscriber)
+    
+    response = Response(stream_with_context(generate()), mimetype='text/event-stream')
+    response.headers['Cache-Control'] = 'no-cache'
+    response.headers['X-Accel-Buffering'] = 'no'
+    return response
 
 @app.route('/health')
 def health_check():
@@ -518,13 +1666,597 @@ def health_check():
             'css_exists': os.path.exists('static/css/style.css'),
             'js_exists': os.path.exists('static/js/script.js')
         },
-        'ephemeris_initialized': True
+        'ephemeris_initialized': True,
+        'ephemeris': {name: _ephemeris_report[name] for name in ('mode', 'source', 'chart_us')}
+    })
+
+@app.route('/ready')
+def readiness_check():
+    """Readiness probe: 200 once this worker has warmed up, with its measured warm chart latency"""
+    start_warmup()
+    status = _warmup.status()
+    return jsonify({'ready': _warmup.ready, **status}), 200 if _warmup.ready else 503
+
+@app.route('/metrics')
+def metrics():
+    """Runtime metrics for the performance subsystems"""
+    return jsonify({
+        'chart_batching': _chart_batcher.metrics() if _chart_batcher is not None else {'enabled': False},
+        'singleflight': _analysis_flight.metrics(),
+        'admission': {
+            **_admission.metrics(),
+            'degraded_mode': app.config['ADMISSION_DEGRADED_MODE'],
+            'cached_responses': len(_recent_responses)
+        },
+        'sessions': _sessions.metrics(),
+        'rules': rule_store().metrics(),
+        'home_pages': _home_pages.metrics(),
+        'results': _results.metrics(),
+        'json': app.json.metrics(),
+        'warmup': _warmup.status(),
+        'ephemeris': _ephemeris_report
     })
 
 # =============================================================================
 # HELPER FUNCTIONS
 # =============================================================================
 
+NDJSON_MIMETYPE = 'application/x-ndjson'
+
+def _language(value: Optional[str]) -> str:
+    """A supported response language: the requested one, or English for anything unknown.
+    
+    Languages are part of cache keys, result store rows and ETags, so an
+    arbitrary value must not create entries of its own.
+    """
+    return value if value in HOME_PAGE_LANGUAGES else 'en'
+
+def _request_language(query: bool = False) -> str:
+    """Language of the current request from X-Language (or first ``?lang=`` with ``query``)"""
+    return _language((query and request.args.get('lang')) or request.headers.get('X-Language'))
+
+def _parse_birth_details(data: Dict[str, Any], prefix: str) -> Tuple[str, str, float, float, float]:
+    """Extract and validate one partner's birth details from request data"""
+    for suffix in ('dob', 'tob', 'lat', 'lon'):
+        if f'{prefix}_{suffix}' not in data:
+            raise ValueError(f'Missing field: {prefix}_{suffix}')
+    
+    try:
+        lat = float(data[f'{prefix}_lat'])
+        lon = float(data[f'{prefix}_lon'])
+        tz_offset = float(data.get(f'{prefix}_tz_offset', 5.5))
+    except (ValueError, TypeError) as e:
+        raise ValueError(f'Invalid coordinate data: {e}')
+    
+    return data[f'{prefix}_dob'], data[f'{prefix}_tob'], lat, lon, tz_offset
+
+def _parse_birth_window(data: Dict[str, Any], prefix: str) -> Tuple[datetime.datetime, int, float, float, float]:
+    """Extract one partner's birth time range as ``(start, minutes, lat, lon, tz_offset)``"""
+    tob_from = data.get(f'{prefix}_tob_from', data.get(f'{prefix}_tob'))
+    tob_to = data.get(f'{prefix}_tob_to', tob_from)
+    dob, _, lat, lon, tz_offset = _parse_birth_details({**data, f'{prefix}_tob': tob_from}, prefix)
+    
+    try:
+        start = datetime.datetime.strptime(f"{dob} {tob_from}", "%Y-%m-%d %H:%M")
+        end = datetime.datetime.strptime(f"{dob} {tob_to}", "%Y-%m-%d %H:%M")
+    except (ValueError, TypeError) as e:
+        raise ValueError(f'Invalid birth time range for {prefix}: {e}')
+    
+    minutes = int((end - start).total_seconds() // 60) % (24 * 60)
+    return start, minutes, lat, lon, tz_offset
+
+def _parse_search_window(data: Dict[str, Any], prefix: str) -> Tuple[datetime.datetime, int, float, float, float]:
+    """Extract a searched partner's date range as ``(start, minutes, lat, lon, tz_offset)``"""
+    for suffix in ('dob_from', 'dob_to', 'lat', 'lon'):
+        if f'{prefix}_{suffix}' not in data:
+            raise ValueError(f'Missing field: {prefix}_{suffix}')
+    
+    try:
+        lat = float(data[f'{prefix}_lat'])
+        lon = float(data[f'{prefix}_lon'])
+        tz_offset = float(data.get(f'{prefix}_tz_offset', 5.5))
+        start = datetime.datetime.strptime(data[f'{prefix}_dob_from'], "%Y-%m-%d")
+        end = datetime.datetime.strptime(data[f'{prefix}_dob_to'], "%Y-%m-%d") + datetime.timedelta(days=1)
+    except (ValueError, TypeError) as e:
+        raise ValueError(f'Invalid search range for {prefix}: {e}')
+    
+    if end <= start:
+        raise ValueError(f'{prefix}_dob_to must not be before {prefix}_dob_from')
+    if (end - start).days > 366 * app.config['REVERSE_SEARCH_MAX_YEARS']:
+        raise ValueError(f"Search range is limited to {app.config['REVERSE_SEARCH_MAX_YEARS']} years")
+    
+    return start, int((end - start).total_seconds() // 60) - 1, lat, lon, tz_offset
+
+def _session_snapshot(session) -> Dict[str, Any]:
+    """Full response body of a session (session lock held)"""
+    return {**session.state.response, 'session_id': session.id, 'version': session.version}
+
+def _sse_event(event: str, data: Dict[str, Any]) -> str:
+    """Format one server-sent event, using the session version as event ID"""
+    return f"id: {data['version']}\nevent: {event}\ndata: {app.json.dumps(data)}\n\n"
+
+def _engine_from_request(data: Dict[str, Any]) -> ChartEngine:
+    """Select the chart engine from the optional ``ayanamsa`` and ``node_type`` fields"""
+    ayanamsa = data.get('ayanamsa')
+    node_type = data.get('node_type')
+    if ayanamsa is not None and ayanamsa not in AYANAMSAS:
+        raise ValueError(f"Unsupported ayanamsa: {ayanamsa} (choose from {', '.join(AYANAMSAS)})")
+    if node_type is not None and node_type not in NODE_TYPES:
+        raise ValueError(f"Unsupported node type: {node_type} (choose from {', '.join(NODE_TYPES)})")
+    return ChartEngine.get(ayanamsa, node_type)
+
+def _options_from_request(data: Dict[str, Any]) -> AnalysisOptions:
+    """Select the optional analysis parts from the ``symmetric``, ``navamsa``, ``vargas`` and ``synastry`` fields,
+    and the response shape from ``schema``, ``fields`` and ``explain``"""
+    divisions = data.get('vargas') or []
+    if not isinstance(divisions, list):
+        raise ValueError('Invalid vargas: expected a list such as ["D9", "D10"]')
+    schema = data.get('schema', 1)
+    if schema not in RESPONSE_SCHEMAS or isinstance(schema, bool):
+        raise ValueError(f"Unsupported schema: {schema} (choose from {', '.join(map(str, RESPONSE_SCHEMAS))})")
+    fields = data.get('fields') or []
+    if isinstance(fields, str):
+        fields = [name.strip() for name in fields.split(',') if name.strip()]
+    if not isinstance(fields, list) or not all(isinstance(name, str) for name in fields):
+        raise ValueError('Invalid fields: expected a list such as ["verdict", "total"]')
+    unknown = sorted(set(fields) - set(COMPACT_FIELDS))
+    if unknown:
+        raise ValueError(f"Unknown field: {unknown[0]} (choose from {', '.join(COMPACT_FIELDS)})")
+    compact = schema == 2
+    return AnalysisOptions(
+        symmetric=bool(data.get('symmetric', False)),
+        navamsa=bool(data.get('navamsa', False)),
+        vargas=tuple(sorted({vargas.parse_division(division) for division in divisions})),
+        synastry=bool(data.get('synastry', False)),
+        schema=schema,
+        # The selection only shapes compact bodies; full bodies ignore it
+        fields=tuple(name for name in COMPACT_FIELDS if name in fields) if compact else (),
+        explain=bool(data.get('explain', False)) and compact
+    )
+
+def _build_analysis_response(male_chart: Dict[str, PlanetInfo], female_chart: Dict[str, PlanetInfo],
+                             male_asc: float, female_asc: float, lang: str,
+                             options: Optional[AnalysisOptions] = None,
+                             male_points: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+    """Run the compatibility analysis and assemble the /analyze response body.
+    
+    With ``options.symmetric`` the body also has the female-to-male direction
+    under ``reverse`` (in the same shape) and a verdict over both under
+    ``combined``; with ``options.vargas`` it lists the requested divisional
+    charts of both partners under ``vargas``, and with ``options.synastry``
+    the aspects between the two charts under ``synastry``.
+    """
+    options = options or AnalysisOptions()
+    if options.schema == 2:
+        return _build_compact_response(male_chart, female_chart, male_asc, female_asc, lang, options, male_points)
+    analysis_result = CompatibilityAnalyzer.analyze_compatibility(
+        male_chart, female_chart, male_asc, female_asc, lang, options=options, male_points=male_points
+    )
+    
+    # Prepare compatibility data for frontend
+    compatibility_data = _prepare_frontend_data(analysis_result, lang)
+    
+    # Determine verdict
+    verdict_info = _determine_verdict(analysis_result['total_matches'], lang, options.ruleset)
+    
+    response = {
+        'success': True,
+        **analysis_result,
+        'compatibility_data': compatibility_data,
+        **verdict_info
+    }
+    
+    if options.symmetric:
+        reverse = analysis_result['reverse']
+        response['reverse'] = {
+            **reverse,
+            'compatibility_data': _prepare_frontend_data(reverse, lang),
+            **_determine_verdict(reverse['total_matches'], lang, options.ruleset)
+        }
+        response['combined'] = _combined_verdict(analysis_result['total_matches'], reverse['total_matches'], lang,
+                                                 options.ruleset)
+    
+    if options.vargas:
+        response['vargas'] = {
+            partner: {
+                f'D{division}': {
+                    body: CompatibilityAnalyzer._translate_rasi(rasi, lang) for body, rasi in positions.items()
+                }
+                for division, positions in AstrologyCalculator.divisional_charts(chart, options.vargas).items()
+            }
+            for partner, chart in (('male', male_chart), ('female', female_chart))
+        }
+    
+    if options.synastry:
+        male_longitudes = {body: info.longitude for body, info in male_chart.items()}
+        female_longitudes = {body: info.longitude for body, info in female_chart.items()}
+        response['synastry'] = {
+            'aspects': [
+                {'male': male_body, 'female': female_body, 'aspect': aspect, 'orb': round(orb, 2)}
+                for male_body, female_body, aspect, orb in synastry.aspects(male_longitudes, female_longitudes)
+            ],
+            'score': round(float(synastry.score(synastry.longitudes(male_longitudes),
+                                                synastry.longitudes(female_longitudes))), 3)
+        }
+    
+    return response
+
+# =============================================================================
+# COMPACT RESPONSES (SCHEMA 2)
+# =============================================================================
+
+RESPONSE_SCHEMAS = (1, 2)
+
+# Top-level fields of a compact body that ``fields`` can select
+COMPACT_FIELDS = ('verdict', 'total', 'matches', 'nodes', 'points', 'poruthams',
+                  'reverse', 'combined', 'vargas', 'synastry')
+# Fields of each direction, at the top level for male-to-female and under ``reverse``
+DIRECTION_FIELDS = ('verdict', 'total', 'matches', 'nodes', 'points')
+
+# Body codes: lords, occupants and divisional chart rows index this tuple
+COMPACT_BODIES = synastry.BODIES + ('Ascendant',)
+BODY_CODES = {body: code for code, body in enumerate(COMPACT_BODIES)}
+ASPECT_CODES = {aspect.name: code for code, aspect in enumerate(synastry.ASPECTS)}
+
+def _compact_codes(lang: str, ruleset: rules.RulePlan) -> Dict[str, Any]:
+    """Tables that the integer codes of compact bodies index, with the display text in ``lang``"""
+    return {
+        'success': True,
+        'schema': 2,
+        'rules': ruleset.revision,
+        'bodies': list(COMPACT_BODIES),
+        'rasis': [CompatibilityAnalyzer._translate_rasi(rasi, lang) for rasi in ASTRO.RASIS],
+        'nakshatras': [CompatibilityAnalyzer._translate_nakshatra(nakshatra, lang) for nakshatra in ASTRO.NAKSHATRAS],
+        'verdicts': [_verdict_text(verdict_class, lang) for verdict_class in rules.VERDICT_CLASSES],
+        'conditions': [
+            {
+                'id': condition.id,
+                'label': {
+                    partner: CompatibilityAnalyzer._condition_label(condition, partner, lang)
+                    for partner in ('female', 'male')
+                },
+                'weight': condition.weight
+            }
+            for condition in ruleset.conditions
+        ],
+        'poruthams': [{'key': name, 'name': get_text(f'porutham_{name}', lang)} for name in porutham.NAMES],
+        'aspects': [aspect.name for aspect in synastry.ASPECTS]
+    }
+
+def _compact_position(info: PlanetInfo) -> Dict[str, Any]:
+    return {'lon': round(info.longitude, 4), 'rasi': RASI_INDEX[info.rasi],
+            'nakshatra': info.nakshatra_index, 'pada': info.pada}
+
+def _compact_direction(node_chart: Dict[str, PlanetInfo], target_chart: Dict[str, PlanetInfo],
+                       target_points: Dict[str, Any], target_partner: str, wanted: Iterable[str],
+                       lang: str, options: AnalysisOptions) -> Tuple[Dict[str, Any], int]:
+    """The wanted fields of one direction (the nodes of one chart checked against the other chart) and its total"""
+    ruleset = options.ruleset
+    masks, reasoning = {}, {}
+    total = 0
+    for node in ('Rahu', 'Ketu'):
+        lord = node_chart[node].nakshatra_lord
+        matched = ruleset.evaluate(lord, target_points)
+        masks[node.lower()] = ruleset.mask(matched)
+        total += ruleset.total(matched)
+        if options.explain:
+            context = {'node': get_text(f'{node.lower()}_lord', lang), 'lord': lord, 'partner': target_partner}
+            reasoning[node.lower()] = [
+                ruleset.reason(condition, terms, target_points, context, lambda key: get_text(key, lang))
+                for condition, terms in matched
+            ]
+    
+    direction = {
+        'verdict': lambda: rules.VERDICT_CLASSES.index(ruleset.verdict_class(total)),
+        'total': lambda: total,
+        'matches': lambda: masks,
+        'nodes': lambda: {
+            node.lower(): {**_compact_position(node_chart[node]), 'lord': BODY_CODES[node_chart[node].nakshatra_lord]}
+            for node in ('Rahu', 'Ketu')
+        },
+        'points': lambda: {
+            'moon': _compact_position(target_chart['Moon']),
+            'lagna': _compact_position(target_chart['Ascendant']),
+            'lagna_occupants': [BODY_CODES[body] for body in target_points['lagna_occupants']],
+            'moon_rasi_occupants': [BODY_CODES[body] for body in target_points['moon_rasi_occupants']],
+            **{
+                key: RASI_INDEX[target_points[feature]]
+                for key, feature in (('navamsa_moon', 'navamsa_moon_rasi'), ('navamsa_lagna', 'navamsa_lagna_rasi'))
+                if feature in target_points
+            }
+        }
+    }
+    body = {name: direction[name]() for name in DIRECTION_FIELDS if name in wanted}
+    if options.explain:
+        body['explain'] = reasoning
+    return body, total
+
+def _build_compact_response(male_chart: Dict[str, PlanetInfo], female_chart: Dict[str, PlanetInfo],
+                            male_asc: float, female_asc: float, lang: str, options: AnalysisOptions,
+                            male_points: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+    """Schema 2 body: the fields selected by ``options.fields``, with integer codes instead of display text.
+    
+    Rasis, nakshatras, bodies, verdicts, conditions, poruthams and aspects are
+    indexes into the tables of ``GET /analyze/codes``; matched conditions
+    (per node) and agreeing poruthams are bit masks over those tables.
+    Reasoning strings are only built with ``options.explain``, and parts that
+    are not selected are not computed.
+    """
+    wanted = set(options.fields or COMPACT_FIELDS)
+    response = {'success': True, 'schema': 2, 'rules': options.ruleset.revision}
+    
+    female_points = CompatibilityAnalyzer.chart_points(female_chart, female_asc, options.navamsa)
+    forward, forward_total = _compact_direction(male_chart, female_chart, female_points, 'female', wanted, lang, options)
+    response.update(forward)
+    
+    if options.symmetric and wanted & {'reverse', 'combined'}:
+        male_points = male_points or CompatibilityAnalyzer.chart_points(male_chart, male_asc, options.navamsa)
+        # The reverse direction has the fields selected for the forward one, or all when none are
+        reverse, reverse_total = _compact_direction(female_chart, male_chart, male_points, 'male',
+                                                    wanted & set(DIRECTION_FIELDS) or DIRECTION_FIELDS,
+                                                    lang, options)
+        if 'reverse' in wanted:
+            response['reverse'] = reverse
+        if 'combined' in wanted:
+            combined_class = options.ruleset.verdict_class(-(-(forward_total + reverse_total) // 2))
+            response['combined'] = {'verdict': rules.VERDICT_CLASSES.index(combined_class),
+                                    'total': forward_total + reverse_total}
+    
+    if 'poruthams' in wanted:
+        bride, groom = female_chart['Moon'], male_chart['Moon']
+        mask = porutham.match(bride.nakshatra_index, RASI_INDEX[bride.rasi], groom.nakshatra_index, RASI_INDEX[groom.rasi])
+        response['poruthams'] = int(mask)
+        response['porutham_count'] = int(porutham.count(mask))
+    
+    if options.vargas and 'vargas' in wanted:
+        response['vargas'] = {
+            partner: {
+                f'D{division}': [RASI_INDEX[positions[body]] for body in COMPACT_BODIES]
+                for division, positions in AstrologyCalculator.divisional_charts(chart, options.vargas).items()
+            }
+            for partner, chart in (('male', male_chart), ('female', female_chart))
+        }
+    
+    if options.synastry and 'synastry' in wanted:
+        male_longitudes = {body: info.longitude for body, info in male_chart.items()}
+        female_longitudes = {body: info.longitude for body, info in female_chart.items()}
+        response['synastry'] = {
+            'aspects': [
+                [BODY_CODES[male_body], BODY_CODES[female_body], ASPECT_CODES[aspect], round(orb, 2)]
+                for male_body, female_body, aspect, orb in synastry.aspects(male_longitudes, female_longitudes)
+            ],
+            'score': round(float(synastry.score(synastry.longitudes(male_longitudes),
+                                                synastry.longitudes(female_longitudes))), 3)
+        }
+    
+    return response
+
+# Modules besides this file whose code shapes analysis results; the local
+# modules they import, at the top or on first use, are covered with them
+_RESULTS_MODULES = ('engine', 'synastry')
+
+def _local_imports(path: str) -> List[str]:
+    """Paths of the modules next to this file that the source at ``path`` imports anywhere"""
+    with open(path, 'rb') as source:
+        tree = ast.parse(source.read(), path)
+    names = set()
+    for node in ast.walk(tree):
+        if isinstance(node, ast.Import):
+            names.update(alias.name.split('.')[0] for alias in node.names)
+        elif isinstance(node, ast.ImportFrom) and node.module and not node.level:
+            names.add(node.module.split('.')[0])
+    root = os.path.dirname(os.path.abspath(__file__))
+    return [os.path.join(root, f'{name}.py') for name in names if os.path.isfile(os.path.join(root, f'{name}.py'))]
+
+def _results_version() -> str:
+    """Fingerprint of the code behind analysis results, so a deploy that changes it changes every result ETag.
+    
+    Covers this file and every local module ``_RESULTS_MODULES`` import,
+    directly or through each other, so splitting a module cannot drop one.
+    """
+    root = os.path.dirname(os.path.abspath(__file__))
+    pending = [os.path.join(root, f'{name}.py') for name in _RESULTS_MODULES]
+    paths = set()
+    while pending:
+        path = pending.pop()
+        if path not in paths:
+            paths.add(path)
+            pending.extend(_local_imports(path))
+    
+    digest = hashlib.sha1()
+    for path in [os.path.abspath(__file__)] + sorted(paths):
+        with open(path, 'rb') as source:
+            digest.update(source.read())
+    return digest.hexdigest()
+
+_RESULTS_VERSION = _results_version()
+
+def _analysis_etag(key: str) -> str:
+    """Validator of an analysis result, derived from its normalized request without computing it"""
+    return hashlib.sha1(f'{_RESULTS_VERSION}\n{key}'.encode('utf-8')).hexdigest()[:20]
+
+def _analysis_inputs(male_details: Tuple[str, str, float, float, float],
+                     female_details: Tuple[str, str, float, float, float],
+                     engine: Optional[ChartEngine] = None, options: Optional[AnalysisOptions] = None) -> List[Any]:
+    """Normalized inputs of an analysis: everything its result depends on besides the language.
+    
+    Birth moments are reduced to their UT Julian Day and coordinates are
+    rounded, so equivalent spellings of the same input map to the same key.
+    """
+    def normalize(details):
+        dob, tob, lat, lon, tz_offset = details
+        return [round(ChartService.birth_jd(dob, tob, tz_offset), 8), round(lat, 6), round(lon, 6)]
+    
+    engine = engine or ChartEngine.get()
+    options = options or AnalysisOptions()
+    return [normalize(male_details), normalize(female_details),
+            engine.ayanamsa, engine.node_type, engine.ephemeris,
+            options.symmetric, options.navamsa, list(options.vargas), options.synastry,
+            options.ruleset.revision, options.schema, list(options.fields), options.explain]
+
+def _analysis_key(male_details: Tuple[str, str, float, float, float],
+                  female_details: Tuple[str, str, float, float, float], lang: str,
+                  engine: Optional[ChartEngine] = None, options: Optional[AnalysisOptions] = None) -> str:
+    """Normalized cache key of an analysis request"""
+    return json.dumps([lang, *_analysis_inputs(male_details, female_details, engine, options)])
+
+def _result_digest(male_details: Tuple[str, str, float, float, float],
+                   female_details: Tuple[str, str, float, float, float],
+                   engine: Optional[ChartEngine] = None, options: Optional[AnalysisOptions] = None) -> str:
+    """Content address (permalink) of an analysis in every language, from its inputs and the analysis code"""
+    inputs = json.dumps(_analysis_inputs(male_details, female_details, engine, options))
+    return hashlib.sha256(f'{_RESULTS_VERSION}\n{inputs}'.encode('utf-8')).hexdigest()[:32]
+
+def _result_inputs(male_details: Tuple[str, str, float, float, float],
+                   female_details: Tuple[str, str, float, float, float],
+                   engine: ChartEngine, options: AnalysisOptions) -> Dict[str, Any]:
+    """Request fields that reproduce an analysis, stored with its result"""
+    fields = {}
+    for partner, details in (('male', male_details), ('female', female_details)):
+        fields.update(zip((f'{partner}_{suffix}' for suffix in ('dob', 'tob', 'lat', 'lon', 'tz_offset')), details))
+    return {
+        **fields,
+        'ayanamsa': engine.ayanamsa,
+        'node_type': engine.node_type,
+        'symmetric': options.symmetric,
+        'navamsa': options.navamsa,
+        'vargas': [f'D{division}' for division in options.vargas],
+        'synastry': options.synastry,
+        'schema': options.schema,
+        'fields': list(options.fields),
+        'explain': options.explain
+    }
+
+def _stored_analysis(male_details: Tuple[str, str, float, float, float],
+                     female_details: Tuple[str, str, float, float, float], lang: str,
+                     engine: ChartEngine, options: AnalysisOptions) -> Tuple[bytes, str]:
+    """Encoded /analyze body from the result store, computed and stored on a miss.
+    
+    Returns the body and how it was obtained: ``stored``, ``computed`` or
+    ``shared`` (with an identical computation in flight). Raises Overloaded
+    when it has to be computed and cannot be admitted.
+    """
+    digest = _result_digest(male_details, female_details, engine, options)
+    body = _results.get(digest, lang)
+    if body is not None:
+        return body, 'stored'
+    
+    # Identical concurrent submissions share one computation, and only
+    # that computation needs an admission slot. It stores its result before
+    # leaving the flight, so a later submission either joins it or finds the
+    # result stored; the text body keeps it shareable across workers.
+    def compute_and_store() -> str:
+        stored = _results.get(digest, lang)  # stored after this request's first lookup
+        if stored is not None:
+            return stored.decode('utf-8')
+        response = _admitted(lambda: _compute_analysis(male_details, female_details, lang, engine, options))
+        body = app.json.dumps_bytes({**response, 'result_id': digest})
+        _results.put(digest, lang, body, _result_inputs(male_details, female_details, engine, options))
+        return body.decode('utf-8')
+    
+    key = _analysis_key(male_details, female_details, lang, engine, options)
+    text, shared = _analysis_flight.do(key, compute_and_store)
+    return text.encode('utf-8'), 'shared' if shared else 'computed'
+
+def _compute_analysis(male_details: Tuple[str, str, float, float, float],
+                      female_details: Tuple[str, str, float, float, float], lang: str,
+                      engine: Optional[ChartEngine] = None,
+                      options: Optional[AnalysisOptions] = None) -> Dict[str, Any]:
+    """Create both birth charts and build the /analyze response"""
+    male_chart, male_asc = ChartService.create_birth_chart(*male_details, engine=engine)
+    female_chart, female_asc = ChartService.create_birth_chart(*female_details, engine=engine)
+    return _build_analysis_response(male_chart, female_chart, male_asc, female_asc, lang, options)
+
+def _iter_ndjson_request() -> Iterator[Dict[str, Any]]:
+    """Yield the JSON objects of an NDJSON request body one line at a time.
+    
+    Lines that are not valid JSON are yielded as ``None`` so the caller can
+    report them per item instead of aborting the whole batch.
+    """
+    for line in request.stream:
+        line = line.strip()
+        if not line:
+            continue
+        try:
+            yield app.json.loads(line)
+        except json.JSONDecodeError:
+            yield None
+
+def _analyze_candidate(male_chart: Dict[str, PlanetInfo], male_asc: float,
+                       candidate: Any, lang: str,
+                       engine: Optional[ChartEngine] = None,
+                       options: Optional[AnalysisOptions] = None,
+                       male_points: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+    """Analyze one female candidate against an already computed male chart"""
+    try:
+        if not isinstance(candidate, dict):
+            raise ValueError('Invalid candidate: expected a JSON object')
+        female_chart, female_asc = ChartService.create_birth_chart(
+            *_parse_birth_details(candidate, 'female'), engine=engine
+        )
+        return _build_analysis_response(male_chart, female_chart, male_asc, female_asc, lang,
+                                        options, male_points)
+    except Exception as e:
+        return {'success': False, 'error': str(e)}
+
+def _iter_batch_results(male_details: Tuple[str, str, float, float, float],
+                        candidates: Iterable[Dict[str, Any]], lang: str,
+                        engine: Optional[ChartEngine] = None,
+                        options: Optional[AnalysisOptions] = None) -> Iterator[Dict[str, Any]]:
+    """Yield one analysis result per candidate, then a final summary item.
+    
+    The male chart (and, with ``options.symmetric``, its lagna and Moon sign
+    occupants) is computed once and reused for every candidate. Results are
+    produced lazily so that only the candidate currently being analyzed is held
+    in memory. Verdicts are counted over both directions when symmetric.
+    """
+    options = options or AnalysisOptions()
+    started = time.perf_counter()
+    male_chart, male_asc = ChartService.create_birth_chart(*male_details, engine=engine)
+    male_points = (CompatibilityAnalyzer.chart_points(male_chart, male_asc, options.navamsa)
+                   if options.symmetric else None)
+    male_chart_ms = (time.perf_counter() - started) * 1000
+    
+    succeeded = failed = 0
+    verdict_counts = {'high': 0, 'moderate': 0, 'low': 0}
+    slowest_ms = 0.0
+    
+    for index, candidate in enumerate(candidates):
+        item_started = time.perf_counter()
+        result = _analyze_candidate(male_chart, male_asc, candidate, lang, engine, options, male_points)
+        if result['success']:
+            verdict = result.get('combined', result)
+            if 'verdict_class' in verdict:
+                verdict_counts[verdict['verdict_class']] += 1
+            elif 'verdict' in verdict:
+                # Compact bodies carry the verdict code, when selected
+                verdict_counts[rules.VERDICT_CLASSES[verdict['verdict']]] += 1
+            succeeded += 1
+        else:
+            logger.error(f"Error analyzing batch candidate {index}: {result['error']}")
+            failed += 1
+        
+        slowest_ms = max(slowest_ms, (time.perf_counter() - item_started) * 1000)
+        
+        candidate_id = candidate.get('id') if isinstance(candidate, dict) else None
+        yield {'index': index, 'id': candidate_id, **result}
+    
+    total = succeeded + failed
+    elapsed_ms = (time.perf_counter() - started) * 1000
+    logger.info(f"Batch analysis completed: {succeeded}/{total} candidates in {elapsed_ms:.1f} ms")
+    yield {
+        'summary': {
+            'total': total,
+            'succeeded': succeeded,
+            'failed': failed,
+            'verdicts': verdict_counts,
+            'male_chart_ms': round(male_chart_ms, 3),
+            'elapsed_ms': round(elapsed_ms, 3),
+            'avg_candidate_ms': round((elapsed_ms - male_chart_ms) / total, 3) if total else 0.0,
+            'max_candidate_ms': round(slowest_ms, 3)
+        }
+    }
+
 def _prepare_frontend_data(analysis_result: Dict[str, Any], lang: str) -> List[Dict[str, Any]]:
     """Prepare compatibility data for frontend display"""
     compatibility_data = []
@@ -574,26 +2306,337 @@ def _prepare_frontend_data(analysis_result: Dict[str, Any], lang: str) -> List[D
     
     return compatibility_data
 
-def _determine_verdict(total_matches: int, lang: str) -> Dict[str, str]:
-    """Determine compatibility verdict based on matches"""
-    if total_matches >= 3:
-        return {
-            'verdict': get_text('highly_compatible', lang),
-            'verdict_class': 'high',
-            'message': get_text('high_message', lang)
-        }
-    elif total_matches >= 1:
-        return {
-            'verdict': get_text('moderately_compatible', lang),
-            'verdict_class': 'moderate',
-            'message': get_text('moderate_message', lang)
+def _combined_verdict(forward_matches: int, reverse_matches: int, lang: str,
+                      ruleset: Optional[rules.RulePlan] = None) -> Dict[str, Any]:
+    """Verdict over both directions, from the average matches per direction rounded up"""
+    return {
+        'total_matches': forward_matches + reverse_matches,
+        **_determine_verdict(-(-(forward_matches + reverse_matches) // 2), lang, ruleset)
+    }
+
+# Translation keys of the verdict and message of each verdict class
+VERDICT_TEXTS = {
+    'high': ('highly_compatible', 'high_message'),
+    'moderate': ('moderately_compatible', 'moderate_message'),
+    'low': ('low_compatibility', 'low_message')
+}
+
+def _determine_verdict(total_matches: int, lang: str, ruleset: Optional[rules.RulePlan] = None) -> Dict[str, str]:
+    """Determine compatibility verdict from the total matches and the rules' thresholds"""
+    return _verdict_text((ruleset or rule_store().current()).verdict_class(total_matches), lang)
+
+def _verdict_text(verdict_class: str, lang: str) -> Dict[str, str]:
+    verdict_key, message_key = VERDICT_TEXTS[verdict_class]
+    return {
+        'verdict': get_text(verdict_key, lang),
+        'verdict_class': verdict_class,
+        'message': get_text(message_key, lang)
+    }
+
+# =============================================================================
+# BACKGROUND JOBS
+# =============================================================================
+
+_job_runner: Optional[JobRunner] = None
+_job_runner_lock = threading.Lock()
+
+def _get_job_runner(create: bool = True) -> Optional[JobRunner]:
+    """Return the process-wide job runner, creating the job database on demand"""
+    global _job_runner
+    if _job_runner is None:
+        if not create and not os.path.exists(app.config['JOBS_DB_PATH']):
+            return None
+        with _job_runner_lock:
+            if _job_runner is None:
+                store = JobStore(app.config['JOBS_DB_PATH'], dumps=app.json.dumps)
+                _job_runner = JobRunner(store, _run_job_items, workers=app.config['JOBS_WORKERS'])
+    _job_runner.ensure_started()
+    return _job_runner
+
+def _run_job_items(payload: Dict[str, Any], start: int, stop: int) -> List[Dict[str, Any]]:
+    """Analyze the (male, candidate) pairs of a job with flat indexes in [start, stop)"""
+    males = payload['males']
+    candidates = payload['candidates']
+    lang = payload.get('lang', 'en')
+    engine = ChartEngine.get(payload.get('ayanamsa'), payload.get('node_type'))
+    options = _options_from_request(payload)
+    if payload.get('screening'):
+        return _screen_job_items(payload, start, stop, engine, options)
+    
+    male_charts = {}
+    male_points = {}
+    results = []
+    
+    for index in range(start, stop):
+        male_index, candidate_index = divmod(index, len(candidates))
+        if male_index not in male_charts:
+            male_charts[male_index] = ChartService.create_birth_chart(
+                *_parse_birth_details(males[male_index], 'male'), engine=engine
+            )
+            if options.symmetric:
+                male_points[male_index] = CompatibilityAnalyzer.chart_points(*male_charts[male_index], options.navamsa)
+        male_chart, male_asc = male_charts[male_index]
+        candidate = candidates[candidate_index]
+        
+        results.append({
+            'index': index,
+            'male_index': male_index,
+            'male_id': males[male_index].get('id'),
+            'candidate_index': candidate_index,
+            'id': candidate.get('id') if isinstance(candidate, dict) else None,
+            **_analyze_candidate(male_chart, male_asc, candidate, lang, engine,
+                                 options, male_points.get(male_index))
+        })
+    
+    return results
+
+def _screen_job_items(payload: Dict[str, Any], start: int, stop: int,
+                      engine: ChartEngine, options: AnalysisOptions) -> List[Dict[str, Any]]:
+    """Screening variant of ``_run_job_items``: compact verdicts from fast-ephemeris charts.
+    
+    Candidate charts for the whole chunk are computed in one vectorized batch.
+    Verdicts and matches are identical to the exact path; longitudes are not
+    reported because they are approximate. The lagna and Moon sign occupants
+    of every chart are found once and shared by all its pairs, in both
+    directions, and the rules are evaluated for all pairs of the chunk at once.
+    With ``options.synastry`` each pair reports only its ``synastry_score``,
+    computed from the screening longitudes.
+    """
+    males = payload['males']
+    candidates = payload['candidates']
+    lang = payload.get('lang', 'en')
+    pairs = [divmod(index, len(candidates)) for index in range(start, stop)]
+    
+    male_charts = {}
+    male_points = {}
+    for male_index in sorted({male_index for male_index, _ in pairs}):
+        male_charts[male_index] = ChartService.create_birth_chart(
+            *_parse_birth_details(males[male_index], 'male'), engine=engine
+        )
+        if options.symmetric:
+            male_points[male_index] = CompatibilityAnalyzer.chart_points(*male_charts[male_index], options.navamsa)
+    
+    # Parse each distinct candidate once; invalid ones are reported per pair
+    requests_by_candidate: Dict[int, Any] = {}
+    for _, candidate_index in pairs:
+        if candidate_index in requests_by_candidate:
+            continue
+        try:
+            candidate = candidates[candidate_index]
+            if not isinstance(candidate, dict):
+                raise ValueError('Invalid candidate: expected a JSON object')
+            dob, tob, lat, lon, tz_offset = _parse_birth_details(candidate, 'female')
+            requests_by_candidate[candidate_index] = (ChartService.birth_jd(dob, tob, tz_offset), lat, lon)
+        except Exception as e:
+            requests_by_candidate[candidate_index] = e
+    
+    valid = [index for index, item in requests_by_candidate.items() if not isinstance(item, Exception)]
+    charts = dict(zip(valid, AstrologyCalculator.calculate_screening_positions_batch(
+        [requests_by_candidate[index] for index in valid], engine, navamsa=options.navamsa
+    )))
+    female_points = {
+        index: CompatibilityAnalyzer.chart_points(chart[0], chart[1], options.navamsa)
+        for index, chart in charts.items() if not isinstance(chart, Exception)
+    }
+    
+    # Poruthams of every scored pair in the chunk in one table lookup
+    scored = [
+        position for position, (_, candidate_index) in enumerate(pairs)
+        if not isinstance(charts.get(candidate_index, requests_by_candidate[candidate_index]), Exception)
+    ]
+    bride_moons = [charts[pairs[position][1]][0]['Moon'] for position in scored]
+    groom_moons = [male_charts[pairs[position][0]][0]['Moon'] for position in scored]
+    porutham_masks = dict(zip(scored, porutham.match_many(
+        np.array([moon.nakshatra_index for moon in bride_moons], dtype=int),
+        np.array([RASI_INDEX[moon.rasi] for moon in bride_moons], dtype=int),
+        np.array([moon.nakshatra_index for moon in groom_moons], dtype=int),
+        np.array([RASI_INDEX[moon.rasi] for moon in groom_moons], dtype=int)
+    ).tolist()))
+    
+    # Synastry scores of every male of the chunk against every scored candidate in one broadcast
+    synastry_scores = {}
+    if options.synastry:
+        def body_longitudes(chart):
+            return synastry.longitudes({body: info.longitude for body, info in chart.items()})
+        
+        male_rows = {male_index: row for row, male_index in enumerate(male_charts)}
+        candidate_rows = {index: row for row, index in enumerate(dict.fromkeys(pairs[position][1] for position in scored))}
+        width = len(synastry.BODIES)
+        scores = synastry.score(
+            np.array([body_longitudes(male_charts[index][0]) for index in male_rows]).reshape(-1, 1, width),
+            np.array([body_longitudes(charts[index][0]) for index in candidate_rows]).reshape(1, -1, width)
+        )
+        synastry_scores = {
+            position: round(float(scores[male_rows[pairs[position][0]], candidate_rows[pairs[position][1]]]), 3)
+            for position in scored
         }
-    else:
+    
+    # Rule matches of every scored pair, per direction and node, in one vectorized evaluation each
+    ruleset = options.ruleset
+    directions = [('female', 'male', male_charts, female_points, 1)]
+    if options.symmetric:
+        female_charts = {index: chart[:2] for index, chart in charts.items() if not isinstance(chart, Exception)}
+        directions.append(('male', 'female', female_charts, male_points, 0))
+    rule_masks = {}
+    for target, node_partner, node_charts, target_points, target_side in directions:
+        owners = [pairs[position][target_side] for position in scored]
+        node_owners = [pairs[position][1 - target_side] for position in scored]
+        order = {owner: row for row, owner in enumerate(dict.fromkeys(owners))}
+        encoded = rules.RulePlan.encode([target_points[owner] for owner in order])
+        rows = np.array([order[owner] for owner in owners], dtype=int)
+        features = {name: values[rows] for name, values in encoded.items()}
+        for node in ('Rahu', 'Ketu'):
+            lords = np.array([rules.GRAHA_INDEX[node_charts[owner][0][node].nakshatra_lord] for owner in node_owners],
+                             dtype=int)
+            rule_masks[target, node] = dict(zip(scored, ruleset.match_many(lords, features).tolist()))
+    labels = {
+        partner: [CompatibilityAnalyzer._condition_label(condition, partner, lang) for condition in ruleset.conditions]
+        for partner in ('female', 'male')
+    }
+    
+    def direction_outcome(target: str, position: int) -> Dict[str, Any]:
+        rahu_mask, ketu_mask = rule_masks[target, 'Rahu'][position], rule_masks[target, 'Ketu'][position]
+        total = int(ruleset.totals(np.array([rahu_mask, ketu_mask])).sum())
         return {
-            'verdict': get_text('low_compatibility', lang),
-            'verdict_class': 'low',
-            'message': get_text('low_message', lang)
+            'total_matches': total,
+            'primary_match_type': 'Rahu' if rahu_mask else 'Ketu' if ketu_mask else 'None',
+            'rahu_matches': [labels[target][bit] for bit in range(len(ruleset.conditions)) if rahu_mask >> bit & 1],
+            'ketu_matches': [labels[target][bit] for bit in range(len(ruleset.conditions)) if ketu_mask >> bit & 1],
+            'verdict_class': _determine_verdict(total, lang, ruleset)['verdict_class']
         }
+    
+    results = []
+    for position, (male_index, candidate_index) in enumerate(pairs):
+        index = start + position
+        candidate = candidates[candidate_index]
+        chart = charts.get(candidate_index, requests_by_candidate[candidate_index])
+        if isinstance(chart, Exception):
+            outcome = {'success': False, 'error': str(chart)}
+        else:
+            outcome = {
+                'success': True,
+                **direction_outcome('female', position),
+                'poruthams': porutham.matched(porutham_masks[position]),
+                'porutham_count': int(porutham.count(porutham_masks[position]))
+            }
+            if options.synastry:
+                outcome['synastry_score'] = synastry_scores[position]
+            if options.symmetric:
+                outcome['reverse'] = direction_outcome('male', position)
+                combined = _combined_verdict(outcome['total_matches'], outcome['reverse']['total_matches'], lang,
+                                             ruleset)
+                outcome['combined'] = {key: combined[key] for key in ('total_matches', 'verdict_class')}
+        
+        results.append({
+            'index': index,
+            'male_index': male_index,
+            'male_id': males[male_index].get('id'),
+            'candidate_index': candidate_index,
+            'id': candidate.get('id') if isinstance(candidate, dict) else None,
+            **outcome
+        })
+    
+    return results
+
+@app.before_request
+def _resume_background_jobs():
+    """Restart job workers in this process so queued or orphaned jobs resume"""
+    _get_job_runner(create=False)
+
+@app.route('/jobs', methods=['POST'])
+def submit_job():
+    """Queue a matchmaking run of male profile(s) x candidates for background processing"""
+    data = request.get_json(silent=True)
+    if not data:
+        return jsonify({'success': False, 'error': 'No data provided'}), 400
+    
+    males = data.get('males', [data])
+    candidates = data.get('candidates')
+    if not isinstance(males, list) or not males:
+        return jsonify({'success': False, 'error': 'Missing field: males'}), 400
+    if not isinstance(candidates, list) or not candidates:
+        return jsonify({'success': False, 'error': 'Missing field: candidates'}), 400
+    
+    try:
+        for male in males:
+            if not isinstance(male, dict):
+                raise ValueError('Invalid male profile: expected a JSON object')
+            _parse_birth_details(male, 'male')
+        engine = _engine_from_request(data)
+        options = _options_from_request(data)
+    except ValueError as e:
+        return jsonify({'success': False, 'error': str(e)}), 400
+    
+    total = len(males) * len(candidates)
+    if total > app.config['JOBS_MAX_ITEMS']:
+        return jsonify({'success': False, 'error': f"Job too large: {total} pairs (limit {app.config['JOBS_MAX_ITEMS']})"}), 400
+    
+    payload = {
+        'males': [{key: value for key, value in male.items() if key != 'candidates'} for male in males],
+        'candidates': candidates,
+        'lang': _request_language(),
+        'ayanamsa': engine.ayanamsa,
+        'node_type': engine.node_type,
+        'screening': bool(data.get('screening', False)),
+        'symmetric': options.symmetric,
+        'navamsa': options.navamsa,
+        'vargas': list(options.vargas),
+        'synastry': options.synastry,
+        'schema': options.schema,
+        'fields': list(options.fields),
+        'explain': options.explain
+    }
+    
+    runner = _get_job_runner()
+    job_id = runner.store.submit(payload, total)
+    runner.notify()
+    
+    logger.info(f"Job {job_id} queued with {total} pairs")
+    return jsonify({
+        'success': True,
+        'job_id': job_id,
+        'status': 'queued',
+        'total': total,
+        'status_url': f'/jobs/{job_id}',
+        'results_url': f'/jobs/{job_id}/results'
+    }), 202
+
+@app.route('/jobs/<job_id>', methods=['GET'])
+def job_status(job_id):
+    """Report job progress, throughput and ETA"""
+    job = _get_job_runner().store.get(job_id)
+    if job is None:
+        return jsonify({'success': False, 'error': 'Job not found'}), 404
+    return jsonify({'success': True, **describe_progress(job)})
+
+@app.route('/jobs/<job_id>', methods=['DELETE'])
+def cancel_job(job_id):
+    """Cancel a queued or running job"""
+    status = _get_job_runner().store.cancel(job_id)
+    if status is None:
+        return jsonify({'success': False, 'error': 'Job not found'}), 404
+    return jsonify({'success': True, 'job_id': job_id, 'status': 'cancelling' if status == 'running' else status})
+
+@app.route('/jobs/<job_id>/results', methods=['GET'])
+def job_results(job_id):
+    """Download job results; pass ?partial=1 to read results of an unfinished job"""
+    store = _get_job_runner().store
+    job = store.get(job_id)
+    if job is None:
+        return jsonify({'success': False, 'error': 'Job not found'}), 404
+    if job['status'] != 'completed' and request.args.get('partial') != '1':
+        return jsonify({'success': False, 'error': f"Job is {job['status']}", **describe_progress(job)}), 409
+    
+    if request.accept_mimetypes.best_match(['application/json', NDJSON_MIMETYPE]) == NDJSON_MIMETYPE:
+        return Response(
+            stream_with_context(line + '\n' for line in store.iter_results(job_id, raw=True)),
+            mimetype=NDJSON_MIMETYPE
+        )
+    
+    # Results are stored encoded, so they are spliced into the body as they are
+    head = app.json.dumps_bytes({'success': True, **describe_progress(job)})
+    results = ','.join(store.iter_results(job_id, raw=True)).encode('utf-8')
+    return app.json.raw_response(head[:-1] + b',"results":[' + results + b']}\n')
 
 # =============================================================================
 # ERROR HANDLERS
@@ -619,4 +2662,5 @@ if __name__ == '__main__':
     debug = app.config.get('DEBUG', False)
     
     logger.info(f"Starting application on port {port} with debug={debug}")
+    start_warmup()
     app.run(host='0.0.0.0', port=port, debug=debug)
\ No newline at end of file
@@ -0,0 +1,205 @@
+"""
+Static asset pipeline: minified, fingerprinted and precompressed files.
+
+``build`` minifies every stylesheet and script under the static folder and
+writes it to an output folder as ``<name>.<hash>.<ext>``, next to ``.gz`` and
+(with the optional ``brotli`` package) ``.br`` copies, plus ``manifest.json``
+mapping each source path to its fingerprinted path. The hash covers the
+minified content, so a fingerprinted URL never changes meaning and can be
+cached forever; an edited file gets a new URL. Building is idempotent and
+only writes files that do not exist yet, so it runs at deploy time
+(``python assets.py``) and again at every startup to pick up changed sources.
+
+The minifiers only remove comments and whitespace. They track strings,
+template literals and regular expressions, keep line breaks in scripts
+(automatic semicolon insertion depends on them) and never touch the content
+of a string.
+"""
+
+import hashlib
+import json
+import os
+import re
+import sys
+import tempfile
+from typing import Dict, List
+
+import pages
+
+MINIFIERS = {}
+
+def _minifier(extension: str):
+    def register(function):
+        MINIFIERS[extension] = function
+        return function
+    return register
+
+_CSS_TOKENS = re.compile(r'("(?:\\.|[^"\\])*"|\'(?:\\.|[^\'\\])*\')|(/\*.*?\*/)', re.S)
+
+@_minifier('.css')
+def minify_css(text: str) -> str:
+    """Stylesheet without comments and redundant whitespace"""
+    parts = []
+    code = []  # code since the last string
+    position = 0
+    for match in _CSS_TOKENS.finditer(text):
+        code.append(text[position:match.start()])
+        if match.group(1):
+            parts.extend((_squeeze_css(''.join(code)), match.group(1)))
+            code = []
+        else:
+            code.append(' ')
+        position = match.end()
+    code.append(text[position:])
+    parts.append(_squeeze_css(''.join(code)))
+    return ''.join(parts).strip() + '\n'
+
+def _squeeze_css(code: str) -> str:
+    code = re.sub(r'\s+', ' ', code)
+    # Whitespace around these never matters; around ":" it can (descendant selectors)
+    code = re.sub(r' ?([{};,>]) ?', r'\1', code)
+    return code.replace(';}', '}')
+
+# Characters and keywords after which a "/" starts a regular expression rather than a division
+_REGEX_PRECEDERS = set('(,=:[!&|?{};+-*%<>~^')
+_REGEX_KEYWORDS = re.compile(r'(?:^|[^\w$.])(?:return|typeof|case|do|else|in|of|void|yield|await|delete|throw|new)\s*$')
+
+@_minifier('.js')
+def minify_js(text: str) -> str:
+    """Script without comments, indentation and blank lines"""
+    parts: List[str] = []
+    code: List[str] = []  # code characters since the last literal
+    # Brace depth at which each open template literal substitution (``${ ... }``) ends
+    substitutions: List[int] = []
+    depth = 0
+    previous = ''  # last character that was not whitespace or a comment
+    index = 0
+    length = len(text)
+
+    def literal(end: int) -> int:
+        nonlocal previous
+        parts.append(_strip_code(''.join(code)))
+        code.clear()
+        parts.append(text[index:end])
+        previous = text[end - 1]
+        return end
+
+    def quoted_end(start: int, quote: str) -> int:
+        position = start + 1
+        while position < length and text[position] != quote:
+            position += 2 if text[position] == '\\' else 1
+        return position + 1
+
+    def template_end(start: int) -> int:
+        """End of template text: after the closing backtick or the start of a substitution"""
+        position = start
+        while position < length:
+            if text[position] == '\\':
+                position += 2
+            elif text[position] == '`':
+                return position + 1
+            elif text.startswith('${', position):
+                substitutions.append(depth)
+                return position + 2
+            else:
+                position += 1
+        return position
+
+    def regex_end(start: int) -> int:
+        position = start + 1
+        in_class = False
+        while position < length and (in_class or text[position] != '/'):
+            if text[position] == '\\':
+                position += 1
+            elif text[position] == '[':
+                in_class = True
+            elif text[position] == ']':
+                in_class = False
+            position += 1
+        return position + 1
+
+    while index < length:
+        char = text[index]
+        if char in '"\'':
+            index = literal(quoted_end(index, char))
+        elif char == '`':
+            index = literal(template_end(index + 1))
+        elif char == '}' and substitutions and substitutions[-1] == depth:
+            substitutions.pop()
+            index = literal(template_end(index + 1))
+        elif text.startswith('//', index):
+            newline = text.find('\n', index)
+            index = length if newline < 0 else newline
+        elif text.startswith('/*', index):
+            end = text.find('*/', index + 2)
+            index = length if end < 0 else end + 2
+            code.append(' ')
+        elif char == '/' and (not previous or previous in _REGEX_PRECEDERS
+                              or _REGEX_KEYWORDS.search(text, max(index - 12, 0), index)):
+            index = literal(regex_end(index))
+        else:
+            if char == '{':
+                depth += 1
+            elif char == '}':
+                depth -= 1
+            if not char.isspace():
+                previous = char
+            code.append(char)
+            index += 1
+    parts.append(_strip_code(''.join(code)))
+    return ''.join(parts).strip() + '\n'
+
+def _strip_code(code: str) -> str:
+    """Code without indentation, trailing whitespace, blank lines and runs of spaces"""
+    code = re.sub(r'[ \t]*\n[ \t\n]*', '\n', code)
+    return re.sub(r'[ \t]+', ' ', code)
+
+# File name suffix of each precompressed copy
+SUFFIXES = {'gzip': 'gz', 'br': 'br'}
+
+def write_atomic(path: str, data: bytes) -> None:
+    """Write a file atomically, so concurrent builds never expose a partial file"""
+    descriptor, temporary = tempfile.mkstemp(dir=os.path.dirname(path))
+    with os.fdopen(descriptor, 'wb') as handle:
+        handle.write(data)
+    # mkstemp creates owner-only files; a front proxy running as another user must read them
+    os.chmod(temporary, 0o644)
+    os.replace(temporary, path)
+
+def sources(static_dir: str, out_dir: str) -> List[str]:
+    """Paths, relative to ``static_dir``, of the files the pipeline processes"""
+    found = []
+    out_dir = os.path.abspath(out_dir)
+    for root, dirs, files in os.walk(static_dir):
+        dirs[:] = sorted(name for name in dirs if os.path.abspath(os.path.join(root, name)) != out_dir)
+        found.extend(
+            os.path.relpath(os.path.join(root, name), static_dir).replace(os.sep, '/')
+            for name in sorted(files) if os.path.splitext(name)[1] in MINIFIERS
+        )
+    return found
+
+def build(static_dir: str, out_dir: str) -> Dict[str, str]:
+    """Minify, fingerprint and precompress the assets under ``static_dir``; return the manifest"""
+    manifest = {}
+    for relative in sources(static_dir, out_dir):
+        stem, extension = os.path.splitext(relative)
+        with open(os.path.join(static_dir, relative), encoding='utf-8') as handle:
+            body = MINIFIERS[extension](handle.read()).encode('utf-8')
+        digest = hashlib.sha256(body).hexdigest()[:12]
+        fingerprinted = f'{stem}.{digest}{extension}'
+        target = os.path.join(out_dir, *fingerprinted.split('/'))
+        if not os.path.exists(target):
+            os.makedirs(os.path.dirname(target), exist_ok=True)
+            for encoding, data in pages.compress(body).items():
+                if encoding != pages.IDENTITY:
+                    write_atomic(f'{target}.{SUFFIXES[encoding]}', data)
+            write_atomic(target, body)
+        manifest[relative] = fingerprinted
+    os.makedirs(out_dir, exist_ok=True)
+    write_atomic(os.path.join(out_dir, 'manifest.json'), json.dumps(manifest, indent=2, sort_keys=True).encode('utf-8'))
+    return manifest
+
+if __name__ == '__main__':
+    static = sys.argv[1] if len(sys.argv) > 1 else os.path.join(os.path.dirname(os.path.abspath(__file__)), 'static')
+    for source, target in build(static, os.path.join(static, 'dist')).items():
+        print(f'{source} -> {target}')
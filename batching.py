@@ -0,0 +1,147 @@
+"""
+Micro-batching scheduler.
+
+Collects work items submitted concurrently by request threads during a short
+window and evaluates them with a single call to a batch function, handing each
+result back to the thread that submitted it.
+"""
+
+import logging
+import os
+import threading
+import time
+from collections import deque
+from concurrent.futures import Future
+from typing import Any, Callable, Deque, Dict, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+# Batch function signature: list of items -> list of results in the same order
+BatchFunction = Callable[[List[Any]], List[Any]]
+
+# Upper bounds of the batch size histogram buckets
+_BATCH_SIZE_BUCKETS = (1, 2, 4, 8, 16, 32, 64)
+
+class MicroBatcher:
+    """Groups items arriving within ``window_ms`` into one batch function call.
+
+    The dispatcher thread is started lazily and restarted after a fork, so an
+    instance can be created at import time under ``gunicorn --preload``.
+    """
+
+    def __init__(self, batch_fn: BatchFunction, window_ms: float = 2.0,
+                 max_batch: int = 64, name: str = 'batcher', latency_samples: int = 2048):
+        self.batch_fn = batch_fn
+        self.window = window_ms / 1000.0
+        self.max_batch = max_batch
+        self.name = name
+        self._pending: Deque[Tuple[Any, Future, float]] = deque()
+        self._condition = threading.Condition()
+        self._pid = None
+
+        # Metrics
+        self._started_at = time.time()
+        self._batches = 0
+        self._items = 0
+        self._errors = 0
+        self._compute_seconds = 0.0
+        self._size_histogram = [0] * (len(_BATCH_SIZE_BUCKETS) + 1)
+        self._latencies: Deque[float] = deque(maxlen=latency_samples)
+
+    def submit(self, item: Any, timeout: Optional[float] = None) -> Any:
+        """Queue an item and block until its result is available"""
+        self._ensure_started()
+        future: Future = Future()
+        submitted = time.perf_counter()
+
+        with self._condition:
+            self._pending.append((item, future, submitted))
+            self._condition.notify()
+
+        try:
+            return future.result(timeout)
+        finally:
+            self._latencies.append((time.perf_counter() - submitted) * 1000)
+
+    def _ensure_started(self) -> None:
+        if self._pid == os.getpid():
+            return
+        with self._condition:
+            if self._pid == os.getpid():
+                return
+            self._pid = os.getpid()
+            self._pending.clear()
+            thread = threading.Thread(target=self._dispatch_loop, name=f'{self.name}-dispatcher', daemon=True)
+            thread.start()
+            logger.info(f"Micro-batcher '{self.name}' started (window {self.window * 1000:.1f} ms, max batch {self.max_batch})")
+
+    def _dispatch_loop(self) -> None:
+        while True:
+            with self._condition:
+                while not self._pending:
+                    self._condition.wait()
+
+                # Hold the batch open until the window that started with the
+                # oldest item closes or the batch is full.
+                deadline = self._pending[0][2] + self.window
+                while len(self._pending) < self.max_batch:
+                    remaining = deadline - time.perf_counter()
+                    if remaining <= 0:
+                        break
+                    self._condition.wait(remaining)
+
+                batch = [self._pending.popleft() for _ in range(min(self.max_batch, len(self._pending)))]
+
+            self._run_batch(batch)
+
+    def _run_batch(self, batch: List[Tuple[Any, Future, float]]) -> None:
+        started = time.perf_counter()
+        try:
+            results = self.batch_fn([item for item, _, _ in batch])
+            for (_, future, _), result in zip(batch, results):
+                if isinstance(result, BaseException):
+                    future.set_exception(result)
+                else:
+                    future.set_result(result)
+        except Exception as e:
+            self._errors += 1
+            logger.error(f"Micro-batcher '{self.name}' batch failed: {e}")
+            for _, future, _ in batch:
+                if not future.done():
+                    future.set_exception(e)
+
+        self._compute_seconds += time.perf_counter() - started
+        self._batches += 1
+        self._items += len(batch)
+        bucket = next((i for i, bound in enumerate(_BATCH_SIZE_BUCKETS) if len(batch) <= bound),
+                      len(_BATCH_SIZE_BUCKETS))
+        self._size_histogram[bucket] += 1
+
+    def metrics(self) -> Dict[str, Any]:
+        """Batch-size and latency statistics since startup"""
+        latencies = sorted(self._latencies)
+
+        def percentile(fraction: float) -> Optional[float]:
+            if not latencies:
+                return None
+            return round(latencies[min(len(latencies) - 1, int(fraction * len(latencies)))], 3)
+
+        labels = [f'<={bound}' for bound in _BATCH_SIZE_BUCKETS] + [f'>{_BATCH_SIZE_BUCKETS[-1]}']
+        return {
+            'enabled': True,
+            'window_ms': self.window * 1000,
+            'max_batch': self.max_batch,
+            'batches': self._batches,
+            'items': self._items,
+            'errors': self._errors,
+            'mean_batch_size': round(self._items / self._batches, 3) if self._batches else None,
+            'batch_size_histogram': dict(zip(labels, self._size_histogram)),
+            'compute_ms_per_item': round(self._compute_seconds * 1000 / self._items, 4) if self._items else None,
+            'items_per_sec': round(self._items / max(time.time() - self._started_at, 1e-9), 2),
+            'latency_ms': {
+                'p50': percentile(0.50),
+                'p95': percentile(0.95),
+                'p99': percentile(0.99),
+                'samples': len(latencies)
+            }
+        }
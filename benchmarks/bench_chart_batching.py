@@ -0,0 +1,85 @@
+#!/usr/bin/env python3
+"""
+Benchmark: direct chart computation vs the micro-batching scheduler.
+
+Runs the same workload from a pool of request threads, once computing every
+chart directly and once through MicroBatcher with a few window sizes, and
+reports throughput, p50/p99 latency and the mean batch size.
+
+Usage: python benchmarks/bench_chart_batching.py [threads] [charts_per_thread] [distinct_charts]
+"""
+
+import os
+import random
+import sys
+import threading
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import logging
+logging.disable(logging.INFO)
+
+from engine import AstrologyCalculator  # noqa: E402
+from batching import MicroBatcher  # noqa: E402
+
+def make_workload(count, distinct):
+    """Chart requests drawn from a pool of distinct birth moments and places"""
+    rng = random.Random(42)
+    pool = [
+        (2440000.5 + rng.uniform(0, 20000), rng.uniform(8, 30), rng.uniform(70, 90))
+        for _ in range(distinct)
+    ]
+    return [rng.choice(pool) for _ in range(count)]
+
+def run(compute, workload, threads):
+    latencies = []
+    lock = threading.Lock()
+    chunks = [workload[i::threads] for i in range(threads)]
+
+    def worker(chunk):
+        local = []
+        for request in chunk:
+            started = time.perf_counter()
+            compute(request)
+            local.append((time.perf_counter() - started) * 1000)
+        with lock:
+            latencies.extend(local)
+
+    started = time.perf_counter()
+    pool = [threading.Thread(target=worker, args=(chunk,)) for chunk in chunks]
+    for thread in pool:
+        thread.start()
+    for thread in pool:
+        thread.join()
+    elapsed = time.perf_counter() - started
+
+    latencies.sort()
+    return {
+        'charts_per_sec': len(workload) / elapsed,
+        'p50_ms': latencies[len(latencies) // 2],
+        'p99_ms': latencies[int(len(latencies) * 0.99)]
+    }
+
+def main():
+    threads = int(sys.argv[1]) if len(sys.argv) > 1 else 16
+    per_thread = int(sys.argv[2]) if len(sys.argv) > 2 else 200
+    distinct = int(sys.argv[3]) if len(sys.argv) > 3 else threads * per_thread // 4
+    workload = make_workload(threads * per_thread, distinct=distinct)
+
+    print(f"Workload: {len(workload)} charts ({distinct} distinct) from {threads} threads")
+    print(f"{'mode':<18}{'charts/s':>12}{'p50 ms':>10}{'p99 ms':>10}{'mean batch':>12}")
+
+    direct = run(lambda r: AstrologyCalculator.calculate_planetary_positions(*r), workload, threads)
+    print(f"{'direct':<18}{direct['charts_per_sec']:>12.0f}{direct['p50_ms']:>10.3f}{direct['p99_ms']:>10.3f}{'-':>12}")
+
+    for window_ms in (0.5, 2.0, 5.0):
+        batcher = MicroBatcher(AstrologyCalculator.calculate_planetary_positions_batch,
+                               window_ms=window_ms, max_batch=64, name='bench')
+        stats = run(batcher.submit, workload, threads)
+        mean_batch = batcher.metrics()['mean_batch_size']
+        print(f"{f'batched {window_ms} ms':<18}{stats['charts_per_sec']:>12.0f}{stats['p50_ms']:>10.3f}"
+              f"{stats['p99_ms']:>10.3f}{mean_batch:>12.2f}")
+
+if __name__ == "__main__":
+    main()
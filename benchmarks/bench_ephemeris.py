@@ -0,0 +1,75 @@
+#!/usr/bin/env python3
+"""
+Benchmark: chart cost in each ephemeris mode.
+
+Computes the same random birth charts one at a time and as one batch in every
+mode available here (``moshier``, ``swiss`` when its files are in
+``EPHE_PATH``, and ``compact``), reports microseconds per chart, and checks
+that every body lands in the same rasi, nakshatra, pada and direction as with
+the compact tables' source. Compact tables are taken from ``EPHE_DATA_DIR``
+(default ``instance/ephemeris``) and built there first if they are missing.
+
+Usage: python benchmarks/bench_ephemeris.py [charts]
+"""
+
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import logging
+logging.disable(logging.INFO)
+
+import ephemeris  # noqa: E402
+from engine import SETTINGS, AstrologyCalculator, ChartEngine  # noqa: E402
+
+def make_workload(count):
+    """Birth moments within the supported years at Indian latitudes and longitudes"""
+    rng = random.Random(42)
+    start_jd, end_jd = ephemeris.supported_jd()
+    return [(rng.uniform(start_jd, end_jd), rng.uniform(8, 30), rng.uniform(70, 90)) for _ in range(count)]
+
+def per_chart_us(compute, count):
+    started = time.perf_counter()
+    result = compute()
+    return result, (time.perf_counter() - started) / count * 1e6
+
+def placements(chart):
+    return {name: (info.rasi, info.nakshatra, info.pada, info.retrograde) for name, info in chart.items()}
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 5000
+    workload = make_workload(count)
+    ephe_path = SETTINGS['ephe_path']
+    modes = ['moshier'] + ([] if ephemeris.missing_files(ephe_path) else ['swiss']) + ['compact']
+
+    print(f"Workload: {count} charts, {ephemeris.SUPPORTED_YEARS[0]}-{ephemeris.SUPPORTED_YEARS[1]}")
+    print(f"{'mode':<10}{'source':<10}{'single':>12}{'batch':>12}  placement mismatches")
+    charts = {}
+    for mode in modes:
+        engine = ChartEngine.get(ephe_path=ephe_path, ephemeris=mode)
+        report = engine.check()
+        if mode == 'compact':
+            print(f"Compact tables: {report['tables']['bytes'] / 1e6:.1f} MB from {engine.source}, "
+                  f"recorded max error {report['tables']['max_error_deg']:.1e} deg")
+
+        calculate = AstrologyCalculator.calculate_planetary_positions
+        single, single_us = per_chart_us(lambda: [calculate(jd, lat, lon, engine) for jd, lat, lon in workload], count)
+        batch, batch_us = per_chart_us(
+            lambda: AstrologyCalculator.calculate_planetary_positions_batch(workload, engine), count
+        )
+        charts[mode] = [placements(chart) for chart, _, _ in single]
+
+        reference = charts.get(engine.source)
+        mismatches = '-'
+        if mode == 'compact' and reference is not None:
+            mismatches = sum(
+                1 for computed, expected in zip(charts[mode], reference)
+                for name in expected if computed[name] != expected[name]
+            ) + sum(1 for (chart, _, _), computed in zip(batch, charts[mode]) if placements(chart) != computed)
+        print(f"{mode:<10}{engine.source:<10}{single_us:>10.0f}us{batch_us:>10.0f}us  {mismatches}")
+
+if __name__ == "__main__":
+    main()
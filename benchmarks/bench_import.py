@@ -0,0 +1,133 @@
+#!/usr/bin/env python3
+"""
+Benchmark: cold start of the engine, the app and gunicorn workers.
+
+Measures, each in fresh processes:
+
+- the import time of ``engine`` and of ``app``, and the time from a bare
+  interpreter to a first chart and a first analysis with the engine alone;
+- under gunicorn (one sync worker), with and without ``--preload``: the time
+  until the server answers, the first /analyze, and the time until a killed
+  worker has been replaced and answers again.
+
+Usage: python benchmarks/bench_import.py [runs]
+"""
+
+import json
+import os
+import signal
+import socket
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+import urllib.request
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+ANALYSIS = {
+    'male_dob': '1990-05-15', 'male_tob': '10:30', 'male_lat': 13.08, 'male_lon': 80.27,
+    'female_dob': '1992-08-20', 'female_tob': '14:45', 'female_lat': 12.97, 'female_lon': 77.59
+}
+
+IMPORT = "import time; started = time.perf_counter(); import {module}; print((time.perf_counter() - started) * 1000)"
+
+FIRST_ANALYSIS = """
+import time
+started = time.perf_counter()
+from engine import AnalysisOptions, ChartService, CompatibilityAnalyzer
+imported = time.perf_counter()
+male, male_asc = ChartService.create_birth_chart('1990-05-15', '10:30', 13.08, 80.27)
+charted = time.perf_counter()
+female, female_asc = ChartService.create_birth_chart('1992-08-20', '14:45', 12.97, 77.59)
+CompatibilityAnalyzer.analyze_compatibility(male, female, male_asc, female_asc, options=AnalysisOptions())
+analyzed = time.perf_counter()
+print((imported - started) * 1000, (charted - started) * 1000, (analyzed - started) * 1000)
+"""
+
+def python(code):
+    """Run ``code`` in a fresh interpreter and return its printed numbers"""
+    output = subprocess.run([sys.executable, '-c', code], cwd=ROOT, capture_output=True, text=True, check=True)
+    return [float(value) for value in output.stdout.split()]
+
+def median_of(runs, code):
+    samples = [python(code) for _ in range(runs)]
+    return [statistics.median(column) for column in zip(*samples)]
+
+def free_port():
+    with socket.socket() as sock:
+        sock.bind(('127.0.0.1', 0))
+        return sock.getsockname()[1]
+
+def wait_until_up(url, timeout=30.0):
+    """Seconds until ``url`` answers"""
+    started = time.perf_counter()
+    while time.perf_counter() - started < timeout:
+        try:
+            with urllib.request.urlopen(url, timeout=1):
+                return time.perf_counter() - started
+        except OSError:
+            time.sleep(0.005)
+    raise RuntimeError(f'{url} did not answer within {timeout} s')
+
+def analyze_ms(base, tob):
+    request = urllib.request.Request(f'{base}/analyze', data=json.dumps({**ANALYSIS, 'male_tob': tob}).encode(),
+                                     headers={'Content-Type': 'application/json'})
+    started = time.perf_counter()
+    with urllib.request.urlopen(request, timeout=30) as response:
+        response.read()
+    return (time.perf_counter() - started) * 1000
+
+def gunicorn_run(preload, instance):
+    port = free_port()
+    base = f'http://127.0.0.1:{port}'
+    # Without gunicorn.conf.py, which preloads the app and starts the warm-up
+    command = [sys.executable, '-m', 'gunicorn', '--config', os.devnull, '--workers', '1',
+               '--bind', f'127.0.0.1:{port}', 'app:app']
+    if preload:
+        command.insert(3, '--preload')
+    # A fresh result store, so every /analyze is computed
+    env = {**os.environ, 'RESULTS_DB_PATH': os.path.join(instance, f'results-{port}.sqlite3')}
+    server = subprocess.Popen(command, cwd=ROOT, env=env, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    try:
+        up_ms = wait_until_up(f'{base}/health') * 1000
+        first_ms = analyze_ms(base, '10:31')
+        warm_ms = min(analyze_ms(base, f'10:{minute}') for minute in range(32, 37))
+
+        worker = int(subprocess.run(['pgrep', '-P', str(server.pid)], capture_output=True, text=True).stdout.split()[0])
+        os.kill(worker, signal.SIGKILL)
+        respawn_ms = wait_until_up(f'{base}/health') * 1000
+        respawn_first_ms = analyze_ms(base, '10:37')
+    finally:
+        server.terminate()
+        server.wait()
+    return [up_ms, first_ms, warm_ms, respawn_ms, respawn_first_ms]
+
+def main():
+    runs = int(sys.argv[1]) if len(sys.argv) > 1 else 5
+
+    print(f"Fresh interpreters, median of {runs} runs")
+    print(f"{'import engine':<32}{median_of(runs, IMPORT.format(module='engine'))[0]:>10.1f} ms")
+    print(f"{'import app':<32}{median_of(runs, IMPORT.format(module='app'))[0]:>10.1f} ms")
+    _, charted, analyzed = median_of(runs, FIRST_ANALYSIS)
+    print(f"{'engine: first chart':<32}{charted:>10.1f} ms")
+    print(f"{'engine: first analysis':<32}{analyzed:>10.1f} ms")
+
+    try:
+        import gunicorn  # noqa: F401
+    except ImportError:
+        print("gunicorn is not installed; skipping the worker benchmark")
+        return
+
+    print(f"\ngunicorn, 1 sync worker, median of {runs} runs (ms)")
+    print(f"{'mode':<12}{'up':>10}{'first':>10}{'warm':>10}{'respawn':>10}{'first after':>13}")
+    with tempfile.TemporaryDirectory() as instance:
+        for preload in (False, True):
+            samples = [gunicorn_run(preload, instance) for _ in range(runs)]
+            columns = [statistics.median(column) for column in zip(*samples)]
+            print(f"{'--preload' if preload else 'default':<12}" + ''.join(f'{value:>10.1f}' for value in columns[:4])
+                  + f'{columns[4]:>13.1f}')
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,78 @@
+#!/usr/bin/env python3
+"""
+Benchmark: Flask's default JSON provider vs serialization.FastJSONProvider.
+
+Encodes the full /analyze bodies of random chart pairs (with PlanetInfo
+objects, both directions and synastry) with Flask's default provider and
+with each backend of FastJSONProvider, checks that every backend decodes to
+the same data, and reports the encoding time per body and the body size in
+English and Tamil.
+
+Usage: python benchmarks/bench_json_providers.py [pairs]
+"""
+
+import json
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import logging
+logging.disable(logging.INFO)
+
+from flask.json.provider import DefaultJSONProvider  # noqa: E402
+
+import serialization  # noqa: E402
+from app import AnalysisOptions, AstrologyCalculator, _build_analysis_response, app  # noqa: E402
+
+def make_bodies(count, lang):
+    """Full analysis bodies for random birth moments between 1950 and 2000 at Indian latitudes and longitudes"""
+    rng = random.Random(42)
+    workload = [
+        (rng.uniform(2433282.5, 2451544.5), rng.uniform(8, 30), rng.uniform(70, 90))
+        for _ in range(2 * count)
+    ]
+    charts = [(chart, asc) for chart, asc, _ in AstrologyCalculator.calculate_planetary_positions_batch(workload)]
+    options = AnalysisOptions(symmetric=True, synastry=True)
+    with app.app_context():
+        return [
+            _build_analysis_response(male_chart, female_chart, male_asc, female_asc, lang, options)
+            for (male_chart, male_asc), (female_chart, female_asc) in zip(charts[0::2], charts[1::2])
+        ]
+
+def encode_all(encode, bodies, rounds=5):
+    """Encoded bodies and the best time per body over ``rounds`` runs"""
+    best = float('inf')
+    for _ in range(rounds):
+        started = time.perf_counter()
+        encoded = [encode(body) for body in bodies]
+        best = min(best, time.perf_counter() - started)
+    return encoded, best * 1000 / len(bodies)
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 1000
+    default = DefaultJSONProvider(app)
+    providers = [('flask default', lambda body: default.dumps(body, separators=(',', ':')).encode('utf-8'))]
+    for backend in serialization.BACKENDS[::-1]:
+        provider = serialization.FastJSONProvider(app, backend)
+        providers.append((f'fast ({backend})', provider.dumps_bytes))
+
+    print(f"Workload: {count} bodies per language")
+    print(f"{'provider':<18}{'lang':<6}{'ms/body':>10}{'bytes':>9}{'speedup':>9}")
+    for lang in ('en', 'ta'):
+        bodies = make_bodies(count, lang)
+        expected, baseline_ms = None, None
+        for name, encode in providers:
+            encoded, ms = encode_all(encode, bodies)
+            decoded = [json.loads(item) for item in encoded]
+            if expected is None:
+                expected, baseline_ms = decoded, ms
+            elif decoded != expected:
+                print(f"{name}: decoded bodies differ from Flask's default provider")
+            size = sum(len(item) for item in encoded) / count
+            print(f"{name:<18}{lang:<6}{ms:>10.4f}{size:>9.0f}{baseline_ms / ms:>8.1f}x")
+
+if __name__ == "__main__":
+    main()
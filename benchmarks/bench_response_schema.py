@@ -0,0 +1,68 @@
+#!/usr/bin/env python3
+"""
+Benchmark: full (schema 1) vs compact (schema 2) /analyze bodies.
+
+Builds and serializes the response body of the same random chart pairs in
+both schemas, with and without the optional parts, and reports the mean body
+size (plain and gzip) and the build and serialization time per body.
+
+Usage: python benchmarks/bench_response_schema.py [pairs]
+"""
+
+import gzip
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import logging
+logging.disable(logging.INFO)
+
+from app import AnalysisOptions, AstrologyCalculator, _build_analysis_response, app  # noqa: E402
+
+def make_charts(count):
+    """Chart pairs for birth moments between 1950 and 2000 at Indian latitudes and longitudes"""
+    rng = random.Random(42)
+    workload = [
+        (rng.uniform(2433282.5, 2451544.5), rng.uniform(8, 30), rng.uniform(70, 90))
+        for _ in range(2 * count)
+    ]
+    charts = [(chart, asc) for chart, asc, _ in AstrologyCalculator.calculate_planetary_positions_batch(workload)]
+    return list(zip(charts[0::2], charts[1::2]))
+
+def measure(pairs, options):
+    """Mean build ms, serialization ms, body bytes and gzip bytes per pair"""
+    build_ms = dumps_ms = size = compressed = 0.0
+    with app.app_context():
+        for (male_chart, male_asc), (female_chart, female_asc) in pairs:
+            started = time.perf_counter()
+            body = _build_analysis_response(male_chart, female_chart, male_asc, female_asc, 'en', options)
+            built = time.perf_counter()
+            data = app.json.dumps(body).encode('utf-8')
+            build_ms += (built - started) * 1000
+            dumps_ms += (time.perf_counter() - built) * 1000
+            size += len(data)
+            compressed += len(gzip.compress(data))
+    count = len(pairs)
+    return build_ms / count, dumps_ms / count, size / count, compressed / count
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 500
+    pairs = make_charts(count)
+    variants = (
+        ('plain', {}),
+        ('symmetric+synastry', {'symmetric': True, 'synastry': True}),
+        ('all parts', {'symmetric': True, 'navamsa': True, 'synastry': True, 'vargas': (9, 10)})
+    )
+
+    print(f"Workload: {count} chart pairs")
+    print(f"{'variant':<20}{'schema':<18}{'build ms':>10}{'dumps ms':>10}{'bytes':>9}{'gzip':>8}")
+    for name, parts in variants:
+        for schema, view in (('1', {}), ('2', {'schema': 2}), ('2 verdict,total', {'schema': 2, 'fields': ('verdict', 'total')})):
+            build_ms, dumps_ms, size, compressed = measure(pairs, AnalysisOptions(**parts, **view))
+            print(f"{name:<20}{schema:<18}{build_ms:>10.3f}{dumps_ms:>10.3f}{size:>9.0f}{compressed:>8.0f}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,74 @@
+#!/usr/bin/env python3
+"""
+Benchmark: exact charts vs fast-ephemeris screening charts.
+
+Computes the same random birth charts with both batch paths, reports charts
+per second and the share of bodies that fell back to Swiss Ephemeris, and
+checks that every body lands in the same rasi, nakshatra and house.
+
+Usage: python benchmarks/bench_screening.py [charts]
+"""
+
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import logging
+logging.disable(logging.INFO)
+
+import swisseph as swe  # noqa: E402
+
+from engine import AstrologyCalculator  # noqa: E402
+
+def make_workload(count):
+    """Birth moments between 1900 and 2050 at Indian latitudes and longitudes"""
+    rng = random.Random(42)
+    return [
+        (rng.uniform(2415020.5, 2469807.5), rng.uniform(8, 30), rng.uniform(70, 90))
+        for _ in range(count)
+    ]
+
+def timed(compute, workload):
+    started = time.perf_counter()
+    charts = compute(workload)
+    return charts, len(workload) / (time.perf_counter() - started)
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 20000
+    workload = make_workload(count)
+
+    calls = {'calc_ut': 0}
+    calc_ut = swe.calc_ut
+
+    def counting_calc_ut(*args):
+        calls['calc_ut'] += 1
+        return calc_ut(*args)
+
+    exact, exact_rate = timed(AstrologyCalculator.calculate_planetary_positions_batch, workload)
+    swe.calc_ut = counting_calc_ut
+    try:
+        screened, screening_rate = timed(AstrologyCalculator.calculate_screening_positions_batch, workload)
+    finally:
+        swe.calc_ut = calc_ut
+
+    mismatches = 0
+    for (exact_chart, exact_asc, _), (chart, asc, _) in zip(exact, screened):
+        for name, info in exact_chart.items():
+            if (info.rasi, info.nakshatra) != (chart[name].rasi, chart[name].nakshatra):
+                mismatches += 1
+            elif (AstrologyCalculator.get_house_number(info.longitude, exact_asc)
+                  != AstrologyCalculator.get_house_number(chart[name].longitude, asc)):
+                mismatches += 1
+
+    bodies = count * (len(exact[0][0]) - 2)
+    print(f"Workload: {count} charts")
+    print(f"{'exact':<12}{exact_rate:>12.0f} charts/s")
+    print(f"{'screening':<12}{screening_rate:>12.0f} charts/s ({screening_rate / exact_rate:.1f}x)")
+    print(f"Exact fallbacks: {calls['calc_ut']} of {bodies} body positions ({calls['calc_ut'] / bodies:.1%})")
+    print(f"Rasi/nakshatra/house mismatches: {mismatches}")
+
+if __name__ == "__main__":
+    main()
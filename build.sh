@@ -5,4 +5,12 @@ echo "Installing Python dependencies..."
 pip install --upgrade pip
 pip install -r requirements.txt
 
+echo "Building static assets..."
+python assets.py
+
+if [ "${EPHE_MODE:-auto}" = "compact" ]; then
+    echo "Building compact ephemeris tables..."
+    python ephemeris.py
+fi
+
 echo "Build completed successfully!"
@@ -14,6 +14,76 @@ class Config:
     HOST = os.environ.get('HOST', '0.0.0.0')
     PORT = int(os.environ.get('PORT', 5001))
     
+    # Chart calculation defaults (requests may override ayanamsa and node type)
+    EPHE_PATH = os.environ.get('EPHE_PATH', '.')
+    DEFAULT_AYANAMSA = os.environ.get('DEFAULT_AYANAMSA', 'lahiri')
+    DEFAULT_NODE_TYPE = os.environ.get('DEFAULT_NODE_TYPE', 'mean')
+    
+    # Ephemeris mode: auto (Swiss Ephemeris files in EPHE_PATH when they cover 1900-2100,
+    # else the built-in Moshier model), moshier, swiss or compact (memory-mapped tables
+    # generated from the best available source into EPHE_DATA_DIR)
+    EPHE_MODE = os.environ.get('EPHE_MODE', 'auto')
+    EPHE_DATA_DIR = os.environ.get('EPHE_DATA_DIR', 'instance/ephemeris')
+    
+    # Reverse search limits (/search/birth-windows)
+    REVERSE_SEARCH_MAX_YEARS = int(os.environ.get('REVERSE_SEARCH_MAX_YEARS', 100))
+    REVERSE_SEARCH_MAX_INTERVALS = int(os.environ.get('REVERSE_SEARCH_MAX_INTERVALS', 10000))
+    
+    # Longest list of upcoming antardashas per partner (/dasha)
+    DASHA_MAX_UPCOMING = int(os.environ.get('DASHA_MAX_UPCOMING', 81))
+    
+    # Compatibility rules file (JSON, or YAML with PyYAML; empty uses the built-in rules)
+    # and how often, in seconds, workers check it for changes
+    RULES_PATH = os.environ.get('RULES_PATH', '')
+    RULES_CHECK_INTERVAL = float(os.environ.get('RULES_CHECK_INTERVAL', 2))
+    
+    # Background job queue (SQLite database and number of worker threads per process)
+    JOBS_DB_PATH = os.environ.get('JOBS_DB_PATH', 'instance/jobs.sqlite3')
+    JOBS_WORKERS = int(os.environ.get('JOBS_WORKERS', 2))
+    JOBS_MAX_ITEMS = int(os.environ.get('JOBS_MAX_ITEMS', 1000000))
+    
+    # Micro-batching of concurrent chart requests (0 disables batching)
+    CHART_BATCH_WINDOW_MS = float(os.environ.get('CHART_BATCH_WINDOW_MS', 0))
+    CHART_BATCH_MAX_SIZE = int(os.environ.get('CHART_BATCH_MAX_SIZE', 64))
+    
+    # Single-flight deduplication of identical in-flight /analyze requests.
+    # Set SINGLEFLIGHT_DIR to a local directory to also share results between workers.
+    SINGLEFLIGHT_DIR = os.environ.get('SINGLEFLIGHT_DIR', '')
+    SINGLEFLIGHT_TTL = float(os.environ.get('SINGLEFLIGHT_TTL', 5))
+    
+    # Admission control for CPU-bound endpoints (per worker process)
+    ADMISSION_MAX_CONCURRENT = int(os.environ.get('ADMISSION_MAX_CONCURRENT', 4))
+    ADMISSION_MAX_QUEUE = int(os.environ.get('ADMISSION_MAX_QUEUE', 16))
+    ADMISSION_QUEUE_TIMEOUT_MS = float(os.environ.get('ADMISSION_QUEUE_TIMEOUT_MS', 5000))
+    ADMISSION_DEADLINE_MS = float(os.environ.get('ADMISSION_DEADLINE_MS', 25000))
+    ADMISSION_DEGRADED_MODE = os.environ.get('ADMISSION_DEGRADED_MODE', 'False').lower() == 'true'
+    ADMISSION_CACHE_SIZE = int(os.environ.get('ADMISSION_CACHE_SIZE', 1024))
+    
+    # Content-addressed store of /analyze results, served at /result/<result_id>
+    # (SQLite file shared by the workers of a host; 0 bytes disables it)
+    RESULTS_DB_PATH = os.environ.get('RESULTS_DB_PATH', 'instance/results.sqlite3')
+    RESULTS_MAX_BYTES = int(os.environ.get('RESULTS_MAX_BYTES', 64 * 1024 * 1024))
+    
+    # JSON encoder of responses: auto (orjson when installed, else the standard library), orjson or stdlib
+    JSON_BACKEND = os.environ.get('JSON_BACKEND', 'auto')
+    
+    # Worker warm-up before GET /ready answers 200: representative charts computed per
+    # worker (0 makes workers ready at once) and timed charts reported as the warm latency
+    WARMUP_CHARTS = int(os.environ.get('WARMUP_CHARTS', 64))
+    WARMUP_SAMPLES = int(os.environ.get('WARMUP_SAMPLES', 20))
+    
+    # Output folder of the minified, fingerprinted static assets (built by build.sh and at startup)
+    ASSETS_DIR = os.environ.get('ASSETS_DIR', 'static/dist')
+    
+    # How often, in seconds, workers check the page template and static files for changes
+    # (home pages are rendered once and served from memory)
+    PAGE_CHECK_INTERVAL = float(os.environ.get('PAGE_CHECK_INTERVAL', 2))
+    
+    # Interactive sessions (in-memory, per worker process)
+    SESSION_TTL = float(os.environ.get('SESSION_TTL', 1800))
+    SESSION_MAX_COUNT = int(os.environ.get('SESSION_MAX_COUNT', 1000))
+    SESSION_HEARTBEAT = float(os.environ.get('SESSION_HEARTBEAT', 15))
+    
     # Default timezone offset for India (IST)
     DEFAULT_TZ_OFFSET = 5.5
     
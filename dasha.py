@@ -0,0 +1,134 @@
+"""
+Vimshottari dasha timelines from the Moon's sidereal longitude.
+
+The 120-year cycle runs through nine lords in a fixed order, starting with
+the lord of the Moon's nakshatra; the part of that nakshatra the Moon has
+already crossed is the part of the first mahadasha already elapsed at
+birth. Every period divides into nine sub-periods in the same order,
+starting with its own lord, in proportion to the lords' years.
+
+Periods are never stored. ``_OFFSETS`` holds the start of each sub-period
+as a fraction of its parent, for every parent lord, so the period running
+at any date is found with one bisection per level (``Timeline.at``) and
+``Timeline.periods`` generates the periods of any level in order, skipping
+every subtree outside the requested range.
+"""
+
+import bisect
+import datetime
+from typing import Iterator, List, NamedTuple, Optional, Tuple
+
+LORDS = ('Ketu', 'Venus', 'Sun', 'Moon', 'Mars', 'Rahu', 'Jupiter', 'Saturn', 'Mercury')
+YEARS = (7, 20, 6, 10, 7, 18, 16, 19, 17)
+TOTAL_YEARS = sum(YEARS)
+YEAR_DAYS = 365.25
+LEVELS = ('maha', 'antar', 'pratyantar', 'sookshma', 'prana')
+
+NAKSHATRA_SPAN = 360.0 / 27.0
+
+def _offsets(lord: int) -> List[float]:
+    starts = [0.0]
+    for step in range(9):
+        starts.append(starts[-1] + YEARS[(lord + step) % 9] / TOTAL_YEARS)
+    starts[-1] = 1.0
+    return starts
+
+# Start of the n-th sub-period of a period of each lord, as a fraction of the
+# period (ten entries; the last is the end of the period)
+_OFFSETS = [_offsets(lord) for lord in range(9)]
+
+_J2000 = datetime.datetime(2000, 1, 1, 12)
+
+def jd_to_date(jd: float) -> str:
+    """ISO date (UT) of a Julian Day"""
+    return (_J2000 + datetime.timedelta(days=jd - 2451545.0)).date().isoformat()
+
+def date_to_jd(date: str) -> float:
+    """Julian Day of 00:00 UT on an ISO date"""
+    moment = datetime.datetime.strptime(date, '%Y-%m-%d')
+    return 2451545.0 + (moment - _J2000).total_seconds() / 86400.0
+
+class Period(NamedTuple):
+    """One dasha period; ``lords`` runs from the mahadasha lord down to this period's lord"""
+    lords: Tuple[str, ...]
+    start: float
+    end: float
+
+    @property
+    def lord(self) -> str:
+        return self.lords[-1]
+
+    @property
+    def level(self) -> str:
+        return LEVELS[len(self.lords) - 1]
+
+class Timeline:
+    """Vimshottari periods of one chart, computed on demand"""
+
+    def __init__(self, moon_longitude: float, birth_jd: float):
+        position = moon_longitude % 360.0
+        nakshatra = min(int(position // NAKSHATRA_SPAN), 26)
+        self.birth_jd = birth_jd
+        self.first_lord = nakshatra % 9
+        elapsed = (position - nakshatra * NAKSHATRA_SPAN) / NAKSHATRA_SPAN
+        first_days = YEARS[self.first_lord] * YEAR_DAYS
+        # The cycle is treated as one period of the first lord lasting 120
+        # years, so its sub-periods are the mahadashas
+        self.cycle_start = birth_jd - elapsed * first_days
+        self.cycle_days = TOTAL_YEARS * YEAR_DAYS
+        self.balance_years = (1.0 - elapsed) * YEARS[self.first_lord]
+
+    def at(self, jd: float, depth: int = 3) -> List[Period]:
+        """The mahadasha and its sub-periods down to ``depth`` levels running at ``jd``"""
+        if jd < self.birth_jd:
+            raise ValueError('Dasha dates must not be before birth')
+        if not 1 <= depth <= len(LEVELS):
+            raise ValueError(f'Dasha depth must be between 1 and {len(LEVELS)}')
+        cycle, _ = divmod(jd - self.cycle_start, self.cycle_days)
+        lord = self.first_lord
+        start = self.cycle_start + cycle * self.cycle_days
+        length = self.cycle_days
+        lords: Tuple[str, ...] = ()
+        periods = []
+        for _ in range(depth):
+            offsets = _OFFSETS[lord]
+            index = min(bisect.bisect_right(offsets, (jd - start) / length) - 1, 8)
+            start, length = start + offsets[index] * length, (offsets[index + 1] - offsets[index]) * length
+            lord = (lord + index) % 9
+            lords += (LORDS[lord],)
+            periods.append(Period(lords, start, start + length))
+        return periods
+
+    def periods(self, level: int = 1, start: Optional[float] = None,
+                end: Optional[float] = None) -> Iterator[Period]:
+        """Periods of one level (1 = mahadasha) overlapping [start, end), in order.
+
+        The range defaults to birth until the end of the first 120-year cycle.
+        """
+        if not 1 <= level <= len(LEVELS):
+            raise ValueError(f'Dasha level must be between 1 and {len(LEVELS)}')
+        start = self.birth_jd if start is None else max(start, self.birth_jd)
+        end = self.cycle_start + self.cycle_days if end is None else end
+        cycle = int((start - self.cycle_start) // self.cycle_days)
+        while self.cycle_start + cycle * self.cycle_days < end:
+            yield from self._children((), self.first_lord, self.cycle_start + cycle * self.cycle_days,
+                                      self.cycle_days, level, start, end)
+            cycle += 1
+
+    def _children(self, lords: Tuple[str, ...], lord: int, period_start: float, length: float,
+                  level: int, start: float, end: float) -> Iterator[Period]:
+        offsets = _OFFSETS[lord]
+        for index in range(9):
+            child_start = period_start + offsets[index] * length
+            child_end = period_start + offsets[index + 1] * length
+            if child_end <= start:
+                continue
+            if child_start >= end:
+                return
+            child_lord = (lord + index) % 9
+            child_lords = lords + (LORDS[child_lord],)
+            if len(child_lords) == level:
+                yield Period(child_lords, child_start, child_end)
+            else:
+                yield from self._children(child_lords, child_lord, child_start, child_end - child_start,
+                                          level, start, end)
@@ -0,0 +1,956 @@
+"""
+Astrology engine: chart computation and compatibility analysis.
+
+This module holds everything that only needs the astrology math (constants,
+``ChartEngine``, ``AstrologyCalculator``, ``CompatibilityAnalyzer`` and
+``ChartService``) and imports neither Flask nor the web application, so
+scripts, notebooks, job workers and benchmarks can use it without paying for
+the application's startup.
+
+Importing it is cheap and has no side effects. Chart settings default to the
+``DEFAULT_AYANAMSA``, ``DEFAULT_NODE_TYPE``, ``EPHE_PATH``, ``EPHE_MODE``,
+``EPHE_DATA_DIR``, ``RULES_PATH`` and ``RULES_CHECK_INTERVAL`` environment
+variables and can be changed with ``configure``; the rule store is loaded on
+first use, and the NumPy-backed modules (``rules``, ``porutham``, ``vargas``,
+``fast_ephemeris``, ``ephemeris`` tables) are imported by the first
+computation that needs them.
+"""
+
+import datetime
+import logging
+import os
+import threading
+import time
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from typing import TYPE_CHECKING, Any, Dict, Iterable, Iterator, List, Optional, Tuple
+
+import swisseph as swe
+
+from translations import get_text
+
+if TYPE_CHECKING:  # pragma: no cover - imported on first use
+    import ephemeris
+    import rules
+
+logger = logging.getLogger(__name__)
+
+# =============================================================================
+# SETTINGS
+# =============================================================================
+
+# Defaults of ChartEngine.get and the rule store
+SETTINGS: Dict[str, Any] = {
+    'ayanamsa': os.environ.get('DEFAULT_AYANAMSA', 'lahiri'),
+    'node_type': os.environ.get('DEFAULT_NODE_TYPE', 'mean'),
+    'ephe_path': os.environ.get('EPHE_PATH', '.'),
+    'ephemeris': os.environ.get('EPHE_MODE', 'auto'),
+    'ephe_data_dir': os.environ.get('EPHE_DATA_DIR', os.path.join('instance', 'ephemeris')),
+    'rules_path': os.environ.get('RULES_PATH', ''),
+    'rules_check_interval': float(os.environ.get('RULES_CHECK_INTERVAL', 2))
+}
+
+def configure(**settings: Any) -> None:
+    """Change the default settings; a changed rules file replaces the rule store"""
+    global _rules
+    unknown = set(settings) - set(SETTINGS)
+    if unknown:
+        raise ValueError(f"Unknown engine settings: {', '.join(sorted(unknown))}")
+    with _rules_lock:
+        if any(settings.get(name, SETTINGS[name]) != SETTINGS[name]
+               for name in ('rules_path', 'rules_check_interval')):
+            _rules = None
+        SETTINGS.update(settings)
+
+# =============================================================================
+# ASTROLOGICAL DATA CONSTANTS
+# =============================================================================
+
+@dataclass
+class AstroConstants:
+    """Container for astrological constants"""
+
+    NAKSHATRAS = [
+        "Ashwini", "Bharani", "Krittika", "Rohini", "Mrigashira", "Ardra",
+        "Punarvasu", "Pushya", "Ashlesha", "Magha", "Purva Phalguni", "Uttara Phalguni",
+        "Hasta", "Chitra", "Swati", "Vishakha", "Anuradha", "Jyeshtha",
+        "Mula", "Purva Ashadha", "Uttara Ashadha", "Shravana", "Dhanishta", "Shatabhisha",
+        "Purva Bhadrapada", "Uttara Bhadrapada", "Revati"
+    ]
+
+    NAKSHATRAS_TAMIL = [
+        "அசுவினி", "பரணி", "கிருத்திகை", "ரோகிணி", "மிருகசீரிடம்", "ஆருத்ரா",
+        "புனர்வசு", "பூசம்", "ஆயில்யம்", "மகம்", "பூரம்", "உத்தரம்",
+        "அஸ்தம்", "சித்திரை", "சுவாதி", "விசாகம்", "அனுஷம்", "கேட்டை",
+        "மூலம்", "பூராடம்", "உத்திராடம்", "திருவோணம்", "அவிட்டம்", "சதயம்",
+        "பூரட்டாதி", "உத்திரட்டாதி", "ரேவதி"
+    ]
+
+    RASIS = [
+        "Mesha", "Rishaba", "Mithuna", "Kataka", "Simha", "Kanni",
+        "Thula", "Vrischika", "Dhanus", "Makara", "Kumbha", "Meena"
+    ]
+
+    RASIS_TAMIL = [
+        "மேஷம்", "ரிஷபம்", "மிதுனம்", "கடகம்", "சிம்மம்", "கன்னி",
+        "துலாம்", "விருச்சிகம்", "தனுசு", "மகரம்", "கும்பம்", "மீனம்"
+    ]
+
+    # Nakshatra lords cycle (9 planets repeated 3 times for 27 nakshatras)
+    NAKSHATRA_LORDS = [
+        "Ketu", "Venus", "Sun", "Moon", "Mars", "Rahu",
+        "Jupiter", "Saturn", "Mercury"
+    ] * 3
+
+    # Rasi lords mapping
+    RASI_LORDS = {
+        "Mesha": "Mars", "Rishaba": "Venus", "Mithuna": "Mercury", "Kataka": "Moon",
+        "Simha": "Sun", "Kanni": "Mercury", "Thula": "Venus", "Vrischika": "Mars",
+        "Dhanus": "Jupiter", "Makara": "Saturn", "Kumbha": "Saturn", "Meena": "Jupiter"
+    }
+
+# Initialize constants
+ASTRO = AstroConstants()
+
+# Create mapping dictionaries
+NAKSHATRA_MAPPING = dict(zip(ASTRO.NAKSHATRAS, ASTRO.NAKSHATRAS_TAMIL))
+RASI_MAPPING = dict(zip(ASTRO.RASIS, ASTRO.RASIS_TAMIL))
+RASI_INDEX = {rasi: index for index, rasi in enumerate(ASTRO.RASIS)}
+
+# Width of a navamsa part (one nakshatra pada)
+NAVAMSA_SPAN = 360.0 / 108.0
+
+# =============================================================================
+# SWISS EPHEMERIS INITIALIZATION
+# =============================================================================
+
+# Supported ayanamsas (sidereal zodiac offsets) and lunar node types
+AYANAMSAS = {
+    'lahiri': swe.SIDM_LAHIRI,
+    'raman': swe.SIDM_RAMAN,
+    'krishnamurti': swe.SIDM_KRISHNAMURTI,
+    'fagan_bradley': swe.SIDM_FAGAN_BRADLEY
+}
+
+NODE_TYPES = {
+    'mean': swe.MEAN_NODE,
+    'true': swe.TRUE_NODE
+}
+
+# swisseph keeps the ephemeris path and sidereal mode in global state, which
+# builds with thread-local storage keep per thread. Every computation runs under
+# this lock with its engine's settings applied. The settings last applied are
+# tracked both process-wide (for builds with one global state) and per thread
+# (for builds with thread-local state), and a setting is applied again when
+# either differs, so neither kind of build computes with another engine's mode.
+_SWE_LOCK = threading.RLock()
+_swe_applied: Dict[str, Any] = {}
+_swe_state = threading.local()
+
+def _apply_swe_setting(name: str, value: Any, apply) -> None:
+    """Apply a swisseph setting unless it is already in effect (swisseph lock held)"""
+    if _swe_applied.get(name) != value or getattr(_swe_state, name, None) != value:
+        apply(value)
+        _swe_applied[name] = value
+        setattr(_swe_state, name, value)
+
+class ChartEngine:
+    """Chart computation settings: ayanamsa, ephemeris path and mode, and node type.
+
+    Engines are cached per mode and are safe to use from concurrent threads:
+    ``activated()`` serializes access to swisseph and only re-applies the
+    global settings when the previous computation used a different mode, so
+    swisseph's internal caches survive as long as requests share a mode.
+
+    ``ephemeris`` is one of ``ephemeris.MODES``; the engine keeps the concrete
+    mode it resolves to and the source it computes from (see ``ephemeris``),
+    and in ``compact`` mode maps the shared tables on first use.
+    """
+
+    _engines: Dict[Tuple[str, str, str, str], 'ChartEngine'] = {}
+    _engines_lock = threading.Lock()
+
+    def __init__(self, ayanamsa: str = 'lahiri', ephe_path: str = '.', node_type: str = 'mean',
+                 ephemeris: str = 'auto', data_dir: Optional[str] = None):
+        import ephemeris as ephemeris_data
+        if ayanamsa not in AYANAMSAS:
+            raise ValueError(f"Unsupported ayanamsa: {ayanamsa} (choose from {', '.join(AYANAMSAS)})")
+        if node_type not in NODE_TYPES:
+            raise ValueError(f"Unsupported node type: {node_type} (choose from {', '.join(NODE_TYPES)})")
+
+        self.ayanamsa = ayanamsa
+        self.ephe_path = ephe_path
+        self.node_type = node_type
+        self.ephemeris, self.source = ephemeris_data.resolve(ephemeris, ephe_path)
+        self.data_dir = data_dir or SETTINGS['ephe_data_dir']
+        self.tables: Optional['ephemeris.CompactTables'] = None
+        self.sid_mode = AYANAMSAS[ayanamsa]
+        self.node_id = NODE_TYPES[node_type]
+        self.flags = swe.FLG_SIDEREAL | swe.FLG_SPEED | ephemeris_data.SOURCE_FLAGS[self.source]
+
+    @classmethod
+    def get(cls, ayanamsa: Optional[str] = None, node_type: Optional[str] = None,
+            ephe_path: Optional[str] = None, ephemeris: Optional[str] = None) -> 'ChartEngine':
+        """Return the shared engine for a mode, creating it on first use"""
+        key = (ayanamsa or SETTINGS['ayanamsa'],
+               node_type or SETTINGS['node_type'],
+               ephe_path or SETTINGS['ephe_path'],
+               ephemeris or SETTINGS['ephemeris'])
+        engine = cls._engines.get(key)
+        if engine is None:
+            with cls._engines_lock:
+                engine = cls._engines.get(key)
+                if engine is None:
+                    engine = cls._engines[key] = cls(key[0], key[2], key[1], key[3])
+        return engine
+
+    @contextmanager
+    def activated(self) -> Iterator['ChartEngine']:
+        """Hold the swisseph lock with this engine's settings applied"""
+        with _SWE_LOCK:
+            _apply_swe_setting('ephe_path', self.ephe_path, swe.set_ephe_path)
+            _apply_swe_setting('sid_mode', self.sid_mode, swe.set_sid_mode)
+            if self.ephemeris == 'compact' and self.tables is None:
+                import ephemeris
+                self.tables = ephemeris.tables(self.data_dir, self.source)
+            yield self
+
+    def check(self, samples: int = 24) -> Dict[str, Any]:
+        """Report the active mode and what a chart costs in it, after verifying its source.
+
+        Raises RuntimeError when Swiss Ephemeris falls back to Moshier in
+        ``swiss`` mode, or when compact tables place a body differently from
+        their source or deviate from it by more than their recorded margin.
+        """
+        import ephemeris
+        start_jd, end_jd = ephemeris.supported_jd()
+        jds = [start_jd + (end_jd - start_jd) * (index + 0.5) / samples for index in range(samples)]
+        missing = ephemeris.missing_files(self.ephe_path)
+        report: Dict[str, Any] = {
+            'mode': self.ephemeris,
+            'source': self.source,
+            'ephe_path': os.path.abspath(self.ephe_path),
+            'files': [name for name in ephemeris.required_files() if name not in missing]
+        }
+
+        with self.activated():
+            if self.source == 'swiss':
+                fallback = [jd for jd in jds if not swe.calc_ut(jd, swe.MOON, self.flags)[1] & swe.FLG_SWIEPH]
+                if fallback:
+                    raise RuntimeError(f"Swiss Ephemeris fell back to Moshier at JD {fallback[0]:.1f}; "
+                                       f"check the files in {report['ephe_path']}")
+
+            timings, charts = [], []
+            for jd in jds:
+                started = time.perf_counter()
+                charts.append(AstrologyCalculator._calculate_bodies(jd, self))
+                timings.append((time.perf_counter() - started) * 1e6)
+
+            if self.tables is not None:
+                deviation = 0.0
+                for jd, chart in zip(jds, charts):
+                    for planet_id, name in PLANET_BODIES + [(self.node_id, 'Rahu')]:
+                        lonlat = swe.calc_ut(jd, planet_id, self.flags)[0]
+                        expected = AstrologyCalculator.get_planet_info(lonlat[0], lonlat[3])
+                        if name == 'Rahu':
+                            expected.retrograde = True
+                        difference = abs((chart[name].longitude - expected.longitude + 180.0) % 360.0 - 180.0)
+                        if (difference > self.tables.max_error[self.tables.columns[planet_id]]
+                                or (chart[name].rasi, chart[name].nakshatra, chart[name].pada, chart[name].retrograde)
+                                != (expected.rasi, expected.nakshatra, expected.pada, expected.retrograde)):
+                            raise RuntimeError(f"Compact ephemeris tables disagree with {self.source} for {name} "
+                                               f"at JD {jd:.1f} ({difference:.2e} deg); rebuild them")
+                        deviation = max(deviation, difference)
+                report['tables'] = {**self.tables.metrics(), 'max_deviation_deg': deviation}
+
+        timings.sort()
+        report['chart_us'] = {'samples': samples, 'p50': round(timings[samples // 2], 1),
+                              'max': round(timings[-1], 1)}
+        return report
+
+def initialize_ephemeris() -> Dict[str, Any]:
+    """Check the default engine's ephemeris and return its report (see ``ChartEngine.check``)"""
+    try:
+        report = ChartEngine.get().check()
+        logger.info(f"Ephemeris: {report['mode']} mode computing from {report['source']}, "
+                    f"{report['chart_us']['p50']:.0f} us per chart")
+        return report
+    except Exception as e:
+        logger.error(f"Failed to initialize Swiss Ephemeris: {e}")
+        raise
+
+# Planet IDs and names for the bodies computed by calc_ut (0-9, excluding mean Node)
+PLANET_BODIES = [
+    (planet_id, swe.get_planet_name(planet_id))
+    for planet_id in range(10)
+    if swe.get_planet_name(planet_id) != "mean Node"
+]
+
+# =============================================================================
+# CORE ASTROLOGICAL CALCULATION CLASSES
+# =============================================================================
+
+@dataclass
+class PlanetInfo:
+    """Data class for planet information"""
+    longitude: float
+    retrograde: bool
+    rasi: str
+    degree_in_sign: float
+    nakshatra: str
+    nakshatra_index: int
+    nakshatra_lord: str
+    pada: int
+
+class AstrologyCalculator:
+    """Core astrology calculation engine"""
+
+    @staticmethod
+    def normalize_longitude(longitude: float) -> float:
+        """Normalize longitude to 0-360 range"""
+        return longitude % 360
+
+    @staticmethod
+    def get_nakshatra_info(longitude: float) -> Dict[str, Any]:
+        """Calculate nakshatra and pada information from longitude"""
+        longitude = AstrologyCalculator.normalize_longitude(longitude)
+
+        # Calculate nakshatra span (360° / 27 nakshatras)
+        nakshatra_span = 360.0 / 27.0
+
+        # Calculate nakshatra index
+        nakshatra_index = int(longitude // nakshatra_span)
+        nakshatra_index = min(nakshatra_index, 26)  # Safety bound
+
+        # Calculate position within nakshatra
+        nakshatra_position = longitude % nakshatra_span
+
+        # Calculate pada (1-4)
+        pada = int((nakshatra_position / (nakshatra_span / 4.0)) + 1)
+        pada = min(max(pada, 1), 4)  # Ensure pada is 1-4
+
+        return {
+            'nakshatra': ASTRO.NAKSHATRAS[nakshatra_index],
+            'nakshatra_index': nakshatra_index,
+            'nakshatra_lord': ASTRO.NAKSHATRA_LORDS[nakshatra_index],
+            'pada': pada
+        }
+
+    @staticmethod
+    def get_planet_info(longitude: float, speed: Optional[float] = None) -> PlanetInfo:
+        """Get comprehensive planet information"""
+        longitude = AstrologyCalculator.normalize_longitude(longitude)
+        nakshatra_info = AstrologyCalculator.get_nakshatra_info(longitude)
+
+        return PlanetInfo(
+            longitude=longitude,
+            retrograde=speed < 0 if speed is not None else False,
+            rasi=ASTRO.RASIS[int(longitude // 30)],
+            degree_in_sign=longitude % 30,
+            **nakshatra_info
+        )
+
+    @staticmethod
+    def divisional_charts(chart: Dict[str, PlanetInfo], divisions: Iterable[int]) -> Dict[int, Dict[str, str]]:
+        """Rasi of every body in each divisional chart, derived from the chart's longitudes"""
+        import vargas
+        longitudes = {name: info.longitude for name, info in chart.items()}
+        return {
+            division: {name: ASTRO.RASIS[sign] for name, sign in positions.items()}
+            for division, positions in vargas.chart(longitudes, divisions).items()
+        }
+
+    @staticmethod
+    def get_house_number(planet_longitude: float, asc_longitude: float) -> int:
+        """Calculate house number from planet and ascendant longitudes"""
+        lagna_rasi = int(asc_longitude // 30)
+        planet_rasi = int(planet_longitude // 30)
+        return (planet_rasi - lagna_rasi) % 12 + 1
+
+    @staticmethod
+    def _calculate_bodies(jd: float, engine: 'ChartEngine') -> Dict[str, PlanetInfo]:
+        """Calculate the planets and lunar nodes for a given time (swisseph lock held)"""
+        if engine.tables is not None and engine.tables.covers(jd):
+            return AstrologyCalculator._tabulated_bodies([jd], engine)[0]
+        calc_ut = swe.calc_ut
+        get_planet_info = AstrologyCalculator.get_planet_info
+        flags = engine.flags
+        results = {}
+
+        # Calculate regular planets (0-9, excluding mean Node)
+        for planet_id, name in PLANET_BODIES:
+            lonlat = calc_ut(jd, planet_id, flags)[0]
+            results[name] = get_planet_info(lonlat[0], lonlat[3])
+
+        results.update(AstrologyCalculator._calculate_nodes(jd, engine))
+        return results
+
+    @staticmethod
+    def _calculate_nodes(jd: float, engine: 'ChartEngine') -> Dict[str, PlanetInfo]:
+        """Calculate Rahu and Ketu for a given time (swisseph lock held)"""
+        # Calculate Rahu (mean or true node, depending on the engine)
+        rahu_lonlat = swe.calc_ut(jd, engine.node_id, engine.flags)[0]
+        rahu_longitude = rahu_lonlat[0]
+
+        rahu = AstrologyCalculator.get_planet_info(rahu_longitude, rahu_lonlat[3])
+        rahu.retrograde = True  # Rahu is always retrograde
+
+        # Calculate Ketu (180° opposite to Rahu)
+        ketu_longitude = (rahu_longitude + 180.0) % 360.0
+        ketu = AstrologyCalculator.get_planet_info(ketu_longitude, rahu_lonlat[3])
+        ketu.retrograde = True  # Ketu is always retrograde
+
+        return {'Rahu': rahu, 'Ketu': ketu}
+
+    @staticmethod
+    def _tabulated_bodies(jds: List[float], engine: 'ChartEngine') -> List[Dict[str, PlanetInfo]]:
+        """The planets and lunar nodes at instants the engine's compact tables cover (swisseph lock held).
+
+        Bodies that lie within the tables' error margin of a navamsa (and so of
+        any sign or nakshatra) boundary, or whose speed is too small to tell
+        their direction, are recomputed from the source, so placements and
+        retrograde flags match ``_calculate_bodies`` without tables.
+        """
+        import numpy as np
+        import fast_ephemeris
+        from ephemeris import PRECESSION_PER_DAY
+        tables = engine.tables
+        calc_ut = swe.calc_ut
+        longitudes, speeds = tables.evaluate(jds)
+        longitudes = (longitudes - np.array([swe.get_ayanamsa_ut(jd) for jd in jds])[:, None]) % 360.0
+        speeds = speeds - PRECESSION_PER_DAY
+
+        uncertain = fast_ephemeris.near_boundary(longitudes, tables.max_error, NAVAMSA_SPAN)
+        uncertain |= np.abs(speeds) <= tables.max_speed_error
+        node = tables.columns[engine.node_id]
+        uncertain[:, node] |= fast_ephemeris.near_boundary(longitudes[:, node] + 180.0, tables.max_error[node])
+        for row, column in zip(*np.nonzero(uncertain)):
+            lonlat = calc_ut(jds[row], tables.bodies[column], engine.flags)[0]
+            longitudes[row, column], speeds[row, column] = lonlat[0], lonlat[3]
+
+        get_planet_info = AstrologyCalculator.get_planet_info
+        columns = [(name, tables.columns[planet_id]) for planet_id, name in PLANET_BODIES]
+        longitudes, speeds = longitudes.tolist(), speeds.tolist()
+        results = []
+        for row_longitudes, row_speeds in zip(longitudes, speeds):
+            bodies = {name: get_planet_info(row_longitudes[column], row_speeds[column]) for name, column in columns}
+            rahu_longitude = row_longitudes[node]
+            bodies['Rahu'] = get_planet_info(rahu_longitude, row_speeds[node])
+            bodies['Rahu'].retrograde = True  # Rahu is always retrograde
+            bodies['Ketu'] = get_planet_info((rahu_longitude + 180.0) % 360.0, row_speeds[node])
+            bodies['Ketu'].retrograde = True  # Ketu is always retrograde
+            results.append(bodies)
+        return results
+
+    @staticmethod
+    def calculate_planetary_positions(jd: float, lat: float, lon: float,
+                                      engine: Optional['ChartEngine'] = None) -> Tuple[Dict[str, PlanetInfo], float, List[float]]:
+        """Calculate all planetary positions for a given time and location"""
+        engine = engine or ChartEngine.get()
+
+        try:
+            with engine.activated():
+                results = AstrologyCalculator._calculate_bodies(jd, engine)
+
+                # Calculate Ascendant
+                cusps, ascmc = swe.houses_ex(jd, lat, lon, b'O', flags=engine.flags)
+
+            results['Ascendant'] = AstrologyCalculator.get_planet_info(ascmc[0])
+
+            return results, ascmc[0], cusps
+
+        except Exception as e:
+            logger.error(f"Error calculating planetary positions: {e}")
+            raise
+
+    @staticmethod
+    def calculate_planetary_positions_batch(
+        requests: List[Tuple[float, float, float]],
+        engine: Optional['ChartEngine'] = None
+    ) -> List[Any]:
+        """Calculate positions for many (jd, lat, lon) requests in one pass.
+
+        Swiss Ephemeris has no vectorized API, so the batch path saves work per
+        chart instead: the planets are evaluated once per distinct instant and
+        the houses once per distinct instant and place, and requests are
+        evaluated in time order, which keeps the ephemeris' internal caches warm.
+        With compact tables, the planets of all covered instants are evaluated
+        at once.
+        Each entry of the result is either the ``calculate_planetary_positions``
+        tuple for that request or the exception raised while computing it.
+        """
+        engine = engine or ChartEngine.get()
+        houses_ex = swe.houses_ex
+        get_planet_info = AstrologyCalculator.get_planet_info
+        bodies_by_jd: Dict[float, Dict[str, PlanetInfo]] = {}
+        houses_by_place: Dict[Tuple[float, float, float], Tuple[Any, Any]] = {}
+        results: List[Any] = [None] * len(requests)
+
+        with engine.activated():
+            tables = engine.tables
+            if tables is not None:
+                covered = sorted({jd for jd, _, _ in requests if tables.covers(jd)})
+                if covered:
+                    bodies_by_jd.update(zip(covered, AstrologyCalculator._tabulated_bodies(covered, engine)))
+
+            for index in sorted(range(len(requests)), key=lambda i: requests[i][0]):
+                jd, lat, lon = requests[index]
+                try:
+                    bodies = bodies_by_jd.get(jd)
+                    if bodies is None:
+                        bodies = bodies_by_jd[jd] = AstrologyCalculator._calculate_bodies(jd, engine)
+
+                    houses = houses_by_place.get((jd, lat, lon))
+                    if houses is None:
+                        houses = houses_by_place[(jd, lat, lon)] = houses_ex(jd, lat, lon, b'O', flags=engine.flags)
+                    cusps, ascmc = houses
+
+                    chart = dict(bodies)
+                    chart['Ascendant'] = get_planet_info(ascmc[0])
+                    results[index] = (chart, ascmc[0], cusps)
+                except Exception as e:
+                    logger.error(f"Error calculating planetary positions: {e}")
+                    results[index] = e
+
+        return results
+
+    @staticmethod
+    def calculate_screening_positions_batch(
+        requests: List[Tuple[float, float, float]],
+        engine: Optional['ChartEngine'] = None,
+        navamsa: bool = False
+    ) -> List[Any]:
+        """Screening-grade positions for many (jd, lat, lon) requests.
+
+        Longitudes come from the vectorized series in ``fast_ephemeris``; a body
+        whose approximate longitude lies within the series' error bound of a sign
+        or nakshatra boundary is recomputed with Swiss Ephemeris, so the rasi,
+        nakshatra and house of every body always match the exact path. Longitudes
+        are otherwise approximate, retrograde flags are only set for the nodes and
+        no house cusps are returned. Requests outside the series' validity range
+        use the exact path. With ``navamsa`` the Moon and Ascendant are also kept
+        clear of navamsa boundaries, so their navamsa signs match as well.
+        Entries have the same shape as in ``calculate_planetary_positions_batch``.
+        """
+        import numpy as np
+        import fast_ephemeris
+        engine = engine or ChartEngine.get()
+        results: List[Any] = [None] * len(requests)
+        if not requests:
+            return results
+
+        jds = np.array([item[0] for item in requests], dtype=float)
+        lats = np.array([item[1] for item in requests], dtype=float)
+        lons = np.array([item[2] for item in requests], dtype=float)
+        screened = ((jds >= fast_ephemeris.VALID_JD[0]) & (jds <= fast_ephemeris.VALID_JD[1])
+                    & (np.abs(lats) <= fast_ephemeris.ASCENDANT_MAX_LATITUDE))
+
+        exact_indexes = np.flatnonzero(~screened).tolist()
+        if exact_indexes:
+            exact = AstrologyCalculator.calculate_planetary_positions_batch(
+                [requests[index] for index in exact_indexes], engine
+            )
+            for index, chart in zip(exact_indexes, exact):
+                results[index] = chart
+
+        indexes = np.flatnonzero(screened)
+        if not len(indexes):
+            return results
+        jds, lats, lons = jds[indexes], lats[indexes], lons[indexes]
+
+        with engine.activated():
+            delta_t = np.array([swe.deltat(jd) for jd in jds])
+            ayanamsa = np.array([swe.get_ayanamsa_ut(jd) for jd in jds])
+            t = fast_ephemeris.centuries(jds + delta_t)
+
+            longitudes = {
+                name: (values - ayanamsa) % 360.0
+                for name, values in fast_ephemeris.tropical_longitudes(jds + delta_t).items()
+            }
+            longitudes['Ascendant'] = (fast_ephemeris.ascendant(jds, t, lats, lons) - ayanamsa) % 360.0
+
+            # Recompute exactly every body that is too close to a boundary to be trusted
+            for planet_id, name in PLANET_BODIES + [(engine.node_id, 'Rahu'), (None, 'Ascendant')]:
+                margin = fast_ephemeris.MAX_ERROR_DEG[name]
+                span = NAVAMSA_SPAN if navamsa and name in ('Moon', 'Ascendant') else None
+                uncertain = fast_ephemeris.near_boundary(longitudes[name], margin, span)
+                if name == 'Rahu':
+                    uncertain |= fast_ephemeris.near_boundary(longitudes[name] + 180.0, margin)
+                    if engine.node_id != swe.MEAN_NODE:
+                        uncertain[:] = True
+
+                for position in np.flatnonzero(uncertain):
+                    jd = jds[position]
+                    if name == 'Ascendant':
+                        exact_longitude = swe.houses_ex(jd, lats[position], lons[position], b'O', flags=engine.flags)[1][0]
+                    else:
+                        exact_longitude = swe.calc_ut(jd, planet_id, engine.flags)[0][0]
+                    longitudes[name][position] = exact_longitude
+
+        get_planet_info = AstrologyCalculator.get_planet_info
+        names = [name for _, name in PLANET_BODIES]
+        columns = {name: longitudes[name].tolist() for name in names + ['Rahu', 'Ascendant']}
+        for position, index in enumerate(indexes.tolist()):
+            chart = {name: get_planet_info(columns[name][position]) for name in names}
+            rahu_longitude = columns['Rahu'][position]
+            chart['Rahu'] = get_planet_info(rahu_longitude)
+            chart['Rahu'].retrograde = True
+            chart['Ketu'] = get_planet_info((rahu_longitude + 180.0) % 360.0)
+            chart['Ketu'].retrograde = True
+            asc_longitude = columns['Ascendant'][position]
+            chart['Ascendant'] = get_planet_info(asc_longitude)
+            results[index] = (chart, asc_longitude, None)
+
+        return results
+
+# =============================================================================
+# COMPATIBILITY ANALYSIS ENGINE
+# =============================================================================
+
+# Match conditions and verdict thresholds (rules.py), loaded on first use and
+# reloaded when the rules file changes
+_rules: Optional['rules.RuleStore'] = None
+_rules_lock = threading.Lock()
+
+def rule_store() -> 'rules.RuleStore':
+    """The shared rule store, created from the current settings on first use"""
+    global _rules
+    if _rules is None:
+        with _rules_lock:
+            if _rules is None:
+                import rules
+                _rules = rules.RuleStore(SETTINGS['rules_path'], SETTINGS['rules_check_interval'])
+    return _rules
+
+@dataclass(frozen=True)
+class AnalysisOptions:
+    """Optional parts of an analysis, selected per request"""
+    symmetric: bool = False  # also check the female nodes against the male chart
+    navamsa: bool = False  # add the navamsa Moon sign and lagna to the conditions
+    vargas: Tuple[int, ...] = ()  # divisional charts to report for both partners
+    synastry: bool = False  # report the aspects between the two charts and their score
+    schema: int = 1  # response body: 1 (full, localized) or 2 (compact, integer codes)
+    fields: Tuple[str, ...] = ()  # schema 2 top-level fields to include (all when empty)
+    explain: bool = False  # schema 2: add the reasoning of every match
+    # Rules in effect when the request arrived, used for the whole analysis
+    ruleset: 'rules.RulePlan' = field(default_factory=lambda: rule_store().current())
+
+class CompatibilityAnalyzer:
+    """Life partner compatibility analysis engine"""
+
+    @staticmethod
+    def get_planets_in_rasi(chart_data: Dict[str, PlanetInfo], target_rasi: str) -> List[str]:
+        """Get all planets in a specific rasi"""
+        return [
+            planet for planet, info in chart_data.items()
+            if planet != 'Ascendant' and info.rasi == target_rasi
+        ]
+
+    @staticmethod
+    def get_planets_in_house(chart_data: Dict[str, PlanetInfo], asc_longitude: float, house_number: int) -> List[str]:
+        """Get all planets in a specific house"""
+        planets = []
+        for planet, info in chart_data.items():
+            if planet != 'Ascendant':
+                house = AstrologyCalculator.get_house_number(info.longitude, asc_longitude)
+                if house == house_number:
+                    planets.append(planet)
+        return planets
+
+    @staticmethod
+    def chart_points(chart: Dict[str, PlanetInfo], asc_longitude: float,
+                     navamsa: bool = False) -> Dict[str, Any]:
+        """Moon and lagna lords and occupants of a chart, which the other partner's nodes are checked against.
+
+        These are the chart features the rules read (``rules.LORD_FEATURES`` and
+        ``rules.SET_FEATURES``). They only depend on this chart, so batch
+        callers compute them once per chart and pass them to every
+        ``analyze_compatibility`` call. With ``navamsa`` the navamsa signs of
+        the Moon and lagna and their lords are added.
+        """
+        moon, asc = chart['Moon'], chart['Ascendant']
+        points = {
+            'moon_rasi_lord': ASTRO.RASI_LORDS[moon.rasi],
+            'moon_nakshatra_lord': moon.nakshatra_lord,
+            'lagna_rasi_lord': ASTRO.RASI_LORDS[asc.rasi],
+            'lagna_nakshatra_lord': asc.nakshatra_lord,
+            'lagna_occupants': CompatibilityAnalyzer.get_planets_in_house(chart, asc_longitude, 1),
+            'moon_rasi_occupants': CompatibilityAnalyzer.get_planets_in_rasi(chart, moon.rasi)
+        }
+        if navamsa:
+            import vargas
+            moon_sign, lagna_sign = vargas.signs([moon.longitude, asc.longitude], 9).tolist()
+            points['navamsa_moon_rasi'] = ASTRO.RASIS[moon_sign]
+            points['navamsa_lagna_rasi'] = ASTRO.RASIS[lagna_sign]
+            points['navamsa_moon_rasi_lord'] = ASTRO.RASI_LORDS[points['navamsa_moon_rasi']]
+            points['navamsa_lagna_rasi_lord'] = ASTRO.RASI_LORDS[points['navamsa_lagna_rasi']]
+        return points
+
+    @staticmethod
+    def analyze_compatibility(
+        male_chart: Dict[str, PlanetInfo], 
+        female_chart: Dict[str, PlanetInfo],
+        male_asc: float, 
+        female_asc: float, 
+        lang: str = 'en',
+        include_poruthams: bool = True,
+        options: Optional[AnalysisOptions] = None,
+        male_points: Optional[Dict[str, Any]] = None,
+        female_points: Optional[Dict[str, Any]] = None
+    ) -> Dict[str, Any]:
+        """Perform comprehensive compatibility analysis.
+
+        The male nodes are checked against the female chart; with
+        ``options.symmetric`` the female nodes are also checked against the male
+        chart and reported under ``reverse``. Both directions reuse the given
+        charts, so no positions are recomputed. Precomputed ``chart_points``
+        must match ``options.navamsa``.
+        """
+        options = options or AnalysisOptions()
+        female_points = female_points or CompatibilityAnalyzer.chart_points(female_chart, female_asc, options.navamsa)
+        result = CompatibilityAnalyzer._analyze_direction(male_chart, female_chart, female_points, 'male', 'female',
+                                                          options.ruleset, lang)
+
+        if options.symmetric:
+            male_points = male_points or CompatibilityAnalyzer.chart_points(male_chart, male_asc, options.navamsa)
+            result['reverse'] = CompatibilityAnalyzer._analyze_direction(
+                female_chart, male_chart, male_points, 'female', 'male', options.ruleset, lang
+            )
+
+        if include_poruthams:
+            result.update(CompatibilityAnalyzer.analyze_poruthams(male_chart, female_chart, lang))
+        return result
+
+    @staticmethod
+    def _analyze_direction(node_chart: Dict[str, PlanetInfo], target_chart: Dict[str, PlanetInfo],
+                           target_points: Dict[str, Any], node_partner: str, target_partner: str,
+                           ruleset: 'rules.RulePlan', lang: str) -> Dict[str, Any]:
+        """Check the nodes of one partner's chart against the other partner's chart"""
+
+        # Extract key information
+        rahu = node_chart['Rahu']
+        ketu = node_chart['Ketu']
+
+        # Get nakshatra lords
+        rahu_lord = rahu.nakshatra_lord
+        ketu_lord = ketu.nakshatra_lord
+
+        # Analyze matches
+        rahu_matches, rahu_reasoning, rahu_total = CompatibilityAnalyzer._check_matches(
+            rahu_lord, target_points, target_partner, 'rahu', ruleset, lang
+        )
+
+        ketu_matches, ketu_reasoning, ketu_total = CompatibilityAnalyzer._check_matches(
+            ketu_lord, target_points, target_partner, 'ketu', ruleset, lang
+        )
+
+        # Prepare detailed conditions
+        conditions = CompatibilityAnalyzer._prepare_conditions(target_chart, target_points, target_partner,
+                                                               ruleset, lang)
+
+        return {
+            f'{node_partner}_rahu': rahu,
+            f'{node_partner}_ketu': ketu,
+            f'{node_partner}_rahu_nakshatra': CompatibilityAnalyzer._translate_nakshatra(rahu.nakshatra, lang),
+            f'{node_partner}_ketu_nakshatra': CompatibilityAnalyzer._translate_nakshatra(ketu.nakshatra, lang),
+            'rahu_nakshatra_lord': rahu_lord,
+            'ketu_nakshatra_lord': ketu_lord,
+            'conditions': conditions,
+            'rahu_matches': rahu_matches,
+            'ketu_matches': ketu_matches,
+            'rahu_reasoning': rahu_reasoning,
+            'ketu_reasoning': ketu_reasoning,
+            'total_matches': rahu_total + ketu_total,
+            'primary_match_type': 'Rahu' if rahu_matches else 'Ketu' if ketu_matches else 'None'
+        }
+
+    @staticmethod
+    def analyze_poruthams(male_chart: Dict[str, PlanetInfo], female_chart: Dict[str, PlanetInfo],
+                          lang: str = 'en') -> Dict[str, Any]:
+        """Evaluate the ten poruthams from the Moon nakshatras and signs of both charts"""
+        import porutham
+        bride, groom = female_chart['Moon'], male_chart['Moon']
+        bride_star, groom_star = bride.nakshatra_index, groom.nakshatra_index
+        bride_rasi, groom_rasi = RASI_INDEX[bride.rasi], RASI_INDEX[groom.rasi]
+        mask = porutham.match(bride_star, bride_rasi, groom_star, groom_rasi)
+
+        def pair(bride_text: str, groom_text: str) -> str:
+            return f"{bride_text} / {groom_text}"
+
+        star_count = f"{get_text('star_count', lang)} {porutham.star_count(bride_star, groom_star)}"
+        details = {
+            'dina': star_count,
+            'gana': pair(get_text(f'gana_{porutham.GANAS[bride_star]}', lang),
+                         get_text(f'gana_{porutham.GANAS[groom_star]}', lang)),
+            'mahendra': star_count,
+            'stree_deergha': star_count,
+            'yoni': pair(get_text(f'yoni_{porutham.YONIS[bride_star]}', lang),
+                         get_text(f'yoni_{porutham.YONIS[groom_star]}', lang)),
+            'rasi': f"{get_text('sign_count', lang)} {porutham.sign_count(bride_rasi, groom_rasi)}",
+            'rasiyathipathi': pair(ASTRO.RASI_LORDS[bride.rasi], ASTRO.RASI_LORDS[groom.rasi]),
+            'vasya': pair(CompatibilityAnalyzer._translate_rasi(bride.rasi, lang),
+                          CompatibilityAnalyzer._translate_rasi(groom.rasi, lang)),
+            'rajju': pair(get_text(f'rajju_{porutham.RAJJUS[bride_star]}', lang),
+                          get_text(f'rajju_{porutham.RAJJUS[groom_star]}', lang)),
+            'vedha': pair(CompatibilityAnalyzer._translate_nakshatra(bride.nakshatra, lang),
+                          CompatibilityAnalyzer._translate_nakshatra(groom.nakshatra, lang))
+        }
+
+        return {
+            'poruthams': [
+                {
+                    'key': name,
+                    'name': get_text(f'porutham_{name}', lang),
+                    'status': 'match' if mask & porutham.BITS[name] else 'no_match',
+                    'details': details[name]
+                }
+                for name in porutham.NAMES
+            ],
+            'porutham_count': int(porutham.count(mask))
+        }
+
+    @staticmethod
+    def _check_matches(lord: str, points: Dict[str, Any], partner: str, node_type: str,
+                       ruleset: 'rules.RulePlan', lang: str) -> Tuple[List[str], List[str], int]:
+        """Check matches for a specific node (Rahu/Ketu) against the given partner's chart.
+
+        Returns the labels of the matched conditions, their reasoning and their
+        total weight.
+        """
+        matched = ruleset.evaluate(lord, points)
+        context = {'node': get_text(f'{node_type}_lord', lang), 'lord': lord, 'partner': partner}
+        translate = lambda key: get_text(key, lang)
+        matches = [CompatibilityAnalyzer._condition_label(condition, partner, lang) for condition, _ in matched]
+        reasoning = [ruleset.reason(condition, terms, points, context, translate) for condition, terms in matched]
+        return matches, reasoning, ruleset.total(matched)
+
+    @staticmethod
+    def _condition_label(condition: 'rules.Condition', partner: str, lang: str) -> str:
+        return get_text(condition.label.replace('{partner}', partner), lang)
+
+    @staticmethod
+    def _prepare_conditions(chart: Dict[str, PlanetInfo], points: Dict[str, Any], partner: str,
+                            ruleset: 'rules.RulePlan', lang: str) -> Dict[str, Dict[str, Any]]:
+        """Prepare detailed condition information, one row per applicable rule condition"""
+        moon = chart['Moon']
+        asc_info = chart['Ascendant']
+        planets_in_lagna = points['lagna_occupants']
+        planets_in_rasi = points['moon_rasi_occupants']
+
+        rows = {
+            'rasi_moon_sign': lambda: {
+                'value': CompatibilityAnalyzer._translate_rasi(moon.rasi, lang),
+                'details': f"{moon.longitude:.2f}° in {CompatibilityAnalyzer._translate_rasi(moon.rasi, lang)}",
+                'lord': ASTRO.RASI_LORDS.get(moon.rasi),
+                'nakshatra_lord': moon.nakshatra_lord
+            },
+            'nakshatra': lambda: {
+                'value': CompatibilityAnalyzer._translate_nakshatra(moon.nakshatra, lang),
+                'details': f"{CompatibilityAnalyzer._translate_nakshatra(moon.nakshatra, lang)} Pada {moon.pada}",
+                'lord': moon.nakshatra_lord,
+                'nakshatra_lord': moon.nakshatra_lord
+            },
+            'lagna_point': lambda: {
+                'value': f"{asc_info.longitude:.2f}° {CompatibilityAnalyzer._translate_rasi(asc_info.rasi, lang)} | {CompatibilityAnalyzer._translate_nakshatra(asc_info.nakshatra, lang)} Pada {asc_info.pada}",
+                'details': f"Lagna: {asc_info.longitude:.2f}° in {CompatibilityAnalyzer._translate_rasi(asc_info.rasi, lang)} | Nakshatra: {CompatibilityAnalyzer._translate_nakshatra(asc_info.nakshatra, lang)} Pada {asc_info.pada} | Rasi Lord: {ASTRO.RASI_LORDS[asc_info.rasi]} | Nakshatra Lord: {asc_info.nakshatra_lord}",
+                'lord': ASTRO.RASI_LORDS[asc_info.rasi],
+                'nakshatra_lord': asc_info.nakshatra_lord
+            },
+            'planets_in_lagna': lambda: {
+                'value': planets_in_lagna,
+                'details': ", ".join([f"{p} ({chart[p].longitude:.1f}°)" for p in planets_in_lagna]) if planets_in_lagna else get_text('none', lang),
+                'lord': planets_in_lagna,
+                'nakshatra_lord': None
+            },
+            'planets_in_rasi': lambda: {
+                'value': planets_in_rasi,
+                'details': ", ".join([f"{p} ({chart[p].longitude:.1f}°)" for p in planets_in_rasi]) if planets_in_rasi else get_text('none', lang),
+                'lord': planets_in_rasi,
+                'nakshatra_lord': None
+            }
+        }
+        for key, rasi_key in (('navamsa_moon_sign', 'navamsa_moon_rasi'), ('navamsa_lagna', 'navamsa_lagna_rasi')):
+            if rasi_key in points:
+                rasi = points[rasi_key]
+                rows[key] = lambda rasi=rasi: {
+                    'value': CompatibilityAnalyzer._translate_rasi(rasi, lang),
+                    'details': f"D9: {CompatibilityAnalyzer._translate_rasi(rasi, lang)} | Rasi Lord: {ASTRO.RASI_LORDS[rasi]}",
+                    'lord': ASTRO.RASI_LORDS[rasi],
+                    'nakshatra_lord': None
+                }
+
+        conditions = {}
+        for condition in ruleset.conditions:
+            if not ruleset.applies(condition, points):
+                continue
+            if condition.id in rows:
+                row = rows[condition.id]()
+            else:
+                # Conditions added by custom rules show the features they test
+                values = [points[feature] for feature in condition.features]
+                row = {
+                    'value': ' | '.join(', '.join(value) if isinstance(value, list) else value for value in values),
+                    'details': ' | '.join(f"{feature}: {points[feature]}" for feature in condition.features),
+                    'lord': [value for value in values if not isinstance(value, list)],
+                    'nakshatra_lord': None
+                }
+            conditions[CompatibilityAnalyzer._condition_label(condition, partner, lang)] = row
+
+        return conditions
+
+    @staticmethod
+    def _translate_nakshatra(nakshatra: str, lang: str) -> str:
+        """Translate nakshatra name based on language"""
+        if lang == 'ta' and nakshatra in NAKSHATRA_MAPPING:
+            return NAKSHATRA_MAPPING[nakshatra]
+        return nakshatra
+
+    @staticmethod
+    def _translate_rasi(rasi: str, lang: str) -> str:
+        """Translate rasi name based on language"""
+        if lang == 'ta' and rasi in RASI_MAPPING:
+            return RASI_MAPPING[rasi]
+        return rasi
+
+# =============================================================================
+# CHART CREATION SERVICE
+# =============================================================================
+
+class ChartService:
+    """Service for creating birth charts"""
+
+    # Micro-batcher that charts are submitted to instead of being computed directly
+    batcher: Optional[Any] = None
+
+    @staticmethod
+    def birth_jd(dob: str, tob: str, tz_offset: float = 5.5) -> float:
+        """Convert local birth date and time to a UT Julian Day"""
+        # Parse date and time
+        local_dt = datetime.datetime.strptime(f"{dob} {tob}", "%Y-%m-%d %H:%M")
+
+        # Convert to UTC
+        utc_dt = local_dt - datetime.timedelta(hours=tz_offset)
+
+        # Calculate Julian Day
+        return swe.julday(utc_dt.year, utc_dt.month, utc_dt.day, utc_dt.hour + utc_dt.minute/60.0)
+
+    @staticmethod
+    def create_birth_chart(dob: str, tob: str, lat: float, lon: float, tz_offset: float = 5.5,
+                           engine: Optional[ChartEngine] = None) -> Tuple[Dict[str, PlanetInfo], float]:
+        """Create birth chart from birth details"""
+        try:
+            jd = ChartService.birth_jd(dob, tob, tz_offset)
+            engine = engine or ChartEngine.get()
+
+            # Calculate planetary positions, sharing a batch with concurrent requests when enabled
+            if ChartService.batcher is not None:
+                planet_data, asc_deg, _ = ChartService.batcher.submit((jd, lat, lon, engine))
+            else:
+                planet_data, asc_deg, _ = AstrologyCalculator.calculate_planetary_positions(jd, lat, lon, engine)
+
+            logger.info(f"Birth chart created successfully for {dob} {tob}")
+            return planet_data, asc_deg
+
+        except Exception as e:
+            logger.error(f"Error creating birth chart: {e}")
+            raise
@@ -0,0 +1,282 @@
+"""
+Ephemeris data: explicit precision modes and compact, memory-mapped tables.
+
+Swiss Ephemeris computes positions either from its data files (``.se1``,
+file-based) or with the Moshier analytic model built into the library, and
+it falls back to Moshier silently for any date its files do not cover. Chart
+engines therefore choose a mode explicitly:
+
+- ``moshier``: the analytic model, with no file lookups.
+- ``swiss``: the Swiss Ephemeris files in the engine's ephemeris path; an
+  engine cannot be created when they do not cover ``SUPPORTED_YEARS``.
+- ``compact``: tables generated locally from the best available source
+  (``swiss`` when its files are present, ``moshier`` otherwise).
+- ``auto``: ``swiss`` when its files cover ``SUPPORTED_YEARS``, ``moshier``
+  otherwise.
+
+Compact tables hold Chebyshev coefficients of every body's longitude on the
+mean equinox of date (the frame of sidereal positions, so subtracting any
+ayanamsa gives the sidereal longitude) over fixed segments of a few days.
+They are written once as a ``.npy`` file and memory-mapped read-only, so all
+workers on a host share one copy through the page cache. Evaluating a chart
+is a few vectorized NumPy operations instead of a Swiss Ephemeris call per
+body, and a batch of charts costs little more than one.
+
+Mode resolution imports nothing heavy; NumPy is imported when tables are
+built or loaded.
+
+Every table records the largest deviation from its source measured at build
+time, between the fitting nodes of every segment. Callers recompute from the
+source any body that lies within that margin (times ``SAFETY``) of a
+boundary, or whose speed is too close to zero to tell its direction, so
+placements and retrograde flags always match the source and longitudes
+agree within the recorded margin.
+"""
+
+import io
+import json
+import logging
+import os
+import threading
+import time
+from functools import lru_cache
+from typing import TYPE_CHECKING, Any, Dict, List, Tuple
+
+import swisseph as swe
+
+from assets import write_atomic
+
+if TYPE_CHECKING:  # pragma: no cover - imported on first use
+    import numpy as np
+
+logger = logging.getLogger(__name__)
+
+MODES = ('auto', 'moshier', 'swiss', 'compact')
+
+# Calculation flag of each source
+SOURCE_FLAGS = {'moshier': swe.FLG_MOSEPH, 'swiss': swe.FLG_SWIEPH}
+
+# Years (UT, from January 1 of the first to January 1 of the last) that
+# compact tables cover and that Swiss Ephemeris files must cover
+SUPPORTED_YEARS = (1900, 2100)
+
+# Bodies in the tables and their segment lengths in days: short enough for the
+# Moon, Mercury and the oscillating true node, long for the outer planets
+TABLE_BODIES = (
+    (swe.SUN, 16.0), (swe.MOON, 8.0), (swe.MERCURY, 8.0), (swe.VENUS, 16.0), (swe.MARS, 16.0),
+    (swe.JUPITER, 32.0), (swe.SATURN, 16.0), (swe.URANUS, 32.0), (swe.NEPTUNE, 16.0), (swe.PLUTO, 32.0),
+    (swe.MEAN_NODE, 32.0), (swe.TRUE_NODE, 4.0)
+)
+
+# Degree of the Chebyshev series of every segment
+DEGREE = 12
+
+# Factor applied to the deviations measured at build time
+SAFETY = 4.0
+
+# Rate of general precession in degrees per day: tabulated speeds are on the
+# equinox of date and exceed sidereal speeds by this much
+PRECESSION_PER_DAY = 50.29 / 3600.0 / 365.25
+
+# Bumped whenever the table layout or the fit changes, to rebuild old files
+FORMAT_VERSION = 1
+
+# Longitudes on the mean equinox of date; speeds are only needed to check the fit
+_CALC_FLAGS = swe.FLG_NONUT
+
+def supported_jd(years: Tuple[int, int] = SUPPORTED_YEARS) -> Tuple[float, float]:
+    return swe.julday(years[0], 1, 1, 0.0), swe.julday(years[1], 1, 1, 0.0)
+
+def required_files(years: Tuple[int, int] = SUPPORTED_YEARS) -> List[str]:
+    """Swiss Ephemeris planet and moon files covering ``years`` (each covers 600 years)"""
+    blocks = range(years[0] // 600 * 6, (years[1] - 1) // 600 * 6 + 1, 6)
+    return [f'{kind}_{block:02d}.se1' for block in blocks for kind in ('sepl', 'semo')]
+
+def missing_files(ephe_path: str, years: Tuple[int, int] = SUPPORTED_YEARS) -> List[str]:
+    return [name for name in required_files(years) if not os.path.isfile(os.path.join(ephe_path, name))]
+
+def resolve(mode: str, ephe_path: str) -> Tuple[str, str]:
+    """The concrete mode and the source it computes from, for a requested mode"""
+    if mode not in MODES:
+        raise ValueError(f"Unsupported ephemeris mode: {mode} (choose from {', '.join(MODES)})")
+    missing = missing_files(ephe_path)
+    if mode == 'swiss' and missing:
+        raise ValueError(f"Swiss Ephemeris files not found in {os.path.abspath(ephe_path)}: {', '.join(missing)}")
+    source = 'moshier' if missing else 'swiss'
+    if mode == 'auto':
+        return source, source
+    return mode, source if mode == 'compact' else mode
+
+# Points between the Chebyshev nodes where the fit is checked against its source
+_CHECKS = (-0.5, 0.5)
+
+@lru_cache(maxsize=None)
+def _chebyshev() -> Tuple['np.ndarray', 'np.ndarray', 'np.ndarray']:
+    """Chebyshev nodes of a segment, the matrix that turns the values at the
+    nodes into series coefficients, and the one that turns series coefficients
+    into the coefficients of their derivative"""
+    import numpy as np
+    nodes = np.cos(np.pi * (np.arange(DEGREE + 1) + 0.5) / (DEGREE + 1))[::-1]
+    fit = np.polynomial.chebyshev.chebvander(nodes, DEGREE).T * (2.0 / (DEGREE + 1))
+    fit[0] /= 2.0
+    derivative = np.polynomial.chebyshev.chebder(np.eye(DEGREE + 1), axis=1)
+    return nodes, fit, derivative
+
+def _series(coefficients: 'np.ndarray', x: 'np.ndarray') -> Tuple['np.ndarray', 'np.ndarray']:
+    """Values and derivatives in ``x`` of Chebyshev series (coefficients on the last axis).
+
+    T_k(x) = cos(k arccos x) gives the whole basis in three array operations,
+    which matters more than the arithmetic for the few series of one chart.
+    """
+    import numpy as np
+    _, _, derivative = _chebyshev()
+    basis = np.cos(np.arccos(np.clip(x, -1.0, 1.0))[..., None] * np.arange(DEGREE + 1))
+    values = np.einsum('...k,...k->...', coefficients, basis)
+    derivatives = np.einsum('...k,...k->...', coefficients @ derivative, basis[..., :DEGREE])
+    return values, derivatives
+
+class CompactTables:
+    """Chebyshev tables of the ``TABLE_BODIES`` longitudes, usually memory-mapped"""
+
+    def __init__(self, coefficients: 'np.ndarray', meta: Dict[str, Any]):
+        import numpy as np
+        self.coefficients = coefficients
+        self.meta = meta
+        self.source = meta['source']
+        self.start_jd, self.end_jd = meta['jd_range']
+        self.bodies = [body for body, _ in TABLE_BODIES]
+        self.columns = {body: index for index, body in enumerate(self.bodies)}
+        self.spans = np.array(meta['spans'])
+        self.offsets = np.array(meta['offsets'])
+        self.max_error = SAFETY * np.array(meta['max_error'])
+        self.max_speed_error = SAFETY * np.array(meta['max_speed_error']) + PRECESSION_PER_DAY
+
+    @classmethod
+    def load(cls, path: str) -> 'CompactTables':
+        import numpy as np
+        with open(path + '.json', encoding='utf-8') as handle:
+            meta = json.load(handle)
+        # A plain view of the mapping: indexing it skips np.memmap's Python-level wrappers
+        return cls(np.asarray(np.load(path, mmap_mode='r')), meta)
+
+    def covers(self, jd: float) -> bool:
+        return self.start_jd <= jd < self.end_jd
+
+    def evaluate(self, jds: 'np.ndarray') -> Tuple['np.ndarray', 'np.ndarray']:
+        """Longitudes (degrees, equinox of date) and speeds (degrees per day) at UT ``jds``,
+        one row per instant and one column per body; every instant must be covered"""
+        import numpy as np
+        position = (np.asarray(jds, dtype=float)[:, None] - self.start_jd) / self.spans
+        segment = position.astype(np.int64)
+        x = 2.0 * (position - segment) - 1.0
+        values, derivatives = _series(self.coefficients[self.offsets + segment], x)
+        return values % 360.0, derivatives * (2.0 / self.spans)
+
+    def metrics(self) -> Dict[str, Any]:
+        return {
+            'source': self.source,
+            'years': self.meta['years'],
+            'bytes': int(self.coefficients.nbytes),
+            'max_error_deg': float(self.max_error.max()),
+            'build_seconds': self.meta['build_seconds']
+        }
+
+def _source_positions(jds: 'np.ndarray', body: int, flags: int) -> Tuple['np.ndarray', 'np.ndarray']:
+    import numpy as np
+    calc_ut = swe.calc_ut
+    rows = [calc_ut(jd, body, flags)[0] for jd in jds.ravel()]
+    longitudes = np.array([row[0] for row in rows]).reshape(jds.shape)
+    speeds = np.array([row[3] for row in rows]).reshape(jds.shape)
+    return longitudes, speeds
+
+def build(path: str, source: str, years: Tuple[int, int] = SUPPORTED_YEARS) -> CompactTables:
+    """Fit tables from ``source`` and write them to ``path`` (``.npy``, plus a ``.json`` header).
+
+    The caller sets up swisseph (ephemeris path) and keeps other threads from
+    changing it while the tables are built.
+    """
+    import numpy as np
+    started = time.perf_counter()
+    nodes, fit, _ = _chebyshev()
+    flags = SOURCE_FLAGS[source] | _CALC_FLAGS
+    start_jd, end_jd = supported_jd(years)
+    blocks, offsets, max_error, max_speed_error = [], [], [], []
+    offset = 0
+    for body, span in TABLE_BODIES:
+        starts = start_jd + span * np.arange(int(np.ceil((end_jd - start_jd) / span)))
+        # Values at the nodes, unwrapped within each segment so the series stay continuous
+        longitudes, _ = _source_positions(starts[:, None] + (nodes + 1.0) * (span / 2.0), body, flags)
+        longitudes = longitudes[:, :1] + (longitudes - longitudes[:, :1] + 180.0) % 360.0 - 180.0
+        coefficients = longitudes @ fit.T
+
+        checks = np.array(_CHECKS)
+        expected, expected_speed = _source_positions(starts[:, None] + (checks + 1.0) * (span / 2.0), body,
+                                                     flags | swe.FLG_SPEED)
+        values, derivatives = _series(coefficients[:, None, :], np.broadcast_to(checks, expected.shape))
+        max_error.append(float(np.abs((values - expected + 180.0) % 360.0 - 180.0).max()))
+        max_speed_error.append(float(np.abs(derivatives * (2.0 / span) - expected_speed).max()))
+
+        blocks.append(coefficients)
+        offsets.append(offset)
+        offset += len(coefficients)
+
+    coefficients = np.concatenate(blocks)
+    meta = {
+        'format': FORMAT_VERSION,
+        'source': source,
+        'swisseph': swe.version,
+        'years': list(years),
+        'jd_range': [start_jd, end_jd],
+        'degree': DEGREE,
+        'bodies': [body for body, _ in TABLE_BODIES],
+        'spans': [span for _, span in TABLE_BODIES],
+        'offsets': offsets,
+        'max_error': max_error,
+        'max_speed_error': max_speed_error,
+        'build_seconds': round(time.perf_counter() - started, 1)
+    }
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    table = io.BytesIO()
+    np.save(table, coefficients)
+    write_atomic(path, table.getvalue())
+    write_atomic(path + '.json', json.dumps(meta, indent=2).encode('utf-8'))
+    return CompactTables.load(path)
+
+def table_path(data_dir: str, source: str) -> str:
+    return os.path.join(data_dir, f'compact-{source}.npy')
+
+def _current(path: str, source: str, years: Tuple[int, int]) -> bool:
+    """Whether the tables at ``path`` exist and were built from ``source`` for ``years`` by this version"""
+    try:
+        with open(path + '.json', encoding='utf-8') as handle:
+            meta = json.load(handle)
+    except (OSError, ValueError):
+        return False
+    return (os.path.isfile(path) and meta.get('format') == FORMAT_VERSION and meta.get('source') == source
+            and meta.get('years') == list(years) and meta.get('swisseph') == swe.version)
+
+_tables: Dict[str, CompactTables] = {}
+_tables_lock = threading.Lock()
+
+def tables(data_dir: str, source: str, years: Tuple[int, int] = SUPPORTED_YEARS) -> CompactTables:
+    """The shared tables of a source, built first if they are missing or out of date (see ``build``)"""
+    path = table_path(data_dir, source)
+    with _tables_lock:
+        loaded = _tables.get(path)
+        if loaded is None:
+            if not _current(path, source, years):
+                logger.info(f"Building compact ephemeris tables from {source} for {years[0]}-{years[1]}...")
+                build(path, source, years)
+            loaded = _tables[path] = CompactTables.load(path)
+            logger.info(f"Compact ephemeris tables mapped from {path} "
+                        f"({loaded.coefficients.nbytes / 1e6:.1f} MB, max error {loaded.max_error.max():.1e} deg)")
+        return loaded
+
+if __name__ == '__main__':
+    import sys
+    ephe_path = sys.argv[1] if len(sys.argv) > 1 else os.environ.get('EPHE_PATH', '.')
+    data_dir = sys.argv[2] if len(sys.argv) > 2 else os.environ.get('EPHE_DATA_DIR', os.path.join('instance', 'ephemeris'))
+    swe.set_ephe_path(ephe_path)
+    _, best = resolve('compact', ephe_path)
+    built = build(table_path(data_dir, best), best)
+    print(json.dumps(built.metrics(), indent=2))
@@ -0,0 +1,265 @@
+"""
+Low-precision analytic ephemeris for batch screening.
+
+Evaluates truncated series for many instants at once with NumPy instead of
+calling Swiss Ephemeris body by body. Positions are geocentric ecliptic
+longitudes referred to the mean equinox of date (no nutation), which is the
+frame Swiss Ephemeris uses for sidereal positions, so subtracting the
+ayanamsa gives the sidereal longitude.
+
+Models:
+
+- Moon: the 59 largest longitude terms of the ELP-2000/82 series (Meeus,
+  Astronomical Algorithms, chapter 47)
+- Sun: the low-precision solar theory (Meeus, chapter 25)
+- Planets: Keplerian elements with linear rates (Standish, "Approximate
+  Positions of the Planets", table 1, valid 1800-2050), rotated to the
+  equinox of date and corrected for light time
+- Mean lunar node: the polynomial of Meeus, chapter 47
+- Ascendant: mean sidereal time and mean obliquity
+
+``MAX_ERROR_DEG`` is the largest difference from Swiss Ephemeris measured
+over ``VALID_YEARS``, with a safety factor; the ascendant bound applies up to
+``ASCENDANT_MAX_LATITUDE``. A longitude that lies farther than its bound from
+every boundary is guaranteed to be in the same sign and nakshatra as the exact
+position; anything closer must be recomputed exactly.
+"""
+
+from typing import Dict, Optional
+
+import numpy as np
+
+J2000 = 2451545.0
+DAYS_PER_CENTURY = 36525.0
+
+# Years (UT) for which the planetary elements and the error bounds hold
+VALID_YEARS = (1800, 2050)
+VALID_JD = (2378496.5, 2469807.5)
+
+# Latitudes beyond which the ascendant error grows without bound
+ASCENDANT_MAX_LATITUDE = 60.0
+
+# Maximum absolute longitude error in degrees: the largest difference from
+# Swiss Ephemeris over 200,000 random instants in VALID_YEARS (and latitudes
+# up to ASCENDANT_MAX_LATITUDE for the ascendant), times 1.5
+MAX_ERROR_DEG = {
+    'Sun': 0.015,
+    'Moon': 0.01,
+    'Mercury': 0.035,
+    'Venus': 0.06,
+    'Mars': 0.1,
+    'Jupiter': 0.26,
+    'Saturn': 0.34,
+    'Uranus': 0.06,
+    'Neptune': 0.035,
+    'Pluto': 0.035,
+    'Rahu': 0.001,
+    'Ascendant': 0.025
+}
+
+# Standish elements at J2000 and rates per century:
+# a (AU), e, I, L, longitude of perihelion, longitude of ascending node (degrees)
+_ELEMENTS = {
+    'Mercury': ((0.38709927, 0.20563593, 7.00497902, 252.25032350, 77.45779628, 48.33076593),
+                (0.00000037, 0.00001906, -0.00594749, 149472.67411175, 0.16047689, -0.12534081)),
+    'Venus': ((0.72333566, 0.00677672, 3.39467605, 181.97909950, 131.60246718, 76.67984255),
+              (0.00000390, -0.00004107, -0.00078890, 58517.81538729, 0.00268329, -0.27769418)),
+    'Mars': ((1.52371034, 0.09339410, 1.84969142, -4.55343205, -23.94362959, 49.55953891),
+             (0.00001847, 0.00007882, -0.00813131, 19140.30268499, 0.44441088, -0.29257343)),
+    'Jupiter': ((5.20288700, 0.04838624, 1.30439695, 34.39644051, 14.72847983, 100.47390909),
+                (-0.00011607, -0.00013253, -0.00183714, 3034.74612775, 0.21252668, 0.20469106)),
+    'Saturn': ((9.53667594, 0.05386179, 2.48599187, 49.95424423, 92.59887831, 113.66242448),
+               (-0.00125060, -0.00050991, 0.00193609, 1222.49362201, -0.41897216, -0.28867794)),
+    'Uranus': ((19.18916464, 0.04725744, 0.77263783, 313.23810451, 170.95427630, 74.01692503),
+               (-0.00196176, -0.00004397, -0.00242939, 428.48202785, 0.40805281, 0.04240589)),
+    'Neptune': ((30.06992276, 0.00859048, 1.77004347, -55.12002969, 44.96476227, 131.78422574),
+                (0.00026291, 0.00005105, 0.00035372, 218.45945325, -0.32241464, -0.00508664)),
+    'Pluto': ((39.48211675, 0.24882730, 17.14001206, 238.92903833, 224.06891629, 110.30393684),
+              (-0.00031596, 0.00005170, 0.00004818, 145.20780515, -0.04062942, -0.01183482))
+}
+
+# Moon longitude terms: multiples of D, M, M', F and amplitude in 1e-6 degrees
+_MOON_TERMS = np.array([
+    (0, 0, 1, 0, 6288774), (2, 0, -1, 0, 1274027), (2, 0, 0, 0, 658314),
+    (0, 0, 2, 0, 213618), (0, 1, 0, 0, -185116), (0, 0, 0, 2, -114332),
+    (2, 0, -2, 0, 58793), (2, -1, -1, 0, 57066), (2, 0, 1, 0, 53322),
+    (2, -1, 0, 0, 45758), (0, 1, -1, 0, -40923), (1, 0, 0, 0, -34720),
+    (0, 1, 1, 0, -30383), (2, 0, 0, -2, 15327), (0, 0, 1, 2, -12528),
+    (0, 0, 1, -2, 10980), (4, 0, -1, 0, 10675), (0, 0, 3, 0, 10034),
+    (4, 0, -2, 0, 8548), (2, 1, -1, 0, -7888), (2, 1, 0, 0, -6766),
+    (1, 0, -1, 0, -5163), (1, 1, 0, 0, 4987), (2, -1, 1, 0, 4036),
+    (2, 0, 2, 0, 3994), (4, 0, 0, 0, 3861), (2, 0, -3, 0, 3665),
+    (0, 1, -2, 0, -2689), (2, 0, -1, 2, -2602), (2, -1, -2, 0, 2390),
+    (1, 0, 1, 0, -2348), (2, -2, 0, 0, 2236), (0, 1, 2, 0, -2120),
+    (0, 2, 0, 0, -2069), (2, -2, -1, 0, 2048), (2, 0, 1, -2, -1773),
+    (2, 0, 0, 2, -1595), (4, -1, -1, 0, 1215), (0, 0, 2, 2, -1110),
+    (3, 0, -1, 0, -892), (2, 1, 1, 0, -810), (4, -1, -2, 0, 759),
+    (0, 2, -1, 0, -713), (2, 2, -1, 0, -700), (2, 1, -2, 0, 691),
+    (2, -1, 0, -2, 596), (4, 0, 1, 0, 549), (0, 0, 4, 0, 537),
+    (4, -1, 0, 0, 520), (1, 0, -2, 0, -487), (2, 1, 0, -2, -399),
+    (0, 0, 2, -2, -381), (1, 1, 1, 0, 351), (3, 0, -2, 0, -340),
+    (4, 0, -3, 0, 330), (2, -1, 2, 0, 327), (0, 2, 1, 0, -323),
+    (1, 1, -1, 0, 299), (0, 0, 3, -2, 294)
+], dtype=float)
+
+# Light time for one AU in days
+_LIGHT_TIME_PER_AU = 0.0057755183
+
+def centuries(jd_tt: np.ndarray) -> np.ndarray:
+    """Julian centuries of Terrestrial Time since J2000"""
+    return (np.asarray(jd_tt, dtype=float) - J2000) / DAYS_PER_CENTURY
+
+def _precession(t: np.ndarray) -> np.ndarray:
+    """General precession in longitude from J2000 to date, degrees"""
+    return (5028.796195 * t + 1.1054348 * t * t) / 3600.0
+
+def sun(t: np.ndarray) -> np.ndarray:
+    """Geocentric longitude of the Sun (with aberration), degrees"""
+    mean_longitude = 280.46646 + 36000.76983 * t + 0.0003032 * t * t
+    anomaly = np.radians(357.52911 + 35999.05029 * t - 0.0001537 * t * t)
+    center = ((1.914602 - 0.004817 * t - 0.000014 * t * t) * np.sin(anomaly)
+              + (0.019993 - 0.000101 * t) * np.sin(2 * anomaly)
+              + 0.000289 * np.sin(3 * anomaly))
+    return (mean_longitude + center - 0.00569) % 360.0
+
+def moon(t: np.ndarray) -> np.ndarray:
+    """Geocentric longitude of the Moon, degrees"""
+    t2, t3, t4 = t * t, t ** 3, t ** 4
+    mean_longitude = 218.3164477 + 481267.88123421 * t - 0.0015786 * t2 + t3 / 538841 - t4 / 65194000
+    elongation = 297.8501921 + 445267.1114034 * t - 0.0018819 * t2 + t3 / 545868 - t4 / 113065000
+    sun_anomaly = 357.5291092 + 35999.0502909 * t - 0.0001536 * t2 + t3 / 24490000
+    moon_anomaly = 134.9633964 + 477198.8675055 * t + 0.0087414 * t2 + t3 / 69699 - t4 / 14712000
+    latitude_argument = 93.2720950 + 483202.0175233 * t - 0.0036539 * t2 - t3 / 3526000 + t4 / 863310000
+    eccentricity = 1.0 - 0.002516 * t - 0.0000074 * t2
+
+    arguments = np.radians(np.stack([elongation, sun_anomaly, moon_anomaly, latitude_argument], axis=-1))
+    terms = np.sin(arguments @ _MOON_TERMS[:, :4].T) * _MOON_TERMS[:, 4]
+
+    # Terms involving the Sun's anomaly shrink with the Earth's orbital eccentricity
+    sun_multiple = np.abs(_MOON_TERMS[:, 1])
+    terms *= eccentricity[..., None] ** sun_multiple
+
+    a1 = np.radians(119.75 + 131.849 * t)
+    a2 = np.radians(53.09 + 479264.290 * t)
+    additive = (3958 * np.sin(a1) + 1962 * np.sin(np.radians(mean_longitude - latitude_argument))
+                + 318 * np.sin(a2))
+
+    return (mean_longitude + (terms.sum(axis=-1) + additive) / 1e6) % 360.0
+
+def mean_node(t: np.ndarray) -> np.ndarray:
+    """Longitude of the mean ascending lunar node, degrees"""
+    return (125.0445479 - 1934.1362891 * t + 0.0020754 * t * t
+            + t ** 3 / 467441 - t ** 4 / 60616000) % 360.0
+
+def _heliocentric(name: str, t: np.ndarray):
+    """Heliocentric ecliptic coordinates (J2000 frame) from the Keplerian elements"""
+    base, rate = _ELEMENTS[name]
+    a, e, inclination, mean_longitude, perihelion, node = (
+        value + value_rate * t for value, value_rate in zip(base, rate)
+    )
+    mean_anomaly = np.radians((mean_longitude - perihelion + 180.0) % 360.0 - 180.0)
+
+    # Kepler's equation; a few Newton steps are exact to well below the model error
+    eccentric = mean_anomaly + e * np.sin(mean_anomaly)
+    for _ in range(4):
+        eccentric -= (eccentric - e * np.sin(eccentric) - mean_anomaly) / (1.0 - e * np.cos(eccentric))
+
+    x_orbit = a * (np.cos(eccentric) - e)
+    y_orbit = a * np.sqrt(1.0 - e * e) * np.sin(eccentric)
+
+    argument = np.radians(perihelion - node)
+    node = np.radians(node)
+    inclination = np.radians(inclination)
+    cos_w, sin_w = np.cos(argument), np.sin(argument)
+    cos_n, sin_n = np.cos(node), np.sin(node)
+    cos_i = np.cos(inclination)
+
+    x = (cos_w * cos_n - sin_w * sin_n * cos_i) * x_orbit + (-sin_w * cos_n - cos_w * sin_n * cos_i) * y_orbit
+    y = (cos_w * sin_n + sin_w * cos_n * cos_i) * x_orbit + (-sin_w * sin_n + cos_w * cos_n * cos_i) * y_orbit
+    z = np.sin(argument) * np.sin(inclination) * x_orbit + np.cos(argument) * np.sin(inclination) * y_orbit
+    return x, y, z
+
+def _earth(t: np.ndarray):
+    """Heliocentric ecliptic coordinates of the Earth (equinox of date) from the solar theory"""
+    anomaly = np.radians(357.52911 + 35999.05029 * t - 0.0001537 * t * t)
+    eccentricity = 0.016708634 - 0.000042037 * t - 0.0000001267 * t * t
+    center = ((1.914602 - 0.004817 * t - 0.000014 * t * t) * np.sin(anomaly)
+              + (0.019993 - 0.000101 * t) * np.sin(2 * anomaly)
+              + 0.000289 * np.sin(3 * anomaly))
+    true_anomaly = anomaly + np.radians(center)
+    distance = 1.000001018 * (1 - eccentricity ** 2) / (1 + eccentricity * np.cos(true_anomaly))
+    longitude = np.radians(280.46646 + 36000.76983 * t + 0.0003032 * t * t + center + 180.0)
+    return distance * np.cos(longitude), distance * np.sin(longitude)
+
+def planet(name: str, t: np.ndarray) -> np.ndarray:
+    """Geocentric longitude of a planet, corrected for light time, degrees"""
+    earth_x, earth_y = _earth(t)
+    precession = np.radians(_precession(t))
+    cos_p, sin_p = np.cos(precession), np.sin(precession)
+
+    light_time = np.zeros_like(t)
+    for _ in range(2):
+        x, y, z = _heliocentric(name, t - light_time / DAYS_PER_CENTURY)
+        x, y = x * cos_p - y * sin_p, x * sin_p + y * cos_p
+        dx, dy = x - earth_x, y - earth_y
+        light_time = np.sqrt(dx * dx + dy * dy + z * z) * _LIGHT_TIME_PER_AU
+
+    return np.degrees(np.arctan2(dy, dx)) % 360.0
+
+def sidereal_time(jd_ut: np.ndarray, longitude: np.ndarray) -> np.ndarray:
+    """Local mean sidereal time, degrees"""
+    days = np.asarray(jd_ut, dtype=float) - J2000
+    t_ut = days / DAYS_PER_CENTURY
+    return (280.46061837 + 360.98564736629 * days + 0.000387933 * t_ut * t_ut
+            - t_ut ** 3 / 38710000 + longitude) % 360.0
+
+def _obliquity(t: np.ndarray) -> np.ndarray:
+    """Mean obliquity of the ecliptic, radians"""
+    return np.radians(23.439291111 - 0.0130041667 * t - 1.639e-7 * t * t + 5.036e-7 * t ** 3)
+
+def ascendant(jd_ut: np.ndarray, t: np.ndarray, latitude: np.ndarray, longitude: np.ndarray) -> np.ndarray:
+    """Longitude of the ascendant from mean sidereal time and mean obliquity, degrees"""
+    ramc = np.radians(sidereal_time(jd_ut, longitude))
+    obliquity = _obliquity(t)
+    latitude = np.radians(latitude)
+
+    return np.degrees(np.arctan2(
+        np.cos(ramc),
+        -(np.sin(ramc) * np.cos(obliquity) + np.tan(latitude) * np.sin(obliquity))
+    )) % 360.0
+
+def rising_sidereal_time(ecliptic_longitude: np.ndarray, t: np.ndarray, latitude: np.ndarray) -> np.ndarray:
+    """Local sidereal time at which an ecliptic longitude is the ascendant (inverse of ``ascendant``), degrees"""
+    ecliptic_longitude = np.radians(ecliptic_longitude)
+    obliquity = _obliquity(t)
+    right_ascension = np.arctan2(np.sin(ecliptic_longitude) * np.cos(obliquity), np.cos(ecliptic_longitude))
+    declination = np.arcsin(np.sin(obliquity) * np.sin(ecliptic_longitude))
+    # The point rises at hour angle -H with cos H = -tan(latitude) tan(declination)
+    hour_angle = np.arccos(-np.tan(np.radians(latitude)) * np.tan(declination))
+    return np.degrees(right_ascension - hour_angle) % 360.0
+
+def tropical_longitudes(jd_tt: np.ndarray) -> Dict[str, np.ndarray]:
+    """Longitudes of the Sun, Moon, planets and mean node for an array of TT Julian Days"""
+    t = centuries(jd_tt)
+    positions = {'Sun': sun(t), 'Moon': moon(t)}
+    for name in _ELEMENTS:
+        positions[name] = planet(name, t)
+    positions['Rahu'] = mean_node(t)
+    return positions
+
+def near_boundary(longitude: np.ndarray, margin, span: Optional[float] = None) -> np.ndarray:
+    """True where a longitude is within ``margin`` degrees of a sign or nakshatra boundary.
+
+    With ``span``, multiples of ``span`` degrees count as boundaries as well
+    (``360 / 108`` for navamsa parts).
+    """
+    longitude = np.asarray(longitude) % 360.0
+    nakshatra_span = 360.0 / 27.0
+    in_sign = longitude % 30.0
+    in_nakshatra = longitude % nakshatra_span
+    near = ((in_sign < margin) | (in_sign > 30.0 - margin)
+            | (in_nakshatra < margin) | (in_nakshatra > nakshatra_span - margin))
+    if span is not None:
+        in_part = longitude % span
+        near |= (in_part < margin) | (in_part > span - margin)
+    return near
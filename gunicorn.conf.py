@@ -0,0 +1,20 @@
+"""
+Gunicorn settings for production (``gunicorn app:app`` picks this file up).
+
+The app is imported once in the master process (``preload_app``), so new and
+restarted workers are forks that start in milliseconds. Each worker then
+warms up in the background; ``GET /ready`` answers 200 once it has, and the
+platform's health check should point there rather than at ``/health``.
+"""
+
+import os
+
+bind = f"0.0.0.0:{os.environ.get('PORT', '10000')}"
+workers = int(os.environ.get('WEB_CONCURRENCY', 2))
+threads = int(os.environ.get('GUNICORN_THREADS', 1))
+preload_app = True
+
+def post_worker_init(worker):
+    """Start warming up the worker that has just loaded the app"""
+    from app import start_warmup
+    start_warmup()
@@ -0,0 +1,310 @@
+"""
+Asynchronous job queue for large matchmaking runs.
+
+Jobs are persisted in a local SQLite database so that they survive a worker
+restart: a job claimed by a worker holds a lease that is renewed after every
+chunk of work, and a job whose lease has expired is picked up again by the next
+idle worker, resuming after the last stored result.
+"""
+
+import json
+import logging
+import os
+import sqlite3
+import threading
+import time
+import uuid
+from contextlib import contextmanager
+from typing import Any, Callable, Dict, Iterator, List, Optional
+
+logger = logging.getLogger(__name__)
+
+# Item handler signature: (payload, start_index, stop_index) -> one result per index
+ItemHandler = Callable[[Dict[str, Any], int, int], List[Dict[str, Any]]]
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS jobs (
+    id TEXT PRIMARY KEY,
+    status TEXT NOT NULL,
+    payload TEXT NOT NULL,
+    total INTEGER NOT NULL,
+    completed INTEGER NOT NULL DEFAULT 0,
+    failed INTEGER NOT NULL DEFAULT 0,
+    cancel_requested INTEGER NOT NULL DEFAULT 0,
+    error TEXT,
+    lease_owner TEXT,
+    lease_expires REAL,
+    run_started_at REAL,
+    run_base INTEGER NOT NULL DEFAULT 0,
+    created_at REAL NOT NULL,
+    started_at REAL,
+    finished_at REAL
+);
+CREATE INDEX IF NOT EXISTS jobs_status_idx ON jobs (status, created_at);
+CREATE TABLE IF NOT EXISTS job_results (
+    job_id TEXT NOT NULL,
+    item_index INTEGER NOT NULL,
+    result TEXT NOT NULL,
+    PRIMARY KEY (job_id, item_index)
+);
+"""
+
+class JobStore:
+    """Durable job and result storage backed by SQLite"""
+
+    def __init__(self, path: str, lease_seconds: float = 60.0,
+                 dumps: Callable[[Any], str] = json.dumps):
+        self.path = path
+        self.lease_seconds = lease_seconds
+        self.dumps = dumps
+        directory = os.path.dirname(os.path.abspath(path))
+        os.makedirs(directory, exist_ok=True)
+        with self._connect() as conn:
+            conn.execute('PRAGMA journal_mode=WAL')
+            conn.executescript(_SCHEMA)
+
+    @contextmanager
+    def _connect(self) -> Iterator[sqlite3.Connection]:
+        """Open a short-lived autocommit connection; connections are not shared between threads"""
+        conn = sqlite3.connect(self.path, timeout=30.0, isolation_level=None)
+        conn.row_factory = sqlite3.Row
+        try:
+            yield conn
+        finally:
+            conn.close()
+
+    @contextmanager
+    def _transaction(self) -> Iterator[sqlite3.Connection]:
+        """Run the enclosed statements in one write transaction"""
+        with self._connect() as conn:
+            conn.execute('BEGIN IMMEDIATE')
+            try:
+                yield conn
+            except Exception:
+                conn.execute('ROLLBACK')
+                raise
+            conn.execute('COMMIT')
+
+    def submit(self, payload: Dict[str, Any], total: int) -> str:
+        """Persist a new job and return its ID"""
+        job_id = uuid.uuid4().hex
+        with self._connect() as conn:
+            conn.execute(
+                'INSERT INTO jobs (id, status, payload, total, created_at) VALUES (?, ?, ?, ?, ?)',
+                (job_id, 'queued', json.dumps(payload), total, time.time())
+            )
+        return job_id
+
+    def get(self, job_id: str) -> Optional[Dict[str, Any]]:
+        """Return the job row (without payload) or None"""
+        with self._connect() as conn:
+            row = conn.execute(
+                'SELECT id, status, total, completed, failed, cancel_requested, error, '
+                'run_started_at, run_base, created_at, started_at, finished_at FROM jobs WHERE id = ?',
+                (job_id,)
+            ).fetchone()
+        return dict(row) if row else None
+
+    def claim(self, owner: str) -> Optional[Dict[str, Any]]:
+        """Atomically claim the oldest queued job or a job whose lease expired"""
+        now = time.time()
+        with self._transaction() as conn:
+            row = conn.execute(
+                "SELECT id, payload, total, completed, failed, started_at FROM jobs "
+                "WHERE status = 'queued' OR (status = 'running' AND lease_expires < ?) "
+                "ORDER BY created_at LIMIT 1",
+                (now,)
+            ).fetchone()
+            if row is None:
+                return None
+            conn.execute(
+                "UPDATE jobs SET status = 'running', lease_owner = ?, lease_expires = ?, "
+                "run_started_at = ?, run_base = completed + failed, started_at = COALESCE(started_at, ?) "
+                "WHERE id = ?",
+                (owner, now + self.lease_seconds, now, now, row['id'])
+            )
+        job = dict(row)
+        job['payload'] = json.loads(job['payload'])
+        return job
+
+    def record_results(self, job_id: str, owner: str, start: int,
+                       results: List[Dict[str, Any]]) -> bool:
+        """Store a chunk of results and renew the lease.
+
+        Returns False when the lease has been lost or cancellation was requested,
+        in which case the caller should stop working on the job.
+        """
+        failed = sum(1 for item in results if not item.get('success', False))
+        with self._transaction() as conn:
+            row = conn.execute(
+                'SELECT lease_owner, cancel_requested FROM jobs WHERE id = ?', (job_id,)
+            ).fetchone()
+            if row is None or row['lease_owner'] != owner:
+                return False
+            conn.executemany(
+                'INSERT OR REPLACE INTO job_results (job_id, item_index, result) VALUES (?, ?, ?)',
+                [(job_id, start + offset, self.dumps(item)) for offset, item in enumerate(results)]
+            )
+            conn.execute(
+                'UPDATE jobs SET completed = completed + ?, failed = failed + ?, lease_expires = ? WHERE id = ?',
+                (len(results) - failed, failed, time.time() + self.lease_seconds, job_id)
+            )
+        return not row['cancel_requested']
+
+    def finish(self, job_id: str, owner: str, status: str, error: Optional[str] = None) -> None:
+        """Mark a job as finished if this worker still holds its lease"""
+        with self._connect() as conn:
+            conn.execute(
+                'UPDATE jobs SET status = ?, error = ?, finished_at = ?, lease_owner = NULL, lease_expires = NULL '
+                'WHERE id = ? AND lease_owner = ?',
+                (status, error, time.time(), job_id, owner)
+            )
+
+    def cancel(self, job_id: str) -> Optional[str]:
+        """Cancel a job; returns the resulting status or None if the job does not exist"""
+        with self._transaction() as conn:
+            row = conn.execute('SELECT status FROM jobs WHERE id = ?', (job_id,)).fetchone()
+            if row is None:
+                return None
+            status = row['status']
+            if status == 'queued':
+                status = 'cancelled'
+                conn.execute(
+                    "UPDATE jobs SET status = 'cancelled', finished_at = ? WHERE id = ?",
+                    (time.time(), job_id)
+                )
+            elif status == 'running':
+                conn.execute('UPDATE jobs SET cancel_requested = 1 WHERE id = ?', (job_id,))
+        return status
+
+    def iter_results(self, job_id: str, page_size: int = 500, raw: bool = False) -> Iterator[Any]:
+        """Yield stored results in index order, reading one page at a time.
+
+        With ``raw=True`` the stored JSON text is yielded without decoding it.
+        """
+        last_index = -1
+        while True:
+            with self._connect() as conn:
+                rows = conn.execute(
+                    'SELECT item_index, result FROM job_results WHERE job_id = ? AND item_index > ? '
+                    'ORDER BY item_index LIMIT ?',
+                    (job_id, last_index, page_size)
+                ).fetchall()
+            if not rows:
+                return
+            for row in rows:
+                yield row['result'] if raw else json.loads(row['result'])
+            last_index = rows[-1]['item_index']
+
+def describe_progress(job: Dict[str, Any]) -> Dict[str, Any]:
+    """Build the public progress view of a job, including throughput and ETA"""
+    done = job['completed'] + job['failed']
+    total = job['total']
+    throughput = None
+    eta_seconds = None
+
+    if job['status'] == 'running' and job['run_started_at']:
+        elapsed = time.time() - job['run_started_at']
+        processed = done - job['run_base']
+        if elapsed > 0 and processed > 0:
+            throughput = processed / elapsed
+            eta_seconds = (total - done) / throughput
+    elif job['finished_at'] and job['started_at'] and done:
+        throughput = done / max(job['finished_at'] - job['started_at'], 1e-9)
+
+    return {
+        'job_id': job['id'],
+        'status': 'cancelling' if job['status'] == 'running' and job['cancel_requested'] else job['status'],
+        'total': total,
+        'completed': job['completed'],
+        'failed': job['failed'],
+        'progress': round(done / total, 4) if total else 1.0,
+        'throughput_per_sec': round(throughput, 2) if throughput is not None else None,
+        'eta_seconds': round(eta_seconds, 1) if eta_seconds is not None else None,
+        'error': job['error'],
+        'created_at': job['created_at'],
+        'started_at': job['started_at'],
+        'finished_at': job['finished_at']
+    }
+
+class JobRunner:
+    """Local worker pool that executes queued jobs chunk by chunk.
+
+    Threads are started lazily on first use and restarted after a fork, so the
+    runner is safe to create at import time under ``gunicorn --preload``.
+    """
+
+    def __init__(self, store: JobStore, handler: ItemHandler, workers: int = 2,
+                 chunk_size: int = 50, poll_interval: float = 1.0):
+        self.store = store
+        self.handler = handler
+        self.workers = workers
+        self.chunk_size = chunk_size
+        self.poll_interval = poll_interval
+        self._wakeup = threading.Event()
+        self._lock = threading.Lock()
+        self._pid = None
+        self._threads: List[threading.Thread] = []
+
+    def ensure_started(self) -> None:
+        """Start the worker threads in this process if they are not running"""
+        if self._pid == os.getpid():
+            return
+        with self._lock:
+            if self._pid == os.getpid():
+                return
+            self._pid = os.getpid()
+            self._threads = []
+            for number in range(self.workers):
+                thread = threading.Thread(
+                    target=self._work_loop, name=f'job-worker-{number}', daemon=True
+                )
+                thread.start()
+                self._threads.append(thread)
+            logger.info(f"Job runner started with {self.workers} workers (pid {self._pid})")
+
+    def notify(self) -> None:
+        """Wake idle workers after a job has been submitted"""
+        self.ensure_started()
+        self._wakeup.set()
+
+    def _work_loop(self) -> None:
+        owner = f'{os.getpid()}-{threading.get_ident()}-{uuid.uuid4().hex[:8]}'
+        while True:
+            try:
+                job = self.store.claim(owner)
+            except Exception as e:
+                logger.error(f"Failed to claim job: {e}")
+                job = None
+
+            if job is None:
+                self._wakeup.wait(self.poll_interval)
+                self._wakeup.clear()
+                continue
+
+            self._run_job(job, owner)
+
+    def _run_job(self, job: Dict[str, Any], owner: str) -> None:
+        job_id = job['id']
+        position = job['completed'] + job['failed']
+        logger.info(f"Running job {job_id} from item {position}/{job['total']}")
+
+        try:
+            while position < job['total']:
+                stop = min(position + self.chunk_size, job['total'])
+                results = self.handler(job['payload'], position, stop)
+                if not self.store.record_results(job_id, owner, position, results):
+                    state = self.store.get(job_id)
+                    if state and state['cancel_requested']:
+                        self.store.finish(job_id, owner, 'cancelled')
+                        logger.info(f"Job {job_id} cancelled at item {stop}")
+                    else:
+                        logger.warning(f"Lost lease on job {job_id}; another worker took it over")
+                    return
+                position = stop
+
+            self.store.finish(job_id, owner, 'completed')
+            logger.info(f"Job {job_id} completed")
+        except Exception as e:
+            logger.error(f"Job {job_id} failed: {e}")
+            self.store.finish(job_id, owner, 'failed', str(e))
@@ -0,0 +1,126 @@
+"""
+Pre-rendered pages served from memory.
+
+A ``PageCache`` renders its pages once and keeps each one as ready-to-send
+bytes: uncompressed, gzip-compressed and, when the optional ``brotli``
+package is installed, brotli-compressed, each with a strong ETag. Serving a
+page is then a lookup, a choice of encoding and a byte copy, and a
+conditional request whose ETag still matches gets an empty 304.
+
+Pages are rendered again when one of their source files changes on disk;
+the files are checked at most every ``check_interval`` seconds.
+"""
+
+import gzip
+import hashlib
+import logging
+import os
+import threading
+import time
+from typing import Any, Callable, Dict, Iterable, NamedTuple, Optional, Sequence, Tuple
+
+try:
+    import brotli
+except ImportError:  # pragma: no cover - optional dependency
+    brotli = None
+
+logger = logging.getLogger(__name__)
+
+IDENTITY = 'identity'
+
+# Encodings in order of preference when the client accepts several equally
+ENCODINGS = ('br', 'gzip', IDENTITY) if brotli is not None else ('gzip', IDENTITY)
+
+def best_encoding(quality: Callable[[str], float], available: Iterable[str] = ENCODINGS) -> str:
+    """The available encoding the client accepts with the highest quality, given its quality of each encoding"""
+    candidates = [encoding for encoding in ENCODINGS if encoding in available]
+    best = max(candidates, key=lambda encoding: (quality(encoding), -candidates.index(encoding)))
+    return best if quality(best) > 0 else IDENTITY
+
+def compress(body: bytes) -> Dict[str, bytes]:
+    """``body`` in every available encoding"""
+    bodies = {IDENTITY: body, 'gzip': gzip.compress(body, compresslevel=9, mtime=0)}
+    if brotli is not None:
+        bodies['br'] = brotli.compress(body, quality=11)
+    return bodies
+
+class Page(NamedTuple):
+    """One rendered page in every available encoding"""
+    bodies: Dict[str, bytes]
+    etags: Dict[str, str]
+
+    @classmethod
+    def build(cls, html: str) -> 'Page':
+        bodies = compress(html.encode('utf-8'))
+        digest = hashlib.sha1(bodies[IDENTITY]).hexdigest()[:20]
+        # A strong ETag identifies one representation, so each encoding gets its own
+        etags = {encoding: digest if encoding == IDENTITY else f'{digest}-{encoding}' for encoding in bodies}
+        return cls(bodies, etags)
+
+class PageCache:
+    """Rendered pages of this worker, re-rendered when a source file changes.
+
+    ``render`` returns the HTML of every page by name. A render that fails at
+    startup raises; later a failed re-render is logged and the previous pages
+    stay in use.
+    """
+
+    def __init__(self, render: Callable[[], Dict[str, str]], sources: Sequence[str], check_interval: float = 2.0):
+        self.render = render
+        self.sources = list(sources)
+        self.check_interval = check_interval
+        self._lock = threading.Lock()
+        self._counts = {'renders': 0, 'errors': 0}
+        self._last_error: Optional[str] = None
+        self._render_ms = 0.0
+        self._stamp = self._source_stamp()
+        self._pages = self._render()
+        self._checked = time.monotonic()
+
+    def _source_stamp(self) -> Tuple[Optional[Tuple[int, int]], ...]:
+        stamps = []
+        for path in self.sources:
+            try:
+                stat = os.stat(path)
+            except OSError:
+                stamps.append(None)
+            else:
+                stamps.append((stat.st_mtime_ns, stat.st_size))
+        return tuple(stamps)
+
+    def _render(self) -> Dict[str, Page]:
+        started = time.perf_counter()
+        rendered = {name: Page.build(html) for name, html in self.render().items()}
+        self._render_ms = (time.perf_counter() - started) * 1000
+        self._counts['renders'] += 1
+        return rendered
+
+    def get(self, name: str) -> Page:
+        if time.monotonic() - self._checked >= self.check_interval:
+            with self._lock:
+                if time.monotonic() - self._checked >= self.check_interval:
+                    self._checked = time.monotonic()
+                    stamp = self._source_stamp()
+                    if stamp != self._stamp:
+                        self._stamp = stamp
+                        try:
+                            self._pages = self._render()
+                            self._last_error = None
+                            logger.info(f"Re-rendered pages {', '.join(self._pages)} in {self._render_ms:.1f} ms")
+                        except Exception as e:
+                            self._counts['errors'] += 1
+                            self._last_error = str(e)
+                            logger.error(f"Keeping the previously rendered pages; rendering failed: {e}")
+        return self._pages[name]
+
+    def metrics(self) -> Dict[str, Any]:
+        return {
+            'pages': {
+                name: {encoding: len(body) for encoding, body in page.bodies.items()}
+                for name, page in self._pages.items()
+            },
+            'encodings': list(ENCODINGS),
+            'last_render_ms': round(self._render_ms, 3),
+            'last_error': self._last_error,
+            **self._counts
+        }
@@ -0,0 +1,139 @@
+"""
+Table-driven ten-porutham (Dasa Porutham) matching.
+
+Every porutham depends only on the Moon nakshatras of the bride and groom
+(Dina, Gana, Mahendra, Stree Deergha, Yoni, Rajju, Vedha) or only on their
+Moon signs (Rasi, Rasiyathipathi, Vasya). All of them are evaluated once at
+import for every pair into two small bit mask tables, indexed
+``[bride, groom]``: ``NAKSHATRA_TABLE`` (27×27) and ``RASI_TABLE`` (12×12).
+Bit ``i`` of a mask is set when porutham ``NAMES[i]`` agrees. Matching a pair
+is then two lookups and an OR, and ``match_many`` does the same for whole
+arrays of charts.
+
+Rules follow the common South Indian practice; counts run from the bride's
+star (or sign) to the groom's, counting the bride's own as 1.
+"""
+
+from typing import List
+
+import numpy as np
+
+NAMES = (
+    'dina', 'gana', 'mahendra', 'stree_deergha', 'yoni',
+    'rasi', 'rasiyathipathi', 'vasya', 'rajju', 'vedha'
+)
+BITS = {name: 1 << index for index, name in enumerate(NAMES)}
+
+# Temperament of each nakshatra
+GANAS = [
+    'deva', 'manushya', 'rakshasa', 'manushya', 'deva', 'manushya',
+    'deva', 'deva', 'rakshasa', 'rakshasa', 'manushya', 'manushya',
+    'deva', 'rakshasa', 'deva', 'rakshasa', 'deva', 'rakshasa',
+    'rakshasa', 'manushya', 'manushya', 'deva', 'rakshasa', 'rakshasa',
+    'manushya', 'manushya', 'deva'
+]
+
+# Animal of each nakshatra and the pairs of animals that are enemies
+YONIS = [
+    'horse', 'elephant', 'goat', 'serpent', 'serpent', 'dog',
+    'cat', 'goat', 'cat', 'rat', 'rat', 'cow',
+    'buffalo', 'tiger', 'buffalo', 'tiger', 'deer', 'deer',
+    'dog', 'monkey', 'mongoose', 'monkey', 'lion', 'horse',
+    'lion', 'cow', 'elephant'
+]
+YONI_ENEMIES = {
+    frozenset(pair) for pair in (
+        ('horse', 'buffalo'), ('elephant', 'lion'), ('goat', 'monkey'), ('serpent', 'mongoose'),
+        ('dog', 'deer'), ('cat', 'rat'), ('cow', 'tiger')
+    )
+}
+
+# Body part of each nakshatra: the parts rise from foot to head and back down
+# in every group of nine stars
+RAJJUS = ['pada', 'kati', 'nabhi', 'kantha', 'siro', 'kantha', 'nabhi', 'kati', 'pada'] * 3
+
+# Pairs of nakshatras that obstruct each other; Mrigashira, Chitra and
+# Dhanishta obstruct one another
+VEDHA_PAIRS = {
+    frozenset(pair) for pair in (
+        (0, 17), (1, 16), (2, 15), (3, 14), (5, 21), (6, 20), (7, 19), (8, 18),
+        (9, 26), (10, 25), (11, 24), (12, 23), (4, 13), (4, 22), (13, 22)
+    )
+}
+
+# Lord of each sign and the natural enemies of each lord
+RASI_LORDS = [
+    'Mars', 'Venus', 'Mercury', 'Moon', 'Sun', 'Mercury',
+    'Venus', 'Mars', 'Jupiter', 'Saturn', 'Saturn', 'Jupiter'
+]
+LORD_ENEMIES = {
+    'Sun': {'Venus', 'Saturn'},
+    'Moon': set(),
+    'Mars': {'Mercury'},
+    'Mercury': {'Moon'},
+    'Jupiter': {'Mercury', 'Venus'},
+    'Venus': {'Sun', 'Moon'},
+    'Saturn': {'Sun', 'Moon', 'Mars'}
+}
+
+# Signs that each sign attracts
+VASYA = {
+    0: {4, 7}, 1: {3, 6}, 2: {5}, 3: {7, 8}, 4: {6, 9}, 5: {1, 11},
+    6: {5, 9}, 7: {3, 5}, 8: {11}, 9: {0, 10}, 10: {0, 11}, 11: {9}
+}
+
+def star_count(bride: int, groom: int) -> int:
+    """Position of the groom's nakshatra counted from the bride's (1-27)"""
+    return (groom - bride) % 27 + 1
+
+def sign_count(bride: int, groom: int) -> int:
+    """Position of the groom's sign counted from the bride's (1-12)"""
+    return (groom - bride) % 12 + 1
+
+def _nakshatra_mask(bride: int, groom: int) -> int:
+    count = star_count(bride, groom)
+    ganas = {GANAS[bride], GANAS[groom]}
+    checks = {
+        'dina': count % 9 in (0, 2, 4, 6, 8),
+        'gana': len(ganas) == 1 or ganas == {'deva', 'manushya'},
+        'mahendra': count in (4, 7, 10, 13, 16, 19, 22, 25),
+        'stree_deergha': count > 13,
+        'yoni': frozenset((YONIS[bride], YONIS[groom])) not in YONI_ENEMIES,
+        'rajju': RAJJUS[bride] != RAJJUS[groom],
+        'vedha': frozenset((bride, groom)) not in VEDHA_PAIRS
+    }
+    return sum(BITS[name] for name, agrees in checks.items() if agrees)
+
+def _rasi_mask(bride: int, groom: int) -> int:
+    bride_lord, groom_lord = RASI_LORDS[bride], RASI_LORDS[groom]
+    checks = {
+        # The 2/12 and 6/8 relations between the signs are inauspicious
+        'rasi': sign_count(bride, groom) not in (2, 6, 8, 12),
+        'rasiyathipathi': groom_lord not in LORD_ENEMIES[bride_lord] and bride_lord not in LORD_ENEMIES[groom_lord],
+        'vasya': groom in VASYA[bride] or bride in VASYA[groom]
+    }
+    return sum(BITS[name] for name, agrees in checks.items() if agrees)
+
+NAKSHATRA_TABLE = np.array([[_nakshatra_mask(bride, groom) for groom in range(27)] for bride in range(27)],
+                           dtype=np.uint16)
+RASI_TABLE = np.array([[_rasi_mask(bride, groom) for groom in range(12)] for bride in range(12)],
+                      dtype=np.uint16)
+
+# Number of agreeing poruthams for every mask
+MATCH_COUNTS = np.array([bin(mask).count('1') for mask in range(1 << len(NAMES))], dtype=np.uint8)
+
+def match(bride_nakshatra: int, bride_rasi: int, groom_nakshatra: int, groom_rasi: int) -> int:
+    """Bit mask of the poruthams that agree for one couple"""
+    return int(NAKSHATRA_TABLE[bride_nakshatra, groom_nakshatra] | RASI_TABLE[bride_rasi, groom_rasi])
+
+def match_many(bride_nakshatras, bride_rasis, groom_nakshatras, groom_rasis) -> np.ndarray:
+    """Bit masks for arrays of couples; the index arrays broadcast against each other"""
+    return NAKSHATRA_TABLE[bride_nakshatras, groom_nakshatras] | RASI_TABLE[bride_rasis, groom_rasis]
+
+def count(masks):
+    """Number of agreeing poruthams in a mask or an array of masks"""
+    return MATCH_COUNTS[masks]
+
+def matched(mask: int) -> List[str]:
+    """Names of the poruthams that agree in a mask"""
+    return [name for name in NAMES if mask & BITS[name]]
@@ -0,0 +1,147 @@
+"""
+Content-addressed store of analysis results.
+
+Every analysis is stored once, encoded, under a digest of its normalized
+inputs (birth moments, places, chart settings, options, rules revision and
+analysis code version), with one body per language. The digest is the
+result's permalink: the bytes stored under it never change, so they can be
+served as they are and cached by clients indefinitely. The inputs are kept
+next to the bodies, so a language that has not been requested yet can be
+computed from them on first access.
+
+The store is a SQLite file shared by all workers on a host. It is bounded by
+the total size of the stored bodies; when a new body pushes it over the
+limit, the least recently used bodies are evicted, and the inputs of a
+digest go with its last body.
+"""
+
+import json
+import logging
+import os
+import sqlite3
+import threading
+import time
+from contextlib import contextmanager
+from typing import Any, Dict, Iterator, Optional
+
+logger = logging.getLogger(__name__)
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS results (
+    digest TEXT NOT NULL,
+    lang TEXT NOT NULL,
+    body BLOB NOT NULL,
+    size INTEGER NOT NULL,
+    created_at REAL NOT NULL,
+    used_at REAL NOT NULL,
+    PRIMARY KEY (digest, lang)
+);
+-- Covers the size sums of eviction, which would otherwise read every body
+CREATE INDEX IF NOT EXISTS results_used_idx ON results (used_at, size);
+CREATE TABLE IF NOT EXISTS result_inputs (
+    digest TEXT PRIMARY KEY,
+    inputs TEXT NOT NULL
+);
+"""
+
+# Reads refresh a body's last use at most this often, to keep reads from writing
+_TOUCH_INTERVAL = 60.0
+
+class ResultStore:
+    """Encoded analysis bodies by digest and language, bounded by ``max_bytes`` (0 disables the store)"""
+
+    def __init__(self, path: str, max_bytes: int):
+        self.path = path
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+        self._counts = {'hits': 0, 'misses': 0, 'stored': 0, 'evicted': 0}
+        if max_bytes > 0:
+            os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+            with self._connect() as conn:
+                conn.execute('PRAGMA journal_mode=WAL')
+                conn.executescript(_SCHEMA)
+
+    @contextmanager
+    def _connect(self) -> Iterator[sqlite3.Connection]:
+        """Open a short-lived autocommit connection; connections are not shared between threads"""
+        conn = sqlite3.connect(self.path, timeout=30.0, isolation_level=None)
+        # The store is a cache: a body lost in a power failure is computed again
+        conn.execute('PRAGMA synchronous=NORMAL')
+        try:
+            yield conn
+        finally:
+            conn.close()
+
+    def _count(self, name: str) -> None:
+        with self._lock:
+            self._counts[name] += 1
+
+    def get(self, digest: str, lang: str) -> Optional[bytes]:
+        """The stored body of a digest in a language, or None"""
+        if self.max_bytes <= 0:
+            return None
+        now = time.time()
+        with self._connect() as conn:
+            row = conn.execute('SELECT body, used_at FROM results WHERE digest = ? AND lang = ?',
+                               (digest, lang)).fetchone()
+            if row is not None and now - row[1] > _TOUCH_INTERVAL:
+                conn.execute('UPDATE results SET used_at = ? WHERE digest = ? AND lang = ?', (now, digest, lang))
+        self._count('misses' if row is None else 'hits')
+        return None if row is None else bytes(row[0])
+
+    def inputs(self, digest: str) -> Optional[Dict[str, Any]]:
+        """The inputs stored with a digest, or None"""
+        if self.max_bytes <= 0:
+            return None
+        with self._connect() as conn:
+            row = conn.execute('SELECT inputs FROM result_inputs WHERE digest = ?', (digest,)).fetchone()
+        return None if row is None else json.loads(row[0])
+
+    def put(self, digest: str, lang: str, body: bytes, inputs: Dict[str, Any]) -> None:
+        """Store a body and its inputs, then evict the least recently used bodies beyond ``max_bytes``"""
+        if self.max_bytes <= 0 or len(body) > self.max_bytes:
+            return
+        now = time.time()
+        with self._connect() as conn:
+            conn.execute('BEGIN IMMEDIATE')
+            try:
+                conn.execute('INSERT OR IGNORE INTO result_inputs (digest, inputs) VALUES (?, ?)',
+                             (digest, json.dumps(inputs, sort_keys=True)))
+                conn.execute(
+                    'INSERT OR REPLACE INTO results (digest, lang, body, size, created_at, used_at) '
+                    'VALUES (?, ?, ?, ?, ?, ?)',
+                    (digest, lang, sqlite3.Binary(body), len(body), now, now)
+                )
+                evicted = self._evict(conn)
+            except Exception:
+                conn.execute('ROLLBACK')
+                raise
+            conn.execute('COMMIT')
+        self._count('stored')
+        if evicted:
+            with self._lock:
+                self._counts['evicted'] += evicted
+
+    def _evict(self, conn: sqlite3.Connection) -> int:
+        total = conn.execute('SELECT COALESCE(SUM(size), 0) FROM results').fetchone()[0]
+        if total <= self.max_bytes:
+            return 0
+        # Keep the most recently used bodies that fit
+        evicted = conn.execute(
+            'DELETE FROM results WHERE rowid IN ('
+            '  SELECT rowid FROM (SELECT rowid, SUM(size) OVER (ORDER BY used_at DESC, rowid DESC) AS kept'
+            '                     FROM results) WHERE kept > ?)',
+            (self.max_bytes,)
+        ).rowcount
+        conn.execute('DELETE FROM result_inputs WHERE digest NOT IN (SELECT digest FROM results)')
+        return evicted
+
+    def metrics(self) -> Dict[str, Any]:
+        stored = {'entries': 0, 'bytes': 0}
+        if self.max_bytes > 0:
+            with self._connect() as conn:
+                stored['entries'], stored['bytes'] = conn.execute(
+                    'SELECT COUNT(*), COALESCE(SUM(size), 0) FROM results'
+                ).fetchone()
+        with self._lock:
+            return {'enabled': self.max_bytes > 0, 'max_bytes': self.max_bytes, **stored, **self._counts}
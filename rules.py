@@ -0,0 +1,359 @@
+"""
+Declarative compatibility rules.
+
+A ruleset lists the conditions a node's nakshatra lord is checked against in
+the other partner's chart, their weights and the verdict thresholds. It is
+written as JSON (or YAML, when PyYAML is installed) and compiled into a
+``RulePlan``, which evaluates it in two ways:
+
+* ``RulePlan.evaluate`` checks one lord against one chart's features and
+  reports which conditions matched and why (the /analyze path);
+* ``RulePlan.match_many`` checks arrays of lords against arrays of encoded
+  features at once and returns a bit mask per pair (screening jobs and the
+  reverse search).
+
+Conditions only read the chart features named in ``LORD_FEATURES`` and
+``SET_FEATURES``; a condition applies when the chart provides every feature
+it tests (the navamsa features only exist when navamsa is requested).
+``DEFAULT_RULES`` reproduces the built-in analysis. A ``RuleStore`` reloads
+its file when it changes, so rules can be edited without restarting workers.
+"""
+
+import hashlib
+import json
+import logging
+import os
+import re
+import threading
+import time
+from typing import Any, Callable, Dict, List, NamedTuple, Optional, Sequence, Tuple
+
+import numpy as np
+
+try:
+    import yaml
+except ImportError:  # pragma: no cover - optional dependency
+    yaml = None
+
+logger = logging.getLogger(__name__)
+
+# Lords a node can have (the nakshatra lords), in bit order
+GRAHAS = ('Sun', 'Moon', 'Mars', 'Mercury', 'Jupiter', 'Venus', 'Saturn', 'Rahu', 'Ketu')
+GRAHA_INDEX = {name: index for index, name in enumerate(GRAHAS)}
+
+# Chart features holding one lord, and features holding a set of bodies
+LORD_FEATURES = (
+    'moon_rasi_lord', 'moon_nakshatra_lord', 'lagna_rasi_lord', 'lagna_nakshatra_lord',
+    'navamsa_moon_rasi_lord', 'navamsa_lagna_rasi_lord'
+)
+SET_FEATURES = ('lagna_occupants', 'moon_rasi_occupants')
+
+VERDICT_CLASSES = ('high', 'moderate', 'low')
+
+# Placeholders of reason templates besides the features
+_CONTEXT = ('node', 'lord', 'partner', 'Partner', 'matched')
+
+DEFAULT_RULES: Dict[str, Any] = {
+    'name': 'default',
+    'conditions': [
+        {
+            'id': 'rasi_moon_sign',
+            'label': '{partner}_rasi_moon_sign',
+            'any': [{'lord_is': 'moon_rasi_lord'}],
+            'reason': '{node} {lord} = <{partner}_moon_sign_lord> {moon_rasi_lord}'
+        },
+        {
+            'id': 'nakshatra',
+            'label': '{partner}_nakshatra',
+            'any': [{'lord_is': 'moon_nakshatra_lord'}],
+            'reason': '{node} {lord} = <{partner}_moon_nakshatra_lord> {moon_nakshatra_lord}'
+        },
+        {
+            'id': 'lagna_point',
+            'label': '{partner}_lagna_point',
+            'any': [
+                {'lord_is': 'lagna_rasi_lord', 'describe': 'Rasi Lord {lagna_rasi_lord}'},
+                {'lord_is': 'lagna_nakshatra_lord', 'describe': 'Nakshatra Lord {lagna_nakshatra_lord}'}
+            ],
+            'reason': '{node} {lord} = {Partner} Lagna {matched}'
+        },
+        {
+            'id': 'planets_in_lagna',
+            'label': 'planets_in_{partner}_lagna',
+            'any': [{'lord_in': 'lagna_occupants'}],
+            'reason': '{node} {lord} <present_in_{partner}_lagna>'
+        },
+        {
+            'id': 'planets_in_rasi',
+            'label': 'planets_in_{partner}_rasi',
+            'any': [{'lord_in': 'moon_rasi_occupants'}],
+            'reason': '{node} {lord} <present_in_{partner}_moon_sign>'
+        },
+        {
+            'id': 'navamsa_moon_sign',
+            'label': '{partner}_navamsa_moon_sign',
+            'any': [{'lord_is': 'navamsa_moon_rasi_lord'}],
+            'reason': '{node} {lord} = <{partner}_navamsa_moon_sign> {navamsa_moon_rasi_lord}'
+        },
+        {
+            'id': 'navamsa_lagna',
+            'label': '{partner}_navamsa_lagna',
+            'any': [{'lord_is': 'navamsa_lagna_rasi_lord'}],
+            'reason': '{node} {lord} = <{partner}_navamsa_lagna> {navamsa_lagna_rasi_lord}'
+        }
+    ],
+    'verdicts': {'high': 3, 'moderate': 1}
+}
+
+class Term(NamedTuple):
+    """One test of a condition: the lord equals a lord feature or is in a set feature"""
+    feature: str
+    is_set: bool
+    describe: str
+
+class Condition(NamedTuple):
+    id: str
+    label: str
+    terms: Tuple[Term, ...]
+    weight: int
+    reason: str
+
+    @property
+    def features(self) -> Tuple[str, ...]:
+        return tuple(term.feature for term in self.terms)
+
+def _format(template: str, values: Dict[str, Any]) -> str:
+    def value(match: 're.Match') -> str:
+        item = values[match.group(1)]
+        return ', '.join(item) if isinstance(item, (list, tuple, set, frozenset)) else str(item)
+    return re.sub(r'\{(\w+)\}', value, template)
+
+def _placeholders(template: str) -> List[str]:
+    return re.findall(r'\{(\w+)\}', template)
+
+class RulePlan:
+    """A compiled ruleset"""
+
+    def __init__(self, conditions: Sequence[Condition], thresholds: Dict[str, int], name: str, revision: str):
+        self.conditions = tuple(conditions)
+        self.thresholds = thresholds
+        self.name = name
+        self.revision = revision
+        self._weights = np.array([condition.weight for condition in self.conditions], dtype=np.int64)
+        self._bits = {condition.id: bit for bit, condition in enumerate(self.conditions)}
+
+    def applies(self, condition: Condition, features: Dict[str, Any]) -> bool:
+        return all(feature in features for feature in condition.features)
+
+    def evaluate(self, lord: str, features: Dict[str, Any]) -> List[Tuple[Condition, List[Term]]]:
+        """Conditions that ``lord`` matches in a chart, each with the terms that matched"""
+        matched = []
+        for condition in self.conditions:
+            if not self.applies(condition, features):
+                continue
+            terms = [
+                term for term in condition.terms
+                if (lord in features[term.feature] if term.is_set else lord == features[term.feature])
+            ]
+            if terms:
+                matched.append((condition, terms))
+        return matched
+
+    def reason(self, condition: Condition, terms: Sequence[Term], features: Dict[str, Any],
+               context: Dict[str, str], translate: Callable[[str], str]) -> str:
+        """Explanation of a match from the condition's template"""
+        partner = context['partner']
+        values = {**features, **context, 'Partner': partner.capitalize()}
+        values['matched'] = ' & '.join(_format(term.describe, values) for term in terms if term.describe)
+        template = condition.reason.replace('{partner}', partner)
+        template = re.sub(r'<(\w+)>', lambda match: translate(match.group(1)), template)
+        return _format(template, values)
+
+    def total(self, matched: Sequence[Tuple[Condition, Any]]) -> int:
+        return sum(condition.weight for condition, _ in matched)
+
+    def mask(self, matched: Sequence[Tuple[Condition, Any]]) -> int:
+        """Bit mask of ``evaluate`` results, with the bits of ``match_many``"""
+        return sum(1 << self._bits[condition.id] for condition, _ in matched)
+
+    @staticmethod
+    def encode(features: Sequence[Dict[str, Any]]) -> Dict[str, np.ndarray]:
+        """Feature arrays for ``match_many`` from per-chart feature dicts.
+
+        Lord features become indexes into ``GRAHAS`` (-1 when absent) and set
+        features bit masks over ``GRAHAS``. A feature missing from any chart is
+        left out, so conditions reading it never match.
+        """
+        encoded = {}
+        for name in LORD_FEATURES:
+            if features and all(name in item for item in features):
+                encoded[name] = np.array([GRAHA_INDEX.get(item[name], -1) for item in features], dtype=np.int64)
+        for name in SET_FEATURES:
+            if features and all(name in item for item in features):
+                encoded[name] = np.array([
+                    sum(1 << GRAHA_INDEX[body] for body in set(item[name]) if body in GRAHA_INDEX)
+                    for item in features
+                ], dtype=np.int64)
+        return encoded
+
+    def match_many(self, lords: np.ndarray, features: Dict[str, np.ndarray]) -> np.ndarray:
+        """Bit masks (bit ``i`` for ``conditions[i]``) for arrays of lord indexes and encoded features.
+
+        All arrays broadcast against each other.
+        """
+        lords = np.asarray(lords, dtype=np.int64)
+        masks = np.zeros(np.broadcast(lords, *features.values()).shape if features else lords.shape, dtype=np.int64)
+        for bit, condition in enumerate(self.conditions):
+            if not all(feature in features for feature in condition.features):
+                continue
+            hit = np.zeros(masks.shape, dtype=bool)
+            for term in condition.terms:
+                values = features[term.feature]
+                hit |= ((values >> lords) & 1).astype(bool) if term.is_set else values == lords
+            masks |= hit.astype(np.int64) << bit
+        return masks
+
+    def totals(self, masks: np.ndarray) -> np.ndarray:
+        """Summed weights of the matched conditions for an array of masks"""
+        masks = np.asarray(masks, dtype=np.int64)
+        bits = (masks[..., None] >> np.arange(len(self.conditions))) & 1
+        return bits @ self._weights
+
+    def conditions_in(self, mask: int) -> List[Condition]:
+        return [condition for bit, condition in enumerate(self.conditions) if mask >> bit & 1]
+
+    def verdict_class(self, total: int) -> str:
+        for verdict_class in VERDICT_CLASSES[:-1]:
+            if total >= self.thresholds[verdict_class]:
+                return verdict_class
+        return VERDICT_CLASSES[-1]
+
+def compile_rules(spec: Dict[str, Any]) -> RulePlan:
+    """Validate a ruleset and compile it; raises ValueError on invalid rules"""
+    if not isinstance(spec, dict) or not isinstance(spec.get('conditions'), list) or not spec['conditions']:
+        raise ValueError('Rules must be an object with a non-empty "conditions" list')
+
+    conditions = []
+    for position, item in enumerate(spec['conditions']):
+        if not isinstance(item, dict) or not isinstance(item.get('id'), str):
+            raise ValueError(f'Condition {position}: expected an object with an "id"')
+        where = f"Condition {item['id']}"
+        if any(condition.id == item['id'] for condition in conditions):
+            raise ValueError(f'{where}: duplicate id')
+        if not isinstance(item.get('any'), list) or not item['any']:
+            raise ValueError(f'{where}: "any" must be a non-empty list of tests')
+
+        terms = []
+        for test in item['any']:
+            if not isinstance(test, dict) or len({'lord_is', 'lord_in'} & set(test)) != 1:
+                raise ValueError(f'{where}: every test needs exactly one of "lord_is" or "lord_in"')
+            is_set = 'lord_in' in test
+            feature = test['lord_in' if is_set else 'lord_is']
+            if feature not in (SET_FEATURES if is_set else LORD_FEATURES):
+                choices = ', '.join(SET_FEATURES if is_set else LORD_FEATURES)
+                raise ValueError(f'{where}: unknown feature {feature!r} (choose from {choices})')
+            terms.append(Term(feature, is_set, str(test.get('describe', ''))))
+
+        weight = item.get('weight', 1)
+        if not isinstance(weight, int) or isinstance(weight, bool) or weight < 1:
+            raise ValueError(f'{where}: weight must be a positive integer')
+
+        label = str(item.get('label', item['id']))
+        reason = str(item.get('reason', '{node} {lord} = <' + label + '>'))
+        allowed = set(LORD_FEATURES + SET_FEATURES + _CONTEXT)
+        for template in [reason] + [term.describe for term in terms]:
+            unknown = set(_placeholders(template)) - allowed
+            if unknown:
+                raise ValueError(f"{where}: unknown placeholder {{{sorted(unknown)[0]}}}")
+        conditions.append(Condition(item['id'], label, tuple(terms), weight, reason))
+
+    if len(conditions) > 62:
+        raise ValueError('Rules may have at most 62 conditions')
+
+    verdicts = spec.get('verdicts', DEFAULT_RULES['verdicts'])
+    if not isinstance(verdicts, dict) or set(verdicts) != set(VERDICT_CLASSES[:-1]) \
+            or not all(isinstance(value, int) and not isinstance(value, bool) for value in verdicts.values()):
+        raise ValueError('"verdicts" must give integer minimum totals for "high" and "moderate"')
+    if verdicts['high'] < verdicts['moderate']:
+        raise ValueError('The "high" threshold must not be below the "moderate" threshold')
+
+    revision = hashlib.sha1(json.dumps(spec, sort_keys=True).encode()).hexdigest()[:12]
+    return RulePlan(conditions, dict(verdicts), str(spec.get('name', 'custom')), revision)
+
+def load_rules(path: str) -> RulePlan:
+    """Compile the ruleset in a JSON or YAML file"""
+    with open(path, encoding='utf-8') as handle:
+        text = handle.read()
+    if path.endswith(('.yaml', '.yml')):
+        if yaml is None:
+            raise ValueError('YAML rules need PyYAML (pip install pyyaml); use JSON otherwise')
+        try:
+            spec = yaml.safe_load(text)
+        except yaml.YAMLError as e:
+            raise ValueError(f'Invalid YAML: {e}')
+    else:
+        spec = json.loads(text)
+    return compile_rules(spec)
+
+DEFAULT_PLAN = compile_rules(DEFAULT_RULES)
+
+class RuleStore:
+    """Current ruleset of this worker, reloaded when its file changes.
+
+    The file is checked at most every ``check_interval`` seconds. A file that
+    fails to load at startup raises; later a broken edit is logged and the
+    previous rules stay in effect.
+    """
+
+    def __init__(self, path: Optional[str] = None, check_interval: float = 2.0):
+        self.path = path or None
+        self.check_interval = check_interval
+        self._plan = DEFAULT_PLAN
+        self._lock = threading.Lock()
+        self._stamp: Optional[Tuple[float, int]] = None
+        self._checked = 0.0
+        self._counts = {'reloads': 0, 'errors': 0}
+        self._last_error: Optional[str] = None
+        if self.path:
+            self._plan = load_rules(self.path)
+            self._stamp = self._file_stamp()
+            self._checked = time.monotonic()
+
+    def _file_stamp(self) -> Optional[Tuple[float, int]]:
+        try:
+            stat = os.stat(self.path)
+        except OSError:
+            return None
+        return stat.st_mtime, stat.st_size
+
+    def current(self) -> RulePlan:
+        if not self.path or time.monotonic() - self._checked < self.check_interval:
+            return self._plan
+        with self._lock:
+            if time.monotonic() - self._checked >= self.check_interval:
+                self._checked = time.monotonic()
+                stamp = self._file_stamp()
+                if stamp is not None and stamp != self._stamp:
+                    self._stamp = stamp
+                    try:
+                        self._plan = load_rules(self.path)
+                        self._counts['reloads'] += 1
+                        self._last_error = None
+                        logger.info(f"Reloaded rules {self._plan.name} ({self._plan.revision}) from {self.path}")
+                    except (OSError, ValueError) as e:
+                        self._counts['errors'] += 1
+                        self._last_error = str(e)
+                        logger.error(f"Keeping rules {self._plan.revision}; {self.path} is invalid: {e}")
+            return self._plan
+
+    def metrics(self) -> Dict[str, Any]:
+        plan = self.current()
+        return {
+            'name': plan.name,
+            'revision': plan.revision,
+            'path': self.path,
+            'conditions': len(plan.conditions),
+            'verdicts': plan.thresholds,
+            'last_error': self._last_error,
+            **self._counts
+        }
@@ -0,0 +1,119 @@
+"""
+Fast JSON encoding for responses, job results and cached bodies.
+
+``FastJSONProvider`` replaces Flask's default JSON provider. It encodes with
+``orjson`` when that package is installed and with the standard library
+otherwise; both backends write the same JSON: sorted keys, compact
+separators and UTF-8 instead of ``\\u`` escapes, so Tamil text costs a third
+of the bytes.
+
+Values JSON has no type for are converted like Flask's default provider does
+(dates as HTTP dates, decimals and UUIDs as strings, dataclasses as objects),
+by an encoder looked up per type and built once: a dataclass such as
+``PlanetInfo`` becomes a dict through its precomputed field names instead of
+the recursive copy ``dataclasses.asdict`` makes of every instance. orjson
+encodes dataclasses natively.
+
+``dumps_bytes`` returns the encoded bytes, and ``raw_response`` sends bytes
+encoded earlier (a cached result, stored job results) without decoding and
+encoding them again.
+"""
+
+import dataclasses
+import datetime
+import decimal
+import json
+import logging
+import uuid
+from typing import Any, Callable, Dict, Optional
+
+from flask.json.provider import JSONProvider
+from werkzeug.http import http_date
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - optional dependency
+    orjson = None
+
+logger = logging.getLogger(__name__)
+
+# Available backends, the preferred one first
+BACKENDS = ('orjson', 'stdlib') if orjson is not None else ('stdlib',)
+
+_ENCODERS: Dict[type, Callable[[Any], Any]] = {}
+
+def register(cls: type, encoder: Callable[[Any], Any]) -> None:
+    """Convert instances of ``cls`` with ``encoder`` (the stdlib backend, and orjson for non-dataclasses)"""
+    _ENCODERS[cls] = encoder
+
+def _encoder_for(cls: type) -> Callable[[Any], Any]:
+    if issubclass(cls, datetime.date):
+        return http_date
+    if issubclass(cls, (decimal.Decimal, uuid.UUID)):
+        return str
+    if dataclasses.is_dataclass(cls):
+        names = tuple(item.name for item in dataclasses.fields(cls))
+        return lambda value: {name: getattr(value, name) for name in names}
+    if hasattr(cls, '__html__'):
+        return lambda value: str(value.__html__())
+    raise TypeError(f'Object of type {cls.__name__} is not JSON serializable')
+
+def default(value: Any) -> Any:
+    """JSON-native form of a value the encoders do not handle themselves"""
+    encoder = _ENCODERS.get(type(value))
+    if encoder is None:
+        encoder = _ENCODERS[type(value)] = _encoder_for(type(value))
+    return encoder(value)
+
+# Dates are passed to ``default`` so both backends format them as HTTP dates
+_ORJSON_OPTIONS = (orjson.OPT_SORT_KEYS | orjson.OPT_NON_STR_KEYS | orjson.OPT_PASSTHROUGH_DATETIME
+                   if orjson is not None else 0)
+_COMPACT = json.JSONEncoder(default=default, sort_keys=True, ensure_ascii=False, separators=(',', ':'))
+_INDENTED = json.JSONEncoder(default=default, sort_keys=True, ensure_ascii=False, indent=2)
+
+class FastJSONProvider(JSONProvider):
+    """JSON provider encoding with ``backend`` (``auto`` picks the fastest installed one)"""
+
+    mimetype = 'application/json'
+    # As with Flask's default provider: None indents responses in debug mode only
+    compact: Optional[bool] = None
+
+    def __init__(self, app, backend: str = 'auto'):
+        super().__init__(app)
+        if backend not in ('auto', 'orjson', 'stdlib'):
+            raise ValueError(f"Unsupported JSON backend: {backend} (choose from auto, orjson, stdlib)")
+        if backend == 'orjson' and orjson is None:
+            logger.warning("orjson is not installed; encoding JSON with the standard library")
+        self.backend = BACKENDS[0] if backend == 'auto' or backend not in BACKENDS else backend
+
+    def dumps_bytes(self, obj: Any, indent: bool = False) -> bytes:
+        """``obj`` encoded as UTF-8 JSON"""
+        if self.backend == 'orjson':
+            return orjson.dumps(obj, default=default,
+                                option=_ORJSON_OPTIONS | orjson.OPT_INDENT_2 if indent else _ORJSON_OPTIONS)
+        return (_INDENTED if indent else _COMPACT).encode(obj).encode('utf-8')
+
+    def dumps(self, obj: Any, **kwargs: Any) -> str:
+        if kwargs:
+            # Formatting arguments, as in flask.json.dumps(obj, indent=2)
+            return json.dumps(obj, **{'default': default, 'sort_keys': True, 'ensure_ascii': False, **kwargs})
+        if self.backend == 'orjson':
+            return orjson.dumps(obj, default=default, option=_ORJSON_OPTIONS).decode('utf-8')
+        return _COMPACT.encode(obj)
+
+    def loads(self, s: Any, **kwargs: Any) -> Any:
+        if self.backend == 'orjson' and not kwargs:
+            return orjson.loads(s)
+        return json.loads(s, **kwargs)
+
+    def response(self, *args: Any, **kwargs: Any):
+        obj = self._prepare_response_obj(args, kwargs)
+        indent = self.compact is False or (self.compact is None and self._app.debug)
+        return self.raw_response(self.dumps_bytes(obj, indent) + b'\n')
+
+    def raw_response(self, body: bytes, status: Optional[int] = None):
+        """Response with a body that is already encoded JSON"""
+        return self._app.response_class(body, status=status, mimetype=self.mimetype)
+
+    def metrics(self) -> Dict[str, Any]:
+        return {'backend': self.backend, 'available': list(BACKENDS)}
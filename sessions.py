@@ -0,0 +1,148 @@
+"""
+In-memory store for interactive analysis sessions.
+
+A session keeps one client's inputs and computed state between requests, so
+that an update only recomputes what its changed inputs affect. Sessions live
+in the worker process that created them (several workers need sticky
+routing), expire after a period of inactivity and are evicted least recently
+used first when the store is full. Updates are published to the session's
+subscribers, which back the server-sent event streams.
+"""
+
+import queue
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional
+
+# Markers delivered to subscribers instead of an event: the subscriber fell
+# behind and must resynchronize from a snapshot, or the session has ended
+RESYNC = object()
+CLOSED = object()
+
+class Session:
+    """Application state of one session, guarded by ``lock``, plus its event subscribers"""
+
+    def __init__(self, session_id: str, state: Any, max_pending: int = 64):
+        self.id = session_id
+        self.state = state
+        self.version = 0
+        self.lock = threading.Lock()
+        self.closed = False
+        self.last_used = time.monotonic()
+        self._max_pending = max_pending
+        self._subscribers: List['queue.Queue'] = []
+        self._subscribers_lock = threading.Lock()
+
+    def subscribe(self) -> 'queue.Queue':
+        """Queue that receives every event published from now on"""
+        subscriber: 'queue.Queue' = queue.Queue(self._max_pending)
+        with self._subscribers_lock:
+            if self.closed:
+                subscriber.put_nowait(CLOSED)
+            self._subscribers.append(subscriber)
+        return subscriber
+
+    def unsubscribe(self, subscriber: 'queue.Queue') -> None:
+        with self._subscribers_lock:
+            if subscriber in self._subscribers:
+                self._subscribers.remove(subscriber)
+
+    @property
+    def subscriber_count(self) -> int:
+        return len(self._subscribers)
+
+    def publish(self, event: Any) -> None:
+        """Deliver an event to every subscriber without blocking.
+
+        A subscriber whose queue is full has missed events; its backlog is
+        replaced by RESYNC.
+        """
+        with self._subscribers_lock:
+            for subscriber in self._subscribers:
+                try:
+                    subscriber.put_nowait(event)
+                except queue.Full:
+                    with subscriber.mutex:
+                        subscriber.queue.clear()
+                    subscriber.put_nowait(RESYNC)
+
+    def close(self) -> None:
+        """End the session and its event streams.
+
+        CLOSED replaces any backlog so a full queue cannot turn it into RESYNC.
+        """
+        with self._subscribers_lock:
+            self.closed = True
+            for subscriber in self._subscribers:
+                with subscriber.mutex:
+                    subscriber.queue.clear()
+                    subscriber.queue.append(CLOSED)
+                    subscriber.not_empty.notify()
+
+class SessionStore:
+    """Thread-safe map of live sessions with an idle timeout and a size bound"""
+
+    def __init__(self, ttl: float = 1800.0, max_sessions: int = 1000):
+        self.ttl = ttl
+        self.max_sessions = max_sessions
+        self._sessions: 'OrderedDict[str, Session]' = OrderedDict()
+        self._lock = threading.Lock()
+        self._counts = {'created': 0, 'expired': 0, 'evicted': 0, 'deleted': 0}
+
+    def create(self, state: Any) -> Session:
+        """Register a new session holding ``state``"""
+        session = Session(uuid.uuid4().hex, state)
+        with self._lock:
+            self._expire_locked()
+            while len(self._sessions) >= self.max_sessions:
+                _, evicted = self._sessions.popitem(last=False)
+                evicted.close()
+                self._counts['evicted'] += 1
+            self._sessions[session.id] = session
+            self._counts['created'] += 1
+        return session
+
+    def get(self, session_id: str) -> Optional[Session]:
+        """Live session by ID, marking it as used"""
+        with self._lock:
+            self._expire_locked()
+            session = self._sessions.get(session_id)
+            if session is not None:
+                session.last_used = time.monotonic()
+                self._sessions.move_to_end(session_id)
+            return session
+
+    def delete(self, session_id: str) -> bool:
+        with self._lock:
+            session = self._sessions.pop(session_id, None)
+            if session is not None:
+                self._counts['deleted'] += 1
+        if session is None:
+            return False
+        session.close()
+        return True
+
+    def _expire_locked(self) -> None:
+        # Sessions are kept in order of last use, so expired ones are at the
+        # front; sessions with an open event stream are kept
+        cutoff = time.monotonic() - self.ttl
+        for session in list(self._sessions.values()):
+            if session.last_used > cutoff:
+                break
+            if session.subscriber_count:
+                continue
+            del self._sessions[session.id]
+            session.close()
+            self._counts['expired'] += 1
+
+    def metrics(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                'active': len(self._sessions),
+                'max_sessions': self.max_sessions,
+                'ttl_seconds': self.ttl,
+                'subscribers': sum(session.subscriber_count for session in self._sessions.values()),
+                **self._counts
+            }
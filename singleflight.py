@@ -0,0 +1,181 @@
+"""
+Single-flight deduplication of identical in-flight computations.
+
+Concurrent callers that ask for the same key while a computation for that key
+is running wait for it and share its result instead of computing it again.
+Within a process this uses an event per key; across worker processes it can
+optionally use striped lock files plus a short-lived result file per key.
+"""
+
+import hashlib
+import json
+import logging
+import os
+import tempfile
+import threading
+import time
+from typing import Any, Callable, Dict, Optional, Tuple
+
+try:
+    import fcntl
+except ImportError:  # pragma: no cover - not available on Windows
+    fcntl = None
+
+logger = logging.getLogger(__name__)
+
+class _Call:
+    """One in-flight computation and the callers waiting on it"""
+
+    __slots__ = ('done', 'result', 'error')
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.result = None
+        self.error: Optional[BaseException] = None
+
+class SingleFlight:
+    """Runs at most one computation per key at a time and shares its result.
+
+    When ``lock_dir`` is given, workers on the same host also coordinate: the
+    first worker to take a key's lock computes and writes the result to
+    ``lock_dir``; workers that had to wait for that lock read the result back
+    if it is younger than ``result_ttl`` seconds.
+    """
+
+    def __init__(self, lock_dir: Optional[str] = None, result_ttl: float = 5.0,
+                 lock_stripes: int = 256,
+                 dumps: Callable[[Any], str] = json.dumps,
+                 loads: Callable[[str], Any] = json.loads):
+        if lock_dir and fcntl is None:
+            logger.warning("File locks are not available on this platform; single-flight is per process only")
+            lock_dir = None
+        if lock_dir:
+            os.makedirs(lock_dir, exist_ok=True)
+
+        self.lock_dir = lock_dir
+        self.result_ttl = result_ttl
+        self.lock_stripes = lock_stripes
+        self.dumps = dumps
+        self.loads = loads
+        self._lock = threading.Lock()
+        self._inflight: Dict[str, _Call] = {}
+        self._last_cleanup = 0.0
+
+        # Counters
+        self._calls = 0
+        self._executions = 0
+        self._shared_in_process = 0
+        self._shared_across_workers = 0
+
+    def do(self, key: str, fn: Callable[[], Any]) -> Tuple[Any, bool]:
+        """Return ``(result, shared)`` where ``shared`` is True if another caller computed it"""
+        with self._lock:
+            self._calls += 1
+            call = self._inflight.get(key)
+            leader = call is None
+            if leader:
+                call = self._inflight[key] = _Call()
+
+        if not leader:
+            call.done.wait()
+            with self._lock:
+                self._shared_in_process += 1
+            if call.error is not None:
+                raise call.error
+            return call.result, True
+
+        try:
+            call.result, shared = self._execute(key, fn)
+            return call.result, shared
+        except BaseException as e:
+            call.error = e
+            raise
+        finally:
+            with self._lock:
+                del self._inflight[key]
+            call.done.set()
+
+    def _execute(self, key: str, fn: Callable[[], Any]) -> Tuple[Any, bool]:
+        if not self.lock_dir:
+            return self._run(fn), False
+
+        digest = hashlib.sha256(key.encode('utf-8')).hexdigest()
+        stripe = int(digest[:8], 16) % self.lock_stripes
+        lock_path = os.path.join(self.lock_dir, f'stripe-{stripe:03d}.lock')
+        result_path = os.path.join(self.lock_dir, f'{digest}.json')
+
+        with open(lock_path, 'a') as handle:
+            try:
+                fcntl.flock(handle, fcntl.LOCK_EX | fcntl.LOCK_NB)
+                contended = False
+            except BlockingIOError:
+                fcntl.flock(handle, fcntl.LOCK_EX)
+                contended = True
+
+            try:
+                if contended:
+                    cached = self._read_result(result_path)
+                    if cached is not None:
+                        with self._lock:
+                            self._shared_across_workers += 1
+                        return cached, True
+
+                result = self._run(fn)
+                self._write_result(result_path, result)
+                return result, False
+            finally:
+                fcntl.flock(handle, fcntl.LOCK_UN)
+
+    def _run(self, fn: Callable[[], Any]) -> Any:
+        with self._lock:
+            self._executions += 1
+        return fn()
+
+    def _read_result(self, path: str) -> Any:
+        try:
+            if time.time() - os.path.getmtime(path) > self.result_ttl:
+                return None
+            with open(path, 'r', encoding='utf-8') as handle:
+                return self.loads(handle.read())
+        except (OSError, ValueError):
+            return None
+
+    def _write_result(self, path: str, result: Any) -> None:
+        try:
+            fd, temp_path = tempfile.mkstemp(dir=self.lock_dir, suffix='.tmp')
+            with os.fdopen(fd, 'w', encoding='utf-8') as handle:
+                handle.write(self.dumps(result))
+            os.replace(temp_path, path)
+            self._remove_expired_results()
+        except (OSError, TypeError, ValueError) as e:
+            logger.warning(f"Could not store single-flight result: {e}")
+
+    def _remove_expired_results(self) -> None:
+        """Delete result files that can no longer be shared, at most once per TTL period"""
+        now = time.time()
+        if now - self._last_cleanup < self.result_ttl:
+            return
+        self._last_cleanup = now
+        cutoff = now - self.result_ttl
+        with os.scandir(self.lock_dir) as entries:
+            for entry in entries:
+                if entry.name.endswith('.json'):
+                    try:
+                        if entry.stat().st_mtime < cutoff:
+                            os.remove(entry.path)
+                    except OSError:
+                        pass
+
+    def metrics(self) -> Dict[str, Any]:
+        """Counters showing how many computations were saved"""
+        with self._lock:
+            shared = self._shared_in_process + self._shared_across_workers
+            return {
+                'cross_worker': bool(self.lock_dir),
+                'calls': self._calls,
+                'executions': self._executions,
+                'in_flight': len(self._inflight),
+                'shared_in_process': self._shared_in_process,
+                'shared_across_workers': self._shared_across_workers,
+                'computations_saved': shared
+            }
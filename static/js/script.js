@@ -3,15 +3,82 @@ const predictionForm = document.getElementById('predictionForm');
 const loading = document.getElementById('loading');
 const results = document.getElementById('results');
 
-// Form submission handler
-predictionForm.addEventListener('submit', async function(e) {
-    e.preventDefault();
+// Interactive session: analyses go to /analyze, and the first edit of the
+// birth details afterwards opens a session; further edits are sent as PATCH
+// requests and only the changed parts of the result return
+let session = null;
+let sessionUpdateInFlight = false;
+
+// ID of the displayed result in the server's result store, when known
+let displayedResultId = null;
+
+// Analyses already done in this browser, keyed by the normalized form and
+// language, with the ETag the server gave them. IndexedDB when available,
+// otherwise localStorage, otherwise memory for the lifetime of the page.
+const resultCache = (() => {
+    const memory = new Map();
+    const prefix = 'analysis:';
+    const database = new Promise(resolve => {
+        try {
+            const request = indexedDB.open('partner-prediction', 1);
+            request.onupgradeneeded = () => request.result.createObjectStore('results');
+            request.onsuccess = () => resolve(request.result);
+            request.onerror = () => resolve(null);
+        } catch (error) {
+            resolve(null);
+        }
+    });
     
-    // Show loading
-    showLoading();
+    // Entries are kept serialized, so later changes to a displayed result never reach the cache
+    function fromStorage(key) {
+        let entry = memory.get(key);
+        try {
+            entry = localStorage.getItem(prefix + key) || entry;
+        } catch (error) {
+            // Storage unavailable
+        }
+        return entry ? JSON.parse(entry) : null;
+    }
+    
+    function toStorage(key, entry) {
+        const serialized = JSON.stringify(entry);
+        try {
+            localStorage.setItem(prefix + key, serialized);
+        } catch (error) {
+            // Storage unavailable or full
+            memory.set(key, serialized);
+        }
+    }
     
-    // Collect form data
-    const formData = {
+    return {
+        async get(key) {
+            const db = await database;
+            if (!db) return fromStorage(key);
+            return new Promise(resolve => {
+                const request = db.transaction('results').objectStore('results').get(key);
+                request.onsuccess = () => resolve(request.result || null);
+                request.onerror = () => resolve(null);
+            });
+        },
+        async put(key, entry) {
+            const db = await database;
+            if (!db) return toStorage(key, entry);
+            db.transaction('results', 'readwrite').objectStore('results').put(entry, key);
+        }
+    };
+})();
+
+// Requests in flight by cache key, so repeated submits of the same form share one
+const analysesInFlight = new Map();
+
+// Get current language from URL
+function currentLanguage() {
+    return window.location.pathname.includes('/tamil') ? 'ta' : 'en';
+}
+
+// Collect form data
+function collectFormData() {
+    return {
         male_dob: document.getElementById('male_dob').value,
         male_tob: document.getElementById('male_tob').value,
         male_lat: document.getElementById('male_lat').value,
@@ -21,40 +88,200 @@ predictionForm.addEventListener('submit', async function(e) {
         female_tob: document.getElementById('female_tob').value,
         female_lat: document.getElementById('female_lat').value,
         female_lon: document.getElementById('female_lon').value,
-        female_tz_offset: 5.5 // IST timezone offset
+        female_tz_offset: 5.5, // IST timezone offset
+        symmetric: document.getElementById('symmetric').checked,
+        navamsa: document.getElementById('navamsa').checked
     };
+}
+
+// Cache key of a form: coordinates rounded as the server rounds them, plus the language
+function resultKey(formData) {
+    const fields = Object.keys(formData).sort().map(name => {
+        const value = formData[name];
+        return [name, /_(lat|lon)$/.test(name) ? Number(value).toFixed(6) : String(value).trim()];
+    });
+    return JSON.stringify([currentLanguage(), fields]);
+}
+
+// Keep a successful analysis response with its ETag, without the session fields
+function storeResult(formData, response, data) {
+    const etag = response.headers.get('ETag');
+    if (!data.success || !etag) return;
+    const { session_id, version, ...result } = data;
+    resultCache.put(resultKey(formData), { etag: etag, data: result });
+}
+
+// Run a request for a cache key unless one for the same key is already running
+function analyzeOnce(key, request) {
+    if (!analysesInFlight.has(key)) {
+        analysesInFlight.set(key, request().finally(() => analysesInFlight.delete(key)));
+    }
+    return analysesInFlight.get(key);
+}
+
+// Start a session; resolves to the full analysis response
+async function startSession(formData) {
+    const response = await fetch('/sessions', {
+        method: 'POST',
+        headers: {
+            'Content-Type': 'application/json',
+            'X-Language': currentLanguage()
+        },
+        body: JSON.stringify(formData)
+    });
+    
+    const data = await response.json();
+    session = data.success ? { id: data.session_id, data: data, fields: formData } : null;
+    storeResult(formData, response, data);
+    return data;
+}
+
+// Analyze a form with /analyze, which shares identical in-flight analyses and
+// serves stored results without computing them
+async function requestAnalysis(formData) {
+    const response = await fetch('/analyze', {
+        method: 'POST',
+        headers: {
+            'Content-Type': 'application/json',
+            'X-Language': currentLanguage()
+        },
+        body: JSON.stringify(formData)
+    });
+    
+    const data = await response.json();
+    storeResult(formData, response, data);
+    return data;
+}
+
+// Check a cached result with the server; resolves to the cached data when it
+// is still current (304, nothing recomputed) or to the new response
+async function revalidate(formData, cached) {
+    const response = await fetch('/analyze', {
+        method: 'POST',
+        headers: {
+            'Content-Type': 'application/json',
+            'X-Language': currentLanguage(),
+            'If-None-Match': cached.etag
+        },
+        body: JSON.stringify(formData)
+    });
+    if (response.status === 304) return cached.data;
+    
+    const data = await response.json();
+    storeResult(formData, response, data);
+    return data;
+}
+
+// Form submission handler
+predictionForm.addEventListener('submit', async function(e) {
+    e.preventDefault();
+    
+    const formData = collectFormData();
+    const key = resultKey(formData);
     
     try {
-        // Get current language from URL
-        const currentLang = window.location.pathname.includes('/tamil') ? 'ta' : 'en';
+        const cached = await resultCache.get(key);
+        if (cached) {
+            // Show the stored result at once; a session starts with the first edit
+            session = { id: null, data: cached.data, fields: formData };
+            displayResults(cached.data);
+            
+            const data = await analyzeOnce(key, () => revalidate(formData, cached)).catch(error => {
+                console.error('Revalidation failed:', error);
+                return cached.data;
+            });
+            if (data !== cached.data && data.success && session && session.id === null) {
+                session.data = data;
+                renderResults(data);
+            }
+            return;
+        }
         
-        // Send API request
-        const response = await fetch('/analyze', {
-            method: 'POST',
-            headers: {
-                'Content-Type': 'application/json',
-                'X-Language': currentLang
-            },
-            body: JSON.stringify(formData)
-        });
+        // Show loading
+        showLoading();
         
-        const data = await response.json();
+        // Send API request; a session starts with the first edit
+        const data = await analyzeOnce(key, () => requestAnalysis(formData));
         
         if (data.success) {
+            session = { id: null, data: data, fields: formData };
             displayResults(data);
         } else {
-            const currentLang = window.location.pathname.includes('/tamil') ? 'ta' : 'en';
-            const errorMsg = currentLang === 'ta' ? 'பகுப்பாய்வின் போது பிழை ஏற்பட்டது.' : 'An error occurred during analysis.';
+            session = null;
+            const errorMsg = currentLanguage() === 'ta' ? 'பகுப்பாய்வின் போது பிழை ஏற்பட்டது.' : 'An error occurred during analysis.';
             showError(data.error || errorMsg);
         }
     } catch (error) {
         console.error('Error:', error);
-        const currentLang = window.location.pathname.includes('/tamil') ? 'ta' : 'en';
-        const errorMsg = currentLang === 'ta' ? 'வலையமைப்பு பிழை. உங்கள் இணைப்பை சரிபார்த்து மீண்டும் முயற்சிக்கவும்.' : 'Network error. Please check your connection and try again.';
+        const errorMsg = currentLanguage() === 'ta' ? 'வலையமைப்பு பிழை. உங்கள் இணைப்பை சரிபார்த்து மீண்டும் முயற்சிக்கவும்.' : 'Network error. Please check your connection and try again.';
         showError(errorMsg);
     }
 });
 
+// Send the fields edited since the last update and apply the returned delta
+async function flushSessionUpdate() {
+    if (!session || sessionUpdateInFlight) return;
+    
+    const formData = collectFormData();
+    const changes = {};
+    Object.keys(formData).forEach(key => {
+        if (String(formData[key]) !== String(session.fields[key])) {
+            changes[key] = formData[key];
+        }
+    });
+    if (Object.keys(changes).length === 0 || Object.values(formData).some(value => value === '')) return;
+    
+    sessionUpdateInFlight = true;
+    try {
+        const response = session.id === null ? null : await fetch(`/sessions/${session.id}`, {
+            method: 'PATCH',
+            headers: { 'Content-Type': 'application/json' },
+            body: JSON.stringify(changes)
+        });
+        
+        if (!response || response.status === 404) {
+            // A result from /analyze or the cache has no session yet, and a session
+            // may have expired or live in another worker: start one with the full form
+            const data = await startSession(formData);
+            if (data.success) renderResults(data);
+        } else {
+            const delta = await response.json();
+            if (delta.success) {
+                applyDelta(session.data, delta);
+                // The stored result of the previous inputs no longer applies
+                delete session.data.result_id;
+                renderResults(session.data);
+            }
+            session.fields = formData;
+        }
+    } catch (error) {
+        console.error('Session update failed:', error);
+        session.fields = formData;
+    } finally {
+        sessionUpdateInFlight = false;
+    }
+    
+    // Pick up edits made while the request was in flight
+    flushSessionUpdate();
+}
+
+// Merge a session delta into the last full response
+function applyDelta(data, delta) {
+    Object.assign(data, delta.changed);
+    delta.removed.forEach(key => delete data[key]);
+    data.compatibility_data.length = delta.condition_count;
+    Object.entries(delta.changed_conditions).forEach(([index, row]) => {
+        data.compatibility_data[Number(index)] = row;
+    });
+}
+
+['male_dob', 'male_tob', 'male_lat', 'male_lon', 'female_dob', 'female_tob', 'female_lat', 'female_lon'].forEach(id => {
+    document.getElementById(id).addEventListener('input', flushSessionUpdate);
+});
+['symmetric', 'navamsa'].forEach(id => {
+    document.getElementById(id).addEventListener('change', flushSessionUpdate);
+});
+
 // Show loading spinner
 function showLoading() {
     loading.classList.remove('hidden');
@@ -69,8 +296,23 @@ function displayResults(data) {
     // Hide loading
     loading.classList.add('hidden');
     
+    renderResults(data);
+    
+    // Show results
+    results.classList.remove('hidden');
+    
+    // Smooth scroll to results
+    setTimeout(() => {
+        results.scrollIntoView({ behavior: 'smooth' });
+    }, 100);
+}
+
+// Fill the result panels from an analysis response
+function renderResults(data) {
+    displayedResultId = data.result_id || null;
+    
     // Get current language for labels
-    const currentLang = window.location.pathname.includes('/tamil') ? 'ta' : 'en';
+    const currentLang = currentLanguage();
     
     // Update summary cards with enhanced details
     document.getElementById('male-rahu-nakshatra').textContent = data.male_rahu_nakshatra;
@@ -113,21 +355,19 @@ function displayResults(data) {
     // Populate compatibility table
     populateCompatibilityTable(data.compatibility_data);
     
-    // Populate reasoning boxes
-    populateReasoningBoxes(data);
+    // Populate porutham table
+    populatePoruthamTable(data.poruthams, data.porutham_count);
     
-    // Show results
-    results.classList.remove('hidden');
+    // Populate the female-to-male direction when it was requested
+    populateReverseSection(data);
     
-    // Smooth scroll to results
-    setTimeout(() => {
-        results.scrollIntoView({ behavior: 'smooth' });
-    }, 100);
+    // Populate reasoning boxes
+    populateReasoningBoxes(data);
 }
 
 // Populate compatibility table
-function populateCompatibilityTable(compatibilityData) {
-    const tableBody = document.getElementById('compatibility-table-body');
+function populateCompatibilityTable(compatibilityData, tableBodyId = 'compatibility-table-body') {
+    const tableBody = document.getElementById(tableBodyId);
     tableBody.innerHTML = '';
     
     compatibilityData.forEach(item => {
@@ -153,6 +393,49 @@ function populateCompatibilityTable(compatibilityData) {
     });
 }
 
+// Populate the female Rahu/Ketu analysis and the verdict over both directions
+function populateReverseSection(data) {
+    const section = document.getElementById('reverse-section');
+    if (!data.reverse) {
+        section.classList.add('hidden');
+        return;
+    }
+    
+    const currentLang = currentLanguage();
+    const reverse = data.reverse;
+    section.classList.remove('hidden');
+    document.getElementById('reverse-summary').textContent = currentLang === 'ta'
+        ? `ராகு: ${reverse.female_rahu_nakshatra} (${reverse.rahu_nakshatra_lord}), கேது: ${reverse.female_ketu_nakshatra} (${reverse.ketu_nakshatra_lord}) — ${reverse.verdict}`
+        : `Rahu: ${reverse.female_rahu_nakshatra} (${reverse.rahu_nakshatra_lord}), Ketu: ${reverse.female_ketu_nakshatra} (${reverse.ketu_nakshatra_lord}) — ${reverse.verdict}`;
+    document.getElementById('combined-verdict').textContent = currentLang === 'ta'
+        ? `இரு திசைகளிலும்: ${data.combined.verdict} (${data.combined.total_matches} பொருத்தங்கள்)`
+        : `Both directions: ${data.combined.verdict} (${data.combined.total_matches} matches)`;
+    populateCompatibilityTable(reverse.compatibility_data, 'reverse-table-body');
+}
+
+// Populate the ten porutham table
+function populatePoruthamTable(poruthams, poruthamCount) {
+    const tableBody = document.getElementById('porutham-table-body');
+    tableBody.innerHTML = '';
+    document.getElementById('porutham-count').textContent = `(${poruthamCount}/${poruthams.length})`;
+    
+    poruthams.forEach(item => {
+        const row = document.createElement('tr');
+        row.className = item.status;
+        
+        const statusIcon = item.status === 'match' ? '✓' : '✗';
+        const statusClass = item.status === 'match' ? 'match' : 'no-match';
+        
+        row.innerHTML = `
+            <td>${item.name}</td>
+            <td>${item.details}</td>
+            <td class="status ${statusClass}">${statusIcon}</td>
+        `;
+        
+        tableBody.appendChild(row);
+    });
+}
+
 // Populate reasoning boxes
 function populateReasoningBoxes(data) {
     // Hide all reasoning boxes first
@@ -239,11 +522,58 @@ function resetForm() {
     window.scrollTo({ top: 0, behavior: 'smooth' });
 }
 
+// Link that shows a stored result on this page
+function permalink(resultId) {
+    return `${location.origin}${location.pathname}?result=${encodeURIComponent(resultId)}`;
+}
+
+// ID of the displayed result in the server's result store; /analyze stores
+// results of session inputs and only computes them if they are not stored yet
+async function storedResultId() {
+    if (displayedResultId || !session) return displayedResultId;
+    const response = await fetch('/analyze', {
+        method: 'POST',
+        headers: {
+            'Content-Type': 'application/json',
+            'X-Language': currentLanguage()
+        },
+        body: JSON.stringify(session.fields)
+    });
+    const data = await response.json();
+    return data.success ? data.result_id : null;
+}
+
+// Show the stored result a permalink points to
+async function showStoredResult(resultId) {
+    showLoading();
+    try {
+        const response = await fetch(`/result/${encodeURIComponent(resultId)}`, {
+            headers: { 'X-Language': currentLanguage() }
+        });
+        const data = await response.json();
+        if (data.success) {
+            displayResults(data);
+        } else {
+            loading.classList.add('hidden');
+            showError(data.error);
+        }
+    } catch (error) {
+        console.error('Error:', error);
+        loading.classList.add('hidden');
+        showError(currentLanguage() === 'ta' ? 'வலையமைப்பு பிழை. உங்கள் இணைப்பை சரிபார்த்து மீண்டும் முயற்சிக்கவும்.' : 'Network error. Please check your connection and try again.');
+    }
+}
+
 // Print results
-function printResults() {
+async function printResults() {
     const printWindow = window.open('', '_blank');
     const resultsContent = results.innerHTML;
     
+    // The printout links back to the stored result, and so does the address bar
+    const resultId = await storedResultId().catch(() => null);
+    const link = resultId ? permalink(resultId) : null;
+    if (link) history.replaceState(null, '', link);
+
     printWindow.document.write(`
         <!DOCTYPE html>
         <html>
@@ -316,6 +646,7 @@ function printResults() {
             <div class="print-header">
                 <h1>🔮 Vedic Life Partner Prediction Results</h1>
                 <p>Generated on ${new Date().toLocaleDateString()} at ${new Date().toLocaleTimeString()}</p>
+                ${link ? `<p><a href="${link}">${link}</a></p>` : ''}
             </div>
             ${resultsContent}
         </body>
@@ -421,6 +752,12 @@ document.addEventListener('DOMContentLoaded', function() {
         document.getElementById('female_lat').value = '11.9416';
         document.getElementById('female_lon').value = '79.8083';
     }
+    
+    // A permalink shows its stored result
+    const resultId = new URLSearchParams(window.location.search).get('result');
+    if (resultId) {
+        showStoredResult(resultId);
+    }
 });
 
 // Add smooth animations for better UX
@@ -0,0 +1,85 @@
+"""
+Synastry: aspects between every body of one chart and every body of another.
+
+The angular separation of two longitudes (0-180°) is bucketed into the
+aspect whose angle it lies within the orb of. Aspect angles are at least 30°
+apart and no orb reaches half that distance, so the only aspect a
+separation can fall into is the one nearest to it, and ``_NEAREST`` holds
+that aspect for every whole degree of separation. Classifying a pair is one
+subtraction, one table lookup and one comparison, done for whole arrays at
+once: ``matrix`` compares the 12 bodies of one chart with the 12 of the
+other (12×12), and a leading axis of charts on either side broadcasts, so
+one chart is compared with a whole array of candidates in one call.
+
+``score`` sums the weights of the aspects found, each scaled by how exact it
+is (1 at the exact angle, 0 at the edge of the orb), for ranking candidates.
+"""
+
+from typing import Dict, List, NamedTuple, Tuple
+
+import numpy as np
+
+BODIES = ('Sun', 'Moon', 'Mercury', 'Venus', 'Mars', 'Jupiter', 'Saturn',
+          'Uranus', 'Neptune', 'Pluto', 'Rahu', 'Ketu')
+
+class Aspect(NamedTuple):
+    name: str
+    angle: float
+    orb: float
+    weight: float
+
+# Major aspects; harmonious ones add to the score, tense ones subtract
+ASPECTS = (
+    Aspect('conjunction', 0.0, 8.0, 1.0),
+    Aspect('sextile', 60.0, 6.0, 1.0),
+    Aspect('square', 90.0, 7.0, -1.0),
+    Aspect('trine', 120.0, 8.0, 2.0),
+    Aspect('opposition', 180.0, 8.0, -1.0)
+)
+NONE = -1
+
+_ANGLES = np.array([aspect.angle for aspect in ASPECTS])
+_ORBS = np.array([aspect.orb for aspect in ASPECTS])
+_WEIGHTS = np.array([aspect.weight for aspect in ASPECTS])
+
+# Nearest aspect for every whole degree of separation (0-180)
+_NEAREST = np.abs(np.arange(181)[:, None] - _ANGLES[None, :]).argmin(axis=1)
+
+def separations(first, second) -> np.ndarray:
+    """Angular separation (0-180°) of every body in ``first`` from every body in ``second``.
+
+    Longitudes are in degrees with the bodies on the last axis; leading axes
+    broadcast, so the result has shape ``(..., len(first bodies), len(second bodies))``.
+    """
+    first = np.asarray(first, dtype=float)
+    second = np.asarray(second, dtype=float)
+    difference = np.abs(second[..., None, :] - first[..., :, None]) % 360.0
+    return np.minimum(difference, 360.0 - difference)
+
+def matrix(first, second):
+    """Aspect index (``NONE`` when there is none) and its deviation from the exact angle, per body pair"""
+    separation = separations(first, second)
+    nearest = _NEAREST[np.rint(separation).astype(np.intp)]
+    deviation = np.abs(separation - _ANGLES[nearest])
+    return np.where(deviation <= _ORBS[nearest], nearest, NONE), deviation
+
+def score(first, second) -> np.ndarray:
+    """Summary score per chart pair: the aspect weights, each scaled by its exactness"""
+    kinds, deviation = matrix(first, second)
+    found = kinds != NONE
+    index = np.where(found, kinds, 0)
+    strength = np.where(found, 1.0 - deviation / _ORBS[index], 0.0)
+    return (_WEIGHTS[index] * strength).sum(axis=(-2, -1))
+
+def longitudes(chart: Dict[str, float]) -> np.ndarray:
+    """Longitudes of ``BODIES`` from a mapping of body name to longitude"""
+    return np.array([chart[body] for body in BODIES], dtype=float)
+
+def aspects(first: Dict[str, float], second: Dict[str, float]) -> List[Tuple[str, str, str, float]]:
+    """``(first body, second body, aspect, orb)`` of every aspect between two charts, tightest first"""
+    aspect_matrix, deviation = matrix(longitudes(first), longitudes(second))
+    found = [
+        (BODIES[row], BODIES[column], ASPECTS[aspect_matrix[row, column]].name, float(deviation[row, column]))
+        for row, column in zip(*np.nonzero(aspect_matrix != NONE))
+    ]
+    return sorted(found, key=lambda item: item[3])
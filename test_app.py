@@ -5,6 +5,10 @@ Test script for the enhanced Vedic Life Partner Prediction App
 
 import requests
 import json
+import random
+import re
+import threading
+import time
 
 def test_compatibility_analysis():
     """Test the compatibility analysis with sample data"""
@@ -86,6 +90,406 @@ def test_web_interface():
     except Exception as e:
         print(f"❌ Web interface test failed - Exception: {str(e)}")
 
+def test_static_assets():
+    """Test that the page references fingerprinted, precompressed assets cached forever"""
+    try:
+        page = requests.get('http://localhost:5001/').text
+        urls = re.findall(r'(?:href|src)="(/assets/[^"]+)"', page)
+        if len(urls) != 2:
+            print(f"❌ Static assets test FAILED - Expected the stylesheet and script, found {urls}")
+            return
+        
+        for url in urls:
+            response = requests.get(f'http://localhost:5001{url}', headers={'Accept-Encoding': 'gzip'})
+            if response.status_code != 200 or response.headers.get('Content-Encoding') != 'gzip':
+                print(f"❌ Static assets test FAILED - {url} not served precompressed")
+                return
+            if 'immutable' not in response.headers.get('Cache-Control', ''):
+                print(f"❌ Static assets test FAILED - {url} not cached as immutable")
+                return
+            revalidated = requests.get(f'http://localhost:5001{url}',
+                                       headers={'Accept-Encoding': 'gzip', 'If-None-Match': response.headers['ETag']})
+            if revalidated.status_code != 304:
+                print(f"❌ Static assets test FAILED - {url} revalidation returned {revalidated.status_code}")
+                return
+        
+        missing = requests.get('http://localhost:5001/assets/js/script.js')
+        if missing.status_code != 404:
+            print(f"❌ Static assets test FAILED - Unfingerprinted asset returned {missing.status_code}")
+        else:
+            print("✅ Static assets test PASSED")
+            print(f"📊 Assets: {', '.join(urls)}")
+            
+    except requests.exceptions.ConnectionError:
+        print("❌ Static assets test FAILED - Could not connect to server")
+    except Exception as e:
+        print(f"❌ Static assets test FAILED - Exception: {str(e)}")
+
+def test_result_revalidation():
+    """Test that a client holding the current result gets 304 without a recomputation"""
+    test_data = {
+        'male_dob': '1978-09-18',
+        'male_tob': '17:35',
+        'male_lat': 13.08333333,
+        'male_lon': 80.28333333,
+        'female_dob': '1984-01-15',
+        'female_tob': '13:30',
+        'female_lat': 11.9416,
+        'female_lon': 79.8083
+    }
+    
+    try:
+        first = requests.post('http://localhost:5001/analyze', json=test_data)
+        etag = first.headers.get('ETag')
+        revalidated = requests.post('http://localhost:5001/analyze', json=test_data, headers={'If-None-Match': etag})
+        other_language = requests.post('http://localhost:5001/analyze', json=test_data,
+                                       headers={'If-None-Match': etag, 'X-Language': 'ta'})
+        session = requests.post('http://localhost:5001/sessions', json=test_data)
+        
+        if not etag:
+            print("❌ Revalidation test FAILED - No ETag on the analysis")
+        elif revalidated.status_code != 304 or revalidated.content:
+            print(f"❌ Revalidation test FAILED - Current result returned {revalidated.status_code}")
+        elif other_language.status_code != 200:
+            print(f"❌ Revalidation test FAILED - Different request returned {other_language.status_code}")
+        elif session.headers.get('ETag') != etag:
+            print("❌ Revalidation test FAILED - Session result has a different ETag")
+        else:
+            print("✅ Revalidation test PASSED")
+            print(f"📊 ETag: {etag}")
+            
+    except requests.exceptions.ConnectionError:
+        print("❌ Revalidation test FAILED - Could not connect to server")
+    except Exception as e:
+        print(f"❌ Revalidation test FAILED - Exception: {str(e)}")
+
+def test_both_directions():
+    """Test the symmetric analysis, which also checks the female nodes against the male chart"""
+    test_data = {
+        'male_dob': '1978-09-18',
+        'male_tob': '17:35',
+        'male_lat': 13.08333333,
+        'male_lon': 80.28333333,
+        'female_dob': '1984-01-15',
+        'female_tob': '13:30',
+        'female_lat': 11.9416,
+        'female_lon': 79.8083,
+        'symmetric': True
+    }
+    
+    # The reverse direction is the forward analysis with the partners swapped
+    swapped = {
+        'male_dob': test_data['female_dob'],
+        'male_tob': test_data['female_tob'],
+        'male_lat': test_data['female_lat'],
+        'male_lon': test_data['female_lon'],
+        'female_dob': test_data['male_dob'],
+        'female_tob': test_data['male_tob'],
+        'female_lat': test_data['male_lat'],
+        'female_lon': test_data['male_lon']
+    }
+    
+    try:
+        result = requests.post('http://localhost:5001/analyze', json=test_data).json()
+        expected = requests.post('http://localhost:5001/analyze', json=swapped).json()
+        
+        reverse = result['reverse']
+        if reverse['total_matches'] != expected['total_matches']:
+            print(f"❌ Both directions test FAILED - {reverse['total_matches']} != {expected['total_matches']} matches")
+        elif result['combined']['total_matches'] != result['total_matches'] + reverse['total_matches']:
+            print("❌ Both directions test FAILED - Combined total is not the sum of both directions")
+        else:
+            print("✅ Both directions test PASSED")
+            print(f"📊 Male → Female: {result['total_matches']}, Female → Male: {reverse['total_matches']}, "
+                  f"Combined: {result['combined']['verdict']}")
+            
+    except requests.exceptions.ConnectionError:
+        print("❌ Both directions test FAILED - Could not connect to server")
+    except Exception as e:
+        print(f"❌ Both directions test FAILED - Exception: {str(e)}")
+
+def test_divisional_charts():
+    """Test the navamsa conditions and the divisional chart listing"""
+    test_data = {
+        'male_dob': '1978-09-18',
+        'male_tob': '17:35',
+        'male_lat': 13.08333333,
+        'male_lon': 80.28333333,
+        'female_dob': '1984-01-15',
+        'female_tob': '13:30',
+        'female_lat': 11.9416,
+        'female_lon': 79.8083
+    }
+    
+    try:
+        plain = requests.post('http://localhost:5001/analyze', json=test_data).json()
+        result = requests.post('http://localhost:5001/analyze',
+                               json={**test_data, 'navamsa': True, 'vargas': ['D1', 'D9']}).json()
+        invalid = requests.post('http://localhost:5001/analyze', json={**test_data, 'vargas': ['D5']})
+        
+        female = result['vargas']['female']
+        if len(result['compatibility_data']) != len(plain['compatibility_data']) + 2:
+            print("❌ Divisional charts test FAILED - Navamsa conditions missing")
+        elif result['total_matches'] < plain['total_matches']:
+            print("❌ Divisional charts test FAILED - Navamsa conditions lost matches")
+        elif female['D1']['Moon'] != result['conditions']['Female Rasi (Moon Sign)']['value']:
+            print("❌ Divisional charts test FAILED - D1 differs from the birth chart")
+        elif invalid.status_code != 400:
+            print(f"❌ Divisional charts test FAILED - Unsupported division returned {invalid.status_code}")
+        else:
+            print("✅ Divisional charts test PASSED")
+            print(f"📊 Female D9 Moon: {female['D9']['Moon']}, D9 Lagna: {female['D9']['Ascendant']}")
+            
+    except requests.exceptions.ConnectionError:
+        print("❌ Divisional charts test FAILED - Could not connect to server")
+    except Exception as e:
+        print(f"❌ Divisional charts test FAILED - Exception: {str(e)}")
+
+def test_synastry():
+    """Test the aspects between both charts and the synastry score"""
+    test_data = {
+        'male_dob': '1978-09-18',
+        'male_tob': '17:35',
+        'male_lat': 13.08333333,
+        'male_lon': 80.28333333,
+        'female_dob': '1984-01-15',
+        'female_tob': '13:30',
+        'female_lat': 11.9416,
+        'female_lon': 79.8083
+    }
+    
+    try:
+        plain = requests.post('http://localhost:5001/analyze', json=test_data).json()
+        result = requests.post('http://localhost:5001/analyze', json={**test_data, 'synastry': True}).json()
+        
+        aspects = result['synastry']['aspects']
+        orbs = [aspect['orb'] for aspect in aspects]
+        if 'synastry' in plain:
+            print("❌ Synastry test FAILED - Aspects reported without being requested")
+        elif not aspects or orbs != sorted(orbs):
+            print("❌ Synastry test FAILED - Aspects missing or not ordered by orb")
+        elif any(aspect['orb'] > 8 for aspect in aspects):
+            print("❌ Synastry test FAILED - Aspect outside its orb")
+        elif result['total_matches'] != plain['total_matches']:
+            print("❌ Synastry test FAILED - Synastry changed the node analysis")
+        else:
+            print("✅ Synastry test PASSED")
+            print(f"📊 {len(aspects)} aspects, score {result['synastry']['score']}, tightest: "
+                  f"{aspects[0]['male']} {aspects[0]['aspect']} {aspects[0]['female']}")
+            
+    except requests.exceptions.ConnectionError:
+        print("❌ Synastry test FAILED - Could not connect to server")
+    except Exception as e:
+        print(f"❌ Synastry test FAILED - Exception: {str(e)}")
+
+def test_compact_schema():
+    """Test the compact (schema 2) body against the full body of the same analysis"""
+    test_data = {
+        'male_dob': '1978-09-18',
+        'male_tob': '17:35',
+        'male_lat': 13.08333333,
+        'male_lon': 80.28333333,
+        'female_dob': '1984-01-15',
+        'female_tob': '13:30',
+        'female_lat': 11.9416,
+        'female_lon': 79.8083,
+        'symmetric': True,
+        'synastry': True
+    }
+    
+    try:
+        full = requests.post('http://localhost:5001/analyze', json=test_data)
+        compact = requests.post('http://localhost:5001/analyze', json={**test_data, 'schema': 2})
+        selected = requests.post('http://localhost:5001/analyze',
+                                 json={**test_data, 'schema': 2, 'fields': 'verdict,total', 'explain': True}).json()
+        codes = requests.get('http://localhost:5001/analyze/codes').json()
+        invalid = requests.post('http://localhost:5001/analyze', json={**test_data, 'schema': 2, 'fields': ['score']})
+        
+        result, body = full.json(), compact.json()
+        matched = [condition['label']['female'] for bit, condition in enumerate(codes['conditions'])
+                   if (body['matches']['rahu'] | body['matches']['ketu']) >> bit & 1]
+        expected = sorted(set(result['rahu_matches'] + result['ketu_matches']))
+        if codes['verdicts'][body['verdict']]['verdict'] != result['verdict'] or body['total'] != result['total_matches']:
+            print("❌ Compact schema test FAILED - Verdict differs from the full body")
+        elif sorted(matched) != expected:
+            print(f"❌ Compact schema test FAILED - Matched conditions {matched} != {expected}")
+        elif codes['nakshatras'][body['points']['moon']['nakshatra']] != result['conditions']['Female Nakshatra']['value']:
+            print("❌ Compact schema test FAILED - Nakshatra code differs from the full body")
+        elif body['porutham_count'] != result['porutham_count'] or body['reverse']['total'] != result['reverse']['total_matches']:
+            print("❌ Compact schema test FAILED - Poruthams or reverse direction differ")
+        elif set(selected) != {'success', 'schema', 'rules', 'result_id', 'verdict', 'total', 'explain'}:
+            print(f"❌ Compact schema test FAILED - Selected fields returned {sorted(selected)}")
+        elif invalid.status_code != 400:
+            print(f"❌ Compact schema test FAILED - Unknown field returned {invalid.status_code}")
+        elif len(compact.content) * 2 > len(full.content):
+            print(f"❌ Compact schema test FAILED - {len(compact.content)} bytes is not much smaller than {len(full.content)}")
+        else:
+            print("✅ Compact schema test PASSED")
+            print(f"📊 Full body: {len(full.content)} bytes, compact: {len(compact.content)} bytes")
+            
+    except requests.exceptions.ConnectionError:
+        print("❌ Compact schema test FAILED - Could not connect to server")
+    except Exception as e:
+        print(f"❌ Compact schema test FAILED - Exception: {str(e)}")
+
+def test_result_permalink():
+    """Test that an analysis is stored under its result_id and served from the store in both languages"""
+    test_data = {
+        'male_dob': '1978-09-18',
+        'male_tob': '17:35',
+        'male_lat': 13.08333333,
+        'male_lon': 80.28333333,
+        'female_dob': '1984-01-15',
+        'female_tob': '13:30',
+        'female_lat': 11.9416,
+        'female_lon': 79.8083,
+        'navamsa': True
+    }
+    
+    try:
+        result = requests.post('http://localhost:5001/analyze', json=test_data).json()
+        result_id = result['result_id']
+        # The same inputs spelled differently have the same result
+        again = requests.post('http://localhost:5001/analyze',
+                              json={**test_data, 'male_lat': 13.083333334, 'male_tz_offset': '5.5'}).json()
+        stored = requests.get(f'http://localhost:5001/result/{result_id}')
+        tamil = requests.get(f'http://localhost:5001/result/{result_id}', headers={'X-Language': 'ta'})
+        english_again = requests.get(f'http://localhost:5001/result/{result_id}?lang=en',
+                                     headers={'If-None-Match': stored.headers.get('ETag')})
+        missing = requests.get('http://localhost:5001/result/0123456789abcdef0123456789abcdef')
+        # Unknown languages are served (and stored) as English
+        entries = requests.get('http://localhost:5001/metrics').json()['results']['entries']
+        unknown = requests.get(f'http://localhost:5001/result/{result_id}?lang=zz1')
+        unknown_analysis = requests.post('http://localhost:5001/analyze', json=test_data, headers={'X-Language': 'zz2'})
+        entries_after = requests.get('http://localhost:5001/metrics').json()['results']['entries']
+        
+        if again.get('result_id') != result_id:
+            print("❌ Result permalink test FAILED - Equivalent inputs have different result IDs")
+        elif stored.status_code != 200 or stored.json() != result:
+            print(f"❌ Result permalink test FAILED - Stored result returned {stored.status_code} or differs")
+        elif 'immutable' not in stored.headers.get('Cache-Control', ''):
+            print("❌ Result permalink test FAILED - Stored result is not cacheable")
+        elif tamil.json().get('result_id') != result_id or tamil.json()['verdict'] == result['verdict']:
+            print("❌ Result permalink test FAILED - Tamil result missing or not in Tamil")
+        elif english_again.status_code != 304:
+            print(f"❌ Result permalink test FAILED - Revalidation returned {english_again.status_code}")
+        elif missing.status_code != 404:
+            print(f"❌ Result permalink test FAILED - Unknown result returned {missing.status_code}")
+        elif (unknown.headers.get('ETag') != stored.headers.get('ETag') or unknown_analysis.json() != result
+              or entries_after != entries):
+            print("❌ Result permalink test FAILED - Unknown language stored or served separately from English")
+        else:
+            print("✅ Result permalink test PASSED")
+            print(f"📊 /result/{result_id}: {len(stored.content)} bytes")
+            
+    except requests.exceptions.ConnectionError:
+        print("❌ Result permalink test FAILED - Could not connect to server")
+    except Exception as e:
+        print(f"❌ Result permalink test FAILED - Exception: {str(e)}")
+
+def test_readiness():
+    """Test that /ready answers 200 once the worker has warmed up and reports its warm chart latency"""
+    try:
+        ready = requests.get('http://localhost:5001/ready')
+        deadline = time.time() + 30
+        while ready.status_code == 503 and time.time() < deadline:
+            time.sleep(0.1)
+            ready = requests.get('http://localhost:5001/ready')
+        status = ready.json()
+        
+        if ready.status_code != 200 or not status.get('ready'):
+            print(f"❌ Readiness test FAILED - /ready returned {ready.status_code} ({status.get('state')})")
+        elif status.get('enabled', True) and not (status.get('charts', 0) > 0 and status['chart_ms']['p50'] > 0):
+            print("❌ Readiness test FAILED - Warm-up work or chart latency missing")
+        else:
+            print("✅ Readiness test PASSED")
+            if 'chart_ms' in status:
+                print(f"📊 Warm-up {status['warmup_ms']} ms, warm chart p50 {status['chart_ms']['p50']} ms")
+    
+    except requests.exceptions.ConnectionError:
+        print("❌ Readiness test FAILED - Could not connect to server")
+    except Exception as e:
+        print(f"❌ Readiness test FAILED - Exception: {str(e)}")
+
+def test_ephemeris_mode():
+    """Test that /health and /metrics report the ephemeris mode verified at startup and its chart cost"""
+    try:
+        health = requests.get('http://localhost:5001/health').json().get('ephemeris', {})
+        report = requests.get('http://localhost:5001/metrics').json().get('ephemeris', {})
+        
+        if health.get('mode') not in ('moshier', 'swiss', 'compact') or health.get('source') not in ('moshier', 'swiss'):
+            print(f"❌ Ephemeris mode test FAILED - Unexpected mode: {health}")
+        elif report.get('mode') != health['mode'] or not report.get('chart_us', {}).get('p50', 0) > 0:
+            print("❌ Ephemeris mode test FAILED - Startup check missing from /metrics")
+        elif report['mode'] == 'compact' and not report['tables']['max_deviation_deg'] <= report['tables']['max_error_deg']:
+            print("❌ Ephemeris mode test FAILED - Compact tables deviate beyond their recorded error")
+        else:
+            print("✅ Ephemeris mode test PASSED")
+            print(f"📊 {report['mode']} from {report['source']}: {report['chart_us']['p50']} µs per chart")
+    
+    except requests.exceptions.ConnectionError:
+        print("❌ Ephemeris mode test FAILED - Could not connect to server")
+    except Exception as e:
+        print(f"❌ Ephemeris mode test FAILED - Exception: {str(e)}")
+
+def test_chart_settings():
+    """Test the ayanamsa and node_type fields, their validation, and that concurrent requests keep their own settings"""
+    base_data = {
+        'male_dob': '1978-09-18', 'male_tob': '17:35', 'male_lat': 13.08333333, 'male_lon': 80.28333333,
+        'female_dob': '1982-03-15', 'female_tob': '08:30', 'female_lat': 13.08333333, 'female_lon': 80.28333333
+    }
+    
+    def rahu_longitude(data, lang='en'):
+        response = requests.post('http://localhost:5001/analyze', json=data, headers={'X-Language': lang})
+        response.raise_for_status()
+        return response.json()['male_rahu']['longitude']
+    
+    try:
+        default = rahu_longitude(base_data)
+        raman = rahu_longitude({**base_data, 'ayanamsa': 'raman'})
+        true_node = rahu_longitude({**base_data, 'node_type': 'true'})
+        both = rahu_longitude({**base_data, 'ayanamsa': 'raman', 'node_type': 'true'})
+        if len({default, raman, true_node, both}) != 4:
+            print("❌ Chart settings test FAILED - ayanamsa or node_type did not change the nodes")
+            return
+        
+        for field, value in (('ayanamsa', 'bogus'), ('node_type', 'bogus')):
+            invalid = requests.post('http://localhost:5001/analyze', json={**base_data, field: value})
+            if invalid.status_code != 400 or invalid.json().get('success') is not False:
+                print(f"❌ Chart settings test FAILED - Invalid {field} returned {invalid.status_code}")
+                return
+        
+        # Alternate the settings across concurrent requests (fresh inputs, so every one is computed)
+        # and compare each with the same analysis recomputed on its own in the other language
+        latitude = round(random.uniform(8, 30), 6)
+        requests_data = [
+            {**base_data, 'male_tob': f'{hour:02d}:35', 'male_lat': latitude, 'ayanamsa': ('lahiri', 'raman')[hour % 2],
+             'node_type': ('mean', 'true')[hour // 2 % 2]}
+            for hour in range(8)
+        ]
+        concurrent = [None] * len(requests_data)
+        
+        def submit(index):
+            concurrent[index] = rahu_longitude(requests_data[index])
+        
+        threads = [threading.Thread(target=submit, args=(index,)) for index in range(len(requests_data))]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        sequential = [rahu_longitude(data, 'ta') for data in requests_data]
+        
+        if concurrent != sequential:
+            print("❌ Chart settings test FAILED - Concurrent requests computed with another request's settings")
+        else:
+            print("✅ Chart settings test PASSED")
+            print(f"📊 Rahu: lahiri/mean {default:.4f}, raman/mean {raman:.4f}, lahiri/true {true_node:.4f}, raman/true {both:.4f}")
+    
+    except requests.exceptions.ConnectionError:
+        print("❌ Chart settings test FAILED - Could not connect to server")
+    except Exception as e:
+        print(f"❌ Chart settings test FAILED - Exception: {str(e)}")
+
 if __name__ == "__main__":
     print("🧪 Testing Enhanced Vedic Life Partner Prediction App")
     print("=" * 60)
@@ -96,6 +500,36 @@ if __name__ == "__main__":
     print("\n2. Testing Compatibility Analysis...")
     test_compatibility_analysis()
     
+    print("\n3. Testing Both Directions...")
+    test_both_directions()
+    
+    print("\n4. Testing Divisional Charts...")
+    test_divisional_charts()
+    
+    print("\n5. Testing Synastry...")
+    test_synastry()
+    
+    print("\n6. Testing Static Assets...")
+    test_static_assets()
+    
+    print("\n7. Testing Result Revalidation...")
+    test_result_revalidation()
+    
+    print("\n8. Testing Compact Schema...")
+    test_compact_schema()
+    
+    print("\n9. Testing Result Permalinks...")
+    test_result_permalink()
+    
+    print("\n10. Testing Readiness...")
+    test_readiness()
+    
+    print("\n11. Testing Ephemeris Mode...")
+    test_ephemeris_mode()
+    
+    print("\n12. Testing Chart Settings...")
+    test_chart_settings()
+    
     print("\n" + "=" * 60)
     print("🎉 Test completed! Open http://localhost:5001 in your browser to use the app.")
     print("💡 Add ?sample=true to the URL to pre-fill sample data for testing.")
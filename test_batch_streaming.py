@@ -0,0 +1,98 @@
+#!/usr/bin/env python3
+"""
+Test script for the batch analysis endpoint and its NDJSON streaming mode
+"""
+
+import requests
+import json
+
+MALE_PROFILE = {
+    'male_dob': '1978-09-18',
+    'male_tob': '17:35',
+    'male_lat': 13.08333333,
+    'male_lon': 80.28333333
+}
+
+CANDIDATES = [
+    {'id': 'c1', 'female_dob': '1984-01-15', 'female_tob': '13:30', 'female_lat': 11.9416, 'female_lon': 79.8083},
+    {'id': 'c2', 'female_dob': '1982-03-15', 'female_tob': '08:30', 'female_lat': 13.0833, 'female_lon': 80.2833},
+    {'id': 'c3', 'female_dob': '1992-08-20', 'female_tob': '16:45', 'female_lat': 11.9416, 'female_lon': 79.8083}
+]
+
+def test_batch_json():
+    """Test the buffered JSON response of the batch endpoint"""
+    try:
+        response = requests.post(
+            'http://localhost:5001/analyze/batch',
+            json={**MALE_PROFILE, 'candidates': CANDIDATES},
+            headers={'Content-Type': 'application/json'}
+        )
+        
+        if response.status_code == 200:
+            result = response.json()
+            summary = result['summary']
+            if len(result['results']) == len(CANDIDATES) and summary['succeeded'] == len(CANDIDATES):
+                print("✅ Batch JSON test PASSED")
+                for item in result['results']:
+                    print(f"   - {item['id']}: {item['total_matches']} matches ({item['verdict_class']})")
+                print(f"   Summary: {summary}")
+                return True
+            else:
+                print(f"❌ Batch JSON test FAILED - Unexpected result: {summary}")
+                return False
+        else:
+            print(f"❌ Batch JSON test FAILED - HTTP {response.status_code}")
+            return False
+            
+    except requests.exceptions.ConnectionError:
+        print("❌ Batch JSON test FAILED - Could not connect to server")
+        return False
+    except Exception as e:
+        print(f"❌ Batch JSON test FAILED - Exception: {str(e)}")
+        return False
+
+def test_batch_ndjson_stream():
+    """Test that NDJSON results arrive one line per candidate plus a summary"""
+    try:
+        body = '\n'.join(json.dumps(item) for item in [MALE_PROFILE] + CANDIDATES)
+        response = requests.post(
+            'http://localhost:5001/analyze/batch',
+            data=body,
+            headers={'Content-Type': 'application/x-ndjson', 'Accept': 'application/x-ndjson'},
+            stream=True
+        )
+        
+        if response.status_code != 200:
+            print(f"❌ NDJSON stream test FAILED - HTTP {response.status_code}")
+            return False
+        
+        lines = [json.loads(line) for line in response.iter_lines() if line]
+        results, summary = lines[:-1], lines[-1].get('summary')
+        
+        if summary and len(results) == len(CANDIDATES) and all(item['success'] for item in results):
+            print("✅ NDJSON stream test PASSED")
+            print(f"   Received {len(results)} result lines, summary: {summary}")
+            return True
+        else:
+            print("❌ NDJSON stream test FAILED - Missing results or summary line")
+            return False
+            
+    except requests.exceptions.ConnectionError:
+        print("❌ NDJSON stream test FAILED - Could not connect to server")
+        return False
+    except Exception as e:
+        print(f"❌ NDJSON stream test FAILED - Exception: {str(e)}")
+        return False
+
+if __name__ == "__main__":
+    print("🧪 Testing Batch Analysis Endpoint")
+    print("=" * 50)
+    
+    print("\n1. Testing buffered JSON batch response...")
+    test_batch_json()
+    
+    print("\n2. Testing NDJSON streaming response...")
+    test_batch_ndjson_stream()
+    
+    print("\n" + "=" * 50)
+    print("🏁 Batch analysis test completed!")
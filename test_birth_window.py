@@ -0,0 +1,137 @@
+#!/usr/bin/env python3
+"""
+Test script for birth time window analysis
+"""
+
+import requests
+
+def test_birth_window():
+    """Analyze a two-hour and a four-hour birth time window"""
+    try:
+        test_data = {
+            'male_dob': '1990-05-15',
+            'male_tob_from': '09:30',
+            'male_tob_to': '11:30',
+            'male_lat': 13.0833,
+            'male_lon': 80.2833,
+            'female_dob': '1992-08-20',
+            'female_tob_from': '12:45',
+            'female_tob_to': '16:45',
+            'female_lat': 13.0833,
+            'female_lon': 80.2833
+        }
+        
+        response = requests.post('http://localhost:5001/analyze/window', json=test_data)
+        if response.status_code != 200:
+            print(f"❌ Birth window test FAILED - HTTP {response.status_code}")
+            return False
+        
+        result = response.json()
+        total_share = sum(item['share'] for item in result['intervals'])
+        if result['success'] and abs(total_share - 1.0) < 1e-3:
+            print(f"✅ Birth window test PASSED - {len(result['intervals'])} intervals from "
+                  f"{result['ephemeris_evaluations']} ephemeris evaluations")
+            for item in result['intervals']:
+                print(f"   - female {item['female_from']} to {item['female_to']}: "
+                      f"{item['total_matches']} matches ({item['share']:.1%})")
+            return True
+        else:
+            print(f"❌ Birth window test FAILED - Shares add up to {total_share}")
+            return False
+            
+    except requests.exceptions.ConnectionError:
+        print("❌ Birth window test FAILED - Could not connect to server")
+        return False
+    except Exception as e:
+        print(f"❌ Birth window test FAILED - Exception: {str(e)}")
+        return False
+
+def test_exact_time_matches_analyze():
+    """A window of a single minute must agree with /analyze"""
+    try:
+        test_data = {
+            'male_dob': '1978-09-18',
+            'male_tob': '17:35',
+            'male_lat': 13.08333333,
+            'male_lon': 80.28333333,
+            'female_dob': '1984-01-15',
+            'female_tob': '13:30',
+            'female_lat': 11.9416,
+            'female_lon': 79.8083
+        }
+        
+        window = requests.post('http://localhost:5001/analyze/window', json=test_data).json()
+        analysis = requests.post('http://localhost:5001/analyze', json=test_data).json()
+        
+        if len(window['intervals']) == 1 and window['intervals'][0]['total_matches'] == analysis['total_matches']:
+            print(f"✅ Exact time window test PASSED - {analysis['total_matches']} matches")
+            return True
+        else:
+            print("❌ Exact time window test FAILED - Window and /analyze disagree")
+            return False
+            
+    except requests.exceptions.ConnectionError:
+        print("❌ Exact time window test FAILED - Could not connect to server")
+        return False
+    except Exception as e:
+        print(f"❌ Exact time window test FAILED - Exception: {str(e)}")
+        return False
+
+def test_reverse_search():
+    """Every found interval must reach the threshold when checked with /analyze"""
+    try:
+        search_data = {
+            'male_dob': '1990-05-15',
+            'male_tob': '14:30',
+            'male_lat': 13.0833,
+            'male_lon': 80.2833,
+            'female_dob_from': '1992-01-01',
+            'female_dob_to': '1992-01-31',
+            'female_lat': 13.0833,
+            'female_lon': 80.2833,
+            'min_matches': 4
+        }
+        
+        response = requests.post('http://localhost:5001/search/birth-windows', json=search_data)
+        if response.status_code != 200:
+            print(f"❌ Reverse search test FAILED - HTTP {response.status_code}")
+            return False
+        
+        result = response.json()
+        for item in result['intervals'][:5]:
+            for moment in (item['from'], item['to']):
+                dob, tob = moment.split(' ')
+                analysis = requests.post('http://localhost:5001/analyze', json={
+                    'male_dob': '1990-05-15', 'male_tob': '14:30', 'male_lat': 13.0833, 'male_lon': 80.2833,
+                    'female_dob': dob, 'female_tob': tob, 'female_lat': 13.0833, 'female_lon': 80.2833
+                }).json()
+                if analysis['total_matches'] < 4:
+                    print(f"❌ Reverse search test FAILED - {moment} has {analysis['total_matches']} matches")
+                    return False
+        
+        print(f"✅ Reverse search test PASSED - {len(result['intervals'])} intervals, "
+              f"{result['matching_minutes']} matching minutes")
+        return True
+            
+    except requests.exceptions.ConnectionError:
+        print("❌ Reverse search test FAILED - Could not connect to server")
+        return False
+    except Exception as e:
+        print(f"❌ Reverse search test FAILED - Exception: {str(e)}")
+        return False
+
+if __name__ == "__main__":
+    print("🧪 Testing Birth Time Window Analysis")
+    print("=" * 50)
+    
+    print("\n1. Testing birth time windows...")
+    test_birth_window()
+    
+    print("\n2. Testing a single-minute window...")
+    test_exact_time_matches_analyze()
+    
+    print("\n3. Testing reverse search...")
+    test_reverse_search()
+    
+    print("\n" + "=" * 50)
+    print("🏁 Birth window test completed!")
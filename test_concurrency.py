@@ -0,0 +1,113 @@
+#!/usr/bin/env python3
+"""
+Test script for concurrent /analyze requests
+"""
+
+import random
+import threading
+
+import requests
+
+BASE_URL = 'http://localhost:5001'
+
+def fresh_analysis():
+    """Analysis inputs no earlier run has stored, so the server has to compute them"""
+    rng = random.Random()
+    return {
+        'male_dob': '1978-09-18',
+        'male_tob': f'{rng.randrange(24):02d}:{rng.randrange(60):02d}',
+        'male_lat': round(rng.uniform(8, 30), 6),
+        'male_lon': 80.28333333,
+        'female_dob': '1984-01-15',
+        'female_tob': '13:30',
+        'female_lat': 11.9416,
+        'female_lon': 79.8083
+    }
+
+def test_singleflight():
+    """Identical concurrent /analyze requests must run one computation and get the same result"""
+    try:
+        before = requests.get(f'{BASE_URL}/metrics').json()['singleflight']
+        data = fresh_analysis()
+        responses = [None] * 8
+        
+        def submit(index):
+            responses[index] = requests.post(f'{BASE_URL}/analyze', json=data)
+        
+        threads = [threading.Thread(target=submit, args=(index,)) for index in range(len(responses))]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        after = requests.get(f'{BASE_URL}/metrics').json()['singleflight']
+        
+        executions = after['executions'] - before['executions']
+        shared = after['shared_in_process'] - before['shared_in_process']
+        if any(response.status_code != 200 for response in responses):
+            print(f"❌ Single-flight test FAILED - Status codes {[response.status_code for response in responses]}")
+            return False
+        if len({response.content for response in responses}) != 1:
+            print("❌ Single-flight test FAILED - Identical requests got different results")
+            return False
+        if executions != 1:
+            print(f"❌ Single-flight test FAILED - {executions} computations for {len(responses)} identical requests")
+            return False
+        
+        print("✅ Single-flight test PASSED")
+        print(f"📊 {len(responses)} requests, 1 computation, {shared} shared in flight")
+        return True
+    
+    except requests.exceptions.ConnectionError:
+        print("❌ Single-flight test FAILED - Could not connect to server")
+        return False
+    except Exception as e:
+        print(f"❌ Single-flight test FAILED - Exception: {str(e)}")
+        return False
+
+def test_load_shedding():
+    """A request that cannot start within its budget gets 503 with Retry-After and can be retried"""
+    try:
+        before = requests.get(f'{BASE_URL}/metrics').json()['admission']
+        data = fresh_analysis()
+        
+        # A zero budget has run out before an admission slot can be taken
+        shed = requests.post(f'{BASE_URL}/analyze', json=data, headers={'X-Request-Timeout': '0'})
+        after = requests.get(f'{BASE_URL}/metrics').json()['admission']
+        retry = requests.post(f'{BASE_URL}/analyze', json=data)
+        
+        if shed.status_code != 503 or shed.json().get('success') is not False:
+            print(f"❌ Load shedding test FAILED - Expected 503, got {shed.status_code}")
+            return False
+        if not shed.headers.get('Retry-After', '').isdigit() or int(shed.headers['Retry-After']) < 1:
+            print(f"❌ Load shedding test FAILED - Bad Retry-After: {shed.headers.get('Retry-After')}")
+            return False
+        if after['shed_total'] != before['shed_total'] + 1:
+            print("❌ Load shedding test FAILED - Shed request not counted in /metrics")
+            return False
+        if retry.status_code != 200 or not retry.json().get('success'):
+            print(f"❌ Load shedding test FAILED - Retry returned {retry.status_code}")
+            return False
+        
+        print("✅ Load shedding test PASSED")
+        print(f"📊 Retry-After: {shed.headers['Retry-After']} s, shed so far: {after['shed']}")
+        return True
+    
+    except requests.exceptions.ConnectionError:
+        print("❌ Load shedding test FAILED - Could not connect to server")
+        return False
+    except Exception as e:
+        print(f"❌ Load shedding test FAILED - Exception: {str(e)}")
+        return False
+
+if __name__ == "__main__":
+    print("🧪 Testing Concurrent Requests")
+    print("=" * 50)
+    
+    print("\n1. Testing single-flight deduplication...")
+    test_singleflight()
+    
+    print("\n2. Testing load shedding...")
+    test_load_shedding()
+    
+    print("\n" + "=" * 50)
+    print("🏁 Concurrency test completed!")
@@ -0,0 +1,99 @@
+#!/usr/bin/env python3
+"""
+Test script for the Vimshottari dasha periods
+"""
+
+import requests
+
+BASE_URL = 'http://localhost:5001'
+
+TEST_DATA = {
+    'male_dob': '1978-09-18',
+    'male_tob': '17:35',
+    'male_lat': 13.08333333,
+    'male_lon': 80.28333333,
+    'female_dob': '1984-01-15',
+    'female_tob': '13:30',
+    'female_lat': 11.9416,
+    'female_lon': 79.8083
+}
+
+def test_current_periods():
+    """The running periods must nest around the date and the upcoming ones follow on"""
+    try:
+        result = requests.post(f'{BASE_URL}/dasha', json={**TEST_DATA, 'date': '2026-10-18', 'upcoming': 5}).json()
+        
+        for partner in ('male', 'female'):
+            current = result[partner]['current']
+            upcoming = result[partner]['upcoming']
+            if [period['level'] for period in current] != ['maha', 'antar', 'pratyantar']:
+                print(f"❌ Current periods test FAILED - Unexpected levels for {partner}")
+                return False
+            if not all(period['start'] <= result['date'] <= period['end'] for period in current):
+                print(f"❌ Current periods test FAILED - {partner} periods do not contain the date")
+                return False
+            if current[1]['lords'][0] != current[0]['lord'] or current[2]['lords'][:2] != current[1]['lords']:
+                print(f"❌ Current periods test FAILED - {partner} sub-periods are not nested")
+                return False
+            if len(upcoming) != 5 or upcoming[0]['start'] != current[1]['end']:
+                print(f"❌ Current periods test FAILED - {partner} upcoming antardashas do not follow the current one")
+                return False
+        
+        starts = [period['start'] for period in result['transitions']]
+        if starts != sorted(starts) or len(starts) != 10:
+            print("❌ Current periods test FAILED - Transitions are not merged by date")
+            return False
+        
+        print("✅ Current periods test PASSED")
+        for partner in ('male', 'female'):
+            print(f"📊 {partner.capitalize()}: {' / '.join(period['lord'] for period in result[partner]['current'])}")
+        return True
+            
+    except requests.exceptions.ConnectionError:
+        print("❌ Current periods test FAILED - Could not connect to server")
+        return False
+    except Exception as e:
+        print(f"❌ Current periods test FAILED - Exception: {str(e)}")
+        return False
+
+def test_balance_at_birth():
+    """At birth the mahadasha is the Moon nakshatra lord's, with the balance left"""
+    try:
+        result = requests.post(f'{BASE_URL}/dasha', json={**TEST_DATA, 'date': '1984-01-16'}).json()
+        female = result['female']
+        
+        if female['current'][0]['lord'] != female['moon_nakshatra_lord']:
+            print("❌ Balance test FAILED - First mahadasha is not the Moon nakshatra lord's")
+            return False
+        if not 0 < female['balance_at_birth_years'] <= 20:
+            print(f"❌ Balance test FAILED - Balance {female['balance_at_birth_years']} out of range")
+            return False
+        
+        invalid = requests.post(f'{BASE_URL}/dasha', json={**TEST_DATA, 'date': '1970-01-01'})
+        if invalid.status_code != 400:
+            print(f"❌ Balance test FAILED - Date before birth returned {invalid.status_code}")
+            return False
+        
+        print(f"✅ Balance test PASSED - {female['balance_at_birth_years']} years of "
+              f"{female['moon_nakshatra_lord']} dasha left at birth")
+        return True
+            
+    except requests.exceptions.ConnectionError:
+        print("❌ Balance test FAILED - Could not connect to server")
+        return False
+    except Exception as e:
+        print(f"❌ Balance test FAILED - Exception: {str(e)}")
+        return False
+
+if __name__ == "__main__":
+    print("🧪 Testing Vimshottari Dasha Periods")
+    print("=" * 50)
+    
+    print("\n1. Testing the current periods...")
+    test_current_periods()
+    
+    print("\n2. Testing the balance at birth...")
+    test_balance_at_birth()
+    
+    print("\n" + "=" * 50)
+    print("🏁 Dasha test completed!")
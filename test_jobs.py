@@ -0,0 +1,143 @@
+#!/usr/bin/env python3
+"""
+Test script for the background job API
+"""
+
+import requests
+import time
+
+MALE_PROFILES = [
+    {'id': 'm1', 'male_dob': '1978-09-18', 'male_tob': '17:35', 'male_lat': 13.08333333, 'male_lon': 80.28333333},
+    {'id': 'm2', 'male_dob': '1990-05-15', 'male_tob': '14:30', 'male_lat': 13.0833, 'male_lon': 80.2833}
+]
+
+CANDIDATES = [
+    {'id': 'c1', 'female_dob': '1984-01-15', 'female_tob': '13:30', 'female_lat': 11.9416, 'female_lon': 79.8083},
+    {'id': 'c2', 'female_dob': '1982-03-15', 'female_tob': '08:30', 'female_lat': 13.0833, 'female_lon': 80.2833},
+    {'id': 'c3', 'female_dob': '1992-08-20', 'female_tob': '16:45', 'female_lat': 11.9416, 'female_lon': 79.8083}
+]
+
+def test_job_lifecycle():
+    """Submit a job, poll it to completion and download the results"""
+    try:
+        response = requests.post(
+            'http://localhost:5001/jobs',
+            json={'males': MALE_PROFILES, 'candidates': CANDIDATES}
+        )
+        if response.status_code != 202:
+            print(f"❌ Job submit test FAILED - HTTP {response.status_code}")
+            return False
+        
+        job = response.json()
+        print(f"✅ Job submitted: {job['job_id']} ({job['total']} pairs)")
+        
+        for _ in range(50):
+            status = requests.get(f"http://localhost:5001{job['status_url']}").json()
+            print(f"   Status: {status['status']} {status['completed']}/{status['total']} "
+                  f"throughput={status['throughput_per_sec']} eta={status['eta_seconds']}")
+            if status['status'] in ('completed', 'failed', 'cancelled'):
+                break
+            time.sleep(0.2)
+        
+        if status['status'] != 'completed':
+            print(f"❌ Job lifecycle test FAILED - Job ended as {status['status']}")
+            return False
+        
+        results = requests.get(f"http://localhost:5001{job['results_url']}").json()['results']
+        if len(results) == len(MALE_PROFILES) * len(CANDIDATES):
+            print("✅ Job lifecycle test PASSED")
+            for item in results:
+                print(f"   - {item['male_id']} x {item['id']}: {item['total_matches']} matches")
+            return True
+        else:
+            print(f"❌ Job lifecycle test FAILED - Got {len(results)} results")
+            return False
+            
+    except requests.exceptions.ConnectionError:
+        print("❌ Job lifecycle test FAILED - Could not connect to server")
+        return False
+    except Exception as e:
+        print(f"❌ Job lifecycle test FAILED - Exception: {str(e)}")
+        return False
+
+def test_job_cancel():
+    """Submit a large job and cancel it"""
+    try:
+        response = requests.post(
+            'http://localhost:5001/jobs',
+            json={'males': MALE_PROFILES, 'candidates': CANDIDATES * 2000}
+        )
+        job_id = response.json()['job_id']
+        
+        cancel = requests.delete(f'http://localhost:5001/jobs/{job_id}').json()
+        time.sleep(1)
+        status = requests.get(f'http://localhost:5001/jobs/{job_id}').json()
+        
+        if cancel['success'] and status['status'] == 'cancelled':
+            print(f"✅ Job cancel test PASSED - stopped after {status['completed']} pairs")
+            return True
+        else:
+            print(f"❌ Job cancel test FAILED - Status: {status['status']}")
+            return False
+            
+    except requests.exceptions.ConnectionError:
+        print("❌ Job cancel test FAILED - Could not connect to server")
+        return False
+    except Exception as e:
+        print(f"❌ Job cancel test FAILED - Exception: {str(e)}")
+        return False
+
+def test_screening_job():
+    """A screening job must reach the same verdicts as an exact job"""
+    try:
+        job_ids = []
+        for screening in (False, True):
+            response = requests.post(
+                'http://localhost:5001/jobs',
+                json={'males': MALE_PROFILES, 'candidates': CANDIDATES, 'screening': screening}
+            )
+            job_ids.append(response.json()['job_id'])
+        
+        results = []
+        for job_id in job_ids:
+            for _ in range(50):
+                status = requests.get(f'http://localhost:5001/jobs/{job_id}').json()
+                if status['status'] in ('completed', 'failed', 'cancelled'):
+                    break
+                time.sleep(0.2)
+            results.append(requests.get(f'http://localhost:5001/jobs/{job_id}/results').json()['results'])
+        
+        exact, screened = results
+        mismatches = [
+            item['index'] for item, fast in zip(exact, screened)
+            if (item['total_matches'], item['verdict_class']) != (fast['total_matches'], fast['verdict_class'])
+        ]
+        if len(screened) == len(exact) and not mismatches:
+            print(f"✅ Screening job test PASSED - {len(screened)} verdicts match the exact job")
+            return True
+        else:
+            print(f"❌ Screening job test FAILED - Mismatched items: {mismatches}")
+            return False
+            
+    except requests.exceptions.ConnectionError:
+        print("❌ Screening job test FAILED - Could not connect to server")
+        return False
+    except Exception as e:
+        print(f"❌ Screening job test FAILED - Exception: {str(e)}")
+        return False
+
+if __name__ == "__main__":
+    print("🧪 Testing Background Job API")
+    print("=" * 50)
+    
+    print("\n1. Testing job submit, progress and results...")
+    test_job_lifecycle()
+    
+    print("\n2. Testing job cancellation...")
+    test_job_cancel()
+    
+    print("\n3. Testing screening jobs...")
+    test_screening_job()
+    
+    print("\n" + "=" * 50)
+    print("🏁 Job API test completed!")
@@ -119,6 +119,71 @@ def test_api_with_different_languages():
         print(f"❌ API test FAILED - Exception: {str(e)}")
         return False
 
+def test_cached_pages():
+    """Test that both pages are served compressed with ETags and revalidate with 304"""
+    try:
+        for path in ('/', '/tamil'):
+            response = requests.get(f'http://localhost:5001{path}', headers={'Accept-Encoding': 'gzip'})
+            etag = response.headers.get('ETag')
+            if response.status_code != 200 or not etag:
+                print(f"❌ Cached page test FAILED - {path} has no ETag")
+                return False
+            if response.headers.get('Content-Encoding') != 'gzip':
+                print(f"❌ Cached page test FAILED - {path} not compressed")
+                return False
+            
+            revalidated = requests.get(f'http://localhost:5001{path}',
+                                       headers={'Accept-Encoding': 'gzip', 'If-None-Match': etag})
+            if revalidated.status_code != 304 or revalidated.content:
+                print(f"❌ Cached page test FAILED - {path} revalidation returned {revalidated.status_code}")
+                return False
+            
+            plain = requests.get(f'http://localhost:5001{path}', headers={'Accept-Encoding': 'identity'})
+            if plain.headers.get('Content-Encoding') or plain.text != response.text:
+                print(f"❌ Cached page test FAILED - {path} differs between encodings")
+                return False
+        
+        print("✅ Cached page test PASSED")
+        return True
+        
+    except Exception as e:
+        print(f"❌ Cached page test FAILED - Exception: {str(e)}")
+        return False
+
+def test_tamil_json():
+    """Test that Tamil analysis bodies are sent as UTF-8 JSON rather than escape sequences"""
+    test_data = {
+        'male_dob': '1978-09-18',
+        'male_tob': '17:35',
+        'male_lat': 13.08333333,
+        'male_lon': 80.28333333,
+        'female_dob': '1982-03-15',
+        'female_tob': '08:30',
+        'female_lat': 13.08333333,
+        'female_lon': 80.28333333
+    }
+    
+    try:
+        response = requests.post('http://localhost:5001/analyze', json=test_data, headers={'X-Language': 'ta'})
+        result = response.json()
+        
+        if not response.headers.get('Content-Type', '').startswith('application/json'):
+            print(f"❌ Tamil JSON test FAILED - Content-Type {response.headers.get('Content-Type')}")
+            return False
+        if b'\\u0b' in response.content or result['verdict'].encode('utf-8') not in response.content:
+            print("❌ Tamil JSON test FAILED - Tamil text is escaped")
+            return False
+        if not isinstance(result['male_rahu'], dict) or 'longitude' not in result['male_rahu']:
+            print("❌ Tamil JSON test FAILED - Planet positions not encoded as objects")
+            return False
+        
+        print(f"✅ Tamil JSON test PASSED ({len(response.content)} bytes)")
+        return True
+        
+    except Exception as e:
+        print(f"❌ Tamil JSON test FAILED - Exception: {str(e)}")
+        return False
+
 def main():
     print("🌐 Testing Multilingual Support in Vedic Life Partner Prediction App")
     print("=" * 70)
@@ -127,7 +192,9 @@ def main():
         ("English Interface", test_english_interface),
         ("Tamil Interface", test_tamil_interface),
         ("Language Switcher", test_language_switcher),
-        ("API Functionality", test_api_with_different_languages)
+        ("API Functionality", test_api_with_different_languages),
+        ("Cached Pages", test_cached_pages),
+        ("Tamil JSON", test_tamil_json)
     ]
     
     passed = 0
@@ -155,6 +222,8 @@ def main():
     print("   - Tamil interface with all translations")
     print("   - Language switcher functionality")
     print("   - API compatibility with both languages")
+    print("   - Pre-rendered pages with compression and ETags")
+    print("   - Tamil analysis bodies as UTF-8 JSON")
     print("   - Form validation messages in both languages")
     print("   - Error messages in both languages")
 
@@ -0,0 +1,120 @@
+#!/usr/bin/env python3
+"""
+Test script for the ten porutham matching
+"""
+
+import time
+
+import requests
+
+BASE_URL = 'http://localhost:5001'
+
+TEST_DATA = {
+    'male_dob': '1978-09-18',
+    'male_tob': '17:35',
+    'male_lat': 13.08333333,
+    'male_lon': 80.28333333,
+    'female_dob': '1984-01-15',
+    'female_tob': '13:30',
+    'female_lat': 11.9416,
+    'female_lon': 79.8083
+}
+
+PORUTHAMS = ['dina', 'gana', 'mahendra', 'stree_deergha', 'yoni',
+             'rasi', 'rasiyathipathi', 'vasya', 'rajju', 'vedha']
+
+def test_ten_poruthams():
+    """Every analysis reports the ten poruthams and how many of them agree"""
+    try:
+        result = requests.post(f'{BASE_URL}/analyze', json=TEST_DATA,
+                               headers={'X-Language': 'en'}).json()
+        
+        keys = [item['key'] for item in result['poruthams']]
+        matched = [item for item in result['poruthams'] if item['status'] == 'match']
+        if keys != PORUTHAMS:
+            print(f"❌ Porutham test FAILED - Unexpected poruthams {keys}")
+            return False
+        if result['porutham_count'] != len(matched):
+            print(f"❌ Porutham test FAILED - Count {result['porutham_count']} for {len(matched)} matches")
+            return False
+        
+        print(f"✅ Porutham test PASSED - {result['porutham_count']}/10 agree")
+        for item in result['poruthams']:
+            print(f"   - {item['name']}: {item['details']} ({item['status']})")
+        return True
+            
+    except requests.exceptions.ConnectionError:
+        print("❌ Porutham test FAILED - Could not connect to server")
+        return False
+    except Exception as e:
+        print(f"❌ Porutham test FAILED - Exception: {str(e)}")
+        return False
+
+def test_same_star_rajju():
+    """A couple born under the same nakshatra never agrees in Rajju"""
+    try:
+        same_star = dict(TEST_DATA, male_dob=TEST_DATA['female_dob'], male_tob=TEST_DATA['female_tob'])
+        result = requests.post(f'{BASE_URL}/analyze', json=same_star).json()
+        
+        rajju = next(item for item in result['poruthams'] if item['key'] == 'rajju')
+        if rajju['status'] == 'no_match':
+            print("✅ Same star Rajju test PASSED")
+            return True
+        else:
+            print(f"❌ Same star Rajju test FAILED - {rajju}")
+            return False
+            
+    except requests.exceptions.ConnectionError:
+        print("❌ Same star Rajju test FAILED - Could not connect to server")
+        return False
+    except Exception as e:
+        print(f"❌ Same star Rajju test FAILED - Exception: {str(e)}")
+        return False
+
+def test_screening_poruthams():
+    """Screening jobs report the same poruthams as the exact analysis"""
+    try:
+        job = requests.post(f'{BASE_URL}/jobs', json={
+            'males': [{key: value for key, value in TEST_DATA.items() if key.startswith('male_')}],
+            'candidates': [{key: value for key, value in TEST_DATA.items() if key.startswith('female_')}],
+            'screening': True
+        }).json()
+        
+        for _ in range(50):
+            status = requests.get(f"{BASE_URL}/jobs/{job['job_id']}").json()
+            if status['status'] == 'completed':
+                break
+            time.sleep(0.1)
+        screened = requests.get(f"{BASE_URL}/jobs/{job['job_id']}/results").json()['results'][0]
+        exact = requests.post(f'{BASE_URL}/analyze', json=TEST_DATA).json()
+        
+        expected = [item['key'] for item in exact['poruthams'] if item['status'] == 'match']
+        if screened['poruthams'] == expected and screened['porutham_count'] == exact['porutham_count']:
+            print("✅ Screening porutham test PASSED")
+            return True
+        else:
+            print(f"❌ Screening porutham test FAILED - {screened['poruthams']} != {expected}")
+            return False
+            
+    except requests.exceptions.ConnectionError:
+        print("❌ Screening porutham test FAILED - Could not connect to server")
+        return False
+    except Exception as e:
+        print(f"❌ Screening porutham test FAILED - Exception: {str(e)}")
+        return False
+
+if __name__ == "__main__":
+    print("🧪 Testing Ten Porutham Matching")
+    print("=" * 50)
+    
+    print("\n1. Testing the porutham report...")
+    test_ten_poruthams()
+    
+    print("\n2. Testing Rajju for the same star...")
+    test_same_star_rajju()
+    
+    print("\n3. Testing screening jobs...")
+    test_screening_poruthams()
+    
+    print("\n" + "=" * 50)
+    print("🏁 Porutham test completed!")
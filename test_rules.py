@@ -0,0 +1,80 @@
+#!/usr/bin/env python3
+"""
+Test script for the declarative compatibility rules
+"""
+
+import requests
+
+BASE_URL = 'http://localhost:5001'
+
+TEST_DATA = {
+    'male_dob': '1978-09-18',
+    'male_tob': '17:35',
+    'male_lat': 13.08333333,
+    'male_lon': 80.28333333,
+    'female_dob': '1984-01-15',
+    'female_tob': '13:30',
+    'female_lat': 11.9416,
+    'female_lon': 79.8083
+}
+
+def test_rules_loaded():
+    """The worker reports the rules in effect and that they loaded cleanly"""
+    try:
+        rules = requests.get(f'{BASE_URL}/metrics').json()['rules']
+        if not rules['conditions'] or not rules['revision']:
+            print("❌ Rules test FAILED - No rules reported")
+            return False
+        if rules['last_error']:
+            print(f"❌ Rules test FAILED - Last reload failed: {rules['last_error']}")
+            return False
+        print(f"✅ Rules test PASSED - {rules['name']} ({rules['revision']}), {rules['conditions']} conditions")
+        return True
+            
+    except requests.exceptions.ConnectionError:
+        print("❌ Rules test FAILED - Could not connect to server")
+        return False
+    except Exception as e:
+        print(f"❌ Rules test FAILED - Exception: {str(e)}")
+        return False
+
+def test_verdict_thresholds():
+    """Verdicts follow the thresholds of the rules in effect, in both directions"""
+    try:
+        thresholds = requests.get(f'{BASE_URL}/metrics').json()['rules']['verdicts']
+        result = requests.post(f'{BASE_URL}/analyze', json={**TEST_DATA, 'symmetric': True, 'navamsa': True}).json()
+        
+        def expected(total):
+            return 'high' if total >= thresholds['high'] else 'moderate' if total >= thresholds['moderate'] else 'low'
+        
+        for name, analysis in (('forward', result), ('reverse', result['reverse'])):
+            if analysis['verdict_class'] != expected(analysis['total_matches']):
+                print(f"❌ Verdict threshold test FAILED - {name} verdict {analysis['verdict_class']} "
+                      f"for {analysis['total_matches']} matches")
+                return False
+            if analysis['total_matches'] and not (analysis['rahu_matches'] or analysis['ketu_matches']):
+                print(f"❌ Verdict threshold test FAILED - {name} total without matched conditions")
+                return False
+        
+        print(f"✅ Verdict threshold test PASSED - thresholds {thresholds}")
+        return True
+            
+    except requests.exceptions.ConnectionError:
+        print("❌ Verdict threshold test FAILED - Could not connect to server")
+        return False
+    except Exception as e:
+        print(f"❌ Verdict threshold test FAILED - Exception: {str(e)}")
+        return False
+
+if __name__ == "__main__":
+    print("🧪 Testing Compatibility Rules")
+    print("=" * 50)
+    
+    print("\n1. Testing the loaded rules...")
+    test_rules_loaded()
+    
+    print("\n2. Testing the verdict thresholds...")
+    test_verdict_thresholds()
+    
+    print("\n" + "=" * 50)
+    print("🏁 Rules test completed!")
@@ -0,0 +1,120 @@
+#!/usr/bin/env python3
+"""
+Test script for interactive analysis sessions
+"""
+
+import json
+import threading
+
+import requests
+
+BASE_URL = 'http://localhost:5001'
+
+TEST_DATA = {
+    'male_dob': '1978-09-18',
+    'male_tob': '17:35',
+    'male_lat': 13.08333333,
+    'male_lon': 80.28333333,
+    'female_dob': '1984-01-15',
+    'female_tob': '13:30',
+    'female_lat': 11.9416,
+    'female_lon': 79.8083
+}
+
+def apply_delta(state, delta):
+    """Merge a PATCH delta into a full response, as the frontend does"""
+    state.update(delta['changed'])
+    for key in delta['removed']:
+        del state[key]
+    rows = state['compatibility_data']
+    rows.extend([None] * (delta['condition_count'] - len(rows)))
+    del rows[delta['condition_count']:]
+    for index, row in delta['changed_conditions'].items():
+        rows[int(index)] = row
+
+def test_session_updates_match_analyze():
+    """Deltas applied to the first response must reproduce /analyze after every change"""
+    try:
+        state = requests.post(f'{BASE_URL}/sessions', json=TEST_DATA).json()
+        session_id = state['session_id']
+        inputs = dict(TEST_DATA)
+        
+        for changes in ({'female_tob': '13:31'}, {'female_lat': 28.6139}, {'male_tob': '05:10'}, {'female_dob': '1985-02-01'},
+                        {'symmetric': True}, {'male_lat': 19.076}, {'navamsa': True}, {'female_tob': '21:05'},
+                        {'symmetric': False}, {'vargas': ['D9', 'D10']}, {'navamsa': False, 'vargas': []}):
+            delta = requests.patch(f'{BASE_URL}/sessions/{session_id}', json=changes).json()
+            apply_delta(state, delta)
+            inputs.update(changes)
+            
+            expected = requests.post(f'{BASE_URL}/analyze', json=inputs).json()
+            expected.pop('result_id', None)  # /analyze results are also stored under their permalink
+            actual = {key: value for key, value in state.items() if key not in ('session_id', 'version')}
+            if actual != expected:
+                print(f"❌ Session update test FAILED - Result differs from /analyze after {changes}")
+                return False
+            print(f"   - {changes}: recomputed {delta['recomputed']} in {delta['elapsed_ms']} ms")
+        
+        requests.delete(f'{BASE_URL}/sessions/{session_id}')
+        print("✅ Session update test PASSED")
+        return True
+            
+    except requests.exceptions.ConnectionError:
+        print("❌ Session update test FAILED - Could not connect to server")
+        return False
+    except Exception as e:
+        print(f"❌ Session update test FAILED - Exception: {str(e)}")
+        return False
+
+def test_session_events():
+    """The event stream sends a snapshot, each delta and a final closed event"""
+    try:
+        session_id = requests.post(f'{BASE_URL}/sessions', json=TEST_DATA).json()['session_id']
+        events = []
+        connected = threading.Event()
+        
+        def listen():
+            with requests.get(f'{BASE_URL}/sessions/{session_id}/events', stream=True, timeout=10) as response:
+                connected.set()
+                event = None
+                for line in response.iter_lines(decode_unicode=True):
+                    if line.startswith('event:'):
+                        event = line[len('event:'):].strip()
+                    elif line.startswith('data:'):
+                        events.append((event, json.loads(line[len('data:'):])['version']))
+                        if event == 'closed':
+                            break
+        
+        listener = threading.Thread(target=listen)
+        listener.start()
+        connected.wait(5)
+        for minute in ('13:31', '13:32'):
+            requests.patch(f'{BASE_URL}/sessions/{session_id}', json={'female_tob': minute})
+        requests.delete(f'{BASE_URL}/sessions/{session_id}')
+        listener.join(10)
+        
+        if events == [('snapshot', 0), ('delta', 1), ('delta', 2), ('closed', 2)]:
+            print("✅ Session events test PASSED")
+            return True
+        else:
+            print(f"❌ Session events test FAILED - Received {events}")
+            return False
+            
+    except requests.exceptions.ConnectionError:
+        print("❌ Session events test FAILED - Could not connect to server")
+        return False
+    except Exception as e:
+        print(f"❌ Session events test FAILED - Exception: {str(e)}")
+        return False
+
+if __name__ == "__main__":
+    print("🧪 Testing Interactive Sessions")
+    print("=" * 50)
+    
+    print("\n1. Testing incremental updates...")
+    test_session_updates_match_analyze()
+    
+    print("\n2. Testing the event stream...")
+    test_session_events()
+    
+    print("\n" + "=" * 50)
+    print("🏁 Session test completed!")
@@ -111,7 +111,70 @@ TRANSLATIONS = {
         'female_moon_nakshatra_lord': 'Female Moon Nakshatra Lord',
         'female_lagna_lord_match': 'Female Lagna Lord',
         'present_in_female_lagna': 'present in female lagna',
-        'present_in_female_moon_sign': 'present in female moon sign'
+        'present_in_female_moon_sign': 'present in female moon sign',
+        'male_rasi_moon_sign': 'Male Rasi (Moon Sign)',
+        'male_nakshatra': 'Male Nakshatra',
+        'male_lagna_point': 'Male Lagna Point',
+        'planets_in_male_lagna': 'Planets in Male Lagna',
+        'planets_in_male_rasi': 'Planets in Male Rasi',
+        'male_moon_sign_lord': 'Male Moon Sign Lord',
+        'male_moon_nakshatra_lord': 'Male Moon Nakshatra Lord',
+        'present_in_male_lagna': 'present in male lagna',
+        'present_in_male_moon_sign': 'present in male moon sign',
+        
+        # Both Directions
+        'both_directions': 'Also check the female Rahu/Ketu against the male chart',
+        'reverse_analysis': '🔁 Female Rahu/Ketu against the Male Chart',
+        'female_rahu_nakshatra': 'Female Rahu Nakshatra',
+        'female_ketu_nakshatra': 'Female Ketu Nakshatra',
+        'male_chart_details': 'Male Chart Details',
+        
+        # Navamsa and Divisional Charts
+        'navamsa_conditions': 'Include navamsa (D9) Moon sign and lagna',
+        'female_navamsa_moon_sign': 'Female Navamsa Moon Sign',
+        'female_navamsa_lagna': 'Female Navamsa Lagna',
+        'male_navamsa_moon_sign': 'Male Navamsa Moon Sign',
+        'male_navamsa_lagna': 'Male Navamsa Lagna',
+        
+        # Poruthams
+        'ten_poruthams': '💑 Ten Poruthams',
+        'porutham_count': 'Poruthams Matched',
+        'porutham': 'Porutham',
+        'porutham_details': 'Female / Male',
+        'star_count': 'Star count',
+        'sign_count': 'Sign count',
+        'porutham_dina': 'Dina',
+        'porutham_gana': 'Gana',
+        'porutham_mahendra': 'Mahendra',
+        'porutham_stree_deergha': 'Stree Deergha',
+        'porutham_yoni': 'Yoni',
+        'porutham_rasi': 'Rasi',
+        'porutham_rasiyathipathi': 'Rasiyathipathi',
+        'porutham_vasya': 'Vasya',
+        'porutham_rajju': 'Rajju',
+        'porutham_vedha': 'Vedha',
+        'gana_deva': 'Deva',
+        'gana_manushya': 'Manushya',
+        'gana_rakshasa': 'Rakshasa',
+        'yoni_horse': 'Horse',
+        'yoni_elephant': 'Elephant',
+        'yoni_goat': 'Goat',
+        'yoni_serpent': 'Serpent',
+        'yoni_dog': 'Dog',
+        'yoni_cat': 'Cat',
+        'yoni_rat': 'Rat',
+        'yoni_cow': 'Cow',
+        'yoni_buffalo': 'Buffalo',
+        'yoni_tiger': 'Tiger',
+        'yoni_deer': 'Deer',
+        'yoni_monkey': 'Monkey',
+        'yoni_mongoose': 'Mongoose',
+        'yoni_lion': 'Lion',
+        'rajju_pada': 'Pada (feet)',
+        'rajju_kati': 'Kati (waist)',
+        'rajju_nabhi': 'Nabhi (navel)',
+        'rajju_kantha': 'Kantha (neck)',
+        'rajju_siro': 'Siro (head)'
     },
     
     'ta': {
@@ -224,7 +287,70 @@ TRANSLATIONS = {
         'female_moon_nakshatra_lord': 'பெண் சந்திரன் நட்சத்திர ஆட்சியாளர்',
         'female_lagna_lord_match': 'பெண் லக்கின ஆட்சியாளர்',
         'present_in_female_lagna': 'பெண் லக்கின வீட்டில் உள்ளது',
-        'present_in_female_moon_sign': 'பெண் சந்திரன் ராசியில் உள்ளது'
+        'present_in_female_moon_sign': 'பெண் சந்திரன் ராசியில் உள்ளது',
+        'male_rasi_moon_sign': 'ஆண் ராசி (சந்திரன் ராசி)',
+        'male_nakshatra': 'ஆண் நட்சத்திரம்',
+        'male_lagna_point': 'ஆண் லக்கின புள்ளி',
+        'planets_in_male_lagna': 'ஆண் லக்கினத்தில் உள்ள கிரகங்கள்',
+        'planets_in_male_rasi': 'ஆண் ராசியில் உள்ள கிரகங்கள்',
+        'male_moon_sign_lord': 'ஆண் சந்திரன் ராசி ஆட்சியாளர்',
+        'male_moon_nakshatra_lord': 'ஆண் சந்திரன் நட்சத்திர ஆட்சியாளர்',
+        'present_in_male_lagna': 'ஆண் லக்கின வீட்டில் உள்ளது',
+        'present_in_male_moon_sign': 'ஆண் சந்திரன் ராசியில் உள்ளது',
+        
+        # Both Directions
+        'both_directions': 'பெண் ராகு/கேதுவை ஆண் சார்ட்டுடனும் சரிபார்',
+        'reverse_analysis': '🔁 ஆண் சார்ட்டுடன் பெண் ராகு/கேது',
+        'female_rahu_nakshatra': 'பெண் ராகு நட்சத்திரம்',
+        'female_ketu_nakshatra': 'பெண் கேது நட்சத்திரம்',
+        'male_chart_details': 'ஆண் சார்ட் விவரங்கள்',
+        
+        # Navamsa and Divisional Charts
+        'navamsa_conditions': 'நவாம்ச (D9) சந்திரன் ராசி மற்றும் லக்கினத்தையும் சேர்',
+        'female_navamsa_moon_sign': 'பெண் நவாம்ச சந்திரன் ராசி',
+        'female_navamsa_lagna': 'பெண் நவாம்ச லக்கினம்',
+        'male_navamsa_moon_sign': 'ஆண் நவாம்ச சந்திரன் ராசி',
+        'male_navamsa_lagna': 'ஆண் நவாம்ச லக்கினம்',
+        
+        # Poruthams
+        'ten_poruthams': '💑 பத்து பொருத்தங்கள்',
+        'porutham_count': 'பொருந்திய பொருத்தங்கள்',
+        'porutham': 'பொருத்தம்',
+        'porutham_details': 'பெண் / ஆண்',
+        'star_count': 'நட்சத்திர எண்ணிக்கை',
+        'sign_count': 'ராசி எண்ணிக்கை',
+        'porutham_dina': 'தினம்',
+        'porutham_gana': 'கணம்',
+        'porutham_mahendra': 'மகேந்திரம்',
+        'porutham_stree_deergha': 'ஸ்திரீ தீர்க்கம்',
+        'porutham_yoni': 'யோனி',
+        'porutham_rasi': 'ராசி',
+        'porutham_rasiyathipathi': 'ராசி அதிபதி',
+        'porutham_vasya': 'வசியம்',
+        'porutham_rajju': 'ரஜ்ஜு',
+        'porutham_vedha': 'வேதை',
+        'gana_deva': 'தேவ கணம்',
+        'gana_manushya': 'மனுஷ்ய கணம்',
+        'gana_rakshasa': 'ராட்சஸ கணம்',
+        'yoni_horse': 'குதிரை',
+        'yoni_elephant': 'யானை',
+        'yoni_goat': 'ஆடு',
+        'yoni_serpent': 'பாம்பு',
+        'yoni_dog': 'நாய்',
+        'yoni_cat': 'பூனை',
+        'yoni_rat': 'எலி',
+        'yoni_cow': 'பசு',
+        'yoni_buffalo': 'எருமை',
+        'yoni_tiger': 'புலி',
+        'yoni_deer': 'மான்',
+        'yoni_monkey': 'குரங்கு',
+        'yoni_mongoose': 'கீரி',
+        'yoni_lion': 'சிங்கம்',
+        'rajju_pada': 'பாத ரஜ்ஜு',
+        'rajju_kati': 'கடி ரஜ்ஜு',
+        'rajju_nabhi': 'நாபி ரஜ்ஜு',
+        'rajju_kantha': 'கண்ட ரஜ்ஜு',
+        'rajju_siro': 'சிரோ ரஜ்ஜு'
     }
 }
 
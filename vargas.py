@@ -0,0 +1,99 @@
+"""
+Divisional charts (vargas) D1-D60 from sidereal longitudes.
+
+A varga divides every sign into parts and maps each part to a sign. For the
+equal divisions the mapping is "count on from a starting sign", where the
+starting sign depends on the sign being divided; these starts are tabulated
+per division in ``_STARTS``. The unequal Trimsamsa (D30) is tabulated per
+whole degree. Longitudes are first truncated to integer arc seconds, so
+every division is a few integer operations and table lookups that work on
+whole NumPy arrays at once, and parts never straddle a rounding error. No
+ephemeris calls are made.
+
+Rules follow Parashara (Brihat Parashara Hora Shastra, chapter 6).
+"""
+
+from typing import Dict, Iterable
+
+import numpy as np
+
+NAMES = {
+    1: 'Rasi', 2: 'Hora', 3: 'Drekkana', 4: 'Chaturthamsa', 7: 'Saptamsa', 9: 'Navamsa',
+    10: 'Dasamsa', 12: 'Dwadasamsa', 16: 'Shodasamsa', 20: 'Vimsamsa', 24: 'Chaturvimsamsa',
+    27: 'Bhamsa', 30: 'Trimsamsa', 40: 'Khavedamsa', 45: 'Akshavedamsa', 60: 'Shashtiamsa'
+}
+DIVISIONS = tuple(NAMES)
+
+SIGN_SECONDS = 30 * 3600
+
+def _by_sign(rule) -> np.ndarray:
+    return np.array([rule(sign) for sign in range(12)], dtype=np.int64)
+
+# Sign the first part of each sign maps to (signs counted from Mesha = 0).
+# Odd signs (Mesha, Mithuna, ...) have even indexes; movable, fixed and dual
+# signs repeat every three signs, the elements every four.
+_STARTS = {
+    1: _by_sign(lambda sign: sign),
+    3: _by_sign(lambda sign: sign),
+    4: _by_sign(lambda sign: sign),
+    7: _by_sign(lambda sign: sign if sign % 2 == 0 else sign + 6),
+    9: _by_sign(lambda sign: [0, 9, 6, 3][sign % 4]),
+    10: _by_sign(lambda sign: sign if sign % 2 == 0 else sign + 8),
+    12: _by_sign(lambda sign: sign),
+    16: _by_sign(lambda sign: [0, 4, 8][sign % 3]),
+    20: _by_sign(lambda sign: [0, 8, 4][sign % 3]),
+    24: _by_sign(lambda sign: 4 if sign % 2 == 0 else 3),
+    27: _by_sign(lambda sign: [0, 3, 6, 9][sign % 4]),
+    40: _by_sign(lambda sign: 0 if sign % 2 == 0 else 6),
+    45: _by_sign(lambda sign: [0, 4, 8][sign % 3]),
+    60: _by_sign(lambda sign: sign)
+}
+
+# Distance in signs between consecutive parts: the Drekkana steps to the 5th
+# and 9th sign, the Chaturthamsa to the 4th, 7th and 10th
+_STEPS = {3: 4, 4: 3}
+
+# Hora: the Sun's sign (Simha) or the Moon's sign (Kataka) per half sign
+_HORA = np.array([[4, 3], [3, 4]] * 6, dtype=np.int64)
+
+# Trimsamsa sign per whole degree of an odd and of an even sign
+_TRIMSAMSA = np.array([
+    [0] * 5 + [10] * 5 + [8] * 8 + [2] * 7 + [6] * 5,
+    [1] * 5 + [5] * 7 + [11] * 8 + [9] * 5 + [7] * 5
+], dtype=np.int64)
+
+def _arc_seconds(longitudes) -> np.ndarray:
+    return np.floor(np.asarray(longitudes, dtype=float) * 3600.0).astype(np.int64) % (360 * 3600)
+
+def signs(longitudes, division: int) -> np.ndarray:
+    """Varga sign indexes (0 = Mesha) of sidereal longitudes in degrees"""
+    if division not in NAMES:
+        raise ValueError(f"Unsupported divisional chart: D{division}")
+    seconds = _arc_seconds(longitudes)
+    sign, in_sign = np.divmod(seconds, SIGN_SECONDS)
+    if division == 2:
+        return _HORA[sign, in_sign * 2 // SIGN_SECONDS]
+    if division == 30:
+        return _TRIMSAMSA[sign % 2, in_sign // 3600]
+    part = in_sign * division // SIGN_SECONDS
+    return (_STARTS[division][sign] + part * _STEPS.get(division, 1)) % 12
+
+def chart(longitudes: Dict[str, float], divisions: Iterable[int]) -> Dict[int, Dict[str, int]]:
+    """Varga sign index of every body for each division, evaluated for all bodies at once"""
+    names = list(longitudes)
+    values = np.array([longitudes[name] for name in names], dtype=float)
+    return {
+        division: dict(zip(names, signs(values, division).tolist()))
+        for division in divisions
+    }
+
+def parse_division(value) -> int:
+    """Division number from ``9``, ``"9"`` or ``"D9"``"""
+    text = str(value).strip().upper()
+    try:
+        division = int(text[1:] if text.startswith('D') else text)
+    except ValueError:
+        raise ValueError(f"Invalid divisional chart: {value}")
+    if division not in NAMES:
+        raise ValueError(f"Unsupported divisional chart: {value} (choose from {', '.join(f'D{d}' for d in DIVISIONS)})")
+    return division
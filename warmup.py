@@ -0,0 +1,107 @@
+"""
+Per-worker warm-up and readiness.
+
+A fresh worker answers its first requests slowly: ephemeris data is not
+paged in yet, lazily built caches are empty and code paths run for the first
+time. ``Warmup`` runs a warm-up function once per process in a background
+thread, then times a probe (one representative chart) a number of times. The
+worker counts as ready only when both have finished, so a readiness check
+can keep traffic away from it until it is fast, and the measured latency is
+reported with the state.
+
+Warm-up starts when ``start`` is first called in a process: from the
+gunicorn ``post_worker_init`` hook, or at the latest from the first
+readiness check. After a fork it runs again in the child.
+"""
+
+import logging
+import os
+import threading
+import time
+from typing import Any, Callable, Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+PENDING = 'pending'
+WARMING = 'warming'
+READY = 'ready'
+FAILED = 'failed'
+
+class Warmup:
+    """Runs ``warm`` and then ``samples`` timed calls of ``probe`` once per process"""
+
+    def __init__(self, warm: Callable[[], Dict[str, Any]], probe: Callable[[], Any], samples: int = 20,
+                 enabled: bool = True):
+        self.warm = warm
+        self.probe = probe
+        self.samples = max(samples, 1)
+        self.enabled = enabled
+        self._lock = threading.Lock()
+        self._pid: Optional[int] = None
+        self._reset()
+
+    def _reset(self) -> None:
+        self._state = PENDING if self.enabled else READY
+        self._error: Optional[str] = None
+        self._warm_ms: Optional[float] = None
+        self._details: Dict[str, Any] = {}
+        self._probe_ms: List[float] = []
+
+    def start(self) -> None:
+        """Start warming this process in the background, unless it already has"""
+        if self._pid == os.getpid():
+            return
+        with self._lock:
+            if self._pid == os.getpid():
+                return
+            self._pid = os.getpid()
+            self._reset()
+            if self.enabled:
+                self._state = WARMING
+                threading.Thread(target=self._run, name='warmup', daemon=True).start()
+
+    def _run(self) -> None:
+        started = time.perf_counter()
+        try:
+            details = self.warm()
+            warm_ms = (time.perf_counter() - started) * 1000
+            probe_ms = []
+            for _ in range(self.samples):
+                probe_started = time.perf_counter()
+                self.probe()
+                probe_ms.append((time.perf_counter() - probe_started) * 1000)
+        except Exception as e:
+            logger.error(f"Worker warm-up failed: {e}")
+            with self._lock:
+                self._state, self._error = FAILED, str(e)
+            return
+        probe_ms.sort()
+        with self._lock:
+            self._state, self._warm_ms, self._details, self._probe_ms = READY, warm_ms, details or {}, probe_ms
+        logger.info(f"Worker {os.getpid()} warmed up in {warm_ms:.0f} ms "
+                    f"(warm chart p50 {probe_ms[len(probe_ms) // 2]:.2f} ms)")
+
+    @property
+    def ready(self) -> bool:
+        return self._state == READY
+
+    def status(self) -> Dict[str, Any]:
+        with self._lock:
+            status: Dict[str, Any] = {'state': self._state, 'pid': os.getpid()}
+            if not self.enabled:
+                return {**status, 'enabled': False}
+            if self._error is not None:
+                status['error'] = self._error
+            if self._warm_ms is not None:
+                probe = self._probe_ms
+                status.update({
+                    'warmup_ms': round(self._warm_ms, 1),
+                    **self._details,
+                    'chart_ms': {
+                        'samples': len(probe),
+                        'p50': round(probe[len(probe) // 2], 3),
+                        'p95': round(probe[min(int(len(probe) * 0.95), len(probe) - 1)], 3),
+                        'max': round(probe[-1], 3)
+                    }
+                })
+            return status